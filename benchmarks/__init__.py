@@ -0,0 +1,23 @@
+"""
+ANAugment Benchmark Suite
+
+This package measures the speed and memory use of every augmentation in `anaug.default`
+and `anaug.generative.random_lesion` over a matrix of square image sizes (128 to 4096),
+dtypes (uint8, uint16, float32, float64) and channel counts (1, 3, 4, 8). Results are
+written as JSON and can be compared against a baseline recorded on the same machine;
+any slowdown or memory growth beyond the tolerance makes the run exit with status 1.
+
+Baselines are machine-specific and are not kept in the repository: record one with
+`--output` before a change and pass it with `--baseline` afterwards.
+
+Usage Examples:
+------------
+$ python -m benchmarks --list
+$ python -m benchmarks --quick --output before.json
+$ python -m benchmarks --quick --baseline before.json --output after.json
+"""
+
+from .cases import CASES, BenchmarkCase
+from .runner import compare, measure, run_benchmarks
+
+__all__ = ['CASES', 'BenchmarkCase', 'compare', 'measure', 'run_benchmarks']
@@ -0,0 +1,232 @@
+"""
+Backend Comparison Benchmark
+
+This module times anaug ops against the reference implementation they replaced or
+dispatch away from (e.g. `blur(blur_type='gaussian')` against a per-channel
+`scipy.ndimage.gaussian_filter`) and reports the speedup for every size, dtype and
+channel count, including many-channel images. Both sides of a comparison compute the
+same result, so the ratio is the gain of the backend dispatch.
+
+Functions:
+- run_backend_benchmarks: Time every selected comparison over the selected matrix.
+- main: Command-line entry point (`python -m benchmarks.backends`).
+
+Usage Examples:
+------------
+$ python -m benchmarks.backends
+$ python -m benchmarks.backends --ops 'blur[gaussian*' --sizes 512 2048 --channels 1 3 16
+"""
+
+import argparse
+import fnmatch
+import json
+import sys
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+from scipy import ndimage
+
+from .cases import ALL_DTYPES, BenchmarkCase, _import, _overlapping_patches, default
+from .runner import environment, make_input, measure
+
+DEFAULT_SIZES = (512, 2048)
+DEFAULT_CHANNELS = (1, 3, 16)
+
+random_resized_crop_module = _import('default.random_resized_crop')
+
+# Channel counts the compared ops accept: OpenCV filters take up to 512 interleaved channels
+_FILTER_CHANNELS = tuple(range(1, 513))
+
+
+def _per_channel(image, value: Any, channel_value: Any) -> Tuple[Any, ...]:
+    return (value, value) + ((channel_value,) if image.ndim == 3 else ())
+
+
+def _scipy_gaussian(image, sigma):
+    return ndimage.gaussian_filter(image, sigma=_per_channel(image, sigma, 0))
+
+
+def _scipy_median(image, size):
+    return ndimage.median_filter(image, size=_per_channel(image, size, 1))
+
+
+def _blur_12bit(image, **params):
+    return default.blur(image >> 4, **params)
+
+
+def _scipy_median_12bit(image, size):
+    return _scipy_median(image >> 4, size)
+
+
+def _gaussian_comparison(sigma: float, method: str) -> Tuple[BenchmarkCase, BenchmarkCase]:
+    return (BenchmarkCase(f'blur[gaussian,sigma={sigma},{method}]', default.blur,
+                          {'blur_type': 'gaussian', 'blur_radius': sigma, 'method': method}, channels=_FILTER_CHANNELS),
+            BenchmarkCase('scipy.gaussian_filter', _scipy_gaussian, {'sigma': sigma}))
+
+
+def _filter2d_motion(image, length, angle):
+    # The uncropped rotated line kernel, applied by `cv2.filter2D` on every call
+    kernel = np.zeros((length, length))
+    kernel[length // 2, :] = 1 / length
+    rotation = cv2.getRotationMatrix2D((length // 2, length // 2), angle, 1)
+    return cv2.filter2D(image, -1, cv2.warpAffine(kernel, rotation, (length, length))).reshape(image.shape)
+
+
+def _motion_comparison(length: int, angle: float) -> Tuple[BenchmarkCase, BenchmarkCase]:
+    return (BenchmarkCase(f'motion_blur[length={length},angle={angle}]', default.motion_blur,
+                          {'length': length, 'angle': angle}, channels=_FILTER_CHANNELS),
+            BenchmarkCase('cv2.filter2D', _filter2d_motion, {'length': length, 'angle': angle}))
+
+
+def _median_comparison(size: int, dtypes: Sequence[str]) -> Tuple[BenchmarkCase, BenchmarkCase]:
+    return (BenchmarkCase(f'blur[median,size={size}]', default.blur, {'blur_type': 'median', 'blur_radius': size},
+                          dtypes=dtypes, channels=_FILTER_CHANNELS),
+            BenchmarkCase('scipy.median_filter', _scipy_median, {'size': size}))
+
+
+def _median_12bit_comparison(size: int) -> Tuple[BenchmarkCase, BenchmarkCase]:
+    # 12-bit data in uint16 images, as produced by CT and many other medical scanners
+    return (BenchmarkCase(f'blur[median,size={size},12-bit]', _blur_12bit, {'blur_type': 'median', 'blur_radius': size},
+                          dtypes=('uint16',), channels=_FILTER_CHANNELS),
+            BenchmarkCase('scipy.median_filter', _scipy_median_12bit, {'size': size}))
+
+
+def _crop_then_scale(image, size):
+    # The former two-step pipeline: copy the region of the seeded draw, then resize the copy
+    top, left, height, width = (int(value) for value in random_resized_crop_module._sample_boxes(
+        np.random.default_rng(0), 1, image.shape[0], image.shape[1], (0.08, 1.0), (3 / 4, 4 / 3))[0])
+    region = default.crop(image, top, left, height, width)
+    return cv2.resize(region, (size[1], size[0]), interpolation=cv2.INTER_LINEAR).reshape(size + image.shape[2:])
+
+
+def _crop_patches(image, patch_size, stride, pad, pad_value=0):
+    # One `crop` call per patch, stacked into the same (rows, cols, ph, pw[, C]) layout
+    pad_value = (pad_value,) * (image.shape[2] if image.ndim == 3 else 1)
+    rows = -(-(image.shape[0] - patch_size) // stride) + 1
+    cols = -(-(image.shape[1] - patch_size) // stride) + 1
+    return np.stack([np.stack([default.crop(image, i * stride, j * stride, patch_size, patch_size,
+                                            adjust_if_exceeds=pad, pad_value=pad_value) for j in range(cols)])
+                     for i in range(rows)])
+
+
+# (candidate, reference): both are called with the same input and must agree
+COMPARISONS: Tuple[Tuple[BenchmarkCase, BenchmarkCase], ...] = (
+    (BenchmarkCase('blur[gaussian,sigma=2]', default.blur, {'blur_type': 'gaussian', 'blur_radius': 2},
+                   channels=_FILTER_CHANNELS),
+     BenchmarkCase('scipy.gaussian_filter', _scipy_gaussian, {'sigma': 2})),
+    (BenchmarkCase('blur[gaussian,sigma=8]', default.blur, {'blur_type': 'gaussian', 'blur_radius': 8},
+                   channels=_FILTER_CHANNELS),
+     BenchmarkCase('scipy.gaussian_filter', _scipy_gaussian, {'sigma': 8})),
+    # Approximations for strong blurs; 'max diff' is their error
+    _gaussian_comparison(20, 'iir'),
+    _gaussian_comparison(20, 'pyramid'),
+    _gaussian_comparison(50, 'iir'),
+    _gaussian_comparison(50, 'pyramid'),
+    # Window-size sweep of the median; the SciPy reference gets slow quickly, so narrow
+    # the sizes for large windows (e.g. --sizes 512)
+    _median_comparison(3, ALL_DTYPES),
+    _median_comparison(5, ALL_DTYPES),
+    _median_comparison(9, ('uint8', 'uint16')),
+    _median_comparison(15, ('uint8', 'uint16')),
+    _median_comparison(31, ('uint8', 'uint16')),
+    _median_12bit_comparison(9),
+    _median_12bit_comparison(15),
+    # Cached, cropped kernels; from 101 pixels the FFT path on images up to 1024x1024
+    _motion_comparison(9, 30),
+    _motion_comparison(25, 5),
+    _motion_comparison(41, 30),
+    _motion_comparison(151, 30),
+    # Resizing straight from the region against copying it first
+    (BenchmarkCase('random_resized_crop', default.random_resized_crop, {'size': (224, 224), 'rng': 0},
+                   channels=(1, 3, 4)),
+     BenchmarkCase('crop+cv2.resize', _crop_then_scale, {'size': (224, 224)})),
+    # One strided view copied once against a crop call per patch
+    (BenchmarkCase('extract_patches[contiguous]', default.extract_patches,
+                   lambda image: dict(_overlapping_patches(image), contiguous=True)),
+     BenchmarkCase('crop per patch', _crop_patches, _overlapping_patches)),
+)
+
+
+def run_backend_benchmarks(
+    patterns: Optional[Sequence[str]] = None,
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    dtypes: Sequence[str] = ALL_DTYPES,
+    channels: Sequence[int] = DEFAULT_CHANNELS,
+    min_time: float = 0.2,
+    repeat: int = 3,
+    progress: Any = None
+) -> List[Dict[str, Any]]:
+    """
+    Time the selected comparisons over the selected matrix.
+
+    Returns
+    -------
+    List[Dict[str, Any]]
+        One entry per comparison and input with 'op', 'reference', 'size', 'dtype',
+        'channels', 'seconds', 'reference_seconds', 'speedup' and 'max_difference' (largest
+        absolute difference between the two results).
+    """
+    results = []
+    for candidate, reference in COMPARISONS:
+        if patterns and not any(fnmatch.fnmatchcase(candidate.name, pattern) for pattern in patterns):
+            continue
+        for size in sizes:
+            for dtype in dtypes:
+                for num_channels in channels:
+                    if not candidate.supports(dtype, num_channels):
+                        continue
+                    image = make_input(size, dtype, num_channels)
+                    seconds = measure(candidate, image, min_time, repeat, memory=False)['seconds']
+                    reference_seconds = measure(reference, image, min_time, repeat, memory=False)['seconds']
+                    difference = np.abs(candidate(image).astype(np.float64) - reference(image).astype(np.float64))
+                    entry = {
+                        'op': candidate.name,
+                        'reference': reference.name,
+                        'size': size,
+                        'dtype': dtype,
+                        'channels': num_channels,
+                        'seconds': seconds,
+                        'reference_seconds': reference_seconds,
+                        'speedup': reference_seconds / seconds if seconds > 0 else float('inf'),
+                        'max_difference': float(difference.max()),
+                    }
+                    results.append(entry)
+                    if progress is not None:
+                        print(format_comparison(entry), file=progress, flush=True)
+    return results
+
+
+def format_comparison(entry: Dict[str, Any]) -> str:
+    return (f"{entry['op']:<34} {entry['size']:>5}px {entry['dtype']:<8} {entry['channels']:>3}ch "
+            f"{entry['seconds'] * 1e3:9.2f} ms  {entry['reference']} {entry['reference_seconds'] * 1e3:9.2f} ms  "
+            f"x{entry['speedup']:.2f}  max diff {entry['max_difference']:.2g}")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run the backend comparison from the command line and return the exit status."""
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.backends',
+                                     description='Compare anaug ops against their reference implementations.')
+    parser.add_argument('--ops', nargs='+', metavar='PATTERN', help='Shell-style patterns of the ops to compare.')
+    parser.add_argument('--sizes', nargs='+', type=int, default=DEFAULT_SIZES,
+                        help=f'Square image sizes. Default: {DEFAULT_SIZES}.')
+    parser.add_argument('--dtypes', nargs='+', choices=ALL_DTYPES, default=ALL_DTYPES, help='Input dtypes. Default: all.')
+    parser.add_argument('--channels', nargs='+', type=int, default=DEFAULT_CHANNELS,
+                        help=f'Channel counts. Default: {DEFAULT_CHANNELS}.')
+    parser.add_argument('--min-time', type=float, default=0.2, help='Minimum timed seconds per entry.')
+    parser.add_argument('--output', help='Write the results as JSON to this file.')
+    args = parser.parse_args(argv)
+
+    results = run_backend_benchmarks(args.ops, args.sizes, args.dtypes, args.channels, args.min_time,
+                                     progress=sys.stdout)
+    if not results:
+        print(f"No comparison matches {args.ops}.", file=sys.stderr)
+        return 2
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump({'environment': environment(), 'results': results}, file, indent=1)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,205 @@
+"""
+Benchmark Case Definitions
+
+This module lists what the benchmark runner times: one `BenchmarkCase` per function of
+`anaug.default` (single-image and `*_batch` variants) and `anaug.generative.random_lesion`,
+with representative parameters and the dtypes and channel counts each function supports.
+
+The installed `anaug` package is benchmarked if it is importable; otherwise the source
+tree of the checkout (`src.anaug`) is used, so the suite runs without installing.
+"""
+
+import importlib
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def _import(module: str):
+    """Import `anaug.<module>`, falling back to the source checkout."""
+    try:
+        return importlib.import_module(f"anaug.{module}")
+    except ImportError:
+        return importlib.import_module(f"src.anaug.{module}")
+
+
+default = _import('default')
+random_lesion_module = _import('generative.random_lesion')
+
+ALL_DTYPES = ('uint8', 'uint16', 'float32', 'float64')
+ALL_CHANNELS = (1, 3, 4, 8)
+
+
+class BenchmarkCase:
+    """
+    A function to benchmark together with its arguments and supported inputs.
+
+    Parameters
+    ----------
+    name : str
+        Unique name of the case, used in reports and baselines.
+    func : Callable[..., np.ndarray]
+        Function under test. It is called as `func(image, **params)`.
+    params : Dict[str, Any] or Callable[[np.ndarray], Dict[str, Any]], optional
+        Keyword arguments, or a function of the input that returns them (for parameters
+        that depend on the image size, such as crop windows).
+    dtypes : Sequence[str], optional
+        Input dtypes the function supports. Defaults to all benchmarked dtypes.
+    channels : Sequence[int], optional
+        Channel counts the function supports; 1 means a 2D (H, W) image. Defaults to all
+        benchmarked channel counts.
+    batch : bool, optional
+        Whether the function takes an (N, H, W[, C]) batch instead of a single image.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[..., np.ndarray],
+        params: Any = None,
+        dtypes: Sequence[str] = ALL_DTYPES,
+        channels: Sequence[int] = ALL_CHANNELS,
+        batch: bool = False
+    ):
+        self.name = name
+        self.func = func
+        self.params = params if params is not None else {}
+        self.dtypes = tuple(dtypes)
+        self.channels = tuple(channels)
+        self.batch = batch
+
+    def supports(self, dtype: str, channels: int) -> bool:
+        return dtype in self.dtypes and channels in self.channels
+
+    def arguments(self, image: np.ndarray) -> Dict[str, Any]:
+        return self.params(image) if callable(self.params) else dict(self.params)
+
+    def __call__(self, image: np.ndarray) -> np.ndarray:
+        return self.func(image, **self.arguments(image))
+
+    def __repr__(self) -> str:
+        return f"BenchmarkCase({self.name!r})"
+
+
+def _spatial(image: np.ndarray, batch: bool) -> Tuple[int, int]:
+    return image.shape[1:3] if batch else image.shape[:2]
+
+
+def _overlapping_patches(image: np.ndarray) -> Dict[str, Any]:
+    # 64x64 patches overlapping by half, padded to cover the whole image
+    return {'patch_size': 64, 'stride': 32, 'pad': True}
+
+
+def _center_crop(image: np.ndarray, batch: bool = False) -> Dict[str, Any]:
+    height, width = _spatial(image, batch)
+    top, left = height // 4, width // 4
+    if batch:
+        return {'tops': top, 'lefts': left, 'height': height // 2, 'width': width // 2}
+    return {'top': top, 'left': left, 'height': height // 2, 'width': width // 2}
+
+
+def _padded_crop(image: np.ndarray, batch: bool = False) -> Dict[str, Any]:
+    # A full-size window shifted by an eighth of the image, so a quarter of it is padding
+    height, width = _spatial(image, batch)
+    channels = image.shape[3 if batch else 2] if image.ndim == (4 if batch else 3) else 1
+    params = {'height': height, 'width': width, 'adjust_if_exceeds': True, 'pad_value': (0,) * channels}
+    if batch:
+        params.update(tops=height // 8, lefts=width // 8)
+    else:
+        params.update(top=height // 8, left=width // 8)
+    return params
+
+
+def _box_size_ramp(image: np.ndarray) -> Dict[str, Any]:
+    # Window sizes growing from 1 to 15 pixels across the image, one per column
+    height, width = image.shape[:2]
+    sizes = np.broadcast_to(1 + np.arange(width) * 15 // width, (height, width))
+    return {'blur_type': 'uniform', 'blur_radius': sizes}
+
+
+def _lesions(image: np.ndarray) -> Dict[str, Any]:
+    # Lesion sizes scale with the image so that every size does comparable work per pixel
+    size = min(image.shape[:2])
+    return {'size_range': (max(10, size // 40), max(11, size // 10)), 'shape': 'irregular', 'num_lesions': 3, 'seed': 0}
+
+
+# Noise only accepts these input dtypes
+_NOISE_DTYPES = ('uint8', 'float32', 'float64')
+
+# Dtypes with a median whose cost does not grow with the window size
+_MEDIAN_SWEEP_DTYPES = ('uint8', 'uint16')
+
+CASES = (
+    # ---------------------
+    # Single-image functions
+    # ---------------------
+    BenchmarkCase('blur[gaussian]', default.blur, {'blur_type': 'gaussian', 'blur_radius': 2}),
+    BenchmarkCase('blur[uniform]', default.blur, {'blur_type': 'uniform', 'blur_radius': 5}),
+    BenchmarkCase('blur[uniform,per-pixel]', default.blur, _box_size_ramp),
+    BenchmarkCase('blur[median]', default.blur, {'blur_type': 'median', 'blur_radius': 3}),
+    # Window-size sweep; SciPy's cost grows with the window area, so the float fallback
+    # is only swept up to 7x7
+    BenchmarkCase('blur[median,size=7]', default.blur, {'blur_type': 'median', 'blur_radius': 7}),
+    BenchmarkCase('blur[median,size=15]', default.blur, {'blur_type': 'median', 'blur_radius': 15},
+                  dtypes=_MEDIAN_SWEEP_DTYPES),
+    BenchmarkCase('blur[median,size=31]', default.blur, {'blur_type': 'median', 'blur_radius': 31},
+                  dtypes=_MEDIAN_SWEEP_DTYPES),
+    BenchmarkCase('motion_blur', default.motion_blur, {'length': 9, 'angle': 30}),
+    BenchmarkCase('crop', default.crop, _center_crop),
+    BenchmarkCase('crop[padded]', default.crop, _padded_crop),
+    BenchmarkCase('crop[view]', default.crop, lambda image: dict(_center_crop(image), copy=False)),
+    BenchmarkCase('extract_patches', default.extract_patches, _overlapping_patches),
+    BenchmarkCase('extract_patches[contiguous]', default.extract_patches,
+                  lambda image: dict(_overlapping_patches(image), contiguous=True)),
+    BenchmarkCase('elastic_deformation', default.elastic_deformation, {'alpha': 34.0, 'sigma': 4.0, 'random_state': 0}),
+    BenchmarkCase('elastic_deformation[grid]', default.elastic_deformation,
+                  {'alpha': 34.0, 'sigma': 4.0, 'random_state': 0, 'method': 'grid'}),
+    BenchmarkCase('elastic_deformation[fixed_point]', default.elastic_deformation,
+                  {'alpha': 34.0, 'sigma': 4.0, 'random_state': 0, 'fixed_point': True}),
+    BenchmarkCase('elastic_deformation[sigma=16]', default.elastic_deformation,
+                  {'alpha': 136.0, 'sigma': 16.0, 'random_state': 0}),
+    BenchmarkCase('elastic_deformation[grid,sigma=16]', default.elastic_deformation,
+                  {'alpha': 136.0, 'sigma': 16.0, 'random_state': 0, 'method': 'grid'}),
+    BenchmarkCase('flip', default.flip, {'axes': ['horizontal', 'vertical']}),
+    BenchmarkCase('intensity', default.intensity, {'brightness_factor': 1.2, 'contrast_factor': 0.8}),
+    BenchmarkCase('noise[gaussian]', default.noise, {'noise_type': 'gaussian', 'noise_intensity': 0.05},
+                  dtypes=_NOISE_DTYPES),
+    BenchmarkCase('noise[salt_and_pepper]', default.noise, {'noise_type': 'salt_and_pepper', 'noise_intensity': 0.05},
+                  dtypes=_NOISE_DTYPES),
+    BenchmarkCase('noise[poisson]', default.noise, {'noise_type': 'poisson', 'noise_intensity': 1.0},
+                  dtypes=_NOISE_DTYPES),
+    BenchmarkCase('random_resized_crop', default.random_resized_crop, {'size': (224, 224), 'rng': 0}),
+    BenchmarkCase('random_rotation', default.random_rotation, {'angle_range': (-30, 30)}),
+    BenchmarkCase('rotate', default.rotate, {'angle': 30}),
+    BenchmarkCase('scale', default.scale, {'scale_factor': 0.5}),
+    BenchmarkCase('random_lesion', random_lesion_module.random_lesion, _lesions,
+                  dtypes=('float32', 'float64'), channels=(1,)),
+
+    # ---------------------
+    # Batch functions
+    # ---------------------
+    BenchmarkCase('blur_batch[gaussian]', default.blur_batch, {'blur_type': 'gaussian', 'blur_radii': 2}, batch=True),
+    BenchmarkCase('blur_batch[uniform,per-sample]', default.blur_batch,
+                  lambda images: {'blur_type': 'uniform', 'blur_radii': 1 + np.arange(len(images)) % 15}, batch=True),
+    BenchmarkCase('crop_batch', default.crop_batch, lambda images: _center_crop(images, batch=True), batch=True),
+    BenchmarkCase('crop_batch[padded]', default.crop_batch, lambda images: _padded_crop(images, batch=True), batch=True),
+    BenchmarkCase('elastic_deformation_batch', default.elastic_deformation_batch,
+                  {'alphas': 34.0, 'sigmas': 4.0, 'random_state': 0}, batch=True),
+    BenchmarkCase('flip_batch', default.flip_batch, {'horizontal': True, 'vertical': True}, batch=True),
+    BenchmarkCase('intensity_batch', default.intensity_batch,
+                  {'brightness_factors': 1.2, 'contrast_factors': 0.8}, batch=True),
+    BenchmarkCase('noise_batch[gaussian]', default.noise_batch, {'noise_type': 'gaussian', 'noise_intensities': 0.05},
+                  dtypes=_NOISE_DTYPES, batch=True),
+    BenchmarkCase('random_resized_crop_batch', default.random_resized_crop_batch, {'size': (224, 224), 'rng': 0},
+                  batch=True),
+    BenchmarkCase('rotate_batch', default.rotate_batch, {'angles': 30}, batch=True),
+    BenchmarkCase('scale_batch', default.scale_batch, {'scale_factors': 0.5}, batch=True),
+)
+
+
+def get_case(name: str) -> Optional[BenchmarkCase]:
+    """Return the case called `name`, or None."""
+    for case in CASES:
+        if case.name == name:
+            return case
+    return None
@@ -0,0 +1,156 @@
+"""
+Import-Time Benchmark
+
+This module measures how long importing `anaug` and its ops takes in a fresh
+interpreter, the cost paid by every spawned worker process, and checks which heavy
+backends each import loads. Light entry points (`import anaug`, `flip`, `intensity`,
+`noise`) must not load OpenCV or SciPy; a violation makes the run exit with status 1,
+as does a slowdown beyond the tolerance when a baseline is given.
+
+Functions:
+- measure_import: Time one import statement in fresh interpreters.
+- run_import_benchmarks: Measure every import case.
+- main: Command-line entry point (`python -m benchmarks.import_time`).
+
+Usage Examples:
+------------
+$ python -m benchmarks.import_time
+$ python -m benchmarks.import_time --output imports.json
+$ python -m benchmarks.import_time --baseline imports.json --tolerance 0.5
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+HEAVY_MODULES = ('cv2', 'scipy')
+
+# (name, statement, heavy modules the statement must not load); '{package}' is
+# replaced by the import name of the package under test
+IMPORT_CASES: Tuple[Tuple[str, str, Tuple[str, ...]], ...] = (
+    ('import anaug', 'import {package}', ('cv2', 'scipy')),
+    ('default.flip+intensity', 'from {package}.default import flip, intensity', ('cv2', 'scipy')),
+    ('default.noise', 'from {package}.default import noise', ('cv2', 'scipy')),
+    ('default.crop', 'from {package}.default import crop', ('cv2', 'scipy')),
+    ('Compose', 'from {package} import Compose', ('scipy',)),
+    ('default.rotate', 'from {package}.default import rotate', ('scipy',)),
+    ('default.blur', 'from {package}.default import blur', ()),
+    ('random_lesion', 'from {package}.generative import random_lesion', ()),
+)
+
+_PROBE = (
+    "import sys, time, json\n"
+    "begin = time.perf_counter()\n"
+    "{statement}\n"
+    "seconds = time.perf_counter() - begin\n"
+    "print(json.dumps({{'seconds': seconds, 'loaded': [name for name in {heavy!r} if name in sys.modules]}}))\n"
+)
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def package_name() -> str:
+    """Return 'anaug' if the package is installed, else the source checkout's 'src.anaug'."""
+    return 'anaug' if importlib.util.find_spec('anaug') is not None else 'src.anaug'
+
+
+def measure_import(statement: str, repeat: int = 5, python: str = sys.executable) -> Dict[str, Any]:
+    """
+    Time `statement` in `repeat` fresh interpreters.
+
+    Interpreter startup is excluded: only the statement itself is timed.
+
+    Returns
+    -------
+    Dict[str, Any]
+        'seconds' (median), 'min_seconds' and 'loaded' (heavy modules present in
+        `sys.modules` afterwards).
+    """
+    code = _PROBE.format(statement=statement, heavy=HEAVY_MODULES)
+    timings, loaded = [], set()
+    for _ in range(repeat):
+        completed = subprocess.run([python, '-c', code], cwd=_ROOT, capture_output=True, text=True, check=True)
+        probe = json.loads(completed.stdout.strip().splitlines()[-1])
+        timings.append(probe['seconds'])
+        loaded.update(probe['loaded'])
+    return {'seconds': statistics.median(timings), 'min_seconds': min(timings), 'loaded': sorted(loaded)}
+
+
+def run_import_benchmarks(repeat: int = 5, package: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Measure every entry of `IMPORT_CASES`.
+
+    Returns
+    -------
+    List[Dict[str, Any]]
+        One entry per case with 'name', 'statement', the fields of `measure_import` and
+        'violations' (forbidden heavy modules that were loaded).
+    """
+    package = package or package_name()
+    results = []
+    for name, template, forbidden in IMPORT_CASES:
+        statement = template.format(package=package)
+        entry = {'name': name, 'statement': statement}
+        entry.update(measure_import(statement, repeat))
+        entry['violations'] = [module for module in forbidden if module in entry['loaded']]
+        results.append(entry)
+    return results
+
+
+def compare_imports(results: Sequence[Dict[str, Any]], baseline: Sequence[Dict[str, Any]],
+                    tolerance: float = 0.5, min_seconds: float = 0.005) -> List[str]:
+    """Return a message for every case that got slower than the baseline by more than `tolerance`."""
+    reference = {entry['name']: entry for entry in baseline}
+    messages = []
+    for entry in results:
+        old = reference.get(entry['name'])
+        if old is None or max(entry['seconds'], old['seconds']) < min_seconds:
+            continue
+        if entry['seconds'] > old['seconds'] * (1 + tolerance):
+            messages.append(f"REGRESSION {entry['name']}: {old['seconds'] * 1e3:.1f} ms -> "
+                            f"{entry['seconds'] * 1e3:.1f} ms ({entry['seconds'] / old['seconds']:.2f}x)")
+    return messages
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run the import-time benchmark from the command line and return the exit status."""
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.import_time',
+                                     description='Measure the import time of anaug entry points.')
+    parser.add_argument('--repeat', type=int, default=5, help='Fresh interpreters per case. Default: 5.')
+    parser.add_argument('--output', help='Write the results as JSON to this file.')
+    parser.add_argument('--baseline', help='JSON results to compare against; exits with status 1 on regression.')
+    parser.add_argument('--tolerance', type=float, default=0.5, help='Allowed relative slowdown. Default: 0.5.')
+    args = parser.parse_args(argv)
+
+    results = run_import_benchmarks(args.repeat)
+    for entry in results:
+        loaded = ', '.join(entry['loaded']) or '-'
+        print(f"{entry['name']:<24} {entry['seconds'] * 1e3:8.1f} ms  loads: {loaded}")
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump({'results': results}, file, indent=1)
+
+    status = 0
+    for entry in results:
+        if entry['violations']:
+            print(f"VIOLATION {entry['name']}: '{entry['statement']}' loads {', '.join(entry['violations'])}",
+                  file=sys.stderr)
+            status = 1
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)['results']
+        messages = compare_imports(results, baseline, args.tolerance)
+        for message in messages:
+            print(message, file=sys.stderr)
+        if messages:
+            status = 1
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
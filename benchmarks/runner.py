@@ -0,0 +1,385 @@
+"""
+Benchmark Runner
+
+This module times the cases of `benchmarks.cases` over a matrix of image sizes, dtypes
+and channel counts, reports throughput and peak memory, writes the results as JSON and
+compares them against a stored baseline.
+
+Functions:
+- make_input: Build the deterministic input array of one matrix entry.
+- measure: Time one case on one input and record its peak traced memory.
+- run_benchmarks: Run every selected case over the selected matrix.
+- compare: Compare results against a baseline and list the regressions.
+- main: Command-line entry point (`python -m benchmarks`).
+
+Usage Examples:
+------------
+$ python -m benchmarks --quick --output results.json
+$ python -m benchmarks --ops 'blur*' 'rotate' --sizes 512 2048 --dtypes uint8 float32
+$ python -m benchmarks --output baseline.json                  # record a baseline
+$ python -m benchmarks --baseline baseline.json --tolerance 0.2 # exits with 1 on regression
+"""
+
+import argparse
+import datetime
+import fnmatch
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from .cases import ALL_CHANNELS, ALL_DTYPES, CASES, BenchmarkCase
+
+DEFAULT_SIZES = (128, 256, 512, 1024, 2048, 4096)
+QUICK_SIZES = (128, 512)
+QUICK_CHANNELS = (1, 3)
+DEFAULT_BATCH_SIZE = 8
+DEFAULT_MAX_INPUT_BYTES = 2**30
+
+# Timings below this are dominated by measurement noise and never count as regressions
+MIN_COMPARED_SECONDS = 1e-4
+
+
+def make_input(size: int, dtype: str, channels: int, batch_size: Optional[int] = None) -> np.ndarray:
+    """
+    Build a deterministic random input of shape ([N,] size, size[, channels]).
+
+    Integer inputs span the full range of their dtype; floating-point inputs lie in [0, 1].
+    A channel count of 1 gives a 2D (grayscale) image.
+    """
+    shape = (size, size) if channels == 1 else (size, size, channels)
+    if batch_size is not None:
+        shape = (batch_size,) + shape
+    rng = np.random.default_rng(0)
+    dtype = np.dtype(dtype)
+    if np.issubdtype(dtype, np.integer):
+        return rng.integers(0, np.iinfo(dtype).max, size=shape, dtype=dtype, endpoint=True)
+    return rng.random(shape, dtype=np.float32 if dtype == np.float32 else np.float64).astype(dtype, copy=False)
+
+
+def _entry(case: BenchmarkCase, size: int, dtype: str, channels: int, batch_size: int) -> Dict[str, Any]:
+    return {
+        'op': case.name,
+        'size': size,
+        'dtype': dtype,
+        'channels': channels,
+        'batch_size': batch_size if case.batch else 1,
+    }
+
+
+def _key(entry: Dict[str, Any]) -> tuple:
+    return (entry['op'], entry['size'], entry['dtype'], entry['channels'], entry['batch_size'])
+
+
+def measure(
+    case: BenchmarkCase,
+    image: np.ndarray,
+    min_time: float = 0.2,
+    repeat: int = 3,
+    max_repeat: int = 50,
+    memory: bool = True
+) -> Dict[str, Any]:
+    """
+    Time `case` on `image` and record its peak memory.
+
+    The case is called once to warm up, then at least `repeat` times and until `min_time`
+    seconds have passed (at most `max_repeat` times). The global NumPy random state is
+    reseeded before every call so that random augmentations do the same work each time.
+
+    Parameters
+    ----------
+    case : BenchmarkCase
+        Case to run.
+    image : np.ndarray
+        Input image or batch.
+    min_time : float, optional
+        Minimum total time spent in timed calls. Default is 0.2 seconds.
+    repeat : int, optional
+        Minimum number of timed calls. Default is 3.
+    max_repeat : int, optional
+        Maximum number of timed calls. Default is 50.
+    memory : bool, optional
+        Whether to run one extra call under `tracemalloc` to measure the peak memory
+        allocated by the call (NumPy, SciPy and OpenCV output buffers are traced).
+
+    Returns
+    -------
+    Dict[str, Any]
+        'seconds' (median), 'min_seconds', 'runs', 'megapixels_per_second',
+        'megabytes_per_second' (input bytes) and 'peak_bytes' (None if not measured).
+    """
+    arguments = case.arguments(image)
+
+    np.random.seed(0)
+    case.func(image, **arguments)
+
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < max_repeat and (len(timings) < repeat or time.perf_counter() - started < min_time):
+        np.random.seed(0)
+        begin = time.perf_counter()
+        case.func(image, **arguments)
+        timings.append(time.perf_counter() - begin)
+
+    peak_bytes = None
+    if memory:
+        np.random.seed(0)
+        tracemalloc.start()
+        try:
+            baseline, _ = tracemalloc.get_traced_memory()
+            case.func(image, **arguments)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        peak_bytes = max(0, peak - baseline)
+
+    seconds = statistics.median(timings)
+    num_pixels = image.shape[0] * image.shape[1] * (image.shape[2] if case.batch else 1)
+    return {
+        'seconds': seconds,
+        'min_seconds': min(timings),
+        'runs': len(timings),
+        'megapixels_per_second': num_pixels / seconds / 1e6 if seconds > 0 else float('inf'),
+        'megabytes_per_second': image.nbytes / seconds / 1e6 if seconds > 0 else float('inf'),
+        'peak_bytes': peak_bytes,
+    }
+
+
+def select_cases(patterns: Optional[Sequence[str]] = None) -> List[BenchmarkCase]:
+    """Return the cases whose name matches any of the shell-style `patterns` (all if None)."""
+    if not patterns:
+        return list(CASES)
+    selected = [case for case in CASES if any(fnmatch.fnmatchcase(case.name, pattern) for pattern in patterns)]
+    if not selected:
+        raise ValueError(f"No benchmark case matches {list(patterns)}. Use --list to see the available cases.")
+    return selected
+
+
+def run_benchmarks(
+    cases: Optional[Iterable[BenchmarkCase]] = None,
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    dtypes: Sequence[str] = ALL_DTYPES,
+    channels: Sequence[int] = ALL_CHANNELS,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_input_bytes: Optional[int] = DEFAULT_MAX_INPUT_BYTES,
+    progress: Optional[Any] = None,
+    **measure_kwargs
+) -> List[Dict[str, Any]]:
+    """
+    Run the cases over the matrix of sizes, dtypes and channel counts.
+
+    Parameters
+    ----------
+    cases : Iterable[BenchmarkCase], optional
+        Cases to run. Defaults to every case.
+    sizes, dtypes, channels : Sequence, optional
+        Matrix to run over; images are square.
+    batch_size : int, optional
+        Number of images per batch for `*_batch` cases. Default is 8.
+    max_input_bytes : int, optional
+        Entries whose input would exceed this size are skipped. Default is 1 GiB.
+    progress : file-like, optional
+        Stream to print one line per finished entry to (unsupported entries are not printed).
+    **measure_kwargs
+        Passed to `measure`.
+
+    Returns
+    -------
+    List[Dict[str, Any]]
+        One entry per case and matrix point, with 'status' set to 'ok', 'skipped'
+        (unsupported input or over the size limit) or 'error' (the call raised).
+    """
+    results = []
+    for case in (CASES if cases is None else cases):
+        for size in sizes:
+            for dtype in dtypes:
+                for num_channels in channels:
+                    entry = _entry(case, size, dtype, num_channels, batch_size)
+                    input_bytes = entry['batch_size'] * size * size * num_channels * np.dtype(dtype).itemsize
+                    if not case.supports(dtype, num_channels):
+                        entry.update(status='skipped', reason='unsupported input')
+                    elif max_input_bytes is not None and input_bytes > max_input_bytes:
+                        entry.update(status='skipped', reason='input larger than max_input_bytes')
+                    else:
+                        image = make_input(size, dtype, num_channels, batch_size if case.batch else None)
+                        try:
+                            entry.update(measure(case, image, **measure_kwargs), status='ok')
+                        except Exception as error:
+                            entry.update(status='error', reason=f"{type(error).__name__}: {error}")
+                        del image
+                    results.append(entry)
+                    if progress is not None and entry.get('reason') != 'unsupported input':
+                        print(format_entry(entry), file=progress, flush=True)
+    return results
+
+
+def compare(
+    results: Sequence[Dict[str, Any]],
+    baseline: Sequence[Dict[str, Any]],
+    tolerance: float = 0.25,
+    memory_tolerance: float = 0.1
+) -> List[Dict[str, Any]]:
+    """
+    Compare results against a baseline.
+
+    An entry regresses if its median time exceeds the baseline's by more than
+    `tolerance` (a fraction; timings under 0.1 ms are ignored), if its peak memory
+    exceeds the baseline's by more than `memory_tolerance`, or if it ran in the baseline
+    but fails now. Entries missing from either side are not compared.
+
+    Returns
+    -------
+    List[Dict[str, Any]]
+        One record per regression with the entry key, 'metric', 'baseline', 'current'
+        and 'ratio'.
+    """
+    reference = {_key(entry): entry for entry in baseline}
+    regressions = []
+    for entry in results:
+        old = reference.get(_key(entry))
+        if old is None or old.get('status') != 'ok':
+            continue
+        key = {name: entry[name] for name in ('op', 'size', 'dtype', 'channels', 'batch_size')}
+        if entry.get('status') == 'error':
+            regressions.append(dict(key, metric='status', baseline='ok', current=entry['reason'], ratio=None))
+            continue
+        if entry.get('status') != 'ok':
+            continue
+        if max(entry['seconds'], old['seconds']) >= MIN_COMPARED_SECONDS and \
+                entry['seconds'] > old['seconds'] * (1 + tolerance):
+            regressions.append(dict(key, metric='seconds', baseline=old['seconds'], current=entry['seconds'],
+                                    ratio=entry['seconds'] / old['seconds']))
+        if entry.get('peak_bytes') is not None and old.get('peak_bytes') is not None and \
+                entry['peak_bytes'] > old['peak_bytes'] * (1 + memory_tolerance):
+            regressions.append(dict(key, metric='peak_bytes', baseline=old['peak_bytes'], current=entry['peak_bytes'],
+                                    ratio=entry['peak_bytes'] / old['peak_bytes'] if old['peak_bytes'] else None))
+    return regressions
+
+
+# ---------------------
+# Reporting
+# ---------------------
+def environment() -> Dict[str, Any]:
+    """Describe the machine and library versions the results were measured with."""
+    versions = {'python': platform.python_version(), 'numpy': np.__version__}
+    for name in ('scipy', 'cv2'):
+        try:
+            versions[name] = __import__(name).__version__
+        except ImportError:
+            versions[name] = None
+    return {
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'versions': versions,
+    }
+
+
+def format_entry(entry: Dict[str, Any]) -> str:
+    label = f"{entry['op']:<28} {entry['size']:>5}² {entry['dtype']:<8} c={entry['channels']:<2}"
+    if entry['batch_size'] > 1:
+        label += f" n={entry['batch_size']}"
+    if entry['status'] != 'ok':
+        return f"{label}  {entry['status']}: {entry['reason']}"
+    peak = '' if entry['peak_bytes'] is None else f"  peak {entry['peak_bytes'] / 2**20:9.1f} MiB"
+    return f"{label}  {entry['seconds'] * 1e3:10.3f} ms  {entry['megapixels_per_second']:9.1f} MP/s{peak}"
+
+
+def format_regression(regression: Dict[str, Any]) -> str:
+    label = (f"{regression['op']} {regression['size']}² {regression['dtype']} "
+             f"c={regression['channels']} n={regression['batch_size']}")
+    if regression['metric'] == 'status':
+        return f"REGRESSION {label}: now fails ({regression['current']})"
+    ratio = '' if regression['ratio'] is None else f" ({regression['ratio']:.2f}x)"
+    return f"REGRESSION {label}: {regression['metric']} {regression['baseline']:.6g} -> {regression['current']:.6g}{ratio}"
+
+
+def _load_results(path: str) -> List[Dict[str, Any]]:
+    with open(path) as file:
+        document = json.load(file)
+    return document['results'] if isinstance(document, dict) else document
+
+
+# ---------------------
+# Command Line
+# ---------------------
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks',
+        description='Time the anaug augmentations over image sizes, dtypes and channel counts.'
+    )
+    parser.add_argument('--ops', nargs='+', metavar='PATTERN', help='Shell-style patterns of the cases to run.')
+    parser.add_argument('--sizes', nargs='+', type=int, help=f'Square image sizes. Default: {DEFAULT_SIZES}.')
+    parser.add_argument('--dtypes', nargs='+', choices=ALL_DTYPES, help='Input dtypes. Default: all.')
+    parser.add_argument('--channels', nargs='+', type=int, help=f'Channel counts. Default: {ALL_CHANNELS}.')
+    parser.add_argument('--quick', action='store_true',
+                        help=f'Small matrix for a fast check: sizes {QUICK_SIZES}, channels {QUICK_CHANNELS}.')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='Images per batch for *_batch cases.')
+    parser.add_argument('--max-input-bytes', type=int, default=DEFAULT_MAX_INPUT_BYTES,
+                        help='Skip entries whose input is larger than this.')
+    parser.add_argument('--min-time', type=float, default=0.2, help='Minimum timed seconds per entry.')
+    parser.add_argument('--repeat', type=int, default=3, help='Minimum timed calls per entry.')
+    parser.add_argument('--no-memory', action='store_true', help='Skip the tracemalloc peak-memory measurement.')
+    parser.add_argument('--output', help='Write the results as JSON to this file.')
+    parser.add_argument('--baseline', help='JSON results to compare against; exits with status 1 on regression.')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed relative slowdown. Default: 0.25.')
+    parser.add_argument('--memory-tolerance', type=float, default=0.1,
+                        help='Allowed relative peak-memory growth. Default: 0.1.')
+    parser.add_argument('--list', action='store_true', help='List the benchmark cases and exit.')
+    parser.add_argument('--quiet', action='store_true', help='Do not print per-entry results.')
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run the benchmarks from the command line and return the exit status."""
+    args = _parser().parse_args(argv)
+    try:
+        cases = select_cases(args.ops)
+    except ValueError as error:
+        print(error, file=sys.stderr)
+        return 2
+    if args.list:
+        for case in cases:
+            kind = 'batch' if case.batch else 'image'
+            print(f"{case.name:<28} {kind:<6} dtypes={','.join(case.dtypes)} channels={','.join(map(str, case.channels))}")
+        return 0
+
+    baseline = _load_results(args.baseline) if args.baseline else None
+    results = run_benchmarks(
+        cases,
+        sizes=args.sizes or (QUICK_SIZES if args.quick else DEFAULT_SIZES),
+        dtypes=args.dtypes or ALL_DTYPES,
+        channels=args.channels or (QUICK_CHANNELS if args.quick else ALL_CHANNELS),
+        batch_size=args.batch_size,
+        max_input_bytes=args.max_input_bytes,
+        progress=None if args.quiet else sys.stdout,
+        min_time=args.min_time,
+        repeat=args.repeat,
+        memory=not args.no_memory,
+    )
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump({'environment': environment(), 'results': results}, file, indent=1)
+
+    status = 0
+    errors = [entry for entry in results if entry['status'] == 'error']
+    for entry in errors:
+        print(f"ERROR {format_entry(entry)}", file=sys.stderr)
+    if errors:
+        status = 1
+    if baseline is not None:
+        regressions = compare(results, baseline, args.tolerance, args.memory_tolerance)
+        for regression in regressions:
+            print(format_regression(regression), file=sys.stderr)
+        if regressions:
+            print(f"{len(regressions)} regression(s) against {args.baseline}.", file=sys.stderr)
+            status = 1
+        else:
+            print(f"No regressions against {args.baseline}.")
+    return status
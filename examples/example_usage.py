@@ -1,6 +1,6 @@
 import cv2
 import matplotlib.pyplot as plt
-from anaug.default import scale, flip, noise, random_rotation, random_crop, intensity, elastic_deformation, occlusion, blur
+from anaug.default import scale, flip, noise, random_rotation, random_resized_crop, intensity, elastic_deformation, blur
 
 # Load the image
 image_path = "images/mri.jpg"
@@ -14,12 +14,11 @@ image = image / 255.0  # Normalize the image to [0, 1]
 params = {
     'blur': {'blur_radius': 2},
     'elastic_deformation': {'alpha': 30, 'sigma': 4},
-    'flip': {'flip_horizontal': True, 'flip_vertical': False},
+    'flip': {'axes': 'horizontal'},
     'intensity': {'brightness_factor': 1.2, 'contrast_factor': 1.3},
     'noise': {'noise_type': 'gaussian', 'noise_intensity': 0.1},
-    'occlusion': {'mask_shape': 'rectangle', 'mask_size_range': (0.1, 0.2)},
     'random_rotation': {'angle_range': (-15, 15)},
-    'random_crop': {'crop_size': (0.8, 0.8), 'scaling_factor': 1.0},
+    'random_resized_crop': {'size': (256, 256), 'scale': (0.64, 0.64), 'ratio': (1.0, 1.0)},
     'scale': {'scale_factor': 0.8}
 }
 
@@ -30,9 +29,8 @@ try:
     augmented_image = flip(augmented_image, **params['flip'])
     augmented_image = intensity(augmented_image, **params['intensity'])
     augmented_image = noise(augmented_image, **params['noise'])
-    augmented_image = occlusion(augmented_image, **params['occlusion'])
     augmented_image = random_rotation(augmented_image, **params['random_rotation'])
-    augmented_image = random_crop(augmented_image, **params['random_crop'])
+    augmented_image = random_resized_crop(augmented_image, **params['random_resized_crop'])
     augmented_image = scale(augmented_image, **params['scale'])
 except Exception as e:
     raise RuntimeError(f"An error occurred while applying augmentations: {e}")
@@ -1,14 +1,83 @@
-from .default.blur import blur
-from .default.crop import crop
-from .default.elastic_deformation import elastic_deformation
-from .default.flip import flip
-from .default.intensity import intensity
-from .default.noise import noise
-from .default.random_rotation import random_rotation
-from .default.rotate import rotate
-from .default.scale import scale
+# Public names are imported from their modules on first access (see `anaug._lazy`), so
+# `import anaug` is cheap and OpenCV and SciPy are only loaded by the ops that need them.
+from typing import TYPE_CHECKING
 
-from .generative.random_lesion import random_lesion
+from ._lazy import attach
+
+attach(__name__, {
+    "blur": ".default.blur",
+    "crop": ".default.crop",
+    "elastic_deformation": ".default.elastic_deformation",
+    "flip": ".default.flip",
+    "intensity": ".default.intensity",
+    "noise": ".default.noise",
+    "extract_patches": ".default.patches",
+    "five_crop": ".default.patches",
+    "ten_crop": ".default.patches",
+    "random_resized_crop": ".default.random_resized_crop",
+    "random_rotation": ".default.random_rotation",
+    "rotate": ".default.rotate",
+    "scale": ".default.scale",
+    "random_lesion": ".generative.random_lesion",
+    "Compose": ".compose",
+    "SharedMemoryExecutor": ".executors",
+    "ThreadExecutor": ".executors",
+    "DirectoryStream": ".streaming",
+    "augment_memmap": ".memmap",
+    "tile_halo": ".tiling",
+    "tiled_apply": ".tiling",
+    "CachedOp": ".cache",
+    "DiskCache": ".cache",
+    "BufferPool": ".buffers",
+    "get_buffer_pool": ".buffers",
+    "use_buffer_pool": ".buffers",
+    "get_precision": ".precision",
+    "set_precision": ".precision",
+    "use_precision": ".precision",
+    "get_rng": ".rng",
+    "spawn_rngs": ".rng",
+    "stream_rng": ".rng",
+    "use_rng": ".rng",
+    "add_metrics": ".instrument",
+    "disable_instrumentation": ".instrument",
+    "enable_instrumentation": ".instrument",
+    "get_metrics": ".instrument",
+    "instrumentation": ".instrument",
+    "instrumented": ".instrument",
+    "is_instrumentation_enabled": ".instrument",
+    "merge_metrics": ".instrument",
+    "reset_metrics": ".instrument",
+    "to_json": ".instrument",
+    "to_prometheus": ".instrument",
+})
+
+if TYPE_CHECKING:
+    from .default.blur import blur
+    from .default.crop import crop
+    from .default.elastic_deformation import elastic_deformation
+    from .default.flip import flip
+    from .default.intensity import intensity
+    from .default.noise import noise
+    from .default.patches import extract_patches, five_crop, ten_crop
+    from .default.random_resized_crop import random_resized_crop
+    from .default.random_rotation import random_rotation
+    from .default.rotate import rotate
+    from .default.scale import scale
+
+    from .generative.random_lesion import random_lesion
+
+    from .compose import Compose
+    from .executors import SharedMemoryExecutor, ThreadExecutor
+    from .streaming import DirectoryStream
+    from .memmap import augment_memmap
+    from .tiling import tile_halo, tiled_apply
+    from .cache import CachedOp, DiskCache
+    from .buffers import BufferPool, get_buffer_pool, use_buffer_pool
+    from .precision import get_precision, set_precision, use_precision
+    from .rng import get_rng, spawn_rngs, stream_rng, use_rng
+    from .instrument import (add_metrics, disable_instrumentation, enable_instrumentation, get_metrics,
+                             instrumentation, instrumented, is_instrumentation_enabled, merge_metrics,
+                             reset_metrics, to_json, to_prometheus)
 
 # Define all accessible modules and functions
 __all__ = [
@@ -19,8 +88,42 @@ __all__ = [
     "intensity",
     "noise",
     "occlusion",
+    "extract_patches",
+    "five_crop",
+    "ten_crop",
+    "random_resized_crop",
     "random_rotation",
     "rotate",
     "scale",
     "random_lesion",
+    "Compose",
+    "SharedMemoryExecutor",
+    "ThreadExecutor",
+    "DirectoryStream",
+    "augment_memmap",
+    "tiled_apply",
+    "tile_halo",
+    "DiskCache",
+    "CachedOp",
+    "BufferPool",
+    "get_buffer_pool",
+    "use_buffer_pool",
+    "get_precision",
+    "set_precision",
+    "use_precision",
+    "get_rng",
+    "use_rng",
+    "stream_rng",
+    "spawn_rngs",
+    "enable_instrumentation",
+    "disable_instrumentation",
+    "is_instrumentation_enabled",
+    "instrumentation",
+    "instrumented",
+    "get_metrics",
+    "reset_metrics",
+    "add_metrics",
+    "merge_metrics",
+    "to_json",
+    "to_prometheus",
 ]
\ No newline at end of file
@@ -0,0 +1,53 @@
+"""
+Lazy attribute loading for the `anaug` packages.
+
+The package `__init__` modules register their public names with `attach` instead of
+importing them, so `import anaug` stays cheap and heavy backends (OpenCV, SciPy) are
+only loaded when an op that needs them is first used (PEP 562).
+"""
+
+import importlib
+import sys
+import types
+from typing import Dict, List
+
+
+class _LazyModule(types.ModuleType):
+    """Module type of packages whose public attributes are imported on first access."""
+
+    def __getattr__(self, name: str):
+        attributes = self.__dict__.get('_lazy_attributes', {})
+        if name not in attributes:
+            raise AttributeError(f"module '{self.__name__}' has no attribute '{name}'")
+        value = getattr(importlib.import_module(attributes[name], self.__name__), name)
+        setattr(self, name, value)
+        return value
+
+    def __setattr__(self, name: str, value) -> None:
+        # Importing a submodule binds it on its package, which would shadow the function of
+        # the same name (e.g. module `anaug.default.flip` and function `flip`): keep the function.
+        attributes = self.__dict__.get('_lazy_attributes', {})
+        if (isinstance(value, types.ModuleType) and name in attributes
+                and value.__name__ == f"{self.__name__}.{name}"):
+            value = getattr(value, name)
+        super().__setattr__(name, value)
+
+    def __dir__(self) -> List[str]:
+        return sorted(set(self.__dict__) | set(self.__dict__.get('_lazy_attributes', {})))
+
+
+def attach(module_name: str, attributes: Dict[str, str]) -> None:
+    """
+    Make the attributes of a package load lazily.
+
+    Parameters
+    ----------
+    module_name : str
+        `__name__` of the package.
+    attributes : Dict[str, str]
+        Maps each public name to the (relative) module that defines it, e.g.
+        `{'flip': '.flip', 'Compose': '.compose'}`.
+    """
+    module = sys.modules[module_name]
+    module.__class__ = _LazyModule
+    module.__dict__['_lazy_attributes'] = dict(attributes)
@@ -0,0 +1,235 @@
+"""
+Scratch Buffer Pool Module
+
+This module provides `BufferPool`, an arena of reusable NumPy arrays keyed by shape and
+dtype. Augmentations borrow their temporaries (displacement fields, noise fields, lesion
+textures, pipeline intermediates) from the active pool instead of allocating them, so
+once a training loop has run a few iterations it stops allocating scratch memory.
+
+The active pool is held in a context variable: it is set with `use_buffer_pool` (or by
+a `Compose` built with `buffer_pool=`) and picked up implicitly by the ops, so it never
+has to be threaded through function signatures.
+
+Classes:
+- BufferPool: Borrow/release arena with usage statistics and high-water marks.
+
+Functions:
+- use_buffer_pool: Context manager that activates a pool for the current context.
+- get_buffer_pool: Return the active pool, or None.
+
+Usage Examples:
+------------
+>>> from anaug import BufferPool, Compose
+>>> from anaug.default import elastic_deformation, noise
+>>> pool = BufferPool()
+>>> pipeline = Compose([(elastic_deformation, {'random_state': 0}), (noise, {})], buffer_pool=pool)
+>>> for image in images:
+...     augmented = pipeline(image)
+>>> pool.stats()['high_water_bytes']
+"""
+
+import contextlib
+import contextvars
+import threading
+from collections import defaultdict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+Key = Tuple[Tuple[int, ...], str]
+
+_active_pool: contextvars.ContextVar = contextvars.ContextVar('anaug_buffer_pool', default=None)
+
+
+class BufferPool:
+    """
+    Pool of reusable scratch arrays keyed by shape and dtype.
+
+    Parameters
+    ----------
+    max_idle_bytes : int, optional
+        Upper bound on the memory held by idle (released) buffers. Buffers released
+        beyond this bound are dropped instead of being kept. If None, every released
+        buffer is kept.
+
+    Notes
+    -----
+    Borrowed arrays are uninitialized, like `np.empty`. A buffer must not be used after
+    it has been released, and the pool keeps a reference to every borrowed buffer until
+    it is released. The pool is thread-safe, so one pool can serve the threads of
+    a `ThreadExecutor`.
+    """
+
+    def __init__(self, max_idle_bytes: Optional[int] = None):
+        if max_idle_bytes is not None and (not isinstance(max_idle_bytes, int) or max_idle_bytes < 0):
+            raise ValueError(f"'max_idle_bytes' must be a non-negative integer or None, but got {max_idle_bytes}.")
+        self.max_idle_bytes = max_idle_bytes
+        self._lock = threading.Lock()
+        self._idle: Dict[Key, List[np.ndarray]] = defaultdict(list)
+        self._borrowed: Dict[int, Tuple[Key, np.ndarray]] = {}
+        self._in_use_count: Dict[Key, int] = defaultdict(int)
+        self._high_water_count: Dict[Key, int] = defaultdict(int)
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        """Reset the counters and high-water marks (idle buffers are kept)."""
+        with self._lock:
+            self._allocations = 0
+            self._reuses = 0
+            self._in_use_bytes = sum(self._nbytes(key) for key, _ in self._borrowed.values())
+            self._idle_bytes = sum(self._nbytes(key) * len(buffers) for key, buffers in self._idle.items())
+            self._high_water_bytes = self._in_use_bytes
+            self._high_water_total = self._in_use_bytes + self._idle_bytes
+            self._high_water_count = defaultdict(int, self._in_use_count)
+
+    @staticmethod
+    def _nbytes(key: Key) -> int:
+        shape, dtype = key
+        return int(np.prod(shape, dtype=np.int64)) * np.dtype(dtype).itemsize
+
+    # ---------------------
+    # Borrow / Release
+    # ---------------------
+    def borrow(self, shape: Tuple[int, ...], dtype: Any = np.float64) -> np.ndarray:
+        """
+        Take an uninitialized array of the given shape and dtype from the pool.
+
+        Parameters
+        ----------
+        shape : Tuple[int, ...]
+            Shape of the array.
+        dtype : np.dtype, optional
+            Data type of the array. Default is float64.
+
+        Returns
+        -------
+        np.ndarray
+            A C-contiguous array, reused from an earlier `release` when possible.
+        """
+        shape = (shape,) if isinstance(shape, (int, np.integer)) else shape
+        key = (tuple(int(size) for size in shape), np.dtype(dtype).str)
+        nbytes = self._nbytes(key)
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                array = idle.pop()
+                self._idle_bytes -= nbytes
+                self._reuses += 1
+            else:
+                array = None
+                self._allocations += 1
+        if array is None:
+            array = np.empty(key[0], dtype=key[1])
+        with self._lock:
+            self._borrowed[id(array)] = (key, array)
+            self._in_use_count[key] += 1
+            self._high_water_count[key] = max(self._high_water_count[key], self._in_use_count[key])
+            self._in_use_bytes += nbytes
+            self._high_water_bytes = max(self._high_water_bytes, self._in_use_bytes)
+            self._high_water_total = max(self._high_water_total, self._in_use_bytes + self._idle_bytes)
+        return array
+
+    def release(self, array: np.ndarray) -> None:
+        """
+        Return a borrowed array to the pool.
+
+        Raises
+        ------
+        ValueError
+            If `array` was not borrowed from this pool or was already released.
+        """
+        with self._lock:
+            entry = self._borrowed.get(id(array))
+            if entry is None or entry[1] is not array:
+                raise ValueError("Array was not borrowed from this pool or was already released.")
+            del self._borrowed[id(array)]
+            key = entry[0]
+            nbytes = self._nbytes(key)
+            self._in_use_count[key] -= 1
+            self._in_use_bytes -= nbytes
+            if self.max_idle_bytes is None or self._idle_bytes + nbytes <= self.max_idle_bytes:
+                self._idle[key].append(array)
+                self._idle_bytes += nbytes
+
+    @contextlib.contextmanager
+    def scratch(self, shape: Tuple[int, ...], dtype: Any = np.float64) -> Iterator[np.ndarray]:
+        """Borrow an array for the duration of a `with` block."""
+        array = self.borrow(shape, dtype)
+        try:
+            yield array
+        finally:
+            self.release(array)
+
+    def clear(self) -> None:
+        """Drop all idle buffers. Borrowed buffers are unaffected."""
+        with self._lock:
+            self._idle.clear()
+            self._idle_bytes = 0
+
+    # ---------------------
+    # Statistics
+    # ---------------------
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report pool usage.
+
+        Returns
+        -------
+        Dict[str, Any]
+            - 'allocations': number of borrows that had to allocate a new array.
+            - 'reuses': number of borrows served from idle buffers.
+            - 'in_use_bytes' / 'idle_bytes': memory currently borrowed / held idle.
+            - 'high_water_bytes': peak of the borrowed memory.
+            - 'high_water_total_bytes': peak of borrowed plus idle memory, i.e. the
+              footprint of the pool.
+            - 'high_water_buffers': peak number of simultaneously borrowed buffers per
+              `(shape, dtype)` key, which is what a pre-sized pool needs to hold.
+        """
+        with self._lock:
+            return {
+                'allocations': self._allocations,
+                'reuses': self._reuses,
+                'in_use_bytes': self._in_use_bytes,
+                'idle_bytes': self._idle_bytes,
+                'high_water_bytes': self._high_water_bytes,
+                'high_water_total_bytes': self._high_water_total,
+                'high_water_buffers': {key: count for key, count in self._high_water_count.items() if count},
+            }
+
+    def __repr__(self) -> str:
+        stats = self.stats()
+        return (f"BufferPool(in_use_bytes={stats['in_use_bytes']}, idle_bytes={stats['idle_bytes']}, "
+                f"high_water_bytes={stats['high_water_bytes']})")
+
+
+def get_buffer_pool() -> Optional[BufferPool]:
+    """Return the buffer pool active in the current context, or None."""
+    return _active_pool.get()
+
+
+@contextlib.contextmanager
+def use_buffer_pool(pool: Optional[BufferPool]) -> Iterator[Optional[BufferPool]]:
+    """
+    Make `pool` the active buffer pool for the enclosed block.
+
+    Passing None deactivates pooling inside the block. Pools nest: the previous pool is
+    restored on exit.
+    """
+    if pool is not None and not isinstance(pool, BufferPool):
+        raise TypeError(f"'pool' must be a BufferPool or None, but got {type(pool).__name__}.")
+    token = _active_pool.set(pool)
+    try:
+        yield pool
+    finally:
+        _active_pool.reset(token)
+
+
+@contextlib.contextmanager
+def _scratch(shape: Tuple[int, ...], dtype: Any = np.float64) -> Iterator[np.ndarray]:
+    """Borrow a scratch array from the active pool, or allocate one if there is none."""
+    pool = _active_pool.get()
+    if pool is None:
+        yield np.empty(shape, dtype=dtype)
+    else:
+        with pool.scratch(shape, dtype) as array:
+            yield array
@@ -0,0 +1,316 @@
+"""
+On-Disk Augmentation Cache Module
+
+This module caches the results of deterministic augmentations on local disk. Entries
+are addressed by a hash of the input image content, the operation and its parameters
+(including any seed), so an expensive stage such as `elastic_deformation` with a fixed
+`random_state` becomes a single file read on every epoch after the first. The cache
+is bounded by a byte budget and evicts the least recently used entries.
+
+Classes:
+- DiskCache: Content-addressed array store with LRU eviction.
+- CachedOp: Picklable callable that wraps an operation with a `DiskCache`.
+
+Usage Examples:
+------------
+>>> from anaug import Compose, DiskCache
+>>> from anaug.default import elastic_deformation, flip
+>>> cache = DiskCache('/scratch/anaug-cache', max_bytes=20 * 2**30)
+>>> pipeline = Compose([
+...     cache.wrap(elastic_deformation, alpha=34, sigma=4, random_state=7),
+...     (flip, {'axes': 'horizontal'}),
+... ])
+>>> augmented = pipeline(image)   # computed and stored
+>>> augmented = pipeline(image)   # read back from disk
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+
+from .precision import get_precision
+
+_SHARD_WIDTH = 2
+
+
+def _update_hash(digest: Any, value: Any) -> None:
+    """Feed a parameter value into `digest` in a type-tagged, order-stable way."""
+    if isinstance(value, np.ndarray):
+        array = np.ascontiguousarray(value)
+        digest.update(f"ndarray:{array.dtype.str}:{array.shape}:".encode())
+        digest.update(array.data if array.size else b'')
+    elif isinstance(value, np.generic):
+        _update_hash(digest, value.item())
+    elif value is None or isinstance(value, (bool, int, float, complex, str, bytes)):
+        digest.update(f"{type(value).__name__}:{value!r};".encode())
+    elif isinstance(value, (list, tuple)):
+        digest.update(f"{type(value).__name__}[{len(value)}]:".encode())
+        for item in value:
+            _update_hash(digest, item)
+    elif isinstance(value, dict):
+        digest.update(f"dict[{len(value)}]:".encode())
+        for key in sorted(value, key=repr):
+            _update_hash(digest, key)
+            _update_hash(digest, value[key])
+    else:
+        raise TypeError(
+            f"Cannot derive a cache key from a parameter of type {type(value).__name__}; "
+            "only plain values, sequences, dicts and arrays are supported. Pass seeds as "
+            "integers rather than generator objects."
+        )
+
+
+def _op_name(func: Callable) -> str:
+    return f"{getattr(func, '__module__', '')}.{getattr(func, '__qualname__', repr(func))}"
+
+
+class DiskCache:
+    """
+    Content-addressed on-disk cache for augmentation results.
+
+    Parameters
+    ----------
+    directory : str
+        Directory that holds the cache entries. It is created if needed and may be shared
+        between processes.
+    max_bytes : int, optional
+        Upper bound on the total size of the stored entries. When it is exceeded, the
+        least recently used entries are deleted. If None, the cache grows without bound.
+    compress : bool, optional
+        If True, entries are stored as compressed `.npz` files, which saves disk space but
+        must be decompressed on every read. If False (default), entries are stored as
+        `.npy` files and returned as read-only memory maps, so a hit costs no copy.
+
+    Notes
+    -----
+    Only deterministic operations should be cached: anything drawing from the global
+    NumPy random state without a fixed seed would return the same "random" result on
+    every epoch. Recency is tracked through file modification times, so the LRU order is
+    shared by all processes using the same directory.
+    """
+
+    def __init__(self, directory: str, max_bytes: Optional[int] = None, compress: bool = False):
+        if max_bytes is not None and (not isinstance(max_bytes, int) or max_bytes <= 0):
+            raise ValueError(f"'max_bytes' must be a positive integer or None, but got {max_bytes}.")
+        self.directory = os.fspath(directory)
+        self.max_bytes = max_bytes
+        self.compress = compress
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+        self._size = self._scan_size()
+
+    @property
+    def _extension(self) -> str:
+        return '.npz' if self.compress else '.npy'
+
+    def _entries(self):
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(('.npy', '.npz')):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    yield path, stat.st_size, stat.st_mtime_ns
+
+    def _scan_size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:_SHARD_WIDTH], key + self._extension)
+
+    # ---------------------
+    # Keys
+    # ---------------------
+    @staticmethod
+    def key(image: np.ndarray, func: Callable, params: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Compute the cache key of applying `func(image, **params)`.
+
+        Parameters
+        ----------
+        image : np.ndarray
+            Input image; its shape, dtype and raw bytes are hashed.
+        func : Callable
+            Operation; identified by its module and qualified name.
+        params : Dict[str, Any], optional
+            Keyword arguments of the call, including any seed.
+
+        Returns
+        -------
+        str
+            Hex digest identifying the result.
+
+        Notes
+        -----
+        The active precision policy (see `anaug.precision`) is hashed too, since it
+        changes the dtype and values of the results.
+        """
+        digest = hashlib.sha256()
+        digest.update(_op_name(func).encode())
+        digest.update(get_precision().encode())
+        _update_hash(digest, image)
+        _update_hash(digest, dict(params or {}))
+        return digest.hexdigest()
+
+    # ---------------------
+    # Storage
+    # ---------------------
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """Return the stored array for `key`, or None if it is not cached."""
+        path = self._path(key)
+        try:
+            if self.compress:
+                with np.load(path) as archive:
+                    array = archive['result']
+            else:
+                array = np.load(path, mmap_mode='r')
+            os.utime(path)
+        except (FileNotFoundError, ValueError, EOFError, OSError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return array
+
+    def put(self, key: str, array: np.ndarray) -> None:
+        """Store `array` under `key`, evicting old entries if the size cap is exceeded."""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temporary file first so that readers never see a partial entry
+        handle, temporary = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(handle, 'wb') as file:
+                if self.compress:
+                    np.savez_compressed(file, result=array)
+                else:
+                    np.save(file, array)
+            size = os.path.getsize(temporary)
+            # An existing entry for the key (a re-put, or another worker) is replaced, not added
+            try:
+                size -= os.path.getsize(path)
+            except FileNotFoundError:
+                pass
+            os.replace(temporary, path)
+        except BaseException:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+        with self._lock:
+            self._size += size
+            over_budget = self.max_bytes is not None and self._size > self.max_bytes
+        if over_budget:
+            self.evict()
+
+    def evict(self, target_bytes: Optional[int] = None) -> int:
+        """
+        Delete least recently used entries until the cache fits in `target_bytes`.
+
+        Parameters
+        ----------
+        target_bytes : int, optional
+            Size to shrink to. Defaults to `max_bytes`.
+
+        Returns
+        -------
+        int
+            Number of entries removed.
+        """
+        target = self.max_bytes if target_bytes is None else target_bytes
+        if target is None:
+            return 0
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for path, size, _ in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        with self._lock:
+            self._size = total
+        return removed
+
+    def clear(self) -> None:
+        """Remove every entry of the cache."""
+        self.evict(0)
+
+    def size(self) -> int:
+        """Return the total size of the stored entries in bytes."""
+        return self._scan_size()
+
+    # ---------------------
+    # Operations
+    # ---------------------
+    def __call__(self, func: Callable[..., np.ndarray], image: np.ndarray, **params) -> np.ndarray:
+        """Return `func(image, **params)`, computing and storing it only on a cache miss."""
+        key = self.key(image, func, params)
+        result = self.get(key)
+        if result is None:
+            result = func(image, **params)
+            self.put(key, result)
+        return result
+
+    def wrap(self, func: Callable[..., np.ndarray], **params) -> 'CachedOp':
+        """
+        Bind `func` and its parameters to this cache as a single-argument callable.
+
+        The returned `CachedOp` is picklable (as long as `func` is), so it can be used as
+        a step of a `Compose` pipeline that runs in worker processes.
+        """
+        return CachedOp(self, func, params)
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit and miss counters of this instance and the current cache size."""
+        return {'hits': self.hits, 'misses': self.misses, 'bytes': self.size()}
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+
+class CachedOp:
+    """
+    An operation with fixed parameters whose results are stored in a `DiskCache`.
+
+    Parameters
+    ----------
+    cache : DiskCache
+        Cache to read from and write to.
+    func : Callable[..., np.ndarray]
+        Deterministic operation taking the image as its first argument.
+    params : Dict[str, Any]
+        Keyword arguments passed to `func`.
+    """
+
+    def __init__(self, cache: DiskCache, func: Callable[..., np.ndarray], params: Dict[str, Any]):
+        if not callable(func):
+            raise TypeError(f"'func' must be callable, but got {type(func).__name__}.")
+        # Fail early on parameters that cannot be hashed into a key
+        _update_hash(hashlib.sha256(), dict(params))
+        self.cache = cache
+        self.func = func
+        self.params = dict(params)
+
+    def __call__(self, image: np.ndarray) -> np.ndarray:
+        return self.cache(self.func, image, **self.params)
+
+    def __repr__(self) -> str:
+        return f"CachedOp({_op_name(self.func)}, {self.params!r})"
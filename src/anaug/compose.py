@@ -0,0 +1,341 @@
+"""
+Augmentation Pipeline Module
+
+This module provides `Compose`, which chains augmentation functions into a single
+callable pipeline. Consecutive geometric operations (`rotate`, `random_rotation`,
+`scale`, `flip` and `crop`) are fused: their 2x3 affine matrices are multiplied
+together and the whole run is executed as one `cv2.warpAffine` directly into the
+final output size, instead of resampling the image once per operation.
+
+Usage Examples:
+------------
+>>> import numpy as np
+>>> from anaug import Compose
+>>> from anaug.default import rotate, scale, crop, noise
+>>> pipeline = Compose([
+...     (rotate, {'angle': 15}),
+...     (scale, {'scale_factor': 0.5}),
+...     (crop, {'top': 16, 'left': 16, 'height': 224, 'width': 224}),
+...     (noise, {'noise_type': 'gaussian', 'noise_intensity': 0.05}),
+... ])
+>>> augmented = pipeline(np.random.rand(512, 512).astype(np.float32))
+>>> augmented.shape
+(224, 224)
+"""
+
+import contextlib
+import functools
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import cv2
+import numpy as np
+
+from .buffers import BufferPool, use_buffer_pool
+from .instrument import _measure
+from .precision import _validate_policy, use_precision
+from .rng import get_rng
+from .default._opencv import _warp_affine
+
+Step = Union[Callable[..., np.ndarray], Tuple[Callable[..., np.ndarray], Dict[str, Any]]]
+
+# Border modes used by `rotate`, mapped to OpenCV constants.
+_ROTATE_BORDER_MODES = {
+    'constant': cv2.BORDER_CONSTANT,
+    'nearest': cv2.BORDER_REPLICATE,
+    'mirror': cv2.BORDER_REFLECT,
+    'wrap': cv2.BORDER_WRAP
+}
+
+
+class _Affine:
+    """Affine transform of one geometric step, in OpenCV (x, y) pixel coordinates."""
+
+    def __init__(self, matrix: np.ndarray, size: Tuple[int, int], border_mode: Optional[int] = None):
+        self.matrix = matrix          # 3x3 forward (source -> destination) matrix
+        self.size = size              # (width, height) of the step output
+        self.border_mode = border_mode
+
+
+def _to_3x3(matrix: np.ndarray) -> np.ndarray:
+    return np.vstack([matrix, [0.0, 0.0, 1.0]])
+
+
+def _rot90_matrix(k: int, w: int, h: int) -> Tuple[np.ndarray, Tuple[int, int]]:
+    """Matrix equivalent to `np.rot90(image, k, axes=(0, 1))`."""
+    matrix = np.eye(3)
+    for _ in range(k % 4):
+        # One counter-clockwise quarter turn: (x, y) -> (y, w - 1 - x)
+        step = np.array([[0.0, 1.0, 0.0], [-1.0, 0.0, w - 1.0], [0.0, 0.0, 1.0]])
+        matrix = step @ matrix
+        w, h = h, w
+    return matrix, (w, h)
+
+
+def _rotate_affine(w, h, angle, mode='nearest', center=None):
+    if not isinstance(angle, (int, float)):
+        raise ValueError("Angle must be a numeric value.")
+    if mode not in _ROTATE_BORDER_MODES:
+        raise ValueError(f"Invalid mode '{mode}'. Supported modes are: {list(_ROTATE_BORDER_MODES)}")
+    if angle % 90 == 0:
+        matrix, size = _rot90_matrix(int(angle / 90) % 4, w, h)
+        return _Affine(matrix, size)
+    if center is None:
+        center = (w / 2, h / 2)
+    matrix = cv2.getRotationMatrix2D(center, angle, scale=1.0)
+    return _Affine(_to_3x3(matrix), (w, h), _ROTATE_BORDER_MODES[mode])
+
+
+def _random_rotation_affine(w, h, angle_range=(-30, 30), center=None, scale=1.0,
+                            border_mode=cv2.BORDER_REFLECT, rng=None):
+    if not (isinstance(angle_range, tuple) and len(angle_range) == 2 and
+            all(isinstance(a, (int, float)) for a in angle_range)):
+        raise ValueError("angle_range must be a tuple of two numeric values.")
+    angle = get_rng(rng).uniform(angle_range[0], angle_range[1])
+    if center is None:
+        center = (w / 2, h / 2)
+    matrix = cv2.getRotationMatrix2D(center, angle, scale=scale)
+    return _Affine(_to_3x3(matrix), (w, h), border_mode)
+
+
+def _scale_affine(w, h, scale_factor, max_dimension=10000):
+    if scale_factor <= 0:
+        raise ValueError("Scale factor must be greater than zero.")
+    new_width = int(w * scale_factor)
+    new_height = int(h * scale_factor)
+    if new_width == 0 or new_height == 0:
+        raise ValueError("Scaled dimensions are invalid (resulting in zero size).")
+    if new_width > max_dimension or new_height > max_dimension:
+        raise ValueError(f"Scaled dimensions ({new_width}x{new_height}) exceed the allowable limit of {max_dimension} pixels.")
+    # Same pixel-center convention as cv2.resize: x_dst = sx * (x_src + 0.5) - 0.5
+    sx, sy = new_width / w, new_height / h
+    matrix = np.array([[sx, 0.0, 0.5 * sx - 0.5], [0.0, sy, 0.5 * sy - 0.5], [0.0, 0.0, 1.0]])
+    return _Affine(matrix, (new_width, new_height))
+
+
+def _flip_affine(w, h, axes='horizontal'):
+    if isinstance(axes, str):
+        axes = [axes]
+    elif not isinstance(axes, list) or not all(isinstance(axis, str) for axis in axes):
+        raise TypeError("'axes' must be a string or a list of strings.")
+    matrix = np.eye(3)
+    for axis in axes:
+        if axis == 'horizontal':
+            step = np.array([[-1.0, 0.0, w - 1.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]])
+        elif axis == 'vertical':
+            step = np.array([[1.0, 0.0, 0.0], [0.0, -1.0, h - 1.0], [0.0, 0.0, 1.0]])
+        else:
+            raise ValueError(f"Invalid axis '{axis}'. Valid axes are 'horizontal' and 'vertical'.")
+        matrix = step @ matrix
+    return _Affine(matrix, (w, h))
+
+
+def _crop_affine(w, h, top, left, height, width, adjust_if_exceeds=False, pad_value=(0,)):
+    for param, name in zip([top, left, height, width], ['top', 'left', 'height', 'width']):
+        if not isinstance(param, int):
+            raise TypeError(f"Parameter '{name}' must be an integer, but got {type(param).__name__}.")
+    if height <= 0 or width <= 0:
+        raise ValueError("Parameters 'height' and 'width' must be positive integers.")
+    exceeds = top < 0 or left < 0 or top + height > h or left + width > w
+    if exceeds and not adjust_if_exceeds:
+        raise ValueError(
+            f"Invalid crop parameters: (top={top}, left={left}, height={height}, width={width}) "
+            f"exceed image dimensions ({h}, {w})."
+        )
+    if exceeds:
+        # Padded crops are executed by `crop` itself so the padding matches exactly.
+        return None
+    matrix = np.array([[1.0, 0.0, -left], [0.0, 1.0, -top], [0.0, 0.0, 1.0]])
+    return _Affine(matrix, (width, height))
+
+
+# Built-in ops are recognized by name rather than identity, so that building a pipeline
+# does not import (and load the backends of) ops it does not use.
+_DEFAULT_OPS_MODULE = __name__.rsplit('.', 1)[0] + '.default.'
+
+
+def _builtin_op(func: Callable[..., np.ndarray]) -> Optional[str]:
+    """Return the name of an `anaug.default` op, or None for any other callable."""
+    module = getattr(func, '__module__', None) or ''
+    return getattr(func, '__name__', None) if module.startswith(_DEFAULT_OPS_MODULE) else None
+
+
+# Geometric operations that can be fused, mapped to their affine builders.
+_AFFINE_BUILDERS = {
+    'rotate': _rotate_affine,
+    'random_rotation': _random_rotation_affine,
+    'scale': _scale_affine,
+    'flip': _flip_affine,
+    'crop': _crop_affine,
+}
+
+
+# Ops whose output has the shape and dtype of their input and that accept `out=`;
+# with a buffer pool, their intermediate results are written into pooled buffers.
+_SHAPE_PRESERVING = {'intensity', 'noise', 'flip', 'blur', 'motion_blur', 'elastic_deformation', 'random_rotation'}
+
+
+class Compose:
+    """
+    Chain augmentation steps into a single callable, fusing consecutive geometric ops.
+
+    Parameters
+    ----------
+    steps : Sequence
+        Augmentation steps applied in order. Each step is either a callable taking an
+        image, a `(function, kwargs)` tuple, or a `functools.partial`. Steps built from
+        `rotate`, `random_rotation`, `scale`, `flip` or `crop` with keyword arguments are
+        recognized as geometric and can be fused.
+    fuse : bool, optional
+        If True, consecutive geometric steps are executed as one `cv2.warpAffine`.
+        If False, every step runs on its own. Default is True.
+    interpolation : int, optional
+        OpenCV interpolation flag used for fused warps. Default is `cv2.INTER_LINEAR`,
+        matching the individual geometric ops.
+    buffer_pool : BufferPool, optional
+        Pool that is made active while the pipeline runs, so that ops borrow their
+        scratch arrays from it. Intermediate results of shape-preserving steps are also
+        written into pooled buffers and returned to the pool once the next step has
+        consumed them. The final result is never a pooled buffer. Default is None.
+    precision : str, optional
+        Precision policy ('float64', 'float32' or 'input') applied while the pipeline
+        runs; see `anaug.set_precision`. If None, the policy in effect is used.
+
+    Notes
+    -----
+    A fused run uses a single border mode: the one of the first rotation in the run,
+    or `cv2.BORDER_REPLICATE` if the run has no rotation. Crops that need padding
+    (`adjust_if_exceeds=True` with an out-of-bounds box) end the fused run and are
+    executed by `crop` itself. Runs of a single geometric step are never fused, so
+    they give exactly the same result as calling the op directly. With instrumentation
+    enabled, fused warps are reported under the op name 'fused_affine'.
+
+    Examples
+    --------
+    >>> pipeline = Compose([(flip, {'axes': 'horizontal'}), (rotate, {'angle': 10})])
+    >>> augmented = pipeline(image)
+    """
+
+    def __init__(self, steps: Sequence[Step], fuse: bool = True,
+                 interpolation: int = cv2.INTER_LINEAR, buffer_pool: Optional[BufferPool] = None,
+                 precision: Optional[str] = None):
+        if isinstance(steps, (str, bytes)) or not isinstance(steps, Sequence):
+            raise TypeError(f"'steps' must be a sequence of augmentation steps, but got {type(steps).__name__}.")
+        self.steps: List[Tuple[Callable[..., np.ndarray], Dict[str, Any]]] = [
+            self._normalize_step(step) for step in steps
+        ]
+        if buffer_pool is not None and not isinstance(buffer_pool, BufferPool):
+            raise TypeError(f"'buffer_pool' must be a BufferPool, but got {type(buffer_pool).__name__}.")
+        self.fuse = fuse
+        self.interpolation = interpolation
+        self.buffer_pool = buffer_pool
+        self.precision = precision if precision is None else _validate_policy(precision)
+
+    @staticmethod
+    def _normalize_step(step: Step) -> Tuple[Callable[..., np.ndarray], Dict[str, Any]]:
+        if isinstance(step, tuple):
+            if len(step) != 2 or not callable(step[0]) or not isinstance(step[1], dict):
+                raise TypeError("Tuple steps must be of the form (function, kwargs).")
+            return step[0], dict(step[1])
+        if isinstance(step, functools.partial) and not step.args:
+            return step.func, dict(step.keywords)
+        if callable(step):
+            return step, {}
+        raise TypeError(f"Each step must be callable, but got {type(step).__name__}.")
+
+    def _is_geometric(self, func: Callable[..., np.ndarray]) -> bool:
+        return self.fuse and _builtin_op(func) in _AFFINE_BUILDERS
+
+    def __call__(self, image: np.ndarray) -> np.ndarray:
+        if not isinstance(image, np.ndarray):
+            raise TypeError(f"Expected 'image' to be a NumPy array, but got {type(image).__name__}.")
+        if self.buffer_pool is None and self.precision is None:
+            return self._apply(image)
+        with contextlib.ExitStack() as context:
+            if self.buffer_pool is not None:
+                context.enter_context(use_buffer_pool(self.buffer_pool))
+            context.enter_context(use_precision(self.precision))
+            return self._apply(image)
+
+    def _apply(self, image: np.ndarray) -> np.ndarray:
+        pool = self.buffer_pool
+        pooled = None  # pooled buffer holding the current intermediate, if any
+        try:
+            i = 0
+            while i < len(self.steps):
+                func, kwargs = self.steps[i]
+                if not self._is_geometric(func):
+                    if (pool is not None and i + 1 < len(self.steps)
+                            and _builtin_op(func) in _SHAPE_PRESERVING and 'out' not in kwargs):
+                        buffer = pool.borrow(image.shape, image.dtype)
+                        try:
+                            result = func(image, out=buffer, **kwargs)
+                        except BaseException:
+                            pool.release(buffer)
+                            raise
+                    else:
+                        buffer = None
+                        result = func(image, **kwargs)
+                    i += 1
+                else:
+                    # Collect the run of consecutive geometric steps starting here
+                    j = i
+                    while j < len(self.steps) and self._is_geometric(self.steps[j][0]):
+                        j += 1
+                    buffer = None
+                    result = self._run_geometric(image, self.steps[i:j])
+                    i = j
+
+                if pooled is not None:
+                    # Steps may return views of their input; detach those before recycling it
+                    if result is not buffer and np.may_share_memory(result, pooled):
+                        result = result.copy()
+                    pool.release(pooled)
+                pooled, image = buffer, result
+        except BaseException:
+            if pooled is not None:
+                pool.release(pooled)
+            raise
+        return image
+
+    def _run_geometric(self, image: np.ndarray, run) -> np.ndarray:
+        if len(run) == 1:
+            func, kwargs = run[0]
+            return func(image, **kwargs)
+
+        h, w = image.shape[:2]
+        matrix = np.eye(3)
+        size = (w, h)
+        border_mode = None
+        fused = 0
+
+        for func, kwargs in run:
+            affine = _AFFINE_BUILDERS[_builtin_op(func)](size[0], size[1], **kwargs)
+            if affine is None:
+                # Step cannot be expressed as a warp: flush what we have and run it directly
+                image = self._flush(image, matrix, size, border_mode, fused)
+                image = func(image, **kwargs)
+                h, w = image.shape[:2]
+                matrix, size, border_mode, fused = np.eye(3), (w, h), None, 0
+                continue
+            matrix = affine.matrix @ matrix
+            size = affine.size
+            if border_mode is None:
+                border_mode = affine.border_mode
+            fused += 1
+
+        return self._flush(image, matrix, size, border_mode, fused)
+
+    def _flush(self, image, matrix, size, border_mode, fused):
+        if fused == 0:
+            return image
+        if border_mode is None:
+            border_mode = cv2.BORDER_REPLICATE
+        # Integer permutations/translations (flips, crops, quarter turns) are exact with
+        # nearest-neighbour sampling, so avoid needless interpolation for those.
+        flags = cv2.INTER_NEAREST if np.allclose(matrix, np.round(matrix)) else self.interpolation
+        with _measure('fused_affine', image):
+            return _warp_affine(image, matrix, size, flags, border_mode, 0)
+
+    def __repr__(self) -> str:
+        names = ", ".join(getattr(func, "__name__", repr(func)) for func, _ in self.steps)
+        return f"Compose([{names}], fuse={self.fuse})"
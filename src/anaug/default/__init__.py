@@ -1,17 +1,42 @@
-# Import key functions from individual files
-from .noise import noise
-from .blur import blur
-from .blur import motion_blur
-from .crop import crop
-from .elastic_deformation import elastic_deformation
-from .flip import flip
-from .intensity import intensity
-from .random_rotation import random_rotation
-from .rotate import rotate
-from .scale import scale
+# Functions are imported from their modules on first access (see `anaug._lazy`), so
+# `from anaug.default import flip` does not load OpenCV or SciPy.
+from typing import TYPE_CHECKING
+
+from .._lazy import attach
+
+attach(__name__, {
+    "noise": ".noise", "noise_batch": ".noise",
+    "blur": ".blur", "blur_batch": ".blur", "motion_blur": ".blur",
+    "crop": ".crop", "crop_batch": ".crop",
+    "elastic_deformation": ".elastic_deformation", "elastic_deformation_batch": ".elastic_deformation",
+    "flip": ".flip", "flip_batch": ".flip",
+    "intensity": ".intensity", "intensity_batch": ".intensity",
+    "extract_patches": ".patches", "five_crop": ".patches", "ten_crop": ".patches",
+    "random_resized_crop": ".random_resized_crop", "random_resized_crop_batch": ".random_resized_crop",
+    "random_rotation": ".random_rotation",
+    "rotate": ".rotate", "rotate_batch": ".rotate",
+    "scale": ".scale", "scale_batch": ".scale",
+})
+
+if TYPE_CHECKING:
+    from .noise import noise, noise_batch
+    from .blur import blur, blur_batch
+    from .blur import motion_blur
+    from .crop import crop, crop_batch
+    from .elastic_deformation import elastic_deformation, elastic_deformation_batch
+    from .flip import flip, flip_batch
+    from .intensity import intensity, intensity_batch
+    from .patches import extract_patches, five_crop, ten_crop
+    from .random_resized_crop import random_resized_crop, random_resized_crop_batch
+    from .random_rotation import random_rotation
+    from .rotate import rotate, rotate_batch
+    from .scale import scale, scale_batch
 
 # Define all accessible functions and modules
-__all__ = ["noise", "blur", "motion_blur", "crop",
+__all__ = ["noise", "blur", "motion_blur", "crop", "extract_patches", "five_crop", "ten_crop",
            "elastic_deformation", "flip", "intensity",
-           "occlusion", "random_rotation",
-           "rotate", "scale"]
+           "occlusion", "random_resized_crop", "random_rotation",
+           "rotate", "scale",
+           "noise_batch", "blur_batch", "crop_batch",
+           "elastic_deformation_batch", "flip_batch", "intensity_batch", "random_resized_crop_batch",
+           "rotate_batch", "scale_batch"]
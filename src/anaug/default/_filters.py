@@ -0,0 +1,469 @@
+"""
+Filter backends for the blur augmentations.
+
+`blur` treats the last axis of a 3D image as channels and never filters across it. The
+SciPy `ndimage` filters with reflect borders define the results; every filter here
+dispatches to the fastest backend that reproduces them for the dtype, kernel size and
+channel count of its input, and falls back to SciPy otherwise. Motion blur has no SciPy
+counterpart; `cv2.filter2D` with reflect-101 borders defines it.
+"""
+
+import functools
+from typing import Any, Optional, Tuple
+
+import cv2
+import numpy as np
+import scipy.fft
+from scipy.ndimage import gaussian_filter, median_filter, uniform_filter
+from scipy.signal import lfilter, lfilter_zi
+
+from ._utils import _cv2_dst
+
+# `scipy.ndimage` truncates Gaussian kernels at this many standard deviations
+_GAUSSIAN_TRUNCATE = 4.0
+
+# OpenCV filters handle at most this many interleaved channels (CV_CN_MAX)
+_CV2_MAX_CHANNELS = 512
+
+# Largest Gaussian kernel for which `cv2.GaussianBlur` beats `gaussian_filter`, per dtype
+# (None: always). Beyond it OpenCV's generic separable filter loses its SIMD advantage
+# while SciPy's cost grows more slowly. Measured on 512x512 images with 1 to 32 channels.
+_CV2_GAUSSIAN_MAX_KSIZE = {
+    np.dtype(np.uint8): 81,
+    np.dtype(np.uint16): 65,
+    np.dtype(np.float32): None,
+    np.dtype(np.float64): 65,
+}
+
+
+def _spatial(image: np.ndarray, value: Any, channel_value: Any, batch: bool = False) -> Tuple[Any, ...]:
+    """
+    Per-axis filter parameter: `value` along the spatial axes, `channel_value` along the
+    channel axis of 3D images (and along the batch axis of batches).
+    """
+    spatial_ndim = image.ndim - (1 if batch else 0)
+    if spatial_ndim == 3:
+        axes = (value, value, channel_value)
+    elif spatial_ndim == 2:
+        axes = (value, value)
+    else:
+        # Neither an image nor a color image: filter every axis, as SciPy does
+        axes = (value,) * spatial_ndim
+    return ((channel_value,) if batch else ()) + axes
+
+
+def _channels(image: np.ndarray) -> int:
+    return image.shape[2] if image.ndim == 3 else 1
+
+
+def _cv2_result(result: np.ndarray, image: np.ndarray, out: Any) -> np.ndarray:
+    """Restore a trailing channel axis that OpenCV drops and copy into `out` if it was not used."""
+    if out is None:
+        return result.reshape(image.shape)
+    if result is not out:
+        np.copyto(out, result.reshape(out.shape))
+    return out
+
+
+def _store(result: np.ndarray, image: np.ndarray, out: Any) -> np.ndarray:
+    """Convert a float result to the dtype of `image`, rounded and saturated for integer
+    dtypes, or copy it into `out`."""
+    if np.issubdtype(image.dtype, np.integer):
+        info = np.iinfo(image.dtype)
+        result = np.clip(np.rint(result), info.min, info.max)
+    if out is None:
+        return result.astype(image.dtype, copy=False)
+    np.copyto(out, result, casting='unsafe')
+    return out
+
+
+def _gaussian_ksize(sigma: float) -> int:
+    """Kernel size of `gaussian_filter` for `sigma`."""
+    return 2 * int(_GAUSSIAN_TRUNCATE * sigma + 0.5) + 1
+
+
+def _use_cv2_gaussian(image: np.ndarray, sigma: float) -> bool:
+    if not np.isscalar(sigma) or sigma <= 0 or image.ndim not in (2, 3):
+        return False
+    if image.dtype not in _CV2_GAUSSIAN_MAX_KSIZE or _channels(image) > _CV2_MAX_CHANNELS:
+        return False
+    max_ksize = _CV2_GAUSSIAN_MAX_KSIZE[image.dtype]
+    return max_ksize is None or _gaussian_ksize(sigma) <= max_ksize
+
+
+# Gaussian blur methods: 'exact' reproduces `gaussian_filter`; 'iir' and 'pyramid' are
+# approximations whose cost does not grow with sigma
+GAUSSIAN_METHODS = ('exact', 'iir', 'pyramid')
+
+# Image range beyond each border that the recursive filter runs over before reaching the
+# image, in sigmas; its state there starts from the steady state of the border value
+_IIR_MARGIN = 3.0
+
+# The recursive filter approximates narrower Gaussians poorly; they are blurred exactly
+_IIR_MIN_SIGMA = 2.5
+
+# Smallest sigma the pyramid method blurs with at the reduced resolution. Smaller values
+# downsample further, and alias more; below twice this sigma no level is skipped
+_PYRAMID_MIN_SIGMA = 4.0
+
+
+def _young_van_vliet(sigma: float, dtype: Any) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    `lfilter` coefficients of the third-order recursive Gaussian of Young and van Vliet
+    (1995), applied once forward and once backward.
+    """
+    if sigma >= 2.5:
+        q = 0.98711 * sigma - 0.96330
+    else:
+        q = 3.97156 - 4.14554 * np.sqrt(1 - 0.26891 * sigma)
+    b0 = 1.57825 + 2.44413 * q + 1.4281 * q ** 2 + 0.422205 * q ** 3
+    b1 = 2.44413 * q + 2.85619 * q ** 2 + 1.26661 * q ** 3
+    b2 = -(1.4281 * q ** 2 + 1.26661 * q ** 3)
+    b3 = 0.422205 * q ** 3
+    gain = 1 - (b1 + b2 + b3) / b0
+    return np.array([gain], dtype=dtype), np.array([1, -b1 / b0, -b2 / b0, -b3 / b0], dtype=dtype)
+
+
+def _iir_axis(data: np.ndarray, sigma: float, axis: int) -> np.ndarray:
+    b, a = _young_van_vliet(sigma, data.dtype)
+    margin = int(np.ceil(_IIR_MARGIN * sigma))
+    # `lfilter` runs fastest along a contiguous axis; padding copies the filtered axis last
+    pad = [(0, 0)] * (data.ndim - 1) + [(margin, margin)]
+    padded = np.pad(np.moveaxis(data, axis, -1), pad, mode='symmetric')
+    steady = lfilter_zi(b, a).astype(data.dtype)
+    forward, _ = lfilter(b, a, padded, zi=steady * padded[..., :1])
+    backward = forward[..., ::-1]
+    smoothed, _ = lfilter(b, a, backward, zi=steady * backward[..., :1])
+    return np.moveaxis(smoothed[..., ::-1][..., margin:margin + data.shape[axis]], -1, axis)
+
+
+def _gaussian_iir(image: np.ndarray, sigma: float) -> np.ndarray:
+    data = image.astype(np.float64 if image.dtype == np.float64 else np.float32, copy=False)
+    return np.ascontiguousarray(_iir_axis(_iir_axis(data, sigma, 0), sigma, 1))
+
+
+def _pyramid_factor(image: np.ndarray, sigma: float) -> int:
+    """Power-of-two downsampling factor of the pyramid method (1: blur at full resolution)."""
+    factor = 1
+    while sigma / (2 * factor) >= _PYRAMID_MIN_SIGMA and min(image.shape[:2]) // (2 * factor) >= 4:
+        factor *= 2
+    return factor
+
+
+def _gaussian_pyramid(image: np.ndarray, sigma: float, factor: int) -> np.ndarray:
+    height, width = image.shape[:2]
+    # Integer images are reduced in float32, so that no level is rounded twice
+    data = image if image.dtype == np.float64 else image.astype(np.float32)
+    small = cv2.resize(data, (-(-width // factor), -(-height // factor)), interpolation=cv2.INTER_AREA)
+    # Area averaging and bilinear upsampling blur too; the reduced-resolution Gaussian adds
+    # the rest of the variance (in reduced pixels)
+    residual = np.sqrt(sigma ** 2 - (factor ** 2 - 1) / 12 - factor ** 2 / 12) / factor
+    small = gaussian_blur(small.reshape(small.shape[:2] + image.shape[2:]), residual)
+    return cv2.resize(small, (width, height), interpolation=cv2.INTER_LINEAR).reshape(image.shape)
+
+
+def gaussian_blur(image: np.ndarray, sigma: float, out: Any = None, method: str = 'exact') -> np.ndarray:
+    """
+    Gaussian blur of a 2D image or of every channel of an (H, W, C) image.
+
+    With `method='exact'`, `cv2.GaussianBlur` is used for uint8, uint16, float32 and
+    float64 images when it is faster for the kernel size, with the kernel and borders of
+    `gaussian_filter` (truncated at 4 sigma, reflect mode); SciPy handles every other case.
+    Float results agree to rounding. Integer results are within two levels of the rounded
+    float64 `gaussian_filter` result, since OpenCV rounds its fixed-point intermediates;
+    `gaussian_filter` on the integer image is too (it converts to the integer dtype after
+    each axis), so the two can differ from each other by up to three levels.
+
+    Two approximations for scalar sigmas cost the same for every sigma, which pays off for
+    strong blurs (sigma of about 10 and more):
+
+    - 'iir': the recursive Gaussian of Young and van Vliet, run forward and backward along
+      each axis. Results stay within 3% of the input's value range of `gaussian_filter`
+      (the largest errors are next to sharp edges).
+    - 'pyramid': downsample by a power of two with area averaging, blur the small image,
+      and upsample bilinearly. The factor keeps sigma at 4 or more at the reduced
+      resolution, so sigmas below 8 are blurred exactly. Results stay within 0.5% of the
+      input's value range of `gaussian_filter`. It is the faster of the two.
+    """
+    if method not in GAUSSIAN_METHODS:
+        raise ValueError(f"Unsupported Gaussian blur method '{method}'. Supported methods are: {GAUSSIAN_METHODS}.")
+    if method != 'exact' and np.isscalar(sigma) and sigma > 0 and image.ndim in (2, 3):
+        if method == 'iir' and sigma >= _IIR_MIN_SIGMA:
+            return _store(_gaussian_iir(image, sigma), image, out)
+        if method == 'pyramid':
+            factor = _pyramid_factor(image, sigma)
+            if factor > 1 and _channels(image) <= _CV2_MAX_CHANNELS:
+                return _store(_gaussian_pyramid(image, sigma, factor), image, out)
+    if _use_cv2_gaussian(image, sigma):
+        ksize = _gaussian_ksize(sigma)
+        blurred = cv2.GaussianBlur(np.ascontiguousarray(image), (ksize, ksize), sigmaX=sigma, sigmaY=sigma,
+                                   dst=_cv2_dst(out), borderType=cv2.BORDER_REFLECT)
+        return _cv2_result(blurred, image, out)
+    if not np.isscalar(sigma):
+        # Explicit per-axis sigmas are passed through unchanged
+        return gaussian_filter(image, sigma=sigma, output=out)
+    return gaussian_filter(image, sigma=_spatial(image, sigma, 0), output=out)
+
+
+
+# Dtypes `cv2.blur` filters natively; its running sums cost the same for every window size
+_CV2_BOX_DTYPES = frozenset(np.dtype(dtype) for dtype in (np.uint8, np.uint16, np.int16, np.float32, np.float64))
+
+
+def _use_cv2_box(image: np.ndarray) -> bool:
+    return image.ndim in (2, 3) and image.dtype in _CV2_BOX_DTYPES and _channels(image) <= _CV2_MAX_CHANNELS
+
+
+def _summed_area_table(image: np.ndarray) -> np.ndarray:
+    """Float64 table `S` of a 2D or (H, W, C) image with a leading row and column of zeros,
+    so that `S[y, x]` is the sum of `image[:y, :x]`."""
+    if _channels(image) <= _CV2_MAX_CHANNELS and image.dtype in _CV2_BOX_DTYPES:
+        return cv2.integral(np.ascontiguousarray(image), sdepth=cv2.CV_64F).reshape(
+            (image.shape[0] + 1, image.shape[1] + 1) + image.shape[2:])
+    table = np.zeros((image.shape[0] + 1, image.shape[1] + 1) + image.shape[2:])
+    np.cumsum(image, axis=0, out=table[1:, 1:])
+    np.cumsum(table[1:, 1:], axis=1, out=table[1:, 1:])
+    return table
+
+
+def _box_blur_map(image: np.ndarray, sizes: np.ndarray) -> np.ndarray:
+    """
+    Box blur with a window size per pixel from one summed-area table: every window sum
+    takes four lookups, whatever its size. Windows are placed as in `uniform_filter`.
+    """
+    if sizes.shape != image.shape[:2]:
+        raise ValueError(f"A per-pixel size map must have the shape {image.shape[:2]} of the image, "
+                         f"but got {sizes.shape}.")
+    # C order keeps the index arithmetic and the gathers below sequential
+    sizes = np.ascontiguousarray(sizes, dtype=np.intp)
+    if sizes.size and sizes.min() < 1:
+        raise ValueError("Box blur sizes must be at least 1.")
+    largest = int(sizes.max()) if sizes.size else 1
+    before, after = largest // 2, (largest - 1) // 2
+    pad = [(before, after), (before, after)] + [(0, 0)] * (image.ndim - 2)
+    table = _summed_area_table(np.pad(image, pad, mode='symmetric'))
+    stride = table.shape[1]
+    table = table.reshape((-1,) + image.shape[2:])
+    # Window of size s at y spans [y - s // 2, y - s // 2 + s) in the image; flat indices
+    # into the table gather much faster than pairs of row and column indices
+    offset = before - sizes // 2
+    top_left = (np.arange(image.shape[0])[:, np.newaxis] + offset) * stride + np.arange(image.shape[1]) + offset
+    top_right = top_left + sizes
+    bottom_left = top_left + sizes * stride
+    sums = np.take(table, bottom_left + sizes, axis=0)
+    sums -= np.take(table, top_right, axis=0)
+    sums -= np.take(table, bottom_left, axis=0)
+    sums += np.take(table, top_left, axis=0)
+    area = (sizes * sizes).astype(np.float64)
+    sums /= area[..., np.newaxis] if image.ndim == 3 else area
+    return sums
+
+
+def box_blur(image: np.ndarray, size: Any, out: Any = None) -> np.ndarray:
+    """
+    Box (uniform) blur of a 2D image or of every channel of an (H, W, C) image.
+
+    `size` is the window size in pixels: a number, one number per channel, or an (H, W)
+    array with a window size per pixel (e.g. a different blur strength per region). Windows
+    are placed as in `uniform_filter` (reflect borders, even windows extend one pixel further
+    up and left). Uniform sizes use `cv2.blur` for uint8, uint16, int16, float32 and float64
+    images, whose cost does not depend on the window size, and `uniform_filter` otherwise.
+    Per-pixel sizes are read from a summed-area table. Float results agree with
+    `uniform_filter` to rounding; integer results are the rounded window means (OpenCV's
+    uint8 fixed point can be one level off), which can differ by up to two levels from
+    SciPy's, since it truncates after each axis.
+    """
+    sizes = np.asarray(size)
+    if sizes.ndim == 2:
+        result = _box_blur_map(image, sizes)
+    elif sizes.ndim == 1:
+        if image.ndim != 3 or sizes.shape[0] != image.shape[2]:
+            raise ValueError(f"Per-channel box blur sizes need one size per channel of an (H, W, C) image, "
+                             f"but got {sizes.shape[0]} sizes for an image of shape {image.shape}.")
+        result = np.empty_like(image) if out is None else out
+        for channel, channel_size in enumerate(sizes):
+            box_blur(image[..., channel], channel_size, out=result[..., channel])
+        return result
+    elif _use_cv2_box(image) and int(size) >= 1:
+        size = int(size)
+        blurred = cv2.blur(np.ascontiguousarray(image), (size, size), dst=_cv2_dst(out), borderType=cv2.BORDER_REFLECT)
+        return _cv2_result(blurred, image, out)
+    else:
+        return uniform_filter(image, size=_spatial(image, int(size), 1), output=out)
+    return _store(result, image, out)
+
+# `cv2.medianBlur` window sizes per dtype (None: every odd size); larger uint8 windows use
+# OpenCV's constant-time histogram algorithm
+_CV2_MEDIAN_KSIZES = {
+    np.dtype(np.uint8): None,
+    np.dtype(np.uint16): (3, 5),
+    np.dtype(np.float32): (3, 5),
+}
+
+
+# Cost of one uint8 `cv2.medianBlur` pass of the split uint16 median, in window elements
+# of `median_filter` (measured on 512x512 images with 3x3 to 41x41 windows)
+_SPLIT_MEDIAN_PASS_COST = 1.5
+
+
+def _median_backend(image: np.ndarray, size: int) -> str:
+    """Name of the median backend for `image` and window `size`: 'cv2', 'split' or 'scipy'."""
+    if image.ndim not in (2, 3) or size < 3 or size % 2 == 0:
+        # Even windows are off-center in SciPy, which OpenCV cannot reproduce
+        return 'scipy'
+    if image.dtype in _CV2_MEDIAN_KSIZES:
+        ksizes = _CV2_MEDIAN_KSIZES[image.dtype]
+        if ksizes is None or size in ksizes:
+            return 'cv2'
+    if image.dtype == np.uint16 and image.size:
+        # One uint8 median pass per distinct high byte of the median, plus one for the high
+        # bytes, against a per-pixel cost that grows with the window area in SciPy
+        high_bytes = (int(image.max()) >> 8) - (int(image.min()) >> 8) + 1
+        if (1 + high_bytes) * _SPLIT_MEDIAN_PASS_COST <= size * size:
+            return 'split'
+    return 'scipy'
+
+
+def _median_uint16(padded: np.ndarray, size: int, radius: int) -> np.ndarray:
+    """
+    Median of a reflect-padded 2D uint16 image from two constant-time uint8 medians.
+
+    The median commutes with every non-decreasing map, so the high byte of the median is
+    the median of the high bytes. For each high byte `h` that occurs, clipping
+    `value - 256 * h` to [0, 255] is non-decreasing too and gives the low byte wherever
+    the median has that high byte; it is computed only on the bounding box of those pixels.
+    """
+    high_median = cv2.medianBlur((padded >> 8).astype(np.uint8), size)[radius:-radius, radius:-radius]
+    result = high_median.astype(np.uint16) << 8
+    for high in np.unique(high_median):
+        rows, cols = np.nonzero(high_median == high)
+        top, bottom, left, right = rows.min(), rows.max() + 1, cols.min(), cols.max() + 1
+        window = padded[top:bottom + 2 * radius, left:right + 2 * radius].astype(np.int32)
+        window -= int(high) << 8
+        low = cv2.medianBlur(np.clip(window, 0, 255).astype(np.uint8), size)[radius:-radius, radius:-radius]
+        region = high_median[top:bottom, left:right] == high
+        result[top:bottom, left:right][region] |= low[region]
+    return result
+
+
+def _median_2d(image: np.ndarray, size: int, backend: str) -> np.ndarray:
+    # Reflect padding reproduces SciPy's borders; OpenCV's own border is never reached
+    radius = size // 2
+    padded = np.pad(image, radius, mode='symmetric')
+    if backend == 'split':
+        return _median_uint16(padded, size, radius)
+    return cv2.medianBlur(padded, size)[radius:-radius, radius:-radius]
+
+
+def median_blur(image: np.ndarray, size: int, out: Any = None) -> np.ndarray:
+    """
+    Median filter of a 2D image or of every channel of an (H, W, C) image over a square
+    window of `size` pixels.
+
+    Odd windows of uint8 images use `cv2.medianBlur`, whose cost does not depend on the
+    window size; uint16 images with windows up to 5 and float32 images with windows of 3
+    or 5 use it too. Larger uint16 windows combine constant-time uint8 medians of the
+    high and low bytes (`_median_uint16`) when the value range makes that cheaper than
+    `median_filter`, e.g. from 7x7 windows on 12-bit images. Every other case, including
+    float images with larger windows, uses `median_filter`. All backends give the exact
+    result of `median_filter` with reflect borders.
+    """
+    backend = _median_backend(image, size)
+    if backend == 'scipy':
+        return median_filter(image, size=_spatial(image, size, 1), output=out)
+    result = np.empty_like(image) if out is None else out
+    if image.ndim == 2:
+        result[...] = _median_2d(image, size, backend)
+    else:
+        for channel in range(image.shape[2]):
+            result[..., channel] = _median_2d(image[..., channel], size, backend)
+    return result
+
+
+# Motion blur angles are rounded to this many decimals (degrees) before building a kernel,
+# so nearby angles share a cached kernel; the kernels differ by far less than their rounding
+_MOTION_ANGLE_DECIMALS = 2
+
+# Smallest motion kernel length and largest image (pixels per channel) for which the FFT
+# correlation beats `cv2.filter2D`, which already switches to its own DFT for kernels of 11
+# taps and more. Measured with one FFT worker on 512x512 to 2048x2048 float32 images; on
+# large images the padded spectra stop fitting in cache and filter2D's tiled DFT wins.
+_FFT_MIN_LENGTH = 101
+_FFT_MAX_PIXELS = 1024 * 1024
+
+
+@functools.lru_cache(maxsize=128)
+def _motion_kernel(length: int, angle: float) -> Tuple[np.ndarray, Tuple[int, int]]:
+    """
+    Normalized line kernel of `length` pixels rotated by `angle` degrees, cropped to its
+    non-zero rows and columns, and the (x, y) anchor of the original kernel center in it.
+
+    The kernel is cached and read-only; call it with a rounded angle in [0, 360).
+    """
+    kernel = np.zeros((length, length))
+    center = length // 2
+    kernel[center, :] = 1
+    kernel /= kernel.sum()
+    rotation = cv2.getRotationMatrix2D((center, center), angle, 1)
+    kernel = cv2.warpAffine(kernel, rotation, (length, length))
+    # Zero rows and columns contribute nothing; dropping them shrinks filter2D's work
+    # from length x length taps to the bounding box of the line
+    rows, cols = np.flatnonzero(kernel.any(axis=1)), np.flatnonzero(kernel.any(axis=0))
+    kernel = np.ascontiguousarray(kernel[rows[0]:rows[-1] + 1, cols[0]:cols[-1] + 1])
+    kernel.flags.writeable = False
+    return kernel, (center - int(cols[0]), center - int(rows[0]))
+
+
+@functools.lru_cache(maxsize=16)
+def _motion_spectrum(length: int, angle: float, shape: Tuple[int, int], dtype: np.dtype) -> np.ndarray:
+    """Real FFT of the flipped motion kernel zero-padded to `shape`, for `_fft_correlate`."""
+    kernel, _ = _motion_kernel(length, angle)
+    spectrum = scipy.fft.rfft2(kernel[::-1, ::-1].astype(dtype), s=shape)
+    spectrum.flags.writeable = False
+    return spectrum
+
+
+def _use_fft_motion(image: np.ndarray, length: int) -> bool:
+    return length >= _FFT_MIN_LENGTH and image.shape[0] * image.shape[1] <= _FFT_MAX_PIXELS
+
+
+def _fft_correlate(image: np.ndarray, length: int, angle: float, workers: Optional[int]) -> np.ndarray:
+    """
+    Correlate a 2D or (H, W, C) image with a cached motion kernel through `scipy.fft`, with
+    the reflect-101 borders of `cv2.filter2D`.
+    """
+    kernel, (anchor_x, anchor_y) = _motion_kernel(length, angle)
+    height, width = kernel.shape
+    work_dtype = np.float64 if image.dtype == np.float64 else np.float32
+    pad = [(anchor_y, height - 1 - anchor_y), (anchor_x, width - 1 - anchor_x)] + [(0, 0)] * (image.ndim - 2)
+    padded = np.pad(image.astype(work_dtype, copy=False), pad, mode='reflect')
+    # Sizes with small prime factors only, so every transform takes the fast path
+    shape = tuple(scipy.fft.next_fast_len(padded.shape[axis], real=True) for axis in (0, 1))
+    spectrum = _motion_spectrum(length, angle, shape, np.dtype(work_dtype))
+    if image.ndim == 3:
+        spectrum = spectrum[..., np.newaxis]
+    product = scipy.fft.rfft2(padded, s=shape, axes=(0, 1), workers=workers)
+    product *= spectrum
+    full = scipy.fft.irfft2(product, s=shape, axes=(0, 1), workers=workers, overwrite_x=True)
+    return full[height - 1:height - 1 + image.shape[0], width - 1:width - 1 + image.shape[1]]
+
+
+def motion_blur_filter(image: np.ndarray, length: int, angle: float, out: Any = None,
+                       workers: Optional[int] = None) -> np.ndarray:
+    """
+    Motion blur of a 2D image or of every channel of an (H, W, C) image: correlation with
+    a line kernel of `length` pixels at `angle` degrees, with reflect-101 borders.
+
+    Kernels are cached per (length, angle rounded to 0.01 degrees) and cropped to the
+    bounding box of the line. `cv2.filter2D` applies them, except for kernels of 101 taps
+    and more on images up to 1024x1024 pixels, which are correlated through `scipy.fft`
+    with `workers` threads and a cached kernel spectrum. Float results of the two paths
+    agree to rounding; integer results of both are within one level of the rounded float
+    result, and of each other.
+    """
+    angle = round(float(angle) % 360, _MOTION_ANGLE_DECIMALS) % 360
+    if image.ndim in (2, 3) and _use_fft_motion(image, length):
+        return _store(_fft_correlate(image, length, angle, workers), image, out)
+    kernel, anchor = _motion_kernel(length, angle)
+    blurred = cv2.filter2D(image, -1, kernel, dst=_cv2_dst(out), anchor=anchor)
+    return _cv2_result(blurred, image, out)
@@ -0,0 +1,95 @@
+"""
+OpenCV helpers for the default augmentations.
+
+`cv2.warpAffine`, `cv2.resize` and `cv2.remap` only handle up to four channels; these wrappers split
+wider images into channel chunks and keep a trailing channel axis that OpenCV drops.
+"""
+
+from typing import Any, Tuple
+
+import cv2
+import numpy as np
+
+
+def _channel_chunks(num_channels: int):
+    """
+    Split a channel count into OpenCV-friendly chunks of at most four channels.
+
+    Two-channel chunks are avoided: `cv2.warpAffine` handles them differently from
+    single channels near the borders, so a remainder of two is split into 1 + 1.
+    """
+    start = 0
+    while start < num_channels:
+        size = min(4, num_channels - start)
+        if size == 2:
+            size = 1
+        yield start, start + size
+        start += size
+
+
+def _warp_affine(image: np.ndarray, matrix: np.ndarray, size: Tuple[int, int],
+                 flags: int, border_mode: int, border_value: Any = 0, dst: Any = None) -> np.ndarray:
+    """
+    Run `cv2.warpAffine` per channel chunk, keeping a trailing channel axis.
+
+    If `dst` is given, every chunk is warped into its channel slice of it: directly by OpenCV
+    when that slice is C-contiguous, and copied otherwise.
+    """
+    matrix = np.asarray(matrix, dtype=np.float64)[:2]
+    if image.ndim == 3 and image.shape[2] not in (1, 3, 4):
+        if dst is None:
+            dst = np.empty((size[1], size[0], image.shape[2]), dtype=image.dtype)
+        for start, stop in _channel_chunks(image.shape[2]):
+            _warp_affine(np.ascontiguousarray(image[..., start:stop]), matrix, size,
+                         flags, border_mode, border_value, dst=dst[..., start:stop])
+        return dst
+    target = None
+    if dst is not None and dst.flags.c_contiguous:
+        # OpenCV writes single channels into 2D arrays
+        target = dst.reshape(dst.shape[:2]) if dst.ndim == 3 and dst.shape[2] == 1 else dst
+    warped = cv2.warpAffine(image, matrix, size, dst=target, flags=flags,
+                            borderMode=border_mode, borderValue=border_value)
+    if dst is not None:
+        if warped is not target:
+            np.copyto(dst, warped.reshape(dst.shape))
+        return dst
+    if image.ndim == 3 and warped.ndim == 2:
+        warped = warped[..., np.newaxis]
+    return warped
+
+
+def _resize(image: np.ndarray, size: Tuple[int, int], interpolation: int, dst: Any = None) -> np.ndarray:
+    """
+    Run `cv2.resize` per channel chunk, keeping a trailing channel axis.
+
+    If `dst` is given, the result is written into it: directly by OpenCV when it is
+    C-contiguous (or by the concatenation of the chunks), and copied otherwise.
+    """
+    if image.ndim == 3 and image.shape[2] not in (1, 3, 4):
+        chunks = [_resize(np.ascontiguousarray(image[..., start:stop]), size, interpolation)
+                  for start, stop in _channel_chunks(image.shape[2])]
+        return np.concatenate(chunks, axis=2, out=dst)
+    target = None
+    if dst is not None and dst.flags.c_contiguous:
+        # OpenCV writes single channels into 2D arrays
+        target = dst.reshape(dst.shape[:2]) if dst.ndim == 3 and dst.shape[2] == 1 else dst
+    resized = cv2.resize(image, size, dst=target, interpolation=interpolation)
+    if dst is not None:
+        if resized is not target:
+            np.copyto(dst, resized.reshape(dst.shape))
+        return dst
+    if image.ndim == 3 and resized.ndim == 2:
+        resized = resized[..., np.newaxis]
+    return resized
+
+
+def _remap(image: np.ndarray, map1: np.ndarray, map2: np.ndarray, interpolation: int, border_mode: int) -> np.ndarray:
+    """Run `cv2.remap` per channel chunk, keeping a trailing channel axis."""
+    if image.ndim == 3 and image.shape[2] not in (1, 3, 4):
+        chunks = [_remap(np.ascontiguousarray(image[..., start:stop]), map1, map2, interpolation, border_mode)
+                  for start, stop in _channel_chunks(image.shape[2])]
+        return np.concatenate(chunks, axis=2)
+    remapped = cv2.remap(image, map1, map2, interpolation, borderMode=border_mode)
+    if image.ndim == 3 and remapped.ndim == 2:
+        remapped = remapped[..., np.newaxis]
+    return remapped
@@ -0,0 +1,85 @@
+"""
+Shared helpers for the default augmentations.
+
+These are internal utilities used by the batched entry points and the pipeline
+machinery; they are not part of the public API. OpenCV helpers live in `_opencv` so
+that ops which do not need OpenCV can be imported without loading it.
+"""
+
+from typing import Any, Tuple
+
+import numpy as np
+
+
+def _validate_batch(images: np.ndarray) -> None:
+    """Validate a stacked batch of 2D (N, H, W) or 3D (N, H, W, C) images."""
+    if not isinstance(images, np.ndarray):
+        raise TypeError(f"Expected 'images' to be a NumPy array, but got {type(images).__name__}.")
+    if images.ndim not in [3, 4]:
+        raise ValueError(f"Input batch must be 3D (N, H, W) or 4D (N, H, W, C), but got {images.ndim}D.")
+    if images.shape[0] == 0:
+        raise ValueError("Input batch must contain at least one image.")
+
+
+def _per_sample(value: Any, n: int, name: str, dtype: Any = np.float64) -> np.ndarray:
+    """Broadcast a scalar or a length-`n` sequence to a 1D per-sample parameter array."""
+    values = np.asarray(value, dtype=dtype)
+    if values.ndim == 0:
+        return np.full(n, values, dtype=dtype)
+    if values.shape != (n,):
+        raise ValueError(f"'{name}' must be a scalar or have one value per image ({n}), but got shape {values.shape}.")
+    return values
+
+
+def _check_out(out: np.ndarray, shape: Tuple[int, ...], dtype: Any) -> None:
+    """Validate a caller-provided output buffer against the shape and dtype of the result."""
+    if not isinstance(out, np.ndarray):
+        raise TypeError(f"'out' must be a NumPy array, but got {type(out).__name__}.")
+    if out.shape != tuple(shape):
+        raise ValueError(f"'out' must have shape {tuple(shape)}, but got {out.shape}.")
+    if out.dtype != np.dtype(dtype):
+        raise ValueError(f"'out' must have dtype {np.dtype(dtype)}, but got {out.dtype}.")
+    if not out.flags.writeable:
+        raise ValueError("'out' must be writeable.")
+
+
+def _resolve_out(image: np.ndarray, out: Any, inplace: bool) -> Any:
+    """Turn `inplace=True` into `out=image`, rejecting a conflicting `out`."""
+    if inplace:
+        if out is not None and out is not image:
+            raise ValueError("'out' cannot be combined with 'inplace=True'.")
+        return image
+    return out
+
+
+def _store(result: np.ndarray, out: Any) -> np.ndarray:
+    """Return `result`, copied into `out` first if a buffer was provided and not already used."""
+    if out is None:
+        return result
+    if result is not out:
+        np.copyto(out, result)
+    return out
+
+
+def _cv2_dst(out: Any) -> Any:
+    """Return `out` if OpenCV can write into it directly, otherwise None."""
+    if out is not None and out.flags.c_contiguous:
+        return out
+    return None
+
+
+def _expand(values: np.ndarray, ndim: int) -> np.ndarray:
+    """Reshape a per-sample array (N,) so it broadcasts against an (N, ...) batch."""
+    return values.reshape((-1,) + (1,) * (ndim - 1))
+
+
+def _stack_channels(images: np.ndarray) -> np.ndarray:
+    """Move the batch axis of (N, H, W[, C]) into the channel axis: (H, W, N * C)."""
+    n, h, w = images.shape[:3]
+    return np.ascontiguousarray(np.moveaxis(images, 0, 2)).reshape(h, w, -1)
+
+
+def _unstack_channels(stacked: np.ndarray, n: int, channels: Tuple[int, ...]) -> np.ndarray:
+    """Inverse of `_stack_channels` for an array of a possibly different (H, W)."""
+    h, w = stacked.shape[:2]
+    return np.moveaxis(stacked.reshape((h, w, n) + channels), 2, 0)
@@ -1,6 +1,10 @@
 import numpy as np
-from typing import Tuple
+from typing import Optional, Sequence, Tuple, Union
 
+from ..instrument import instrumented
+from ._utils import _validate_batch, _per_sample, _check_out
+
+@instrumented
 def crop(
     image: np.ndarray,
     top: int,
@@ -9,7 +13,9 @@ def crop(
     width: int,
     *,
     adjust_if_exceeds: bool = False,
-    pad_value: Tuple[int, ...] = (0,)
+    pad_value: Tuple[int, ...] = (0,),
+    out: Optional[np.ndarray] = None,
+    copy: bool = True
 ) -> np.ndarray:
     """
     Crop an image to the specified size and position.
@@ -33,11 +39,19 @@ def crop(
         Value to use for padding if `adjust_if_exceeds` is True and the crop exceeds image boundaries.
         The length of the tuple should match the number of channels in the image.
         Defaults to (0,).
+    out : np.ndarray, optional
+        Preallocated array of shape (height, width[, C]) and the input dtype to write the
+        crop into. Defaults to None (a new array is returned).
+    copy : bool, optional
+        If False, a crop that needs no padding is returned as a view of `image` (no pixel
+        is copied; writing to it modifies `image`). Padded crops and crops into `out` are
+        always new data. Defaults to True.
 
     Returns:
     -------
     np.ndarray
         Cropped image with the same number of channels and dtype as input.
+        If `out` is given, that array is returned.
 
     Raises:
     ------
@@ -95,6 +109,8 @@ def crop(
         raise ValueError("Parameters 'height' and 'width' must be positive integers.")
 
     image_height, image_width = image.shape[:2]
+    if out is not None:
+        _check_out(out, (height, width) + image.shape[2:], image.dtype)
 
     # ---------------------
     # Boundary Validation
@@ -113,61 +129,154 @@ def crop(
 
     if not exceeds:
         # Perform Cropping
-        cropped = image[top:top + height, left:left + width].copy()
-        return cropped
+        view = image[top:top + height, left:left + width]
+        if out is not None:
+            np.copyto(out, view)
+            return out
+        return view.copy() if copy else view
 
     # If exceeds and adjust_if_exceeds == True
-    # Adjust crop parameters
+    if image.ndim == 2:
+        # Grayscale Image
+        if isinstance(pad_value, tuple):
+            if len(pad_value) != 1:
+                raise ValueError(
+                    f"Length of 'pad_value' ({len(pad_value)}) does not match number of channels (1)."
+                )
+            pad_value = pad_value[0]
+    else:
+        # Multi-channel Image
+        num_channels = image.shape[2]
+        if not isinstance(pad_value, tuple):
+            raise TypeError(f"Parameter 'pad_value' must be a tuple for multi-channel images, got {type(pad_value).__name__}.")
+        if len(pad_value) != num_channels:
+            raise ValueError(
+                f"Length of 'pad_value' ({len(pad_value)}) does not match number of channels ({num_channels})."
+            )
+    # Cast like `np.pad` does, e.g. -1 wraps to 255 in uint8 images
+    fill = np.asarray(pad_value).astype(image.dtype)
+
+    # Adjust crop parameters: the part inside the image goes to the top-left corner of the
+    # crop, the rest is padded at the bottom/right
     new_top = max(top, 0)
     new_left = max(left, 0)
-    new_bottom = min(top + height, image_height)
-    new_right = min(left + width, image_width)
-    cropped = image[new_top:new_bottom, new_left:new_right].copy()
-
-    # Calculate required padding
-    pad_bottom = height - (new_bottom - new_top)
-    pad_right = width - (new_right - new_left)
-
-    if pad_bottom > 0 or pad_right > 0:
-        if image.ndim == 2:
-            # Grayscale Image
-            pad_width_tuple = ((0, pad_bottom), (0, pad_right))
-            if isinstance(pad_value, tuple):
-                if len(pad_value) != 1:
-                    raise ValueError(
-                        f"Length of 'pad_value' ({len(pad_value)}) does not match number of channels (1)."
-                    )
-                pad_val = pad_value[0]
-            else:
-                pad_val = pad_value
-            cropped = np.pad(
-                cropped,
-                pad_width=pad_width_tuple,
-                mode='constant',
-                constant_values=pad_val
+    valid_height = max(min(top + height, image_height) - new_top, 0)
+    valid_width = max(min(left + width, image_width) - new_left, 0)
+
+    # A single output allocation: copy the valid region and fill only the padding around it
+    cropped = np.empty((height, width) + image.shape[2:], dtype=image.dtype) if out is None else out
+    cropped[:valid_height, :valid_width] = image[new_top:new_top + valid_height, new_left:new_left + valid_width]
+    cropped[valid_height:] = fill
+    cropped[:valid_height, valid_width:] = fill
+    return cropped
+
+
+@instrumented
+def crop_batch(
+    images: np.ndarray,
+    tops: Union[int, Sequence[int]],
+    lefts: Union[int, Sequence[int]],
+    height: int,
+    width: int,
+    *,
+    adjust_if_exceeds: bool = False,
+    pad_value: Tuple[int, ...] = (0,),
+    out: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Crop every image of a stacked batch at its own position, with a shared crop size.
+
+    The output is allocated once (or `out` is used) and every crop is copied straight
+    into its slot, with no intermediate batch.
+
+    Parameters:
+    ----------
+    images : np.ndarray
+        Batch of images as an (N, H, W) or (N, H, W, C) NumPy array.
+    tops : int or Sequence[int]
+        Top pixel coordinate for the whole batch or one per image.
+    lefts : int or Sequence[int]
+        Left pixel coordinate for the whole batch or one per image.
+    height : int
+        Desired height of the cropped images.
+    width : int
+        Desired width of the cropped images.
+    adjust_if_exceeds : bool, optional
+        If set to True, crops that exceed the image boundaries are padded as in `crop`
+        instead of raising an error. Defaults to False.
+    pad_value : Tuple[int, ...], optional
+        Value to use for padding, one per channel. Defaults to (0,).
+    out : np.ndarray, optional
+        Preallocated array of shape (N, height, width[, C]) and the input dtype to write
+        the crops into. Defaults to None (a new array is returned).
+
+    Returns:
+    -------
+    np.ndarray
+        Batch of cropped images of shape (N, height, width[, C]) with the input dtype.
+
+    Raises:
+    ------
+    TypeError
+        If input parameters are not of the expected types.
+    ValueError
+        If crop parameters are invalid or exceed image boundaries when `adjust_if_exceeds` is False.
+        If `pad_value` length does not match number of channels in the images.
+    """
+    _validate_batch(images)
+    n = images.shape[0]
+
+    for param, name in zip([height, width], ['height', 'width']):
+        if not isinstance(param, int):
+            raise TypeError(f"Parameter '{name}' must be an integer, but got {type(param).__name__}.")
+    if height <= 0 or width <= 0:
+        raise ValueError("Parameters 'height' and 'width' must be positive integers.")
+
+    for param, name in zip([tops, lefts], ['tops', 'lefts']):
+        if not np.issubdtype(np.asarray(param).dtype, np.integer):
+            raise TypeError(f"Parameter '{name}' must contain integers, but got {np.asarray(param).dtype}.")
+    tops = _per_sample(tops, n, 'tops', dtype=np.int64)
+    lefts = _per_sample(lefts, n, 'lefts', dtype=np.int64)
+
+    image_height, image_width = images.shape[1:3]
+    if out is not None:
+        _check_out(out, (n, height, width) + images.shape[3:], images.dtype)
+    exceeds = (
+        (tops < 0) | (lefts < 0) |
+        (tops + height > image_height) |
+        (lefts + width > image_width)
+    )
+    if exceeds.any() and not adjust_if_exceeds:
+        index = int(np.flatnonzero(exceeds)[0])
+        raise ValueError(
+            f"Invalid crop parameters for image {index}: (top={tops[index]}, left={lefts[index]}, "
+            f"height={height}, width={width}) exceed image dimensions ({image_height}, {image_width})."
+        )
+
+    fill = None
+    if exceeds.any():
+        num_channels = images.shape[3] if images.ndim == 4 else 1
+        if not isinstance(pad_value, tuple):
+            pad_value = (pad_value,)
+        if len(pad_value) != num_channels:
+            raise ValueError(
+                f"Length of 'pad_value' ({len(pad_value)}) does not match number of channels ({num_channels})."
             )
-        else:
-            # Multi-channel Image
-            num_channels = image.shape[2]
-            if not isinstance(pad_value, tuple):
-                raise TypeError(f"Parameter 'pad_value' must be a tuple for multi-channel images, got {type(pad_value).__name__}.")
-            if len(pad_value) != num_channels:
-                raise ValueError(
-                    f"Length of 'pad_value' ({len(pad_value)}) does not match number of channels ({num_channels})."
-                )
-            # Pad each channel individually
-            padded_channels = []
-            for c in range(num_channels):
-                channel = cropped[:, :, c]
-                pad_val = pad_value[c]
-                padded_channel = np.pad(
-                    channel,
-                    pad_width=((0, pad_bottom), (0, pad_right)),
-                    mode='constant',
-                    constant_values=pad_val
-                )
-                padded_channels.append(padded_channel)
-            # Stack channels back
-            cropped = np.stack(padded_channels, axis=2)
+        # Cast like `crop` does, e.g. -1 wraps to 255 in uint8 images
+        fill = np.asarray(pad_value).astype(images.dtype)
+        if images.ndim == 3:
+            fill = fill[0]
 
-    return cropped.copy()
\ No newline at end of file
+    # Every crop is copied straight into its slot of the output; like `crop`, out-of-bounds
+    # crops start at the first valid pixel and are padded at the bottom/right
+    cropped = np.empty((n, height, width) + images.shape[3:], dtype=images.dtype) if out is None else out
+    for image, top, left, target in zip(images, tops, lefts, cropped):
+        top, left = max(int(top), 0), max(int(left), 0)
+        valid_height = max(min(top + height, image_height) - top, 0)
+        valid_width = max(min(left + width, image_width) - left, 0)
+        target[:valid_height, :valid_width] = image[top:top + valid_height, left:left + valid_width]
+        if valid_height < height:
+            target[valid_height:] = fill
+        if valid_width < width:
+            target[:valid_height, valid_width:] = fill
+    return cropped
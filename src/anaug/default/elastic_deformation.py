@@ -1,30 +1,225 @@
+import contextlib
+import cv2
 import numpy as np
-from scipy.ndimage import gaussian_filter, map_coordinates
-from typing import Optional, Union
+from scipy.ndimage import map_coordinates
+from typing import Any, Optional, Sequence, Tuple, Union
 
+from ..buffers import _scratch
+from ..instrument import instrumented
+from ..precision import _random_field, _work_dtype
+from ..rng import get_rng, stream_rng
+from ._filters import _GAUSSIAN_TRUNCATE, gaussian_blur
+from ._opencv import _remap, _resize
+from ._utils import _validate_batch, _per_sample, _expand, _check_out, _store
 
+# Ways to build the displacement fields (see `elastic_deformation`)
+ELASTIC_METHODS = ('exact', 'grid')
+
+# Control point spacing of the 'grid' method, in units of sigma. The smoothed fields of the
+# exact method have almost no power at wavelengths below ~4 sigma, which this samples
+_GRID_SPACING = 2.0
+
+# Side of the square blocks in which tiled deformations draw their random fields
+_FIELD_BLOCK = 128
+
+# Dtypes `cv2.remap` interpolates like `map_coordinates(order=1)` (up to rounding of integer
+# results); it quantizes the weights of others (e.g. float64, int16) to 1/32 pixel
+_CV2_REMAP_DTYPES = (np.dtype(np.uint8), np.dtype(np.uint16), np.dtype(np.float32))
+
+
+def _warp(image: np.ndarray, rows: np.ndarray, cols: np.ndarray, out: Optional[np.ndarray] = None,
+          fixed_point: bool = False) -> np.ndarray:
+    """
+    Sample every channel of `image` at the (H, W) coordinates `rows`, `cols` with bilinear
+    interpolation and reflected borders.
+
+    All channels share the coordinates, so they are warped in one `cv2.remap` call where
+    OpenCV supports the dtype, and channel by channel with `map_coordinates` otherwise.
+    """
+    if image.dtype in _CV2_REMAP_DTYPES:
+        map1, map2 = cols.astype(np.float32, copy=False), rows.astype(np.float32, copy=False)
+        if fixed_point:
+            map1, map2 = cv2.convertMaps(map1, map2, cv2.CV_16SC2)
+        warped = _remap(np.ascontiguousarray(image), map1, map2, cv2.INTER_LINEAR, cv2.BORDER_REFLECT)
+        return _store(warped.reshape(rows.shape + image.shape[2:]), out)
+    if image.ndim == 2:
+        return map_coordinates(image, (rows, cols), order=1, mode='reflect', output=out)
+    warped = np.empty(rows.shape + image.shape[2:], dtype=image.dtype) if out is None else out
+    for channel in range(image.shape[2]):
+        map_coordinates(image[..., channel], (rows, cols), order=1, mode='reflect', output=warped[..., channel])
+    return warped
+
+
+def _smooth_field(field: np.ndarray, sigma: float, out: Optional[np.ndarray] = None,
+                  method: str = 'pyramid') -> np.ndarray:
+    """
+    Smooth an (H, W) random field like `gaussian_filter(field, sigma, mode='constant')`,
+    with `gaussian_blur`: padding with zeros by the kernel radius gives the constant border.
+
+    With the default `method='pyramid'`, sigmas of 8 and more are smoothed at reduced
+    resolution at a cost that does not grow with sigma. The smoothed field then differs
+    from the exact one by about 7% of its amplitude, with the same standard deviation and
+    smoothness (within 1%), which is all a random field needs.
+    """
+    radius = int(_GAUSSIAN_TRUNCATE * sigma + 0.5)
+    smoothed = gaussian_blur(np.pad(field, radius), sigma, method=method)
+    smoothed = smoothed[radius:radius + field.shape[0], radius:radius + field.shape[1]]
+    if out is None:
+        return smoothed
+    out[...] = smoothed
+    return out
+
+
+def _block_noise(entropy: Any, top: int, left: int, shape: Tuple[int, int], dtype: Any) -> np.ndarray:
+    """
+    Return the uniform [-1, 1] random fields (rows and columns) of the (h, w) window at
+    (`top`, `left`) of an image, as a (2, h, w) array.
+
+    The fields are drawn block by block, each block from the stream `(entropy, row, col)`
+    of its fixed position in the image, so a pixel gets the same values whichever window
+    it is drawn in.
+    """
+    height, width = shape
+    fields = np.empty((2, height, width), dtype=dtype)
+    for row in range(top // _FIELD_BLOCK, (top + height - 1) // _FIELD_BLOCK + 1):
+        for col in range(left // _FIELD_BLOCK, (left + width - 1) // _FIELD_BLOCK + 1):
+            block = stream_rng(entropy, row, col).random((2, _FIELD_BLOCK, _FIELD_BLOCK), dtype=dtype)
+            y0, x0 = max(row * _FIELD_BLOCK, top), max(col * _FIELD_BLOCK, left)
+            y1, x1 = min((row + 1) * _FIELD_BLOCK, top + height), min((col + 1) * _FIELD_BLOCK, left + width)
+            fields[:, y0 - top:y1 - top, x0 - left:x1 - left] = \
+                block[:, y0 - row * _FIELD_BLOCK:y1 - row * _FIELD_BLOCK, x0 - col * _FIELD_BLOCK:x1 - col * _FIELD_BLOCK]
+    fields *= 2
+    fields -= 1
+    return fields
+
+
+def _elastic_tile(
+    window: np.ndarray,
+    origin: Tuple[int, int],
+    core: Tuple[int, int, int, int],
+    image_shape: Tuple[int, ...],
+    alpha: float,
+    sigma: float,
+    entropy: Any,
+    fixed_point: bool = False
+) -> np.ndarray:
+    """
+    Deform the `core` (top, bottom, left, right) region of an image from a `window` of it
+    at `origin`, as `anaug.tiled_apply` does tile by tile.
+
+    The result depends only on `entropy` and the core, not on how the image is tiled: the
+    random fields come from `_block_noise`, and are smoothed over the core plus the
+    Gaussian kernel radius with the zeros beyond the image borders that the
+    `mode='constant'` filter of `elastic_deformation` sees. Since the smoothed fields lie
+    in [-1, 1], no pixel moves by more than `alpha`, so a window reaching `alpha + 1`
+    pixels beyond the core holds every pixel the core samples.
+    """
+    if alpha <= 0 or sigma <= 0:
+        raise ValueError(f"'alpha' and 'sigma' must be positive, but got {alpha} and {sigma}.")
+    top, bottom, left, right = core
+    height, width = image_shape[:2]
+    work_dtype = _work_dtype(window.dtype)
+    radius = int(_GAUSSIAN_TRUNCATE * sigma + 0.5)  # Gaussian kernel radius
+
+    # Random fields over the core plus the kernel radius, zero outside the image
+    field_top, field_left = max(top - radius, 0), max(left - radius, 0)
+    field_bottom, field_right = min(bottom + radius, height), min(right + radius, width)
+    padded = np.zeros((2, bottom - top + 2 * radius, right - left + 2 * radius), dtype=work_dtype)
+    padded[:, field_top - top + radius:field_bottom - top + radius, field_left - left + radius:field_right - left + radius] = \
+        _block_noise(entropy, field_top, field_left, (field_bottom - field_top, field_right - field_left), work_dtype)
+
+    grid = np.ogrid[top - origin[0]:bottom - origin[0], left - origin[1]:right - origin[1]]
+    coordinates = []
+    for axis in range(2):
+        # Smoothed exactly: the pyramid's reduced grid would follow the tile position.
+        # The zero padding already reaches a kernel radius beyond the core
+        displacement = gaussian_blur(padded[axis], sigma)
+        displacement = displacement[radius:radius + bottom - top, radius:radius + right - left]
+        displacement *= alpha
+        displacement += grid[axis]
+        coordinates.append(displacement)
+    return _warp(window, *coordinates, fixed_point=fixed_point)
+
+
+def _grid_fields(shape: Tuple[int, int], alpha: float, sigma: float, rng: np.random.Generator,
+                 dtype: Any) -> list:
+    """
+    Return the (H, W) displacement fields (rows and columns) of the 'grid' method: uniform
+    random displacements on a control grid spaced `_GRID_SPACING * sigma` apart, upsampled
+    with bicubic `cv2.resize`.
+
+    The upsampled fields have the standard deviation of the smoothed fields of the exact
+    method away from the borders, `alpha / sqrt(3) / (2 sqrt(pi) sigma)`, so `alpha` and
+    `sigma` keep their meaning.
+    """
+    spacing = _GRID_SPACING * sigma
+    control_shape = tuple(max(int(np.ceil((size - 1) / spacing)) + 1, 2) for size in shape)
+    # Bicubic interpolation (a = -0.75) between independent control values keeps on average
+    # 6/7 of their variance per axis, which the amplitude makes up for
+    amplitude = 7 / 6 * alpha / (2 * np.sqrt(np.pi) * sigma)
+
+    # A single draw for both axes, laid out (h, w, axis) so that one resize upsamples both
+    control = rng.random(control_shape + (2,), dtype=dtype)
+    control *= 2 * amplitude
+    control -= amplitude
+    dense = _resize(control, (shape[1], shape[0]), cv2.INTER_CUBIC)
+    return [dense[:, :, axis] for axis in range(2)]
+
+
+@instrumented
 def elastic_deformation(
     image: Union[np.ndarray, np.generic],
     alpha: float = 34.0,
     sigma: float = 4.0,
-    random_state: Optional[Union[int, np.random.RandomState]] = None
+    random_state: Optional[Union[int, np.random.RandomState, np.random.Generator]] = None,
+    *,
+    out: Optional[np.ndarray] = None,
+    rng: Any = None,
+    method: str = 'exact',
+    fixed_point: bool = False
 ) -> np.ndarray:
     """
     Apply elastic deformation to an image using displacement fields.
 
+    The displacement fields are 2D and shared by all channels, so a color image is
+    deformed consistently and costs about as much as a grayscale one: uint8, uint16 and
+    float32 images are resampled with a single `cv2.remap` call, other dtypes with
+    `map_coordinates` channel by channel.
+
     Parameters
     ----------
     image : np.ndarray
-        Input image as a 2D (grayscale) or 3D (color) NumPy array.
+        Input image as a 2D (grayscale) or 3D (color) NumPy array, with channels last.
     alpha : float, optional
         Scale factor that controls the intensity of the deformation. Must be positive.
         Default is 34.0.
     sigma : float, optional
         Standard deviation of the Gaussian kernel that controls the smoothness of the deformation.
         Must be positive. Default is 4.0.
-    random_state : int or np.random.RandomState, optional
-        Seed or RandomState instance for reproducibility. If None, a random seed is used.
-        Default is None.
+    random_state : int, np.random.Generator or np.random.RandomState, optional
+        Seed or generator for reproducibility; kept for compatibility, `rng` takes
+        precedence. Default is None.
+    out : np.ndarray, optional
+        Preallocated array with the shape and dtype of `image` to write the result into.
+    rng : np.random.Generator or int, optional
+        Random generator to draw the displacement fields from, or a seed for a new one (see
+        `anaug.rng.get_rng`). If neither `rng` nor `random_state` is given, the generator
+        activated with `anaug.use_rng`, or else NumPy's global random state, is used.
+    method : str, optional
+        How the displacement fields are built:
+
+        - 'exact' (default): full-resolution uniform noise smoothed with a Gaussian of
+          `sigma`. From `sigma` 8 the smoothing uses the pyramid method of `blur`, whose
+          fields have the same statistics and whose cost does not grow with `sigma`.
+        - 'grid': random displacements on a control grid spaced 2 * `sigma` apart,
+          upsampled with bicubic interpolation, with the same standard deviation as the
+          exact fields. The fields cost almost nothing beyond the resampling, for every
+          `sigma`; the draws differ from the exact method's.
+    fixed_point : bool, optional
+        If True, convert the sampling coordinates to OpenCV's fixed-point maps
+        (`cv2.convertMaps` to CV_16SC2) before remapping, which is faster at the cost of
+        quantizing them to 1/32 pixel. Only applies to the dtypes resampled with
+        `cv2.remap`. Default is False.
 
     Returns
     -------
@@ -34,7 +229,7 @@ def elastic_deformation(
     Raises
     ------
     TypeError
-        If `image` is not a NumPy array or if `random_state` is not of the correct type.
+        If `image` is not a NumPy array or if `random_state` or `rng` is not of the correct type.
     ValueError
         If `alpha` or `sigma` are non-positive, or if `image` has unsupported dimensions.
 
@@ -63,57 +258,164 @@ def elastic_deformation(
     if not isinstance(sigma, (int, float)) or sigma <= 0:
         raise ValueError(f"'sigma' must be a positive float, but got {sigma}.")
 
-    if random_state is None:
-        rng = np.random.RandomState()
-    elif isinstance(random_state, int):
-        rng = np.random.RandomState(random_state)
-    elif isinstance(random_state, np.random.RandomState):
-        rng = random_state
-    else:
-        raise TypeError(f"'random_state' must be None, int, or np.random.RandomState, but got {type(random_state).__name__}.")
+    if method not in ELASTIC_METHODS:
+        raise ValueError(f"Unsupported method '{method}'. Supported methods are: {list(ELASTIC_METHODS)}.")
 
-    shape = image.shape
-    ndim = image.ndim
+    # `random_state` is the historical name of `rng`
+    rng = get_rng(random_state if rng is None else rng)
 
-    # ---------------------
-    # Generate Displacement Fields
-    # ---------------------
-    displacement_fields = []
-    for axis in range(ndim):
-        # Generate random displacement field with the same shape as the image
-        random_field = rng.rand(*shape) * 2 - 1  # Values in [-1, 1]
-        displacement = gaussian_filter(random_field, sigma=sigma, mode='constant', cval=0) * alpha
-        displacement_fields.append(displacement)
+    if out is not None:
+        _check_out(out, image.shape, image.dtype)
 
-    # ---------------------
-    # Create Meshgrid for Coordinates
-    # ---------------------
-    if ndim == 2:
-        # For 2D images, axes are (y, x)
-        y, x = np.meshgrid(np.arange(shape[0]), np.arange(shape[1]), indexing='ij')
-        indices = (y + displacement_fields[0], x + displacement_fields[1])
-    elif ndim == 3:
-        # For 3D images, axes are (z, y, x)
-        z, y, x = np.meshgrid(
-            np.arange(shape[0]),
-            np.arange(shape[1]),
-            np.arange(shape[2]),
-            indexing='ij'
-        )
-        indices = (
-            z + displacement_fields[0],
-            y + displacement_fields[1],
-            x + displacement_fields[2]
-        )
+    # One (H, W) field per spatial axis, shared by all channels
+    shape = image.shape[:2]
 
-    # ---------------------
-    # Apply Elastic Deformation
-    # ---------------------
-    deformed_image = map_coordinates(
-        image,
-        indices,
-        order=1,
-        mode='reflect'
-    ).reshape(shape)
-
-    return deformed_image
\ No newline at end of file
+    # The displacement fields are scratch memory, borrowed from the active buffer pool if
+    # any, in the floating-point dtype of the precision policy
+    work_dtype = _work_dtype(image.dtype)
+    with contextlib.ExitStack() as scratch:
+        # ---------------------
+        # Generate Displacement Fields
+        # ---------------------
+        if method == 'grid':
+            displacement_fields = _grid_fields(shape, alpha, sigma, rng, work_dtype)
+        else:
+            displacement_fields = []
+            for axis in range(2):
+                # Generate random displacement field with the spatial shape of the image
+                random_field = scratch.enter_context(_random_field(shape, work_dtype, rng.random))
+                random_field *= 2
+                random_field -= 1  # Values in [-1, 1]
+                displacement = scratch.enter_context(_scratch(shape, work_dtype))
+                _smooth_field(random_field, sigma, out=displacement)
+                displacement *= alpha
+                displacement_fields.append(displacement)
+
+        # ---------------------
+        # Create Coordinates
+        # ---------------------
+        # Add the pixel grid to the displacement fields in place, using a broadcast
+        # (open) grid per axis instead of a full meshgrid
+        for axis, grid in enumerate(np.ogrid[:shape[0], :shape[1]]):
+            displacement_fields[axis] += grid
+
+        # ---------------------
+        # Apply Elastic Deformation
+        # ---------------------
+        deformed_image = _warp(image, *displacement_fields, out=out, fixed_point=fixed_point)
+
+    return deformed_image
+
+
+@instrumented
+def elastic_deformation_batch(
+    images: np.ndarray,
+    alphas: Union[float, Sequence[float]] = 34.0,
+    sigmas: Union[float, Sequence[float]] = 4.0,
+    random_state: Optional[Union[int, np.random.RandomState, np.random.Generator]] = None,
+    *,
+    out: Optional[np.ndarray] = None,
+    rng: Any = None,
+    method: str = 'exact',
+    fixed_point: bool = False
+) -> np.ndarray:
+    """
+    Apply elastic deformation to every image of a stacked batch with per-sample parameters.
+
+    The (N, H, W) random fields of the whole batch are drawn at once, then smoothed and
+    resampled image by image as in `elastic_deformation`. With `method='grid'` the fields
+    are built image by image instead.
+
+    Parameters
+    ----------
+    images : np.ndarray
+        Batch of images as an (N, H, W) or (N, H, W, C) NumPy array. Each image is
+        deformed like `elastic_deformation` deforms a 2D or 3D image.
+    alphas : float or Sequence[float], optional
+        Deformation intensity for the whole batch or one per image. Must be positive.
+        Default is 34.0.
+    sigmas : float or Sequence[float], optional
+        Smoothness of the deformation for the whole batch or one per image. Must be positive.
+        Default is 4.0.
+    random_state : int, np.random.Generator or np.random.RandomState, optional
+        Seed or generator for reproducibility; kept for compatibility, `rng` takes
+        precedence. Default is None.
+    out : np.ndarray, optional
+        Preallocated array with the shape and dtype of `images` to write the result into.
+    rng : np.random.Generator or int, optional
+        Random generator to draw the displacement fields from, or a seed for a new one,
+        as in `elastic_deformation`.
+    method : str, optional
+        'exact' (default) or 'grid', as in `elastic_deformation`.
+    fixed_point : bool, optional
+        Whether to remap with fixed-point coordinates, as in `elastic_deformation`.
+        Default is False.
+
+    Returns
+    -------
+    np.ndarray
+        Batch of deformed images with the same shape and dtype as the input.
+
+    Raises
+    ------
+    TypeError
+        If `images` is not a NumPy array or if `random_state` or `rng` is not of the correct type.
+    ValueError
+        If `alphas` or `sigmas` are non-positive or do not match the batch size, or if
+        `images` has unsupported dimensions.
+    """
+    _validate_batch(images)
+    n = images.shape[0]
+    alphas = _per_sample(alphas, n, 'alphas')
+    sigmas = _per_sample(sigmas, n, 'sigmas')
+
+    if np.any(alphas <= 0):
+        raise ValueError("'alphas' must all be positive.")
+    if np.any(sigmas <= 0):
+        raise ValueError("'sigmas' must all be positive.")
+    if out is not None:
+        _check_out(out, images.shape, images.dtype)
+
+    if method not in ELASTIC_METHODS:
+        raise ValueError(f"Unsupported method '{method}'. Supported methods are: {list(ELASTIC_METHODS)}.")
+
+    # `random_state` is the historical name of `rng`
+    rng = get_rng(random_state if rng is None else rng)
+
+    if method == 'grid':
+        # Control grids are small; only the resampling is per pixel
+        deformed = np.empty_like(images) if out is None else out
+        for image, alpha, sigma, target in zip(images, alphas, sigmas, deformed):
+            elastic_deformation(image, float(alpha), float(sigma), out=target, rng=rng, method='grid',
+                                fixed_point=fixed_point)
+        return deformed
+
+    shape = images.shape[:3]
+
+    work_dtype = _work_dtype(images.dtype)
+    deformed = np.empty_like(images) if out is None else out
+    with contextlib.ExitStack() as scratch:
+        # ---------------------
+        # Generate Displacement Fields
+        # ---------------------
+        displacement_fields = []
+        for axis in range(2):
+            random_fields = scratch.enter_context(_random_field(shape, work_dtype, rng.random))
+            random_fields *= 2
+            random_fields -= 1  # Values in [-1, 1]
+            displacement = scratch.enter_context(_scratch(shape, work_dtype))
+            for random_field, sigma, target in zip(random_fields, sigmas, displacement):
+                _smooth_field(random_field, float(sigma), out=target)
+            displacement *= _expand(alphas, 3)
+            displacement_fields.append(displacement)
+
+        # ---------------------
+        # Resample Image by Image
+        # ---------------------
+        rows, cols = np.ogrid[:shape[1], :shape[2]]
+        displacement_fields[0] += rows
+        displacement_fields[1] += cols
+        for image, row_field, col_field, target in zip(images, *displacement_fields, deformed):
+            _warp(image, row_field, col_field, out=target, fixed_point=fixed_point)
+
+    return deformed
@@ -1,10 +1,17 @@
 import numpy as np
-from typing import Union, List
+from typing import Optional, Union, List, Sequence
 
+from ..instrument import instrumented
+from ._utils import _validate_batch, _per_sample, _check_out, _resolve_out
 
+
+@instrumented
 def flip(
     image: np.ndarray,
-    axes: Union[str, List[str]] = 'horizontal'
+    axes: Union[str, List[str]] = 'horizontal',
+    *,
+    out: Optional[np.ndarray] = None,
+    inplace: bool = False
 ) -> np.ndarray:
     """
     Flips the image horizontally, vertically, or along specified axes.
@@ -20,11 +27,16 @@ def flip(
         - 'both': Flip both horizontally and vertically.
         - List[str]: Specify a list of axes to flip, e.g., ['horizontal', 'vertical'].
         Default is 'horizontal'.
+    out : np.ndarray, optional
+        Preallocated array with the shape and dtype of `image` to write the result into.
+    inplace : bool, optional
+        If True, `image` itself is flipped. Default is False.
 
     Returns
     -------
     np.ndarray
-        Flipped image based on specified axes.
+        Flipped image based on specified axes. If `out` is given (or `inplace` is True),
+        that array is returned.
 
     Raises
     ------
@@ -77,12 +89,85 @@ def flip(
         if axis not in valid_axes:
             raise ValueError(f"Invalid axis '{axis}'. Valid axes are 'horizontal' and 'vertical'.")
 
-    # Apply flips based on specified axes
-    flipped_image = image.copy()
+    out = _resolve_out(image, out, inplace)
+    if out is not None:
+        _check_out(out, image.shape, image.dtype)
+
+    # Compose the flips as a view, then materialize it with a single copy
+    flipped_image = image
     for axis in axes:
         if axis == 'horizontal':
             flipped_image = np.fliplr(flipped_image)
         elif axis == 'vertical':
             flipped_image = np.flipud(flipped_image)
 
-    return flipped_image
\ No newline at end of file
+    if out is None:
+        return flipped_image.copy()
+    # `np.copyto` buffers overlapping views, so flipping into `image` itself is safe
+    np.copyto(out, flipped_image)
+    return out
+
+
+@instrumented
+def flip_batch(
+    images: np.ndarray,
+    horizontal: Union[bool, Sequence[bool]] = False,
+    vertical: Union[bool, Sequence[bool]] = False,
+    *,
+    out: Optional[np.ndarray] = None,
+    inplace: bool = False
+) -> np.ndarray:
+    """
+    Flips every image of a stacked batch, with per-sample flip decisions.
+
+    Parameters
+    ----------
+    images : np.ndarray
+        Batch of images as an (N, H, W) or (N, H, W, C) NumPy array.
+    horizontal : bool or Sequence[bool], optional
+        Whether to flip left-right. Either one value for the whole batch or one per image.
+        Default is False.
+    vertical : bool or Sequence[bool], optional
+        Whether to flip up-down. Either one value for the whole batch or one per image.
+        Default is False.
+    out : np.ndarray, optional
+        Preallocated array with the shape and dtype of `images` to write the result into.
+    inplace : bool, optional
+        If True, `images` itself is flipped. Default is False.
+
+    Returns
+    -------
+    np.ndarray
+        Batch of flipped images with the same shape and dtype as the input.
+
+    Raises
+    ------
+    TypeError
+        If `images` is not a NumPy array.
+    ValueError
+        If the batch has invalid dimensions or the flip masks do not match the batch size.
+
+    Examples
+    --------
+    >>> batch = np.random.rand(8, 128, 128)
+    >>> flipped = flip_batch(batch, horizontal=np.random.rand(8) < 0.5)
+    """
+    _validate_batch(images)
+    n = images.shape[0]
+    horizontal = _per_sample(horizontal, n, 'horizontal', dtype=bool)
+    vertical = _per_sample(vertical, n, 'vertical', dtype=bool)
+
+    out = _resolve_out(images, out, inplace)
+    if out is None:
+        flipped_images = images.copy()
+    else:
+        _check_out(out, images.shape, images.dtype)
+        flipped_images = out
+        if out is not images:
+            np.copyto(out, images)
+    if horizontal.any():
+        flipped_images[horizontal] = flipped_images[horizontal][:, :, ::-1]
+    if vertical.any():
+        flipped_images[vertical] = flipped_images[vertical][:, ::-1]
+
+    return flipped_images
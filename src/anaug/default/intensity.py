@@ -1,10 +1,20 @@
 import numpy as np
+from typing import Optional, Sequence, Union
 
+from ..instrument import instrumented
+from ..precision import _work_dtype
+from ._utils import _validate_batch, _per_sample, _expand, _check_out, _resolve_out
 
+
+@instrumented
 def intensity(
     image: np.ndarray,
     brightness_factor: float = 1.0,
-    contrast_factor: float = 1.0
+    contrast_factor: float = 1.0,
+    *,
+    out: Optional[np.ndarray] = None,
+    inplace: bool = False,
+    mean: Optional[float] = None
 ) -> np.ndarray:
     """
     Adjusts brightness and contrast of a given image.
@@ -19,11 +29,21 @@ def intensity(
     contrast_factor : float, optional
         Factor to adjust contrast. Values > 1 increase contrast, values < 1 decrease contrast.
         Must be positive. Default is 1.0 (no change).
+    out : np.ndarray, optional
+        Preallocated array with the shape and dtype of `image` to write the result into.
+        For float64 images no intermediate array is allocated at all.
+    inplace : bool, optional
+        If True, `image` itself is overwritten with the result. Default is False.
+    mean : float, optional
+        Mean intensity of the image before the brightness adjustment, around which the
+        contrast is stretched. Defaults to the mean of `image`; pass the mean of the whole
+        image when adjusting one tile of it at a time.
 
     Returns
     -------
     np.ndarray
         Image with adjusted brightness and contrast, maintaining the original shape and data type.
+        If `out` is given (or `inplace` is True), that array is returned.
 
     Raises
     ------
@@ -76,20 +96,118 @@ def intensity(
     else:
         raise ValueError(f"Unsupported image data type: {dtype}.")
 
-    # Convert image to float for processing
-    image_float = image.astype(float)
+    out = _resolve_out(image, out, inplace)
+    if out is not None:
+        _check_out(out, image.shape, dtype)
+
+    # Work in a single floating-point buffer whose dtype follows the precision policy
+    # (float64 by default); when it matches the image dtype, `out` is used directly
+    work_dtype = _work_dtype(dtype)
+    if dtype == work_dtype and out is not None:
+        work = out
+    else:
+        work = np.empty(image.shape, dtype=work_dtype)
 
     # Adjust brightness
-    image_bright = image_float * brightness_factor
+    np.multiply(image, brightness_factor, out=work, dtype=work_dtype)
 
-    # Adjust contrast
-    mean_intensity = np.mean(image_bright)
-    image_contrast = contrast_factor * (image_bright - mean_intensity) + mean_intensity
+    # Adjust contrast (the mean is always accumulated in double precision)
+    if mean is None:
+        mean_intensity = np.mean(work, dtype=np.float64)
+    else:
+        mean_intensity = mean * brightness_factor
+    work -= mean_intensity
+    work *= contrast_factor
+    work += mean_intensity
 
     # Clip values to the valid range based on original data type
-    image_clipped = np.clip(image_contrast, info.min, info.max)
+    np.clip(work, info.min, info.max, out=work)
 
     # Convert back to original data type
-    adjusted_image = image_clipped.astype(dtype)
+    if work is out:
+        return out
+    if out is None:
+        return work if dtype == work_dtype else work.astype(dtype)
+    np.copyto(out, work, casting='unsafe')
+    return out
+
+
+@instrumented
+def intensity_batch(
+    images: np.ndarray,
+    brightness_factors: Union[float, Sequence[float]] = 1.0,
+    contrast_factors: Union[float, Sequence[float]] = 1.0,
+    *,
+    out: Optional[np.ndarray] = None,
+    inplace: bool = False
+) -> np.ndarray:
+    """
+    Adjusts brightness and contrast of every image of a stacked batch in one vectorized pass.
+
+    Parameters
+    ----------
+    images : np.ndarray
+        Batch of images as an (N, H, W) or (N, H, W, C) NumPy array.
+    brightness_factors : float or Sequence[float], optional
+        Brightness factor for the whole batch or one per image. Must be positive. Default is 1.0.
+    contrast_factors : float or Sequence[float], optional
+        Contrast factor for the whole batch or one per image. Must be positive. Default is 1.0.
+    out : np.ndarray, optional
+        Preallocated array with the shape and dtype of `images` to write the result into.
+    inplace : bool, optional
+        If True, `images` itself is overwritten with the result. Default is False.
+
+    Returns
+    -------
+    np.ndarray
+        Batch with adjusted brightness and contrast, with the same shape and dtype as the input.
+        Each image gives the same result as calling `intensity` on it with its own factors.
+
+    Raises
+    ------
+    TypeError
+        If `images` is not a NumPy array.
+    ValueError
+        If the batch has invalid dimensions or dtype, or if factors are non-positive or
+        do not match the batch size.
+
+    Examples
+    --------
+    >>> batch = np.random.randint(0, 256, (16, 128, 128), dtype=np.uint8)
+    >>> adjusted = intensity_batch(batch, brightness_factors=np.random.uniform(0.8, 1.2, 16))
+    """
+    _validate_batch(images)
+    n = images.shape[0]
+    brightness_factors = _per_sample(brightness_factors, n, 'brightness_factors')
+    contrast_factors = _per_sample(contrast_factors, n, 'contrast_factors')
+
+    if np.any(brightness_factors <= 0):
+        raise ValueError("'brightness_factors' must all be positive.")
+    if np.any(contrast_factors <= 0):
+        raise ValueError("'contrast_factors' must all be positive.")
+
+    dtype = images.dtype
+    if np.issubdtype(dtype, np.integer):
+        info = np.iinfo(dtype)
+    elif np.issubdtype(dtype, np.floating):
+        info = np.finfo(dtype)
+    else:
+        raise ValueError(f"Unsupported image data type: {dtype}.")
 
-    return adjusted_image
\ No newline at end of file
+    out = _resolve_out(images, out, inplace)
+    if out is not None:
+        _check_out(out, images.shape, dtype)
+
+    # Same arithmetic as `intensity`, with the factors broadcast per sample
+    work_dtype = _work_dtype(dtype)
+    work = np.multiply(images, _expand(brightness_factors, images.ndim), dtype=work_dtype)
+    mean_intensity = work.mean(axis=tuple(range(1, images.ndim)), keepdims=True, dtype=np.float64)
+    work -= mean_intensity
+    work *= _expand(contrast_factors, images.ndim)
+    work += mean_intensity
+    np.clip(work, info.min, info.max, out=work)
+
+    if out is None:
+        return work if dtype == work_dtype else work.astype(dtype)
+    np.copyto(out, work, casting='unsafe')
+    return out
@@ -1,12 +1,33 @@
 import numpy as np
-from typing import Optional
+from typing import Any, Optional, Sequence, Union
 
+from ..buffers import _scratch
+from ..instrument import instrumented
+from ..precision import _random_field, _work_dtype
+from ..rng import get_rng
+from ._utils import _validate_batch, _per_sample, _expand, _check_out, _resolve_out, _store
 
+
+def _add_noise(image: np.ndarray, gauss: np.ndarray, out: Optional[np.ndarray], reuse: bool = True) -> np.ndarray:
+    """Add a noise field to `image` in the image dtype, as `image + gauss.astype(dtype)`."""
+    if image.dtype == gauss.dtype:
+        # Reuse the noise buffer for the result unless the caller provided one
+        return np.add(image, gauss, out=gauss if out is None and reuse else out)
+    with _scratch(image.shape, image.dtype) as cast:
+        np.copyto(cast, gauss, casting='unsafe')
+        return np.add(image, cast, out=out)
+
+
+@instrumented
 def noise(
     image: np.ndarray,
     noise_type: str = 'gaussian',
     noise_intensity: float = 0.05,
-    scale: Optional[float] = None
+    scale: Optional[float] = None,
+    *,
+    out: Optional[np.ndarray] = None,
+    inplace: bool = False,
+    rng: Any = None
 ) -> np.ndarray:
     """
     Adds noise to the image to simulate different scanning conditions.
@@ -32,11 +53,20 @@ def noise(
     scale : float, optional
         Scaling factor for Poisson noise. Relevant only if `noise_type` is 'poisson'.
         Must be positive. If not provided, defaults to 1.0.
+    out : np.ndarray, optional
+        Preallocated array with the shape and dtype of `image` to write the result into.
+    inplace : bool, optional
+        If True, the noise is added to `image` itself. Default is False.
+    rng : np.random.Generator or int, optional
+        Random generator to draw from, or a seed for a new one (see `anaug.rng.get_rng`).
+        If None, the generator activated with `anaug.use_rng`, or else NumPy's global
+        random state, is used.
 
     Returns
     -------
     np.ndarray
         Image with added noise, maintaining the original shape and data type.
+        If `out` is given (or `inplace` is True), that array is returned.
 
     Raises
     ------
@@ -105,39 +135,40 @@ def noise(
         # This block should be unreachable due to earlier dtype validation
         raise ValueError(f"Unsupported image data type: {dtype}.")
 
+    out = _resolve_out(image, out, inplace)
+    if out is not None:
+        _check_out(out, image.shape, image.dtype)
+    rng = get_rng(rng)
+
     # If noise_intensity is zero, return the original image
     if noise_intensity == 0.0:
-        return image.copy()
+        return _store(image, out) if out is not None else image.copy()
 
     # Gaussian Noise
     if noise_type == 'gaussian':
-        mean = 0
-        std = noise_intensity
-        gauss = np.random.normal(mean, std, image.shape).astype(dtype)
-        noisy_image = image + gauss
-        noisy_image = np.clip(noisy_image, min_val, max_val)
+        work_dtype = _work_dtype(dtype)
+        with _random_field(image.shape, work_dtype, rng.standard_normal) as gauss:
+            gauss *= noise_intensity
+            noisy_image = _add_noise(image, gauss, out, reuse=work_dtype == np.float64)
+        np.clip(noisy_image, min_val, max_val, out=noisy_image)
         return noisy_image
 
     # Salt-and-Pepper Noise
     elif noise_type == 'salt_and_pepper':
-        noisy_image = image.copy()
+        noisy_image = image.copy() if out is None else _store(image, out)
         total_pixels = image.size
         num_salt = int(np.ceil(noise_intensity * total_pixels * 0.5))
         num_pepper = int(np.ceil(noise_intensity * total_pixels * 0.5))
 
         # Generate flat indices
-        noisy_image_flat = noisy_image.flatten()
-        coords_salt = np.random.choice(total_pixels, num_salt, replace=False)
-        coords_pepper = np.random.choice(total_pixels, num_pepper, replace=False)
+        coords_salt = rng.choice(total_pixels, num_salt, replace=False)
+        coords_pepper = rng.choice(total_pixels, num_pepper, replace=False)
 
         # Apply salt noise
-        noisy_image_flat[coords_salt] = max_val
+        noisy_image.put(coords_salt, max_val)
 
         # Apply pepper noise
-        noisy_image_flat[coords_pepper] = min_val
-
-        # Reshape back to original shape
-        noisy_image = noisy_image_flat.reshape(image.shape)
+        noisy_image.put(coords_pepper, min_val)
 
         return noisy_image
 
@@ -155,25 +186,160 @@ def noise(
             # Ensure no negative values
             if np.any(scaled_image < 0):
                 raise ValueError("Scaled image contains negative values, which are not allowed for Poisson noise.")
-
-            noisy_image = np.random.poisson(scaled_image).astype(float) / (noise_intensity * scale)
         elif dtype == np.uint8:
             # For uint8 images, ensure scaling to avoid overflow
-            scaled_image = image.astype(np.float64) * noise_intensity * scale
-            noisy_image = np.random.poisson(scaled_image).astype(float) / (noise_intensity * scale)
+            scaled_image = image.astype(_work_dtype(dtype)) * noise_intensity * scale
+
+        noisy_image = rng.poisson(scaled_image).astype(_work_dtype(dtype))
+        noisy_image /= noise_intensity * scale
 
         # Clip to valid range
-        noisy_image = np.clip(noisy_image, min_val, max_val)
+        np.clip(noisy_image, min_val, max_val, out=noisy_image)
 
         # Preserve original dtype
         if dtype == np.uint8:
             # Round before casting to avoid truncation
-            noisy_image = np.round(noisy_image).astype(dtype)
-        else:
-            noisy_image = noisy_image.astype(dtype)
-
-        return noisy_image
+            np.round(noisy_image, out=noisy_image)
+        if out is None:
+            return noisy_image.astype(dtype, copy=False)
+        np.copyto(out, noisy_image, casting='unsafe')
+        return out
 
     else:
         # This else block is theoretically unreachable due to earlier validation
         raise ValueError(f"Unsupported noise type '{noise_type}'.")
+
+
+@instrumented
+def noise_batch(
+    images: np.ndarray,
+    noise_type: str = 'gaussian',
+    noise_intensities: Union[float, Sequence[float]] = 0.05,
+    scale: Optional[float] = None,
+    *,
+    out: Optional[np.ndarray] = None,
+    inplace: bool = False,
+    rng: Any = None
+) -> np.ndarray:
+    """
+    Adds noise to every image of a stacked batch with per-sample noise intensities.
+
+    Parameters
+    ----------
+    images : np.ndarray
+        Batch of images as an (N, H, W) or (N, H, W, C) NumPy array of dtype uint8,
+        float32 or float64, with the same value conventions as `noise`.
+    noise_type : str, optional
+        Type of noise to add: 'gaussian', 'salt_and_pepper' or 'poisson'. Default is 'gaussian'.
+    noise_intensities : float or Sequence[float], optional
+        Noise intensity for the whole batch or one per image, interpreted as in `noise`.
+        Default is 0.05.
+    scale : float, optional
+        Scaling factor for Poisson noise. Must be positive. If not provided, defaults to 1.0.
+    out : np.ndarray, optional
+        Preallocated array with the shape and dtype of `images` to write the result into.
+    inplace : bool, optional
+        If True, the noise is added to `images` itself. Default is False.
+    rng : np.random.Generator or int, optional
+        Random generator to draw from, or a seed for a new one, as in `noise`.
+
+    Returns
+    -------
+    np.ndarray
+        Batch with added noise, with the same shape and dtype as the input.
+
+    Raises
+    ------
+    TypeError
+        If `images` is not a NumPy array or if parameters are of incorrect types.
+    ValueError
+        If the batch has invalid dimensions or dtype, or if the noise parameters are invalid.
+
+    Notes
+    -----
+    All random values for the batch are drawn in a single call. For 'salt_and_pepper',
+    each pixel is independently set to salt or pepper with probability
+    `noise_intensity / 2`, so the number of affected pixels per image follows a
+    binomial distribution around the exact count used by `noise`.
+
+    Examples
+    --------
+    >>> batch = np.random.rand(16, 128, 128).astype(np.float32)
+    >>> noisy = noise_batch(batch, 'gaussian', noise_intensities=np.linspace(0, 0.1, 16))
+    """
+    _validate_batch(images)
+    n = images.shape[0]
+
+    supported_dtypes = {np.uint8, np.float32, np.float64}
+    if images.dtype.type not in supported_dtypes:
+        raise ValueError(f"Unsupported image data type: {images.dtype.type}. Supported types are: {supported_dtypes}.")
+
+    supported_noise_types = {'gaussian', 'salt_and_pepper', 'poisson'}
+    if not isinstance(noise_type, str):
+        raise TypeError(f"'noise_type' must be a string, but got {type(noise_type).__name__}.")
+    if noise_type not in supported_noise_types:
+        raise ValueError(f"Unsupported noise type '{noise_type}'. Supported types are: {supported_noise_types}.")
+
+    noise_intensities = _per_sample(noise_intensities, n, 'noise_intensities')
+    if np.any(noise_intensities < 0):
+        raise ValueError("'noise_intensities' must all be non-negative.")
+    if noise_type == 'salt_and_pepper' and np.any(noise_intensities > 1):
+        raise ValueError("For 'salt_and_pepper' noise, 'noise_intensities' must be between 0 and 1.")
+
+    dtype = images.dtype.type
+    if dtype == np.uint8:
+        min_val, max_val = 0, 255
+    else:
+        min_val, max_val = 0.0, 1.0
+
+    out = _resolve_out(images, out, inplace)
+    if out is not None:
+        _check_out(out, images.shape, images.dtype)
+    rng = get_rng(rng)
+
+    # Gaussian Noise
+    if noise_type == 'gaussian':
+        work_dtype = _work_dtype(dtype)
+        with _random_field(images.shape, work_dtype, rng.standard_normal) as gauss:
+            gauss *= _expand(noise_intensities, images.ndim)
+            noisy_images = _add_noise(images, gauss, out, reuse=work_dtype == np.float64)
+        np.clip(noisy_images, min_val, max_val, out=noisy_images)
+        return noisy_images
+
+    # Salt-and-Pepper Noise
+    elif noise_type == 'salt_and_pepper':
+        noisy_images = images.copy() if out is None else _store(images, out)
+        half = _expand(noise_intensities * 0.5, images.ndim)
+        with _random_field(images.shape, _work_dtype(dtype), rng.random) as draws:
+            noisy_images[draws < half] = max_val
+            noisy_images[(draws >= half) & (draws < 2 * half)] = min_val
+        return noisy_images
+
+    # Poisson Noise
+    else:
+        if scale is None:
+            scale = 1.0
+        elif not isinstance(scale, (int, float)):
+            raise TypeError(f"'scale' must be a float, but got {type(scale).__name__}.")
+        if scale <= 0:
+            raise ValueError(f"'scale' must be positive, but got {scale}.")
+
+        factors = _expand(noise_intensities * scale, images.ndim)
+        scaled_images = images.astype(_work_dtype(dtype)) * factors
+        if np.any(scaled_images < 0):
+            raise ValueError("Scaled image contains negative values, which are not allowed for Poisson noise.")
+
+        # Samples with zero intensity are returned unchanged, as in `noise`
+        active = factors > 0
+        safe_factors = np.where(active, factors, 1.0)
+        noisy_images = rng.poisson(scaled_images).astype(_work_dtype(dtype))
+        noisy_images /= safe_factors
+        np.copyto(noisy_images, images, where=~active)
+        np.clip(noisy_images, min_val, max_val, out=noisy_images)
+
+        if dtype == np.uint8:
+            np.round(noisy_images, out=noisy_images)
+        if out is None:
+            return noisy_images.astype(dtype, copy=False)
+        np.copyto(out, noisy_images, casting='unsafe')
+        return out
@@ -0,0 +1,218 @@
+import numpy as np
+from typing import Any, Optional, Tuple, Union
+
+from ..instrument import instrumented
+from .crop import crop
+
+
+def _pair(value: Any, name: str, minimum: int = 1) -> Tuple[int, int]:
+    """Resolve an int or an (height, width) pair of ints into a pair."""
+    pair = (value, value) if isinstance(value, (int, np.integer)) else value
+    if not (isinstance(pair, tuple) and len(pair) == 2 and
+            all(isinstance(v, (int, np.integer)) and v >= minimum for v in pair)):
+        raise ValueError(f"'{name}' must be an integer or a pair of integers >= {minimum}, but got {value}.")
+    return int(pair[0]), int(pair[1])
+
+
+def _validate_image(image: np.ndarray) -> None:
+    if not isinstance(image, np.ndarray):
+        raise TypeError(f"Expected 'image' to be a NumPy array, but got {type(image).__name__}.")
+    if image.ndim not in [2, 3]:
+        raise ValueError(f"Input image must be 2D or 3D, but got {image.ndim}D.")
+
+
+def _grid_count(length: int, patch: int, stride: int, pad: bool) -> int:
+    """Number of patch positions along an axis; with `pad`, enough to cover the whole axis."""
+    if pad:
+        return max(-(-(length - patch) // stride), 0) + 1
+    return (length - patch) // stride + 1
+
+
+@instrumented
+def extract_patches(
+    image: np.ndarray,
+    patch_size: Union[int, Tuple[int, int]],
+    stride: Optional[Union[int, Tuple[int, int]]] = None,
+    *,
+    pad: bool = False,
+    pad_value: Tuple[int, ...] = (0,),
+    contiguous: bool = False
+) -> np.ndarray:
+    """
+    Extract a regular grid of patches, e.g. for patch-based training or sliding-window inference.
+
+    Patches start every `stride` pixels, so `stride` equal to `patch_size` gives a
+    non-overlapping grid, a smaller stride overlapping patches (overlap is `patch_size -
+    stride`) and a stride of 1 every sliding-window position. All patches are returned as
+    one strided view of `image`: no pixel is copied, however many patches there are.
+
+    Parameters:
+    ----------
+    image : np.ndarray
+        Input image as a 2D (grayscale) or 3D (color) NumPy array.
+    patch_size : int or Tuple[int, int]
+        Patch (height, width), or one size for both.
+    stride : int or Tuple[int, int], optional
+        Step between patches along (rows, columns), or one step for both. Defaults to
+        `patch_size`.
+    pad : bool, optional
+        If False, only patches fully inside the image are returned; a remainder at the
+        bottom/right that is smaller than a stride is left out. If True, the image is
+        padded at the bottom/right with `pad_value` so that the patches cover all of it,
+        which copies the image once. Defaults to False.
+    pad_value : int or Tuple[int, ...], optional
+        Padding value per channel, as in `crop`; a single value (or a 1-tuple) pads every
+        channel. Defaults to (0,).
+    contiguous : bool, optional
+        If True, the patches are copied into a new C-contiguous array, which can then be
+        reshaped into an (N, ph, pw[, C]) batch without another copy. Defaults to False.
+
+    Returns:
+    -------
+    np.ndarray
+        Array of shape (rows, cols, ph, pw[, C]) whose entry [i, j] is the patch at
+        (i * stride[0], j * stride[1]). Unless `contiguous` is True it is a read-only view
+        (patches may overlap); `reshape(-1, ph, pw[, C])` of a view copies.
+
+    Raises:
+    ------
+    TypeError
+        If the input image is not a NumPy array.
+    ValueError
+        If the image is not 2D or 3D, `patch_size` or `stride` are invalid, or the patch
+        is larger than the image and `pad` is False.
+    """
+    _validate_image(image)
+    patch_height, patch_width = _pair(patch_size, 'patch_size')
+    stride_y, stride_x = _pair(patch_size if stride is None else stride, 'stride')
+    height, width = image.shape[:2]
+    if not pad and (patch_height > height or patch_width > width):
+        raise ValueError(f"Patch size {(patch_height, patch_width)} exceeds image dimensions {(height, width)}; "
+                         f"set pad=True to pad the image.")
+
+    rows = _grid_count(height, patch_height, stride_y, pad)
+    cols = _grid_count(width, patch_width, stride_x, pad)
+    covered_height = (rows - 1) * stride_y + patch_height
+    covered_width = (cols - 1) * stride_x + patch_width
+    if covered_height > height or covered_width > width:
+        if image.ndim == 3:
+            # A single value pads every channel
+            if not isinstance(pad_value, tuple):
+                pad_value = (pad_value,)
+            if len(pad_value) == 1:
+                pad_value = pad_value * image.shape[2]
+        # The only copy of the view path: one padded image shared by all patches
+        image = crop(image, 0, 0, covered_height, covered_width, adjust_if_exceeds=True, pad_value=pad_value)
+
+    # (rows, cols, ph, pw[, C]) view: the grid steps by the strides, the patches by pixels
+    strides = image.strides
+    patches = np.lib.stride_tricks.as_strided(
+        image,
+        shape=(rows, cols, patch_height, patch_width) + image.shape[2:],
+        strides=(strides[0] * stride_y, strides[1] * stride_x) + strides,
+        writeable=False
+    )
+    return np.ascontiguousarray(patches) if contiguous else patches
+
+
+def _n_crop_views(image: np.ndarray, size: Tuple[int, int]) -> Tuple[np.ndarray, ...]:
+    height, width = image.shape[:2]
+    crop_height, crop_width = size
+    if crop_height > height or crop_width > width:
+        raise ValueError(f"Crop size {size} exceeds image dimensions {(height, width)}.")
+    top, left = (height - crop_height) // 2, (width - crop_width) // 2
+    return (image[:crop_height, :crop_width],
+            image[:crop_height, width - crop_width:],
+            image[height - crop_height:, :crop_width],
+            image[height - crop_height:, width - crop_width:],
+            image[top:top + crop_height, left:left + crop_width])
+
+
+def _gather(views: Tuple[np.ndarray, ...], contiguous: bool) -> Union[Tuple[np.ndarray, ...], np.ndarray]:
+    if not contiguous:
+        return views
+    stacked = np.empty((len(views),) + views[0].shape, dtype=views[0].dtype)
+    for target, view in zip(stacked, views):
+        target[...] = view
+    return stacked
+
+
+@instrumented
+def five_crop(
+    image: np.ndarray,
+    size: Union[int, Tuple[int, int]],
+    *,
+    contiguous: bool = False
+) -> Union[Tuple[np.ndarray, ...], np.ndarray]:
+    """
+    Crop the four corners and the center of an image.
+
+    Parameters:
+    ----------
+    image : np.ndarray
+        Input image as a 2D (grayscale) or 3D (color) NumPy array.
+    size : int or Tuple[int, int]
+        Crop (height, width), or one size for both.
+    contiguous : bool, optional
+        If True, the crops are copied into one new (5, height, width[, C]) array.
+        Defaults to False.
+
+    Returns:
+    -------
+    Tuple[np.ndarray, ...] or np.ndarray
+        The top-left, top-right, bottom-left, bottom-right and center crops, as views of
+        `image` (writing to them modifies `image`), or stacked if `contiguous` is True.
+
+    Raises:
+    ------
+    TypeError
+        If the input image is not a NumPy array.
+    ValueError
+        If the image is not 2D or 3D, or `size` is invalid or larger than the image.
+    """
+    _validate_image(image)
+    return _gather(_n_crop_views(image, _pair(size, 'size')), contiguous)
+
+
+@instrumented
+def ten_crop(
+    image: np.ndarray,
+    size: Union[int, Tuple[int, int]],
+    *,
+    vertical: bool = False,
+    contiguous: bool = False
+) -> Union[Tuple[np.ndarray, ...], np.ndarray]:
+    """
+    Return the `five_crop` crops of an image followed by those of its flipped copy.
+
+    Flipped crops are negative-stride views, so the ten crops still copy no pixel.
+
+    Parameters:
+    ----------
+    image : np.ndarray
+        Input image as a 2D (grayscale) or 3D (color) NumPy array.
+    size : int or Tuple[int, int]
+        Crop (height, width), or one size for both.
+    vertical : bool, optional
+        If True, flip the image vertically instead of horizontally. Defaults to False.
+    contiguous : bool, optional
+        If True, the crops are copied into one new (10, height, width[, C]) array.
+        Defaults to False.
+
+    Returns:
+    -------
+    Tuple[np.ndarray, ...] or np.ndarray
+        The five crops of `image`, then the five crops of the flipped image (each in the
+        `five_crop` order), as views of `image` or stacked if `contiguous` is True.
+
+    Raises:
+    ------
+    TypeError
+        If the input image is not a NumPy array.
+    ValueError
+        If the image is not 2D or 3D, or `size` is invalid or larger than the image.
+    """
+    _validate_image(image)
+    size = _pair(size, 'size')
+    flipped = image[::-1] if vertical else image[:, ::-1]
+    return _gather(_n_crop_views(image, size) + _n_crop_views(flipped, size), contiguous)
@@ -0,0 +1,183 @@
+import numpy as np
+import cv2
+from typing import Any, Optional, Sequence, Tuple
+
+from ..instrument import instrumented
+from ..rng import get_rng
+from ._opencv import _resize
+from ._utils import _validate_batch, _check_out
+
+# Boxes drawn per image before falling back to a centered crop of the whole image
+_ATTEMPTS = 10
+
+
+def _validate_box_ranges(size: Any, scale: Sequence[float], ratio: Sequence[float]) -> None:
+    if not (isinstance(size, tuple) and len(size) == 2 and all(isinstance(s, int) and s > 0 for s in size)):
+        raise ValueError(f"'size' must be a tuple of two positive integers (height, width), but got {size}.")
+    if not (len(scale) == 2 and 0 < scale[0] <= scale[1] <= 1):
+        raise ValueError(f"'scale' must be an increasing pair of area fractions in (0, 1], but got {scale}.")
+    if not (len(ratio) == 2 and 0 < ratio[0] <= ratio[1]):
+        raise ValueError(f"'ratio' must be an increasing pair of positive aspect ratios, but got {ratio}.")
+
+
+def _sample_boxes(rng: np.random.Generator, n: int, height: int, width: int,
+                  scale: Sequence[float], ratio: Sequence[float]) -> np.ndarray:
+    """
+    Draw one crop box (top, left, height, width) per image, as an (n, 4) integer array.
+
+    Every random number comes from a single call: `_ATTEMPTS` candidate boxes per image,
+    each with an area fraction, a log-uniform aspect ratio (width / height) and a
+    position. The first candidate that fits the image is used; images without one get a
+    centered crop of the whole image, clamped to `ratio`.
+    """
+    draws = rng.random((n, _ATTEMPTS, 4))
+    area = height * width * (scale[0] + (scale[1] - scale[0]) * draws[..., 0])
+    log_ratio = np.log(ratio[0]) + (np.log(ratio[1]) - np.log(ratio[0])) * draws[..., 1]
+    aspect = np.exp(log_ratio)
+    box_widths = np.rint(np.sqrt(area * aspect)).astype(np.int64)
+    box_heights = np.rint(np.sqrt(area / aspect)).astype(np.int64)
+    fits = (box_widths >= 1) & (box_widths <= width) & (box_heights >= 1) & (box_heights <= height)
+
+    # Centered fallback
+    aspect = width / height
+    if aspect < ratio[0]:
+        fallback_width, fallback_height = width, int(round(width / ratio[0]))
+    elif aspect > ratio[1]:
+        fallback_width, fallback_height = int(round(height * ratio[1])), height
+    else:
+        fallback_width, fallback_height = width, height
+
+    boxes = np.empty((n, 4), dtype=np.int64)
+    attempt = np.argmax(fits, axis=1)
+    samples = np.arange(n)
+    found = fits[samples, attempt]
+    box_heights = np.where(found, box_heights[samples, attempt], fallback_height)
+    box_widths = np.where(found, box_widths[samples, attempt], fallback_width)
+    # Uniform over the positions that keep the box inside the image
+    tops = np.minimum((draws[samples, attempt, 2] * (height - box_heights + 1)).astype(np.int64), height - box_heights)
+    lefts = np.minimum((draws[samples, attempt, 3] * (width - box_widths + 1)).astype(np.int64), width - box_widths)
+    boxes[:, 0] = np.where(found, tops, (height - box_heights) // 2)
+    boxes[:, 1] = np.where(found, lefts, (width - box_widths) // 2)
+    boxes[:, 2] = box_heights
+    boxes[:, 3] = box_widths
+    return boxes
+
+
+def _resize_box(image: np.ndarray, box: np.ndarray, size: Tuple[int, int], interpolation: int,
+                out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Resize the region `box` of `image` to `size`, reading only that region, into `out` if given."""
+    top, left, box_height, box_width = (int(value) for value in box)
+    # A view of the region: OpenCV reads it in place through its row stride
+    region = image[top:top + box_height, left:left + box_width]
+    return _resize(region, (size[1], size[0]), interpolation, dst=out)
+
+
+@instrumented
+def random_resized_crop(
+    image: np.ndarray,
+    size: Tuple[int, int],
+    scale: Tuple[float, float] = (0.08, 1.0),
+    ratio: Tuple[float, float] = (3 / 4, 4 / 3),
+    interpolation: int = cv2.INTER_LINEAR,
+    out: Optional[np.ndarray] = None,
+    rng: Any = None
+) -> np.ndarray:
+    """
+    Crop a random region of an image and resize it to a fixed size.
+
+    The region covers a random fraction `scale` of the image area with a random aspect
+    ratio (width / height) from `ratio`, drawn log-uniformly, at a random position. If
+    no such region fits after ten draws, the whole image is used, cropped at the center
+    to the closest ratio in range. The region is resized straight from the input into
+    the output with one `cv2.resize` call (into `out` itself if it is C-contiguous): it is
+    never copied, and nothing outside it is read.
+
+    Parameters:
+    ----------
+    image : np.ndarray
+        Input image as a 2D (grayscale) or 3D (color) NumPy array.
+    size : Tuple[int, int]
+        Output (height, width).
+    scale : Tuple[float, float], optional
+        Range of the region area as a fraction of the image area. Defaults to (0.08, 1.0).
+    ratio : Tuple[float, float], optional
+        Range of the region aspect ratio (width / height). Defaults to (3/4, 4/3).
+    interpolation : int, optional
+        OpenCV interpolation flag. Defaults to cv2.INTER_LINEAR.
+    out : np.ndarray, optional
+        Preallocated array of shape (height, width[, C]) and the input dtype to write the
+        result into. Defaults to None (a new array is returned).
+    rng : np.random.Generator, int or None, optional
+        Random generator to draw the region from, or a seed for a new one. If None, the
+        generator activated with `anaug.use_rng`, or else NumPy's global random state, is used.
+
+    Returns:
+    -------
+    np.ndarray
+        Image of shape (height, width[, C]) with the input dtype (`out` if it was given).
+
+    Raises:
+    ------
+    TypeError
+        If the input image is not a NumPy array.
+    ValueError
+        If the image is not 2D or 3D, or `size`, `scale` or `ratio` are invalid.
+    """
+    if not isinstance(image, np.ndarray):
+        raise TypeError(f"Expected 'image' to be a NumPy array, but got {type(image).__name__}.")
+    if image.ndim not in [2, 3] or image.shape[0] == 0 or image.shape[1] == 0:
+        raise ValueError(f"Input image must be a non-empty 2D or 3D array, but got shape {image.shape}.")
+    _validate_box_ranges(size, scale, ratio)
+    if out is not None:
+        _check_out(out, size + image.shape[2:], image.dtype)
+
+    box = _sample_boxes(get_rng(rng), 1, image.shape[0], image.shape[1], scale, ratio)[0]
+    return _resize_box(image, box, size, interpolation, out)
+
+
+@instrumented
+def random_resized_crop_batch(
+    images: np.ndarray,
+    size: Tuple[int, int],
+    scale: Tuple[float, float] = (0.08, 1.0),
+    ratio: Tuple[float, float] = (3 / 4, 4 / 3),
+    interpolation: int = cv2.INTER_LINEAR,
+    out: Optional[np.ndarray] = None,
+    rng: Any = None
+) -> np.ndarray:
+    """
+    Apply `random_resized_crop` to every image of a stacked batch, each with its own region.
+
+    The regions of all images are drawn with one vectorized call to the random generator;
+    with the same generator state, image 0 gets the region that `random_resized_crop`
+    would draw. Each region is then resized straight into its slot of the output, which
+    OpenCV writes in place when the output is C-contiguous (a new output always is).
+
+    Parameters:
+    ----------
+    images : np.ndarray
+        Batch of images as an (N, H, W) or (N, H, W, C) NumPy array.
+    size, scale, ratio, interpolation :
+        As in `random_resized_crop`.
+    out : np.ndarray, optional
+        Preallocated array of shape (N, height, width[, C]) and the input dtype to write
+        the results into. Defaults to None (a new array is returned).
+    rng : np.random.Generator, int or None, optional
+        As in `random_resized_crop`.
+
+    Returns:
+    -------
+    np.ndarray
+        Batch of shape (N, height, width[, C]) with the input dtype (`out` if it was given).
+    """
+    _validate_batch(images)
+    _validate_box_ranges(size, scale, ratio)
+    n = images.shape[0]
+    if out is not None:
+        _check_out(out, (n,) + size + images.shape[3:], images.dtype)
+    result = np.empty((n,) + size + images.shape[3:], dtype=images.dtype) if out is None else out
+
+    boxes = _sample_boxes(get_rng(rng), n, images.shape[1], images.shape[2], scale, ratio)
+    for image, box, target in zip(images, boxes, result):
+        _resize_box(image, box, size, interpolation, target)
+    return result
@@ -1,7 +1,13 @@
 import numpy as np
 import cv2
 
-def random_rotation(image, angle_range=(-30, 30), center=None, scale=1.0, border_mode=cv2.BORDER_REFLECT):
+from ..instrument import instrumented
+from ..rng import get_rng
+from ._utils import _check_out, _store, _cv2_dst
+
+@instrumented
+def random_rotation(image, angle_range=(-30, 30), center=None, scale=1.0, border_mode=cv2.BORDER_REFLECT, out=None,
+                    rng=None):
     """
     Applies a random rotation to the image within the specified angle range.
     
@@ -11,9 +17,13 @@ def random_rotation(image, angle_range=(-30, 30), center=None, scale=1.0, border
     - center (tuple or None): The point around which to rotate the image. If None, the image center is used.
     - scale (float): Scaling factor applied during the rotation. Default is 1.0 (no scaling).
     - border_mode (int): Pixel extrapolation method for areas outside the image. Default is cv2.BORDER_REFLECT.
+    - out (np.array or None): Preallocated array with the shape and dtype of the input to write the result into.
+      If None, a new array is returned.
+    - rng (np.random.Generator, int or None): Random generator to draw the angle from, or a seed for a new one.
+      If None, the generator activated with `anaug.use_rng`, or else NumPy's global random state, is used.
 
     Returns:
-    - np.array: Rotated image with the same shape as input.
+    - np.array: Rotated image with the same shape as input (`out` if it was given).
 
     Raises:
     - TypeError: If the input image is not a numpy array.
@@ -28,8 +38,11 @@ def random_rotation(image, angle_range=(-30, 30), center=None, scale=1.0, border
             all(isinstance(a, (int, float)) for a in angle_range)):
         raise ValueError("angle_range must be a tuple of two numeric values.")
 
+    if out is not None:
+        _check_out(out, image.shape, image.dtype)
+
     # Randomly select an angle within the specified range
-    angle = np.random.uniform(angle_range[0], angle_range[1])
+    angle = get_rng(rng).uniform(angle_range[0], angle_range[1])
 
     # Get the image dimensions and calculate the center
     h, w = image.shape[:2]
@@ -40,5 +53,5 @@ def random_rotation(image, angle_range=(-30, 30), center=None, scale=1.0, border
     rotation_matrix = cv2.getRotationMatrix2D(center, angle, scale=scale)
 
     # Apply rotation
-    rotated_image = cv2.warpAffine(image, rotation_matrix, (w, h), borderMode=border_mode)
-    return rotated_image
\ No newline at end of file
+    rotated_image = cv2.warpAffine(image, rotation_matrix, (w, h), dst=_cv2_dst(out), borderMode=border_mode)
+    return _store(rotated_image, out)
\ No newline at end of file
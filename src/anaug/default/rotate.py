@@ -1,7 +1,12 @@
 import cv2
 import numpy as np
 
-def rotate(image, angle, mode='nearest', center=None):
+from ..instrument import instrumented
+from ._opencv import _warp_affine
+from ._utils import _validate_batch, _per_sample, _stack_channels, _unstack_channels, _check_out, _store
+
+@instrumented
+def rotate(image, angle, mode='nearest', center=None, out=None):
     """
     Rotate the image by the specified angle around a given center.
     
@@ -11,9 +16,11 @@ def rotate(image, angle, mode='nearest', center=None):
     - mode (str): Points outside the boundaries of the input are filled according to the given mode
                   ('constant', 'nearest', 'mirror', or 'wrap').
     - center (tuple or None): The point around which to rotate the image. If None, the image center is used.
+    - out (np.ndarray or None): Preallocated array with the shape and dtype of the rotated image to write
+                                the result into. If None, a new array is returned.
     
     Returns:
-    - np.ndarray: Rotated image.
+    - np.ndarray: Rotated image (`out` if it was given).
     
     Raises:
     - TypeError: If the input image is not a numpy array.
@@ -39,12 +46,18 @@ def rotate(image, angle, mode='nearest', center=None):
     # Handle rotations that are multiples of 90 degrees
     if angle % 90 == 0:
         k = int(angle / 90) % 4
-        return np.rot90(image, k=k, axes=(0, 1))
+        rotated_image = np.rot90(image, k=k, axes=(0, 1))
+        if out is not None:
+            _check_out(out, rotated_image.shape, image.dtype)
+            return _store(rotated_image, out)
+        return rotated_image
 
     # Define center
     h, w = image.shape[:2]
     if center is None:
         center = (w / 2, h / 2)
+    if out is not None:
+        _check_out(out, image.shape, image.dtype)
 
     # Map mode to OpenCV border modes
     cv2_border_modes = {
@@ -58,12 +71,75 @@ def rotate(image, angle, mode='nearest', center=None):
     # Compute the rotation matrix
     rotation_matrix = cv2.getRotationMatrix2D(center, angle, scale=1.0)
 
-    # Apply the rotation
-    if image.ndim == 3:  # Multi-channel image
-        rotated_channels = [cv2.warpAffine(image[..., i], rotation_matrix, (w, h), borderMode=border_mode)
-                            for i in range(image.shape[2])]
-        rotated_image = np.stack(rotated_channels, axis=-1)
-    else:  # Grayscale image
-        rotated_image = cv2.warpAffine(image, rotation_matrix, (w, h), borderMode=border_mode)
+    # Apply the rotation; multi-channel images are warped chunk by chunk straight into `out`
+    return _warp_affine(image, rotation_matrix, (w, h), cv2.INTER_LINEAR, border_mode, dst=out)
+
+@instrumented
+def rotate_batch(images, angles, mode='nearest', center=None, out=None):
+    """
+    Rotate every image of a stacked batch by its own angle.
+
+    Images that share an angle are rotated together: the batch axis is folded into the
+    channel axis so the whole group goes through a single `cv2.warpAffine` call.
+
+    Parameters:
+    - images (np.ndarray): Batch of images as an (N, H, W) or (N, H, W, C) numpy array.
+    - angles (float or sequence): Rotation angle in degrees for the whole batch or one per image.
+    - mode (str): Points outside the boundaries of the input are filled according to the given mode
+                  ('constant', 'nearest', 'mirror', or 'wrap').
+    - center (tuple or None): The point around which to rotate the images. If None, the image center is used.
+    - out (np.ndarray or None): Preallocated array with the shape and dtype of the rotated batch to write
+                                the result into. If None, a new array is returned.
+
+    Returns:
+    - np.ndarray: Batch of rotated images.
+
+    Raises:
+    - TypeError: If the input batch is not a numpy array.
+    - ValueError: If the batch has invalid dimensions, the mode is invalid, or the angles would
+                  produce images of different shapes (quarter turns of non-square images).
+    """
+    _validate_batch(images)
+    n = images.shape[0]
+    angles = _per_sample(angles, n, 'angles')
+
+    valid_modes = ['constant', 'nearest', 'mirror', 'wrap']
+    if mode not in valid_modes:
+        raise ValueError(f"Invalid mode '{mode}'. Supported modes are: {valid_modes}")
+
+    cv2_border_modes = {
+        'constant': cv2.BORDER_CONSTANT,
+        'nearest': cv2.BORDER_REPLICATE,
+        'mirror': cv2.BORDER_REFLECT,
+        'wrap': cv2.BORDER_WRAP
+    }
+    border_mode = cv2_border_modes[mode]
+
+    h, w = images.shape[1:3]
+    if center is None:
+        center = (w / 2, h / 2)
+
+    rotated = {}
+    for angle in np.unique(angles):
+        group = np.flatnonzero(angles == angle)
+        if angle % 90 == 0:
+            k = int(angle / 90) % 4
+            rotated[angle] = (group, np.rot90(images[group], k=k, axes=(1, 2)))
+        else:
+            rotation_matrix = cv2.getRotationMatrix2D(center, float(angle), scale=1.0)
+            stacked = _warp_affine(_stack_channels(images[group]), rotation_matrix, (w, h),
+                                   cv2.INTER_LINEAR, border_mode)
+            rotated[angle] = (group, _unstack_channels(stacked, len(group), images.shape[3:]))
+
+    shapes = {result.shape[1:] for _, result in rotated.values()}
+    if len(shapes) != 1:
+        raise ValueError("Angles produce rotated images of different shapes; quarter turns of "
+                         "non-square images cannot be mixed with other angles in one batch.")
 
-    return rotated_image
\ No newline at end of file
+    shape = (n,) + shapes.pop()
+    if out is not None:
+        _check_out(out, shape, images.dtype)
+    rotated_images = np.empty(shape, dtype=images.dtype) if out is None else out
+    for group, result in rotated.values():
+        rotated_images[group] = result
+    return rotated_images
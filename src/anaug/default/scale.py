@@ -1,6 +1,12 @@
 import cv2
+import numpy as np
 
-def scale(image, scale_factor, max_dimension=10000):
+from ..instrument import instrumented
+from ._opencv import _resize
+from ._utils import _validate_batch, _per_sample, _stack_channels, _unstack_channels, _check_out, _cv2_dst
+
+@instrumented
+def scale(image, scale_factor, max_dimension=10000, out=None):
     """
     Scale an image by a given factor.
 
@@ -8,9 +14,11 @@ def scale(image, scale_factor, max_dimension=10000):
         image (numpy.ndarray): Input image to be scaled.
         scale_factor (float): Factor to scale the image. Must be > 0.
         max_dimension (int): Maximum allowable dimension for the scaled image. Default is 10000.
+        out (numpy.ndarray, optional): Preallocated array of the scaled shape and the input dtype to
+            write the result into. If None, a new array is returned.
 
     Returns:
-        numpy.ndarray: Scaled image with adjusted dimensions.
+        numpy.ndarray: Scaled image with adjusted dimensions (`out` if it was given).
 
     Raises:
         ValueError: If scale_factor is <= 0, input image is empty, or resulting dimensions exceed the allowable limit.
@@ -32,5 +40,81 @@ def scale(image, scale_factor, max_dimension=10000):
     if new_width > max_dimension or new_height > max_dimension:
         raise ValueError(f"Scaled dimensions ({new_width}x{new_height}) exceed the allowable limit of {max_dimension} pixels.")
 
-    # Resize using OpenCV
-    return cv2.resize(image, (new_width, new_height), interpolation=cv2.INTER_LINEAR)
+    if out is None:
+        # Resize using OpenCV
+        return cv2.resize(image, (new_width, new_height), interpolation=cv2.INTER_LINEAR)
+
+    _check_out(out, (new_height, new_width) + image.shape[2:], image.dtype)
+    resized = cv2.resize(image, (new_width, new_height), dst=_cv2_dst(out), interpolation=cv2.INTER_LINEAR)
+    if resized is not out:
+        # OpenCV drops a trailing singleton channel axis
+        np.copyto(out, resized.reshape(out.shape))
+    return out
+
+
+@instrumented
+def scale_batch(images, scale_factors, max_dimension=10000, out=None):
+    """
+    Scale every image of a stacked batch by its own factor.
+
+    Images that share a scale factor are resized together: the batch axis is folded into
+    the channel axis so the whole group goes through a single `cv2.resize` call.
+
+    Args:
+        images (numpy.ndarray): Batch of images as an (N, H, W) or (N, H, W, C) array.
+        scale_factors (float or sequence): Scale factor for the whole batch or one per image. Must be > 0.
+        max_dimension (int): Maximum allowable dimension for the scaled images. Default is 10000.
+        out (numpy.ndarray, optional): Preallocated array of the scaled batch shape and the input dtype
+            to write the result into. Only valid when all images end up with the same size. If None,
+            a new array (or list) is returned.
+
+    Returns:
+        numpy.ndarray or list: Stacked batch of scaled images (`out` if it was given) if all images end
+        up with the same size. Otherwise a plain Python list of the N scaled images in input order,
+        each an (H_i, W_i) or (H_i, W_i, C) array.
+
+    Raises:
+        ValueError: If a scale factor is <= 0, the batch is invalid, resulting dimensions exceed the
+            allowable limit, or `out` is given for images of different sizes or does not match the batch.
+    """
+    _validate_batch(images)
+    n = images.shape[0]
+    scale_factors = _per_sample(scale_factors, n, 'scale_factors')
+    if np.any(scale_factors <= 0):
+        raise ValueError("Scale factors must be greater than zero.")
+
+    height, width = images.shape[1:3]
+    sizes = {}
+    for factor in np.unique(scale_factors):
+        new_width = int(width * factor)
+        new_height = int(height * factor)
+
+        if new_width == 0 or new_height == 0:
+            raise ValueError("Scaled dimensions are invalid (resulting in zero size).")
+        if new_width > max_dimension or new_height > max_dimension:
+            raise ValueError(f"Scaled dimensions ({new_width}x{new_height}) exceed the allowable limit of {max_dimension} pixels.")
+        sizes[factor] = (new_width, new_height)
+
+    if len(set(sizes.values())) != 1:
+        if out is not None:
+            raise ValueError("`out` can only be used when all images are scaled to the same size.")
+        scaled = [None] * n
+    else:
+        new_width, new_height = next(iter(sizes.values()))
+        shape = (n, new_height, new_width) + images.shape[3:]
+        if out is not None:
+            _check_out(out, shape, images.dtype)
+        scaled = np.empty(shape, dtype=images.dtype) if out is None else out
+
+    for factor, size in sizes.items():
+        group = np.flatnonzero(scale_factors == factor)
+        resized = _resize(_stack_channels(images[group]), size, cv2.INTER_LINEAR)
+        resized = _unstack_channels(resized, len(group), images.shape[3:])
+        if isinstance(scaled, list):
+            for index, image in zip(group, resized):
+                scaled[index] = image
+        elif len(group) == n:
+            np.copyto(scaled, resized)
+        else:
+            scaled[group] = resized
+    return scaled
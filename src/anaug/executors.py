@@ -0,0 +1,541 @@
+"""
+Parallel Execution Module
+
+This module runs augmentation pipelines over batches of images in parallel.
+
+Classes:
+- SharedMemoryExecutor: Runs a pipeline in worker processes that read inputs from and
+  write results into a ring of preallocated `multiprocessing.shared_memory` batch slots,
+  so no image is ever pickled between processes.
+- ThreadExecutor: Fans samples out to a thread pool. OpenCV and SciPy release the GIL
+  inside `cv2.warpAffine`, `cv2.resize`, `cv2.filter2D` and `scipy.ndimage` filters, so
+  pipelines dominated by those ops scale across cores without any serialization.
+
+Usage Examples:
+------------
+>>> import numpy as np
+>>> from anaug import Compose, SharedMemoryExecutor
+>>> from anaug.default import flip, noise
+>>> pipeline = Compose([(flip, {'axes': 'horizontal'}), (noise, {'noise_intensity': 0.05})])
+>>> batches = (np.random.rand(32, 128, 128).astype(np.float32) for _ in range(100))
+>>> with SharedMemoryExecutor(pipeline, input_shape=(128, 128), batch_size=32, seed=0) as executor:
+...     for augmented in executor.imap(batches):
+...         train_step(augmented)  # zero-copy view, valid until the next batch is requested
+
+>>> from anaug import ThreadExecutor
+>>> with ThreadExecutor(pipeline, num_threads=8) as executor:
+...     augmented = executor.map(np.random.rand(256, 128, 128).astype(np.float32))
+...     print(executor.stats()['utilization'])
+"""
+
+import multiprocessing
+import queue
+import threading
+import time
+import traceback
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .instrument import _init_worker, _take_metrics, _worker_state, add_metrics
+from .rng import stream_rng, use_rng
+
+# `cv2.setNumThreads` is process-global, so open `ThreadExecutor`s share one saved value
+_cv2_threads_lock = threading.Lock()
+_cv2_threads_users = 0
+_cv2_threads_saved = None
+
+
+def _acquire_cv2_threads(num_threads: int) -> None:
+    """Pin OpenCV's thread count, saving the original setting for the first user."""
+    global _cv2_threads_users, _cv2_threads_saved
+    # Imported here so that worker processes that never use threads do not load OpenCV
+    import cv2
+    with _cv2_threads_lock:
+        if _cv2_threads_users == 0:
+            _cv2_threads_saved = cv2.getNumThreads()
+        _cv2_threads_users += 1
+        cv2.setNumThreads(num_threads)
+
+
+def _release_cv2_threads() -> None:
+    """Restore OpenCV's original thread count once the last user is gone."""
+    global _cv2_threads_users, _cv2_threads_saved
+    import cv2
+    with _cv2_threads_lock:
+        _cv2_threads_users -= 1
+        if _cv2_threads_users == 0:
+            cv2.setNumThreads(_cv2_threads_saved)
+            _cv2_threads_saved = None
+
+
+def _shared_memory_worker(pipeline, input_spec, output_spec, entropy, task_queue, result_queue, instrument_state):
+    """Worker loop: run `pipeline` on input slots and write results into output slots."""
+    _init_worker(instrument_state)
+    # Child processes share the parent's resource tracker, so attaching here does not
+    # register a second owner; the parent alone unlinks the segments in `close`.
+    input_shm = shared_memory.SharedMemory(name=input_spec[0])
+    output_shm = shared_memory.SharedMemory(name=output_spec[0])
+    inputs = np.ndarray(input_spec[1], dtype=input_spec[2], buffer=input_shm.buf)
+    outputs = np.ndarray(output_spec[1], dtype=output_spec[2], buffer=output_shm.buf)
+
+    try:
+        while True:
+            task = task_queue.get()
+            if task is None:
+                break
+            slot, start, stop, first_sample = task
+            try:
+                for i in range(start, stop):
+                    # One stream per sample, not per worker, so results do not depend on scheduling
+                    with use_rng(stream_rng(entropy, first_sample + i)):
+                        result = pipeline(inputs[slot, i])
+                    if result.shape != outputs.shape[2:]:
+                        raise ValueError(f"Pipeline returned shape {result.shape}, "
+                                         f"expected {outputs.shape[2:]}.")
+                    outputs[slot, i] = result
+                result_queue.put((slot, stop - start, None, _take_metrics()))
+            except Exception:
+                result_queue.put((slot, stop - start, traceback.format_exc(), _take_metrics()))
+    finally:
+        del inputs, outputs
+        input_shm.close()
+        output_shm.close()
+
+
+class SharedMemoryExecutor:
+    """
+    Run an augmentation pipeline in worker processes with shared-memory batch transport.
+
+    Inputs and outputs live in a ring of `num_slots` preallocated batch slots in shared
+    memory. The parent copies each incoming batch into a free input slot, workers run the
+    pipeline on chunks of that slot and write straight into the matching output slot, and
+    the consumer receives a zero-copy view of the output slot.
+
+    Parameters
+    ----------
+    pipeline : Callable[[np.ndarray], np.ndarray]
+        Function applied to every image, e.g. a `Compose`. Must be picklable when the
+        multiprocessing start method is not 'fork'.
+    input_shape : Tuple[int, ...]
+        Shape of a single input image.
+    output_shape : Tuple[int, ...], optional
+        Shape of a single output image. Defaults to `input_shape`.
+    dtype : np.dtype, optional
+        Dtype of the input images. Default is np.float32.
+    output_dtype : np.dtype, optional
+        Dtype of the output images. Defaults to `dtype`.
+    batch_size : int, optional
+        Maximum number of images per batch. Default is 32.
+    num_slots : int, optional
+        Number of batch slots in the ring. At most `num_slots - 1` batches are prefetched
+        while the consumer holds the current one, which bounds memory and lets the
+        producer run at most that far ahead. Must be at least 2. Default is 4.
+    num_workers : int, optional
+        Number of worker processes. Defaults to `os.cpu_count()`.
+    seed : int, optional
+        Root seed. Every sample draws from its own stream `anaug.stream_rng(seed, sample index)`,
+        activated with `anaug.use_rng`, so results are reproducible and independent of the
+        number of workers. Custom pipeline steps should draw from `anaug.get_rng()` to take
+        part. If None, fresh entropy is used.
+    mp_context : str, optional
+        Multiprocessing start method ('fork', 'spawn', 'forkserver'). Defaults to the
+        platform default.
+
+    Notes
+    -----
+    A view returned by `imap` stays valid only until the next batch is requested; copy it
+    if it has to outlive the iteration step.
+
+    If instrumentation (`anaug.enable_instrumentation`) is enabled when the executor is
+    created, the workers record op metrics too and send them back with every finished
+    chunk; they are merged into the metrics of the parent process.
+    """
+
+    def __init__(
+        self,
+        pipeline: Callable[[np.ndarray], np.ndarray],
+        input_shape: Tuple[int, ...],
+        output_shape: Optional[Tuple[int, ...]] = None,
+        dtype: Any = np.float32,
+        output_dtype: Any = None,
+        batch_size: int = 32,
+        num_slots: int = 4,
+        num_workers: Optional[int] = None,
+        seed: Optional[int] = None,
+        mp_context: Optional[str] = None
+    ):
+        if not callable(pipeline):
+            raise TypeError(f"'pipeline' must be callable, but got {type(pipeline).__name__}.")
+        if not isinstance(batch_size, int) or batch_size < 1:
+            raise ValueError(f"'batch_size' must be a positive integer, but got {batch_size}.")
+        if not isinstance(num_slots, int) or num_slots < 2:
+            raise ValueError(f"'num_slots' must be an integer >= 2, but got {num_slots}.")
+        if num_workers is None:
+            num_workers = multiprocessing.cpu_count()
+        if not isinstance(num_workers, int) or num_workers < 1:
+            raise ValueError(f"'num_workers' must be a positive integer, but got {num_workers}.")
+
+        self.pipeline = pipeline
+        self.input_shape = tuple(input_shape)
+        self.output_shape = tuple(output_shape) if output_shape is not None else self.input_shape
+        self.dtype = np.dtype(dtype)
+        self.output_dtype = np.dtype(output_dtype) if output_dtype is not None else self.dtype
+        self.batch_size = batch_size
+        self.num_slots = num_slots
+        self.num_workers = num_workers
+        self.entropy = np.random.SeedSequence(seed).entropy
+
+        input_ring = (num_slots, batch_size) + self.input_shape
+        output_ring = (num_slots, batch_size) + self.output_shape
+        self._input_shm = shared_memory.SharedMemory(
+            create=True, size=max(1, int(np.prod(input_ring)) * self.dtype.itemsize))
+        self._output_shm = shared_memory.SharedMemory(
+            create=True, size=max(1, int(np.prod(output_ring)) * self.output_dtype.itemsize))
+        self._inputs = np.ndarray(input_ring, dtype=self.dtype, buffer=self._input_shm.buf)
+        self._outputs = np.ndarray(output_ring, dtype=self.output_dtype, buffer=self._output_shm.buf)
+
+        context = multiprocessing.get_context(mp_context)
+        self._task_queue = context.Queue()
+        self._result_queue = context.Queue()
+        self._workers = [
+            context.Process(
+                target=_shared_memory_worker,
+                args=(pipeline,
+                      (self._input_shm.name, input_ring, self.dtype.str),
+                      (self._output_shm.name, output_ring, self.output_dtype.str),
+                      self.entropy, self._task_queue, self._result_queue, _worker_state()),
+                daemon=True
+            )
+            for _ in range(num_workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+        self._pending = [0] * num_slots
+        self._errors: List[Optional[str]] = [None] * num_slots
+        self._samples_submitted = 0
+        self._closed = False
+
+    # ---------------------
+    # Slot Management
+    # ---------------------
+    def _submit(self, slot: int, batch: np.ndarray) -> int:
+        batch = np.asarray(batch)
+        if batch.ndim != len(self.input_shape) + 1 or batch.shape[1:] != self.input_shape:
+            raise ValueError(f"Expected a batch of shape (n,) + {self.input_shape}, but got {batch.shape}.")
+        count = batch.shape[0]
+        if not 1 <= count <= self.batch_size:
+            raise ValueError(f"Batch must contain between 1 and {self.batch_size} images, but got {count}.")
+
+        self._inputs[slot, :count] = batch
+        chunk = -(-count // self.num_workers)
+        for start in range(0, count, chunk):
+            self._task_queue.put((slot, start, min(start + chunk, count), self._samples_submitted))
+        self._pending[slot] = count
+        self._samples_submitted += count
+        return count
+
+    def _wait(self, slot: int) -> None:
+        """Block until every chunk of `slot` is done, re-raising worker failures."""
+        while self._pending[slot] > 0:
+            try:
+                done_slot, count, error, metrics = self._result_queue.get(timeout=1.0)
+            except queue.Empty:
+                if not all(worker.is_alive() for worker in self._workers):
+                    raise RuntimeError("A worker process exited unexpectedly.")
+                continue
+            if metrics is not None:
+                add_metrics(metrics)
+            self._pending[done_slot] -= count
+            # Keep the first failure of each slot; later chunks of the same slot often fail the same way
+            if error is not None and self._errors[done_slot] is None:
+                self._errors[done_slot] = error
+        if self._errors[slot] is not None:
+            error, self._errors[slot] = self._errors[slot], None
+            raise RuntimeError(f"Augmentation failed in a worker process:\n{error}")
+
+    def imap(self, batches: Iterable[np.ndarray]) -> Iterator[np.ndarray]:
+        """
+        Augment batches in order, yielding zero-copy views of the output slots.
+
+        Batches are pulled from `batches` only when a slot is free, so the producer never
+        runs more than `num_slots - 1` batches ahead of the consumer.
+
+        Parameters
+        ----------
+        batches : Iterable[np.ndarray]
+            Batches of shape (n,) + input_shape with 1 <= n <= batch_size.
+
+        Yields
+        ------
+        np.ndarray
+            View of shape (n,) + output_shape into shared memory, valid until the next
+            batch is requested.
+        """
+        if self._closed:
+            raise RuntimeError("Executor is closed.")
+
+        free = deque(range(self.num_slots))
+        in_flight = deque()
+        source = iter(batches)
+        exhausted = False
+
+        try:
+            while True:
+                while free and not exhausted:
+                    try:
+                        batch = next(source)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    slot = free.popleft()
+                    in_flight.append((slot, self._submit(slot, batch)))
+                if not in_flight:
+                    return
+                slot, count = in_flight.popleft()
+                self._wait(slot)
+                yield self._outputs[slot, :count]
+                # The consumer asked for the next batch: its previous slot can be reused
+                free.append(slot)
+        finally:
+            # Drain work that is still running so the slots are consistent for the next call
+            for slot, _ in in_flight:
+                try:
+                    self._wait(slot)
+                except RuntimeError:
+                    pass
+
+    def map(self, images: np.ndarray) -> np.ndarray:
+        """
+        Augment a stacked array of images and return a new array with the results.
+
+        Parameters
+        ----------
+        images : np.ndarray
+            Array of shape (N,) + input_shape.
+
+        Returns
+        -------
+        np.ndarray
+            Array of shape (N,) + output_shape.
+        """
+        images = np.asarray(images)
+        results = np.empty((images.shape[0],) + self.output_shape, dtype=self.output_dtype)
+        batches = (images[i:i + self.batch_size] for i in range(0, images.shape[0], self.batch_size))
+        position = 0
+        for augmented in self.imap(batches):
+            results[position:position + augmented.shape[0]] = augmented
+            position += augmented.shape[0]
+        return results
+
+    # ---------------------
+    # Lifecycle
+    # ---------------------
+    def close(self) -> None:
+        """Stop the workers and release the shared memory."""
+        if self._closed:
+            return
+        self._closed = True
+        for _ in self._workers:
+            self._task_queue.put(None)
+        for worker in self._workers:
+            worker.join(timeout=10)
+            if worker.is_alive():
+                worker.terminate()
+        del self._inputs, self._outputs
+        for shm in (self._input_shm, self._output_shm):
+            try:
+                shm.close()
+            except BufferError:
+                # A consumer still holds a view; the mapping is released when it goes away
+                pass
+            shm.unlink()
+
+    def __enter__(self) -> "SharedMemoryExecutor":
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb) -> None:
+        self.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class ThreadExecutor:
+    """
+    Run an augmentation pipeline over a batch of images with a pool of threads.
+
+    Samples are split into one contiguous chunk per thread. While the executor is open,
+    OpenCV's own internal threading is pinned to `cv2_threads` so that OpenCV's parallel
+    loops do not oversubscribe the cores already used by the pool; the previous setting
+    is restored by `close`.
+
+    Parameters
+    ----------
+    pipeline : Callable[[np.ndarray], np.ndarray]
+        Function applied to every image, e.g. a `Compose`.
+    num_threads : int, optional
+        Number of worker threads. Defaults to `os.cpu_count()`.
+    cv2_threads : int, optional
+        Value passed to `cv2.setNumThreads` from construction until `close`. Default is 1.
+
+    Notes
+    -----
+    Only the GIL-releasing parts of a pipeline (OpenCV calls, `scipy.ndimage` filters,
+    large NumPy ufuncs) run concurrently; pure-Python work is serialized. Use
+    `stats()` to check the per-thread utilization and prefer `SharedMemoryExecutor`
+    for pipelines that stay low.
+
+    `cv2.setNumThreads` is process-global: it also applies to OpenCV calls made outside
+    the executor while it is open. When several executors are open at once, the most
+    recently created one sets the value, and the original setting is restored when the
+    last of them is closed.
+
+    If a chunk fails, `map` still waits for all other chunks before it re-raises, so no
+    thread keeps writing into `out`. The exception of the failed chunk that comes first
+    in input order is re-raised.
+    """
+
+    def __init__(
+        self,
+        pipeline: Callable[[np.ndarray], np.ndarray],
+        num_threads: Optional[int] = None,
+        cv2_threads: int = 1
+    ):
+        if not callable(pipeline):
+            raise TypeError(f"'pipeline' must be callable, but got {type(pipeline).__name__}.")
+        if num_threads is None:
+            num_threads = multiprocessing.cpu_count()
+        if not isinstance(num_threads, int) or num_threads < 1:
+            raise ValueError(f"'num_threads' must be a positive integer, but got {num_threads}.")
+        if not isinstance(cv2_threads, int) or cv2_threads < 0:
+            raise ValueError(f"'cv2_threads' must be a non-negative integer, but got {cv2_threads}.")
+
+        self.pipeline = pipeline
+        self.num_threads = num_threads
+        self.cv2_threads = cv2_threads
+        self._pool = ThreadPoolExecutor(max_workers=num_threads, thread_name_prefix="anaug")
+        self._lock = threading.Lock()
+        self._busy: Dict[str, float] = {}
+        self._samples: Dict[str, int] = {}
+        self._wall_time = 0.0
+        _acquire_cv2_threads(cv2_threads)
+
+    def _run_chunk(self, images, start: int, stop: int, results) -> None:
+        name = threading.current_thread().name
+        begin = time.perf_counter()
+        for i in range(start, stop):
+            results[i] = self.pipeline(images[i])
+        elapsed = time.perf_counter() - begin
+        with self._lock:
+            self._busy[name] = self._busy.get(name, 0.0) + elapsed
+            self._samples[name] = self._samples.get(name, 0) + (stop - start)
+
+    def map(
+        self,
+        images: Union[np.ndarray, List[np.ndarray]],
+        out: Optional[np.ndarray] = None
+    ) -> Union[np.ndarray, List[np.ndarray]]:
+        """
+        Augment every image of a batch in parallel.
+
+        Parameters
+        ----------
+        images : np.ndarray or List[np.ndarray]
+            Stacked batch of shape (N, ...) or a list of images.
+        out : np.ndarray, optional
+            Preallocated array of shape (N,) + output shape. Results are written into it
+            directly and it is returned.
+
+        Returns
+        -------
+        np.ndarray or List[np.ndarray]
+            Stacked results if all outputs have the same shape (or `out` if given),
+            otherwise a list of results in input order.
+        """
+        if self._pool is None:
+            raise RuntimeError("Executor is closed.")
+        n = len(images)
+        if out is not None and len(out) != n:
+            raise ValueError(f"'out' must have one entry per image ({n}), but got {len(out)}.")
+        results = out if out is not None else [None] * n
+        if n == 0:
+            return results
+
+        chunk = -(-n // self.num_threads)
+        begin = time.perf_counter()
+        futures = [self._pool.submit(self._run_chunk, images, start, min(start + chunk, n), results)
+                   for start in range(0, n, chunk)]
+        wait(futures)
+        self._wall_time += time.perf_counter() - begin
+        for future in futures:
+            # Raises the exception of the first failed chunk in input order
+            future.result()
+
+        if out is not None:
+            return out
+        if len({result.shape for result in results}) == 1:
+            return np.stack(results)
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report per-thread utilization accumulated over all `map` calls.
+
+        Returns
+        -------
+        Dict[str, Any]
+            - 'wall_time': total wall-clock seconds spent in `map`.
+            - 'threads': per thread name, the number of samples processed, the busy time in
+              seconds and the utilization (busy time / wall time).
+            - 'utilization': mean utilization over all `num_threads` threads.
+        """
+        with self._lock:
+            wall = self._wall_time
+            threads = {
+                name: {
+                    'samples': self._samples[name],
+                    'busy_time': busy,
+                    'utilization': busy / wall if wall > 0 else 0.0,
+                }
+                for name, busy in sorted(self._busy.items())
+            }
+        total_busy = sum(thread['busy_time'] for thread in threads.values())
+        return {
+            'wall_time': wall,
+            'threads': threads,
+            'utilization': total_busy / (wall * self.num_threads) if wall > 0 else 0.0,
+        }
+
+    def reset_stats(self) -> None:
+        """Clear the accumulated utilization statistics."""
+        with self._lock:
+            self._busy.clear()
+            self._samples.clear()
+            self._wall_time = 0.0
+
+    def close(self) -> None:
+        """Shut down the thread pool and restore OpenCV's thread count."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+            _release_cv2_threads()
+
+    def __enter__(self) -> "ThreadExecutor":
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb) -> None:
+        self.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
@@ -1,3 +1,10 @@
-from .random_lesion import random_lesion
+from typing import TYPE_CHECKING
 
-__all__ = ["random_lesion"]
\ No newline at end of file
+from .._lazy import attach
+
+attach(__name__, {"random_lesion": ".random_lesion"})
+
+if TYPE_CHECKING:
+    from .random_lesion import random_lesion
+
+__all__ = ["random_lesion"]
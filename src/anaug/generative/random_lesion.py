@@ -1,25 +1,38 @@
 import numpy as np
-from scipy.ndimage import gaussian_filter
-from typing import Tuple, Optional
+from typing import Any, Tuple, Optional
 
-def generate_perlin_noise(shape: Tuple[int, int], scale: float = 10.0, seed: Optional[int] = None) -> np.ndarray:
+from ..buffers import _scratch
+from ..default._filters import gaussian_blur
+from ..instrument import instrumented
+from ..precision import _random_field, _work_dtype
+from ..rng import get_rng
+
+def generate_perlin_noise(shape: Tuple[int, int], scale: float = 10.0, seed: Optional[int] = None,
+                          dtype: Any = None, rng: Any = None) -> np.ndarray:
     """
     Generates a 2D Perlin noise array.
 
     Parameters:
     - shape (tuple): Shape of the noise array (height, width).
     - scale (float): Scale of the noise features.
-    - seed (int, optional): Seed for random number generator.
+    - seed (int, optional): Seed for a new random generator. The global NumPy random state is not modified.
+    - dtype (np.dtype, optional): Floating-point dtype of the noise. If None, it follows the precision policy
+      (float64 by default).
+    - rng (np.random.Generator, optional): Random generator to draw from; takes precedence over `seed`.
+      If neither is given, the generator activated with `anaug.use_rng`, or else NumPy's global random
+      state, is used.
 
     Returns:
     - np.ndarray: 2D array of Perlin noise in range [0, 1].
     """
-    if seed is not None:
-        np.random.seed(seed)
+    if dtype is None:
+        dtype = _work_dtype(np.float64)
+    rng = get_rng(seed if rng is None else rng)
     height, width = shape
     d = (height // int(scale), width // int(scale))
-    gradients = np.random.rand(d[0]+1, d[1]+1, 2) * 2 - 1
+    gradients = rng.random((d[0]+1, d[1]+1, 2)) * 2 - 1
     gradients /= np.linalg.norm(gradients, axis=2, keepdims=True) + 1e-10
+    gradients = gradients.astype(dtype, copy=False)
 
     def perlin(x, y):
         x0 = x.astype(int)
@@ -53,14 +66,15 @@ def generate_perlin_noise(shape: Tuple[int, int], scale: float = 10.0, seed: Opt
         return a + t * (b - a)
 
     # Create 2D grid for x and y
-    x = np.linspace(0, d[0], height, endpoint=False)
-    y = np.linspace(0, d[1], width, endpoint=False)
+    x = np.linspace(0, d[0], height, endpoint=False, dtype=dtype)
+    y = np.linspace(0, d[1], width, endpoint=False, dtype=dtype)
     x, y = np.meshgrid(x, y, indexing='ij')
 
     noise = perlin(x, y)
     noise = (noise - noise.min()) / (noise.max() - noise.min())
     return noise
 
+@instrumented
 def random_lesion(
     image: np.ndarray,
     intensity_range: Tuple[float, float] = (0.2, 0.8),
@@ -70,7 +84,8 @@ def random_lesion(
     texture_strength: float = 0.5,
     num_lesions: int = 1,
     blending_mode: str = 'additive',
-    seed: Optional[int] = None  # Added seed parameter
+    seed: Optional[int] = None,
+    rng: Any = None
 ) -> np.ndarray:
     """
     Generates one or multiple random lesions with specified properties and adds them to the image.
@@ -84,13 +99,15 @@ def random_lesion(
     - texture_strength (float): Strength of texture variation (0 for smooth, 1 for highly textured).
     - num_lesions (int): Number of lesions to generate.
     - blending_mode (str): Blending mode ('additive', 'overlay').
-    - seed (int, optional): Seed for random number generator.
+    - seed (int, optional): Seed for a new random generator. The global NumPy random state is not modified.
+    - rng (np.random.Generator, optional): Random generator to draw from; takes precedence over `seed`.
+      If neither is given, the generator activated with `anaug.use_rng`, or else NumPy's global random
+      state, is used.
 
     Returns:
     - np.ndarray: Image with the generated lesion(s).
     """
-    if seed is not None:
-        np.random.seed(seed)
+    rng = get_rng(seed if rng is None else rng)
 
     # Validate inputs
     if not isinstance(image, np.ndarray) or image.ndim != 2:
@@ -109,16 +126,19 @@ def random_lesion(
         raise ValueError("blending_mode must be either 'additive' or 'overlay'.")
 
     augmented_image = image.copy()
+    work_dtype = _work_dtype(image.dtype)
+    # Open grids broadcast like a full meshgrid without materializing it
+    y, x = np.ogrid[:image.shape[0], :image.shape[1]]
 
     for _ in range(num_lesions):
         # Generate lesion properties
-        intensity = np.random.uniform(*intensity_range)
-        size = np.random.randint(*size_range)
+        intensity = rng.uniform(*intensity_range)
+        size = int(rng.integers(*size_range))
 
         # Choose location
         if location is None:
-            center_x = np.random.randint(size, image.shape[1] - size)
-            center_y = np.random.randint(size, image.shape[0] - size)
+            center_x = int(rng.integers(size, image.shape[1] - size))
+            center_y = int(rng.integers(size, image.shape[0] - size))
         else:
             center_x, center_y = location
             if not (0 <= center_x < image.shape[1] and 0 <= center_y < image.shape[0]):
@@ -128,44 +148,48 @@ def random_lesion(
                 raise ValueError("Lesion size with given location exceeds image boundaries.")
 
         # Create lesion mask
-        x, y = np.meshgrid(np.arange(image.shape[1]), np.arange(image.shape[0]))
         if shape == 'circle':
             distance_sq = (x - center_x) ** 2 + (y - center_y) ** 2
             mask = distance_sq <= size ** 2
-            lesion = np.zeros_like(image)
-            lesion[mask] = intensity
         elif shape == 'ellipse':
-            axis_x = size * np.random.uniform(0.5, 1.5)
+            axis_x = size * rng.uniform(0.5, 1.5)
             axis_y = size
-            distance = (((x - center_x) / axis_x) ** 2 + ((y - center_y) / axis_y) ** 2)
+            distance = (((x - center_x) / axis_x).astype(work_dtype) ** 2
+                        + ((y - center_y) / axis_y).astype(work_dtype) ** 2)
             mask = distance <= 1
-            lesion = np.zeros_like(image)
-            lesion[mask] = intensity
         elif shape == 'irregular':
             # Generate Perlin noise for more realistic textures
-            noise = generate_perlin_noise(image.shape, scale=size / 5, seed=seed)
-            lesion = noise * intensity
+            noise = generate_perlin_noise(image.shape, scale=size / 5, dtype=work_dtype, rng=rng)
             # Create mask based on noise threshold
             threshold = 0.5
             mask = noise > threshold
-            lesion = np.zeros_like(image)
+
+        # The lesion and texture fields are scratch memory, borrowed from the active buffer pool if any
+        with _scratch(image.shape, image.dtype) as lesion:
+            lesion.fill(0)
             lesion[mask] = intensity
 
-        # Add texture
-        if shape != 'irregular':
-            texture = np.random.normal(0, 1, image.shape)
-            texture = gaussian_filter(texture, sigma=size * 0.5 * (1 - texture_strength))
-            texture = (texture - texture.min()) / (texture.max() - texture.min())
-            texture = texture * texture_strength
-            lesion[mask] += texture[mask] * intensity  # Apply texture only within the mask
-            lesion = np.clip(lesion, 0, 1)
-
-        # Blend lesion with image
-        if blending_mode == 'additive':
-            augmented_image = np.clip(augmented_image + lesion, 0, 1)
-        elif blending_mode == 'overlay':
-            mask = lesion > 0
-            augmented_image[mask] = augmented_image[mask] * (1 - intensity) + intensity
-            augmented_image = np.clip(augmented_image, 0, 1)
+            # Add texture
+            if shape != 'irregular':
+                with _random_field(image.shape, work_dtype, rng.standard_normal) as draws, \
+                        _scratch(image.shape, work_dtype) as texture:
+                    # Texture sigmas grow with the lesion size; the pyramid Gaussian costs the same for all
+                    gaussian_blur(draws, size * 0.5 * (1 - texture_strength), out=texture, method='pyramid')
+                    texture -= texture.min()
+                    texture /= texture.max()
+                    # Texture adds up to `texture_strength * intensity`, scaled down where that
+                    # would take the lesion beyond `intensity_range`
+                    texture *= min(texture_strength * intensity, intensity_range[1] - intensity)
+                    lesion[mask] += texture[mask]  # Apply texture only within the mask
+                np.clip(lesion, 0, 1, out=lesion)
+
+            # Blend lesion with image
+            if blending_mode == 'additive':
+                augmented_image += lesion
+                np.clip(augmented_image, 0, 1, out=augmented_image)
+            elif blending_mode == 'overlay':
+                mask = lesion > 0
+                augmented_image[mask] = augmented_image[mask] * (1 - intensity) + intensity
+                np.clip(augmented_image, 0, 1, out=augmented_image)
 
     return augmented_image
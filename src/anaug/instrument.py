@@ -0,0 +1,398 @@
+"""
+Operation Instrumentation Module
+
+This module records per-operation metrics for the augmentations: call counts, errors,
+wall time, bytes passed in and returned, bytes of newly allocated results and,
+optionally, the peak memory traced by `tracemalloc` during each call. It is off by
+default; while it is off an instrumented op costs one global flag check per call.
+Ops called by other ops (e.g. `motion_blur` by `blur`) record their calls and time, but
+their allocations and peaks are accounted only to the outermost op.
+
+Metrics are aggregated per process. `SharedMemoryExecutor` workers send their metrics
+back with every finished chunk, so the parent's snapshot covers the whole pool; metrics
+collected in other worker processes can be merged with `add_metrics` or `merge_metrics`.
+
+Functions:
+- enable_instrumentation / disable_instrumentation: Global switch.
+- instrumentation: Context manager that enables recording for a block.
+- get_metrics / reset_metrics: Snapshot or clear the metrics of this process.
+- add_metrics / merge_metrics: Combine snapshots from several processes.
+- to_prometheus / to_json: Export a snapshot.
+- instrumented: Decorator that makes a function report its calls.
+
+Usage Examples:
+------------
+>>> from anaug import get_metrics, instrumentation, to_prometheus
+>>> from anaug.default import blur, elastic_deformation
+>>> with instrumentation():
+...     for image in images:
+...         augmented = blur(elastic_deformation(image, random_state=0), blur_radius=2)
+>>> metrics = get_metrics()
+>>> metrics['ops']['elastic_deformation']['seconds']
+>>> print(to_prometheus(metrics))
+"""
+
+import contextlib
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterator, Optional
+
+import numpy as np
+
+_enabled = False
+_trace_allocations = False
+_started_tracemalloc = False
+
+# Counters that are summed when metrics are merged; the remaining fields are maxima
+_SUMMED = ('calls', 'errors', 'seconds', 'bytes_in', 'bytes_out', 'bytes_allocated')
+_MAXED = ('seconds_max', 'peak_bytes')
+
+_PROMETHEUS_METRICS = (
+    ('calls', 'op_calls_total', 'counter', 'Number of calls.'),
+    ('errors', 'op_errors_total', 'counter', 'Number of calls that raised an exception.'),
+    ('seconds', 'op_seconds_total', 'counter', 'Wall time spent in the op.'),
+    ('seconds_max', 'op_seconds_max', 'gauge', 'Longest single call.'),
+    ('bytes_in', 'op_bytes_in_total', 'counter', 'Bytes of the array arguments.'),
+    ('bytes_out', 'op_bytes_out_total', 'counter', 'Bytes of the returned arrays.'),
+    ('bytes_allocated', 'op_bytes_allocated_total', 'counter', 'Bytes of returned arrays that were newly allocated.'),
+    ('peak_bytes', 'op_peak_bytes', 'gauge', 'Largest memory peak traced during a single call.'),
+)
+
+
+def _empty_stats() -> Dict[str, Any]:
+    return {'calls': 0, 'errors': 0, 'seconds': 0.0, 'seconds_max': 0.0,
+            'bytes_in': 0, 'bytes_out': 0, 'bytes_allocated': 0, 'peak_bytes': None}
+
+
+def _merge_stats(target: Dict[str, Any], source: Dict[str, Any]) -> None:
+    for field in _SUMMED:
+        target[field] += source.get(field, 0)
+    for field in _MAXED:
+        value = source.get(field)
+        if value is not None:
+            target[field] = value if target[field] is None else max(target[field], value)
+
+
+class _Registry:
+    """Thread-safe per-process store of op metrics."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        self._ops: Dict[str, Dict[str, Any]] = {}
+        self._processes = set()
+
+    def record(self, op: str, seconds: float, bytes_in: int, bytes_out: int, bytes_allocated: int,
+               peak_bytes: Optional[int], error: bool) -> None:
+        with self._lock:
+            stats = self._ops.get(op)
+            if stats is None:
+                stats = self._ops[op] = _empty_stats()
+            self._processes.add(os.getpid())
+            stats['calls'] += 1
+            stats['errors'] += error
+            stats['seconds'] += seconds
+            stats['seconds_max'] = max(stats['seconds_max'], seconds)
+            stats['bytes_in'] += bytes_in
+            stats['bytes_out'] += bytes_out
+            stats['bytes_allocated'] += bytes_allocated
+            if peak_bytes is not None:
+                stats['peak_bytes'] = peak_bytes if stats['peak_bytes'] is None else max(stats['peak_bytes'], peak_bytes)
+
+    def add(self, snapshot: Dict[str, Any]) -> None:
+        with self._lock:
+            self._processes.update(snapshot.get('processes', ()))
+            for op, source in snapshot.get('ops', {}).items():
+                _merge_stats(self._ops.setdefault(op, _empty_stats()), source)
+
+    def snapshot(self, reset: bool = False) -> Dict[str, Any]:
+        with self._lock:
+            snapshot = {
+                'processes': sorted(self._processes),
+                'ops': {op: dict(stats) for op, stats in sorted(self._ops.items())},
+            }
+            if reset:
+                self.reset()
+        return snapshot
+
+
+_registry = _Registry()
+
+# Number of instrumented calls the current call runs in; allocations are only accounted
+# at the outermost one, so that ops dispatching to other ops are not counted twice
+_depth = contextvars.ContextVar('anaug_instrument_depth', default=0)
+
+# `tracemalloc.reset_peak` is new in Python 3.9; without it no per-call peak can be
+# traced, and 'peak_bytes' stays None
+_CAN_RESET_PEAK = hasattr(tracemalloc, 'reset_peak')
+
+
+# ---------------------
+# Switch
+# ---------------------
+def enable_instrumentation(trace_allocations: bool = False) -> None:
+    """
+    Start recording metrics for every instrumented op in this process.
+
+    Parameters
+    ----------
+    trace_allocations : bool, optional
+        If True, `tracemalloc` is started (if it is not already running) and the peak
+        memory allocated during every call is recorded as 'peak_bytes'. Tracing slows
+        down all allocations noticeably, so it is off by default. Peaks need Python 3.9
+        or later; on Python 3.8 'peak_bytes' stays None.
+    """
+    global _enabled, _trace_allocations, _started_tracemalloc
+    if trace_allocations and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _started_tracemalloc = True
+    _trace_allocations = bool(trace_allocations)
+    _enabled = True
+
+
+def disable_instrumentation() -> None:
+    """Stop recording metrics. Metrics recorded so far are kept."""
+    global _enabled, _trace_allocations, _started_tracemalloc
+    _enabled = False
+    _trace_allocations = False
+    if _started_tracemalloc:
+        tracemalloc.stop()
+        _started_tracemalloc = False
+
+
+def is_instrumentation_enabled() -> bool:
+    """Return whether metrics are being recorded."""
+    return _enabled
+
+
+@contextlib.contextmanager
+def instrumentation(trace_allocations: bool = False, reset: bool = False) -> Iterator[None]:
+    """
+    Record metrics for the enclosed block.
+
+    Parameters
+    ----------
+    trace_allocations : bool, optional
+        Whether to trace per-call peak memory; see `enable_instrumentation`.
+    reset : bool, optional
+        If True, previously recorded metrics are cleared on entry. Default is False.
+
+    Notes
+    -----
+    The switch is process-wide: calls made by other threads while the block runs are
+    recorded as well. The previous state is restored on exit.
+    """
+    global _enabled, _trace_allocations, _started_tracemalloc
+    previous = (_enabled, _trace_allocations, _started_tracemalloc)
+    started_here = trace_allocations and not tracemalloc.is_tracing()
+    if reset:
+        reset_metrics()
+    enable_instrumentation(trace_allocations)
+    try:
+        yield
+    finally:
+        if started_here:
+            tracemalloc.stop()
+        _enabled, _trace_allocations, _started_tracemalloc = previous
+
+
+def _worker_state() -> tuple:
+    return _enabled, _trace_allocations
+
+
+def _init_worker(state: tuple) -> None:
+    """Adopt the parent's switch in a worker process and drop metrics inherited by fork."""
+    global _started_tracemalloc
+    _started_tracemalloc = False
+    enabled, trace_allocations = state
+    if enabled:
+        enable_instrumentation(trace_allocations)
+    else:
+        disable_instrumentation()
+    reset_metrics()
+
+
+def _take_metrics() -> Optional[Dict[str, Any]]:
+    """Return and clear the metrics recorded since the last call, or None if disabled."""
+    return _registry.snapshot(reset=True) if _enabled else None
+
+
+# ---------------------
+# Recording
+# ---------------------
+def _array_bytes(values) -> int:
+    total = 0
+    for value in values:
+        if isinstance(value, np.ndarray):
+            total += value.nbytes
+    return total
+
+
+def _trace_enter() -> int:
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    return current
+
+
+def _trace_exit(start: int) -> int:
+    _, peak = tracemalloc.get_traced_memory()
+    return max(0, peak - start)
+
+
+def _call(op: str, func: Callable, args: tuple, kwargs: dict) -> Any:
+    inputs = [value for value in args if isinstance(value, np.ndarray)]
+    inputs += [value for name, value in kwargs.items() if name != 'out' and isinstance(value, np.ndarray)]
+    out = kwargs.get('out')
+    bytes_in = _array_bytes(inputs)
+    outermost = _depth.get() == 0
+    tracing = outermost and _trace_allocations and _CAN_RESET_PEAK and tracemalloc.is_tracing()
+    start = _trace_enter() if tracing else 0
+    token = _depth.set(_depth.get() + 1)
+    begin = time.perf_counter()
+    try:
+        result = func(*args, **kwargs)
+    except BaseException:
+        seconds = time.perf_counter() - begin
+        _depth.reset(token)
+        peak_bytes = _trace_exit(start) if tracing else None
+        _registry.record(op, seconds, bytes_in, 0, 0, peak_bytes, error=True)
+        raise
+    seconds = time.perf_counter() - begin
+    _depth.reset(token)
+    peak_bytes = _trace_exit(start) if tracing else None
+
+    if isinstance(result, np.ndarray):
+        bytes_out = result.nbytes
+        # Results written into `out` or into an input (in place) did not allocate
+        fresh = result is not out and not any(np.may_share_memory(result, value) for value in inputs)
+        bytes_allocated = bytes_out if fresh else 0
+    else:
+        bytes_out = bytes_allocated = _array_bytes(result) if isinstance(result, (list, tuple)) else 0
+    if not outermost:
+        # The enclosing op accounts for what this call allocated
+        bytes_allocated = 0
+    _registry.record(op, seconds, bytes_in, bytes_out, bytes_allocated, peak_bytes, error=False)
+    return result
+
+
+@contextlib.contextmanager
+def _measure(op: str, image: np.ndarray) -> Iterator[None]:
+    """Record a block of code as one call of `op` on `image` (for work that is not a function call)."""
+    if not _enabled:
+        yield
+        return
+    tracing = _depth.get() == 0 and _trace_allocations and _CAN_RESET_PEAK and tracemalloc.is_tracing()
+    start = _trace_enter() if tracing else 0
+    token = _depth.set(_depth.get() + 1)
+    begin = time.perf_counter()
+    error = True
+    try:
+        yield
+        error = False
+    finally:
+        seconds = time.perf_counter() - begin
+        _depth.reset(token)
+        peak_bytes = _trace_exit(start) if tracing else None
+        _registry.record(op, seconds, image.nbytes, 0, 0, peak_bytes, error=error)
+
+
+def instrumented(func: Optional[Callable] = None, *, name: Optional[str] = None) -> Callable:
+    """
+    Decorate an augmentation so that its calls are recorded while instrumentation is on.
+
+    Parameters
+    ----------
+    func : Callable
+        Function to instrument.
+    name : str, optional
+        Name the metrics are reported under. Defaults to `func.__name__`.
+
+    Returns
+    -------
+    Callable
+        A wrapper with the name, docstring and signature of `func`.
+    """
+    if func is None:
+        return functools.partial(instrumented, name=name)
+    op = name or func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _enabled:
+            return func(*args, **kwargs)
+        return _call(op, func, args, kwargs)
+
+    return wrapper
+
+
+# ---------------------
+# Snapshots
+# ---------------------
+def get_metrics() -> Dict[str, Any]:
+    """
+    Return a snapshot of the metrics recorded in this process.
+
+    Returns
+    -------
+    Dict[str, Any]
+        - 'processes': ids of the processes whose calls are included.
+        - 'ops': for every op, 'calls', 'errors', 'seconds' (total wall time),
+          'seconds_max', 'bytes_in', 'bytes_out', 'bytes_allocated' and 'peak_bytes'
+          (None unless allocations were traced).
+    """
+    return _registry.snapshot()
+
+
+def reset_metrics() -> None:
+    """Clear the metrics recorded in this process."""
+    with _registry._lock:
+        _registry.reset()
+
+
+def add_metrics(snapshot: Dict[str, Any]) -> None:
+    """Merge a snapshot taken in another process into the metrics of this process."""
+    _registry.add(snapshot)
+
+
+def merge_metrics(*snapshots: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Combine snapshots, e.g. from several worker processes, into one.
+
+    Counters and times are summed; 'seconds_max' and 'peak_bytes' take the maximum.
+    """
+    registry = _Registry()
+    for snapshot in snapshots:
+        registry.add(snapshot)
+    return registry.snapshot()
+
+
+def to_json(snapshot: Optional[Dict[str, Any]] = None, **kwargs) -> str:
+    """Serialize a snapshot (the current metrics by default) as JSON; `kwargs` go to `json.dumps`."""
+    return json.dumps(get_metrics() if snapshot is None else snapshot, **kwargs)
+
+
+def to_prometheus(snapshot: Optional[Dict[str, Any]] = None, prefix: str = 'anaug') -> str:
+    """
+    Format a snapshot (the current metrics by default) in the Prometheus text exposition format.
+
+    Every metric is labelled with the op name, e.g. `anaug_op_seconds_total{op="blur"} 1.25`.
+    """
+    snapshot = get_metrics() if snapshot is None else snapshot
+    lines = []
+    for field, metric, kind, description in _PROMETHEUS_METRICS:
+        samples = [(op, stats.get(field)) for op, stats in snapshot['ops'].items() if stats.get(field) is not None]
+        if not samples:
+            continue
+        lines.append(f"# HELP {prefix}_{metric} {description}")
+        lines.append(f"# TYPE {prefix}_{metric} {kind}")
+        for op, value in samples:
+            label = op.replace('\\', '\\\\').replace('"', '\\"')
+            lines.append(f'{prefix}_{metric}{{op="{label}"}} {value!r}')
+    return '\n'.join(lines) + '\n' if lines else ''
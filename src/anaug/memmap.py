@@ -0,0 +1,171 @@
+"""
+Memory-Mapped Dataset Augmentation Module
+
+This module augments `.npy` image stacks that do not fit in memory. The input stack is
+memory-mapped and read chunk by chunk in order, every chunk is augmented, and results
+are written into a preallocated memory-mapped output, so peak memory is bounded by the
+chunk size rather than the dataset size.
+
+Functions:
+- augment_memmap: Apply a pipeline to an (N, ...) stack chunk by chunk.
+
+Usage Examples:
+------------
+>>> from anaug import Compose, augment_memmap
+>>> from anaug.default import flip, intensity
+>>> pipeline = Compose([(flip, {'axes': 'horizontal'}), (intensity, {'brightness_factor': 1.1})])
+>>> augmented = augment_memmap(pipeline, 'mri_slices.npy', 'mri_slices_aug.npy', chunk_bytes=256 * 2**20)
+>>> augmented.shape
+(250000, 512, 512)
+"""
+
+import mmap
+import os
+from typing import Any, Callable, Optional, Tuple, Union
+
+import numpy as np
+
+ArrayOrPath = Union[str, os.PathLike, np.ndarray]
+
+DEFAULT_CHUNK_BYTES = 64 * 2**20
+
+
+def _advise_sequential(array: np.ndarray) -> None:
+    """Tell the kernel a memory map will be read front to back, where supported."""
+    mapping = getattr(array, '_mmap', None)
+    advice = getattr(mmap, 'MADV_SEQUENTIAL', None)
+    if mapping is not None and advice is not None:
+        try:
+            mapping.madvise(advice)
+        except (OSError, ValueError):
+            pass
+
+
+def augment_memmap(
+    pipeline: Callable[[np.ndarray], np.ndarray],
+    source: ArrayOrPath,
+    destination: Optional[ArrayOrPath] = None,
+    *,
+    output_shape: Optional[Tuple[int, ...]] = None,
+    output_dtype: Any = None,
+    chunk_size: Optional[int] = None,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    batched: bool = False,
+    flush_every_chunk: bool = False
+) -> np.ndarray:
+    """
+    Apply an augmentation pipeline to a memory-mapped image stack, chunk by chunk.
+
+    Parameters
+    ----------
+    pipeline : Callable[[np.ndarray], np.ndarray]
+        Function applied to every image, e.g. a `Compose`. With `batched=True` it is
+        called once per chunk with an (n, ...) array instead, e.g. a `*_batch` function.
+    source : str, os.PathLike or np.ndarray
+        Path to an `.npy` file (opened read-only with `mmap_mode='r'`) or an existing
+        array / `np.memmap` of shape (N, ...).
+    destination : str, os.PathLike or np.ndarray, optional
+        Path of the `.npy` file to create, or a preallocated array / `np.memmap` of shape
+        (N,) + output_shape. If None, a regular in-memory array is allocated.
+    output_shape : Tuple[int, ...], optional
+        Shape of a single output image. If None, it is taken from the pipeline output of
+        the first image (or from `destination` if it is an array).
+    output_dtype : np.dtype, optional
+        Dtype of the output. Defaults to the dtype of the first pipeline output.
+    chunk_size : int, optional
+        Number of images read per chunk. If None, it is derived from `chunk_bytes`.
+    chunk_bytes : int, optional
+        Target size of an input chunk in bytes, used when `chunk_size` is None. Larger
+        chunks give longer sequential reads; smaller ones lower peak memory.
+        Default is 64 MiB.
+    batched : bool, optional
+        Whether `pipeline` takes a whole chunk instead of a single image. Default is False.
+    flush_every_chunk : bool, optional
+        If True and the output is a memory map, dirty pages are flushed after every chunk
+        so that written data does not accumulate in the page cache. Default is False.
+
+    Returns
+    -------
+    np.ndarray
+        The output array (an `np.memmap` when `destination` is a path or memory map).
+
+    Raises
+    ------
+    TypeError
+        If `pipeline` is not callable or `source` is not an array or path.
+    ValueError
+        If the stack is empty, the chunk parameters are invalid, or the pipeline output
+        does not match the output array.
+    """
+    # ---------------------
+    # Validation
+    # ---------------------
+    if not callable(pipeline):
+        raise TypeError(f"'pipeline' must be callable, but got {type(pipeline).__name__}.")
+    if isinstance(source, (str, os.PathLike)):
+        source = np.load(source, mmap_mode='r')
+    elif not isinstance(source, np.ndarray):
+        raise TypeError(f"'source' must be a path or a NumPy array, but got {type(source).__name__}.")
+    if source.ndim < 2 or source.shape[0] == 0:
+        raise ValueError(f"'source' must be a non-empty (N, ...) stack, but got shape {source.shape}.")
+    if chunk_size is None:
+        if not isinstance(chunk_bytes, int) or chunk_bytes <= 0:
+            raise ValueError(f"'chunk_bytes' must be a positive integer, but got {chunk_bytes}.")
+        sample_bytes = max(1, source[0].nbytes)
+        chunk_size = max(1, chunk_bytes // sample_bytes)
+    elif not isinstance(chunk_size, int) or chunk_size <= 0:
+        raise ValueError(f"'chunk_size' must be a positive integer, but got {chunk_size}.")
+
+    _advise_sequential(source)
+    total = source.shape[0]
+
+    # ---------------------
+    # Output Allocation
+    # ---------------------
+    first_chunk = np.asarray(source[:min(chunk_size, total)])
+    first_results = pipeline(first_chunk) if batched else None
+    if isinstance(destination, np.ndarray):
+        out = destination
+        if out.shape[0] != total:
+            raise ValueError(f"'destination' must hold {total} images, but has {out.shape[0]}.")
+    else:
+        if output_shape is None or output_dtype is None:
+            probe = first_results[0] if batched else np.asarray(pipeline(first_chunk[0]))
+            output_shape = probe.shape if output_shape is None else tuple(output_shape)
+            output_dtype = probe.dtype if output_dtype is None else output_dtype
+        shape = (total,) + tuple(output_shape)
+        if destination is None:
+            out = np.empty(shape, dtype=output_dtype)
+        elif isinstance(destination, (str, os.PathLike)):
+            out = np.lib.format.open_memmap(destination, mode='w+', dtype=output_dtype, shape=shape)
+        else:
+            raise TypeError(f"'destination' must be a path or a NumPy array, but got {type(destination).__name__}.")
+
+    # ---------------------
+    # Chunked Processing
+    # ---------------------
+    for start in range(0, total, chunk_size):
+        stop = min(start + chunk_size, total)
+        if start == 0:
+            chunk, results = first_chunk, first_results
+        else:
+            chunk = np.asarray(source[start:stop])
+            results = pipeline(chunk) if batched else None
+
+        if batched:
+            if np.shape(results) != out[start:stop].shape:
+                raise ValueError(f"Pipeline returned shape {np.shape(results)}, expected {out[start:stop].shape}.")
+            out[start:stop] = results
+        else:
+            for i in range(stop - start):
+                result = pipeline(chunk[i])
+                if result.shape != out.shape[1:]:
+                    raise ValueError(f"Pipeline returned shape {result.shape}, expected {out.shape[1:]}.")
+                out[start + i] = result
+
+        if flush_every_chunk and isinstance(out, np.memmap):
+            out.flush()
+
+    if isinstance(out, np.memmap):
+        out.flush()
+    return out
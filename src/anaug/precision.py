@@ -0,0 +1,113 @@
+"""
+Floating-Point Precision Policy Module
+
+This module controls the dtype of the floating-point intermediates that augmentations
+create (brightness/contrast buffers, noise and displacement fields, lesion textures).
+The default policy, 'float64', reproduces the historical behavior of computing in double
+precision. 'float32' keeps every intermediate in single precision, which halves the
+memory traffic on large float32 images, and 'input' follows the dtype of the input image.
+
+The policy can be set globally with `set_precision`, for a block of code with
+`use_precision`, or per pipeline with `Compose(..., precision=...)`.
+
+Functions:
+- set_precision: Set the process-wide default policy.
+- get_precision: Return the policy in effect.
+- use_precision: Context manager that overrides the policy for the current context.
+
+Usage Examples:
+------------
+>>> import numpy as np
+>>> from anaug import use_precision
+>>> from anaug.default import intensity
+>>> image = np.random.rand(4096, 4096).astype(np.float32)
+>>> with use_precision('float32'):
+...     adjusted = intensity(image, brightness_factor=1.2, contrast_factor=0.9)
+"""
+
+import contextlib
+import contextvars
+from typing import Any, Callable, Iterator, Optional
+
+import numpy as np
+
+from .buffers import _scratch
+
+PRECISION_POLICIES = ('float64', 'float32', 'input')
+
+_default_policy = 'float64'
+_policy_override: contextvars.ContextVar = contextvars.ContextVar('anaug_precision', default=None)
+
+
+def _validate_policy(policy: Any) -> str:
+    if policy not in PRECISION_POLICIES:
+        raise ValueError(f"Unsupported precision policy '{policy}'. Supported policies are: {PRECISION_POLICIES}.")
+    return policy
+
+
+def set_precision(policy: str) -> None:
+    """
+    Set the process-wide default precision policy.
+
+    Parameters
+    ----------
+    policy : str
+        'float64' (default; intermediates in double precision), 'float32' (intermediates
+        in single precision) or 'input' (intermediates follow the input dtype: float32
+        and float64 inputs keep their dtype, integer and half-precision inputs use float32).
+    """
+    global _default_policy
+    _default_policy = _validate_policy(policy)
+
+
+def get_precision() -> str:
+    """Return the precision policy in effect in the current context."""
+    policy = _policy_override.get()
+    return _default_policy if policy is None else policy
+
+
+@contextlib.contextmanager
+def use_precision(policy: Optional[str]) -> Iterator[str]:
+    """
+    Override the precision policy for the enclosed block.
+
+    Passing None keeps the policy that is already in effect. Overrides nest and are local
+    to the current thread or task.
+    """
+    if policy is not None:
+        _validate_policy(policy)
+    token = _policy_override.set(policy if policy is not None else _policy_override.get())
+    try:
+        yield get_precision()
+    finally:
+        _policy_override.reset(token)
+
+
+def _work_dtype(dtype: Any) -> np.dtype:
+    """Return the dtype of floating-point intermediates for an input of dtype `dtype`."""
+    policy = get_precision()
+    if policy == 'float64':
+        return np.dtype(np.float64)
+    if policy == 'float32':
+        return np.dtype(np.float32)
+    dtype = np.dtype(dtype)
+    if dtype in (np.float32, np.float64):
+        return dtype
+    return np.dtype(np.float32)
+
+
+@contextlib.contextmanager
+def _random_field(shape: tuple, dtype: Any, sample: Callable[..., np.ndarray]) -> Iterator[np.ndarray]:
+    """
+    Yield an array of the floating-point dtype `dtype` filled by the Generator method
+    `sample` (e.g. `rng.standard_normal` or `rng.random`).
+
+    float64 fields are freshly allocated, so callers may hand them out as results. Narrower
+    dtypes are sampled natively in that dtype, without a float64 temporary, into a scratch
+    buffer borrowed from the active buffer pool, if any.
+    """
+    if np.dtype(dtype) == np.float64:
+        yield sample(size=shape)
+    else:
+        with _scratch(shape, dtype) as field:
+            yield sample(dtype=dtype, out=field)
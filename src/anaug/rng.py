@@ -0,0 +1,164 @@
+"""
+Random Number Generation Module
+
+This module resolves the `rng=` argument that every random augmentation accepts and
+derives independent, reproducible random streams for parallel workers.
+
+Ops draw from a `np.random.Generator`. An explicit `rng=` argument wins; otherwise the
+generator activated with `use_rng` for the current context is used; otherwise the ops
+draw from NumPy's global random state, so `np.random.seed` keeps making scripts
+reproducible without any op ever reseeding it.
+
+Streams for workers and samples are derived from one root seed with `SeedSequence`
+spawn keys, so the stream of sample `i` depends only on `(seed, i)` and not on which
+worker processes it or in which order.
+
+Functions:
+- get_rng: Resolve an `rng=` argument (None, seed, SeedSequence, Generator, RandomState).
+- use_rng: Context manager that activates a generator for the current context.
+- stream_rng: Generator for the stream identified by a root seed and a key.
+- spawn_rngs: Generators for `n` independent streams of a root seed.
+
+Usage Examples:
+------------
+>>> import numpy as np
+>>> from anaug import spawn_rngs, stream_rng, use_rng
+>>> from anaug.default import noise
+>>> image = np.random.rand(256, 256).astype(np.float32)
+>>> noisy = noise(image, noise_intensity=0.1, rng=np.random.default_rng(0))
+>>> worker_rngs = spawn_rngs(1234, 8)                 # one stream per worker
+>>> with use_rng(stream_rng(1234, 17)):               # stream of sample 17
+...     noisy = noise(image, noise_intensity=0.1)
+"""
+
+import contextlib
+import contextvars
+from typing import Any, Iterator, List, Optional
+
+import numpy as np
+
+BIT_GENERATORS = {
+    'philox': np.random.Philox,
+    'pcg64': np.random.PCG64,
+}
+
+_active_rng: contextvars.ContextVar = contextvars.ContextVar('anaug_rng', default=None)
+
+# Generator sharing the bit generator of NumPy's global random state, created lazily
+_global_generator: Optional[np.random.Generator] = None
+
+
+def _global_bit_generator() -> np.random.BitGenerator:
+    if hasattr(np.random, 'get_bit_generator'):
+        return np.random.get_bit_generator()
+    return np.random.mtrand._rand._bit_generator  # NumPy < 1.25
+
+
+def _default_rng() -> np.random.Generator:
+    """Return the generator of the current context, or one drawing from the global state."""
+    rng = _active_rng.get()
+    if rng is not None:
+        return rng
+    global _global_generator
+    bit_generator = _global_bit_generator()
+    # `np.random.seed` reseeds the bit generator in place; `set_bit_generator` replaces it
+    if _global_generator is None or _global_generator.bit_generator is not bit_generator:
+        _global_generator = np.random.Generator(bit_generator)
+    return _global_generator
+
+
+def get_rng(rng: Any = None) -> np.random.Generator:
+    """
+    Resolve the `rng=` argument of an op into a `np.random.Generator`.
+
+    Parameters
+    ----------
+    rng : None, int, np.random.SeedSequence, np.random.Generator or np.random.RandomState, optional
+        - None: the generator activated with `use_rng`, or else a generator drawing from
+          NumPy's global random state (reproducible with `np.random.seed`).
+        - int or SeedSequence: a new generator seeded with it.
+        - Generator: used as is, so consecutive calls continue its stream.
+        - RandomState: a generator sharing its bit generator (legacy compatibility).
+
+    Returns
+    -------
+    np.random.Generator
+
+    Raises
+    ------
+    TypeError
+        If `rng` is of any other type.
+    """
+    if rng is None:
+        return _default_rng()
+    if isinstance(rng, np.random.Generator):
+        return rng
+    if isinstance(rng, (int, np.integer, np.random.SeedSequence)) and not isinstance(rng, bool):
+        return np.random.default_rng(rng)
+    if isinstance(rng, np.random.RandomState):
+        return np.random.Generator(rng._bit_generator)
+    raise TypeError(f"'rng' must be None, an int, a SeedSequence, a Generator or a RandomState, "
+                    f"but got {type(rng).__name__}.")
+
+
+@contextlib.contextmanager
+def use_rng(rng: Any) -> Iterator[np.random.Generator]:
+    """
+    Make the ops of the enclosed block draw from `rng` unless they get an explicit `rng=`.
+
+    `rng` is resolved with `get_rng`; None falls back to NumPy's global random state.
+    Generators nest and are local to the current thread or task.
+    """
+    token = _active_rng.set(get_rng(rng) if rng is not None else None)
+    try:
+        yield _default_rng()
+    finally:
+        _active_rng.reset(token)
+
+
+def _seed_sequence(seed: Any, key: tuple) -> np.random.SeedSequence:
+    if isinstance(seed, np.random.SeedSequence):
+        return np.random.SeedSequence(seed.entropy, spawn_key=tuple(seed.spawn_key) + key)
+    return np.random.SeedSequence(seed, spawn_key=key)
+
+
+def stream_rng(seed: Any, *key: int, bit_generator: str = 'philox') -> np.random.Generator:
+    """
+    Return the generator of the random stream identified by `seed` and `key`.
+
+    Parameters
+    ----------
+    seed : int or np.random.SeedSequence
+        Root seed (entropy) shared by all streams. None draws fresh entropy.
+    *key : int
+        Non-negative integers identifying the stream, e.g. `(worker,)` or
+        `(epoch, sample_index)`. Different keys give statistically independent streams.
+    bit_generator : str, optional
+        'philox' (counter-based, default) or 'pcg64'.
+
+    Returns
+    -------
+    np.random.Generator
+        The same seed, key and bit generator always give the same stream.
+    """
+    if bit_generator not in BIT_GENERATORS:
+        raise ValueError(f"Unsupported bit generator '{bit_generator}'. Supported bit generators are: "
+                         f"{list(BIT_GENERATORS)}.")
+    if any(not isinstance(part, (int, np.integer)) or part < 0 for part in key):
+        raise ValueError(f"Stream keys must be non-negative integers, but got {key}.")
+    key = tuple(int(part) for part in key)
+    return np.random.Generator(BIT_GENERATORS[bit_generator](_seed_sequence(seed, key)))
+
+
+def spawn_rngs(seed: Any, n: int, bit_generator: str = 'philox') -> List[np.random.Generator]:
+    """
+    Return generators for `n` independent streams of `seed`, e.g. one per worker.
+
+    Stream `i` is `stream_rng(seed, i, bit_generator=bit_generator)`, which is the stream
+    `np.random.SeedSequence(seed).spawn(n)[i]` seeds.
+    """
+    if not isinstance(n, int) or n < 0:
+        raise ValueError(f"'n' must be a non-negative integer, but got {n}.")
+    if seed is None:
+        seed = np.random.SeedSequence()  # one shared entropy so the streams stay distinct
+    return [stream_rng(seed, i, bit_generator=bit_generator) for i in range(n)]
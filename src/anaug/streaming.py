@@ -0,0 +1,330 @@
+"""
+Streaming Directory Augmentation Module
+
+This module augments image directories of any size with flat memory use. Files are
+discovered lazily, decoded ahead of time by reader threads, augmented by a pipeline
+stage and encoded by writer threads, with bounded queues between the stages so that
+only a fixed number of images is ever held in memory.
+
+Classes:
+- DirectoryStream: Reader -> pipeline -> writer streaming pipeline with per-stage throughput.
+
+Usage Examples:
+------------
+>>> from anaug import Compose, DirectoryStream
+>>> from anaug.default import flip, noise
+>>> pipeline = Compose([(flip, {'axes': 'horizontal'}), (noise, {'noise_intensity': 0.05})])
+>>> stream = DirectoryStream(pipeline, 'slices/', 'slices_augmented/', num_readers=4, num_writers=4)
+>>> stats = stream.run()
+>>> print(stats['read']['images_per_second'], stats['write']['images_per_second'])
+
+>>> # Consume augmented images directly instead of writing them
+>>> for relative_path, augmented in DirectoryStream(pipeline, 'slices/'):
+...     process(relative_path, augmented)
+"""
+
+import os
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+_DONE = object()
+
+DEFAULT_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.tif', '.tiff', '.bmp')
+
+
+def _iter_files(root: str, extensions: Sequence[str], recursive: bool) -> Iterator[str]:
+    """Lazily yield image paths under `root` without listing the whole tree up front."""
+    directories = [root]
+    while directories:
+        directory = directories.pop()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        directories.append(entry.path)
+                elif os.path.splitext(entry.name)[1].lower() in extensions:
+                    yield entry.path
+
+
+class _StageStats:
+    """Thread-safe image count and busy time of one stage."""
+
+    def __init__(self):
+        self.images = 0
+        self.busy_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float) -> None:
+        with self._lock:
+            self.images += 1
+            self.busy_seconds += seconds
+
+
+class DirectoryStream:
+    """
+    Stream images from a directory through an augmentation pipeline.
+
+    Parameters
+    ----------
+    pipeline : Callable[[np.ndarray], np.ndarray]
+        Function applied to every image, e.g. a `Compose`.
+    src_dir : str
+        Directory to read images from.
+    dst_dir : str, optional
+        Directory to write augmented images to, mirroring the layout of `src_dir`.
+        Required by `run`; not needed when iterating over the stream.
+    extensions : Sequence[str], optional
+        File extensions to pick up (case-insensitive). Defaults to common image formats.
+    recursive : bool, optional
+        Whether to descend into subdirectories. Default is True.
+    num_readers : int, optional
+        Number of decoding threads. Default is 2.
+    num_writers : int, optional
+        Number of encoding threads used by `run`. Default is 2.
+    queue_size : int, optional
+        Capacity of each queue between stages. Together with the thread counts this bounds
+        the number of images held in memory. Default is 16.
+    read_flags : int, optional
+        Flags passed to `cv2.imread`. Default is `cv2.IMREAD_UNCHANGED`.
+    normalize : bool, optional
+        If True, integer images are converted to float32 in [0, 1] before the pipeline
+        and converted back to their original dtype before writing. Default is True.
+    skip_unreadable : bool, optional
+        If True, files that cannot be decoded are skipped and counted; otherwise a
+        ValueError is raised. Default is False.
+
+    Notes
+    -----
+    The pipeline stage runs in the thread that consumes the stream. Images are processed
+    in directory-scan order, which is not sorted.
+    """
+
+    def __init__(
+        self,
+        pipeline: Callable[[np.ndarray], np.ndarray],
+        src_dir: str,
+        dst_dir: Optional[str] = None,
+        extensions: Sequence[str] = DEFAULT_EXTENSIONS,
+        recursive: bool = True,
+        num_readers: int = 2,
+        num_writers: int = 2,
+        queue_size: int = 16,
+        read_flags: int = cv2.IMREAD_UNCHANGED,
+        normalize: bool = True,
+        skip_unreadable: bool = False
+    ):
+        if not callable(pipeline):
+            raise TypeError(f"'pipeline' must be callable, but got {type(pipeline).__name__}.")
+        if not os.path.isdir(src_dir):
+            raise ValueError(f"Source directory '{src_dir}' does not exist.")
+        for value, name in zip([num_readers, num_writers, queue_size], ['num_readers', 'num_writers', 'queue_size']):
+            if not isinstance(value, int) or value < 1:
+                raise ValueError(f"'{name}' must be a positive integer, but got {value}.")
+
+        self.pipeline = pipeline
+        self.src_dir = src_dir
+        self.dst_dir = dst_dir
+        self.extensions = tuple(extension.lower() for extension in extensions)
+        self.recursive = recursive
+        self.num_readers = num_readers
+        self.num_writers = num_writers
+        self.queue_size = queue_size
+        self.read_flags = read_flags
+        self.normalize = normalize
+        self.skip_unreadable = skip_unreadable
+        self._reset_stats()
+
+    def _reset_stats(self) -> None:
+        self._stages = {'read': _StageStats(), 'augment': _StageStats(), 'write': _StageStats()}
+        self._skipped = 0
+        self._started = None
+        self._finished = None
+
+    # ---------------------
+    # Stages
+    # ---------------------
+    def _decode(self, path: str) -> Optional[Tuple[np.ndarray, Any]]:
+        image = cv2.imread(path, self.read_flags)
+        if image is None:
+            if self.skip_unreadable:
+                return None
+            raise ValueError(f"Could not decode image '{path}'.")
+        dtype = image.dtype
+        if self.normalize and np.issubdtype(dtype, np.integer):
+            image = image.astype(np.float32) / np.iinfo(dtype).max
+        return image, dtype
+
+    def _encode(self, relative_path: str, image: np.ndarray, dtype: Any) -> None:
+        if self.normalize and np.issubdtype(dtype, np.integer) and not np.issubdtype(image.dtype, np.integer):
+            info = np.iinfo(dtype)
+            image = np.round(np.clip(image, 0.0, 1.0) * info.max).astype(dtype)
+        path = os.path.join(self.dst_dir, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if not cv2.imwrite(path, image):
+            raise ValueError(f"Could not encode image '{path}'.")
+
+    @staticmethod
+    def _put(target: queue.Queue, item: Any, stop: threading.Event) -> bool:
+        """Blocking put that gives up once `stop` is set."""
+        while not stop.is_set():
+            try:
+                target.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _reader(self, paths, paths_lock, decoded, stop, errors, remaining) -> None:
+        try:
+            while not stop.is_set():
+                with paths_lock:
+                    path = next(paths, None)
+                if path is None:
+                    break
+                begin = time.perf_counter()
+                result = self._decode(path)
+                if result is None:
+                    with paths_lock:
+                        self._skipped += 1
+                    continue
+                self._stages['read'].add(time.perf_counter() - begin)
+                relative_path = os.path.relpath(path, self.src_dir)
+                if not self._put(decoded, (relative_path,) + result, stop):
+                    break
+        except Exception as error:
+            errors.append(error)
+            stop.set()
+        finally:
+            with paths_lock:
+                remaining[0] -= 1
+                last = remaining[0] == 0
+            if last:
+                self._put(decoded, _DONE, stop)
+
+    def _writer(self, encoded, stop, errors) -> None:
+        # Keep draining until the end marker even after a failure, so producers never block
+        while True:
+            item = encoded.get()
+            if item is _DONE:
+                break
+            if stop.is_set():
+                continue
+            try:
+                begin = time.perf_counter()
+                self._encode(*item)
+                self._stages['write'].add(time.perf_counter() - begin)
+            except Exception as error:
+                errors.append(error)
+                stop.set()
+
+    def _stream(self, keep_dtype: bool) -> Iterator[tuple]:
+        self._reset_stats()
+        self._started = time.perf_counter()
+
+        paths = _iter_files(self.src_dir, self.extensions, self.recursive)
+        paths_lock = threading.Lock()
+        decoded = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+        errors = []
+        remaining = [self.num_readers]
+        readers = [
+            threading.Thread(target=self._reader, args=(paths, paths_lock, decoded, stop, errors, remaining),
+                             name=f"anaug-reader-{i}", daemon=True)
+            for i in range(self.num_readers)
+        ]
+        for reader in readers:
+            reader.start()
+
+        try:
+            while True:
+                try:
+                    item = decoded.get(timeout=0.1)
+                except queue.Empty:
+                    if errors:
+                        break
+                    continue
+                if item is _DONE:
+                    break
+                relative_path, image, dtype = item
+                begin = time.perf_counter()
+                augmented = self.pipeline(image)
+                self._stages['augment'].add(time.perf_counter() - begin)
+                yield (relative_path, augmented, dtype) if keep_dtype else (relative_path, augmented)
+        finally:
+            stop.set()
+            for reader in readers:
+                reader.join()
+            self._finished = time.perf_counter()
+        if errors:
+            raise errors[0]
+
+    def __iter__(self) -> Iterator[Tuple[str, np.ndarray]]:
+        """Yield `(relative_path, augmented_image)` pairs as they come out of the pipeline."""
+        return self._stream(keep_dtype=False)
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Augment every image of `src_dir` and write the results to `dst_dir`.
+
+        Returns
+        -------
+        Dict[str, Any]
+            The statistics reported by `stats`.
+        """
+        if self.dst_dir is None:
+            raise ValueError("'dst_dir' must be set to write augmented images.")
+
+        encoded = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+        errors = []
+        writers = [
+            threading.Thread(target=self._writer, args=(encoded, stop, errors),
+                             name=f"anaug-writer-{i}", daemon=True)
+            for i in range(self.num_writers)
+        ]
+        for writer in writers:
+            writer.start()
+
+        try:
+            for item in self._stream(keep_dtype=True):
+                if not self._put(encoded, item, stop):
+                    break
+        finally:
+            for _ in writers:
+                encoded.put(_DONE)
+            for writer in writers:
+                writer.join()
+            self._finished = time.perf_counter()
+        if errors:
+            raise errors[0]
+        return self.stats()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report per-stage throughput of the last run or iteration.
+
+        Returns
+        -------
+        Dict[str, Any]
+            - 'wall_seconds': elapsed time of the run.
+            - 'read', 'augment', 'write': number of images, busy seconds summed over the
+              stage's threads, and 'images_per_second' over the wall time.
+            - 'skipped': number of files that could not be decoded.
+        """
+        if self._started is None:
+            wall = 0.0
+        else:
+            wall = (self._finished or time.perf_counter()) - self._started
+        report = {'wall_seconds': wall, 'skipped': self._skipped}
+        for name, stage in self._stages.items():
+            report[name] = {
+                'images': stage.images,
+                'busy_seconds': stage.busy_seconds,
+                'images_per_second': stage.images / wall if wall > 0 else 0.0,
+            }
+        return report
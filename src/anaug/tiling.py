@@ -0,0 +1,322 @@
+"""
+Tiled Execution Module
+
+This module applies augmentations to images too large to process at once, such as
+whole-slide images, by splitting them into tiles. Every tile is read together with a
+halo of surrounding pixels, wide enough to hold everything the op looks at (e.g. 4 sigma
+for a Gaussian blur, the largest displacement for an elastic deformation). The op then
+runs on that window and only the tile itself is written back, so neighbouring tiles join
+without seams. Tiles run in parallel on a thread pool. The input and output may be
+`.npy` memory maps, so peak memory is bounded by the tile size and the number of
+threads rather than by the image size.
+
+Functions:
+- tile_halo: Halo in pixels that an op needs around every tile.
+- tiled_apply: Apply an op to an image (or `.npy` file) tile by tile.
+
+Usage Examples:
+------------
+>>> from anaug import tiled_apply
+>>> from anaug.default import blur, elastic_deformation
+>>> blurred = tiled_apply(blur, 'slide.npy', 'slide_blurred.npy', {'blur_type': 'gaussian', 'blur_radius': 8})
+>>> deformed = tiled_apply(elastic_deformation, blurred, 'slide_deformed.npy', {'alpha': 34, 'sigma': 4},
+...                        tile_size=2048, num_threads=8, seed=0)
+"""
+
+import inspect
+import math
+import multiprocessing
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .rng import stream_rng, use_rng
+
+ArrayOrPath = Union[str, os.PathLike, np.ndarray]
+
+DEFAULT_TILE_SIZE = 1024
+
+# Built-in ops are recognized by name rather than identity, as in `Compose`
+_PACKAGE = __name__.rsplit('.', 1)[0] + '.'
+_DEFAULT_OPS_MODULE = _PACKAGE + 'default.'
+
+# Built-in ops whose result depends on the whole image at once, with the reason
+_UNTILEABLE_OPS = {
+    'random_lesion': "it places its lesions, shapes irregular ones with a noise field and "
+                     "normalizes their texture over the whole image, so tiles would each get "
+                     "different lesions",
+}
+
+# Parameters that `tiled_apply` controls itself
+_RESERVED_PARAMS = ('out', 'inplace', 'rng', 'random_state', 'mean')
+
+
+def _arguments(op: Callable[..., np.ndarray], params: Dict[str, Any]) -> Dict[str, Any]:
+    """Bind `params` to the signature of `op`, with defaults, without the image argument."""
+    signature = inspect.signature(op)
+    bound = signature.bind(None, **params)
+    bound.apply_defaults()
+    arguments = dict(bound.arguments)
+    arguments.pop(next(iter(signature.parameters)))
+    for name, parameter in signature.parameters.items():
+        if parameter.kind is inspect.Parameter.VAR_KEYWORD:
+            arguments.update(arguments.pop(name, {}))
+    return arguments
+
+
+def _blur_halo(blur_type='gaussian', blur_radius=1, method='exact', length=5, **_) -> int:
+    if blur_type == 'gaussian':
+        # 4 sigma kernels; the pyramid method also rounds the tile to its downsampling grid
+        extent = 4.0 * blur_radius + (blur_radius / 2 if method == 'pyramid' else 0)
+        return math.ceil(extent) + 1
+    if blur_type in ('uniform', 'median'):
+        return int(np.max(blur_radius)) // 2 + 1
+    if blur_type == 'motion':
+        return int(length) // 2 + 1
+    raise ValueError("Unsupported blur type. Use 'gaussian', 'uniform', 'median', or 'motion'.")
+
+
+# Halo of every op that can be tiled, as a function of its parameters
+_HALOS: Dict[str, Callable[..., int]] = {
+    'blur': _blur_halo,
+    'motion_blur': lambda length=5, **_: int(length) // 2 + 1,
+    'elastic_deformation': lambda alpha=34.0, **_: math.ceil(alpha) + 1,
+    'intensity': lambda **_: 0,
+    'noise': lambda **_: 0,
+}
+
+
+def _op_name(op: Callable[..., np.ndarray]) -> Optional[str]:
+    module = getattr(op, '__module__', None) or ''
+    return getattr(op, '__name__', None) if module.startswith(_DEFAULT_OPS_MODULE) else None
+
+
+def _check_tileable(op: Callable[..., np.ndarray]) -> None:
+    module = getattr(op, '__module__', None) or ''
+    name = getattr(op, '__name__', None)
+    if module.startswith(_PACKAGE) and name in _UNTILEABLE_OPS:
+        raise ValueError(f"{name!r} cannot be applied tile by tile: {_UNTILEABLE_OPS[name]}.")
+
+
+def tile_halo(op: Callable[..., np.ndarray], params: Optional[Dict[str, Any]] = None) -> int:
+    """
+    Return the halo, in pixels, that `op` called with `params` needs around every tile.
+
+    Parameters
+    ----------
+    op : Callable[..., np.ndarray]
+        One of the `anaug.default` ops `blur`, `motion_blur`, `elastic_deformation`,
+        `intensity` or `noise`.
+    params : Dict[str, Any], optional
+        Keyword arguments of `op`.
+
+    Returns
+    -------
+    int
+        Number of pixels the result of a pixel depends on in every direction.
+
+    Raises
+    ------
+    ValueError
+        If the halo of `op` is not known (pass `halo=` to `tiled_apply` for other ops), or
+        `op` cannot be tiled (`random_lesion`).
+    """
+    _check_tileable(op)
+    name = _op_name(op)
+    if name not in _HALOS:
+        raise ValueError(f"The halo of {getattr(op, '__name__', op)!r} is not known; pass 'halo' explicitly. "
+                         f"Ops with a known halo are: {list(_HALOS)}.")
+    return _HALOS[name](**_arguments(op, params or {}))
+
+
+def _tiles(shape: Tuple[int, ...], tile_size: Tuple[int, int]) -> List[Tuple[int, int, int, int]]:
+    return [(top, min(top + tile_size[0], shape[0]), left, min(left + tile_size[1], shape[1]))
+            for top in range(0, shape[0], tile_size[0])
+            for left in range(0, shape[1], tile_size[1])]
+
+
+def _chunked_mean(source: np.ndarray, rows: int) -> float:
+    """Mean of `source`, accumulated band by band in double precision."""
+    total = 0.0
+    for top in range(0, source.shape[0], rows):
+        total += np.sum(source[top:top + rows], dtype=np.float64)
+    return total / source.size
+
+
+def tiled_apply(
+    op: Callable[..., np.ndarray],
+    source: ArrayOrPath,
+    destination: Optional[ArrayOrPath] = None,
+    params: Optional[Dict[str, Any]] = None,
+    *,
+    tile_size: Union[int, Tuple[int, int]] = DEFAULT_TILE_SIZE,
+    halo: Optional[int] = None,
+    num_threads: Optional[int] = None,
+    seed: Optional[int] = None
+) -> np.ndarray:
+    """
+    Apply `op` to a large image tile by tile, with a halo around every tile.
+
+    Every tile is read together with `halo` pixels on each side (fewer at the image
+    borders, which the op then handles with its own border mode), and only the tile is
+    written back. For the built-in ops the halo covers everything the result depends on,
+    so the tiled result of deterministic ops equals the untiled one (up to floating-point
+    rounding; the approximate Gaussian methods stay within their approximation error).
+
+    Random ops draw from per-tile streams of `seed` and are reproducible for a seed and
+    tile size, but differ from the untiled call:
+
+    - `noise` draws every tile from the stream `anaug.stream_rng(seed, top, left)`.
+    - `elastic_deformation` (`method='exact'` only) draws its random fields in fixed
+      128x128 blocks, so its result does not depend on the tile size and has no seams.
+    - `intensity` stretches the contrast around the mean of the whole image, computed in
+      a first pass.
+
+    `anaug.generative.random_lesion` cannot be tiled, with any halo: it places its lesions,
+    shapes irregular ones with a noise field and normalizes their texture over the whole
+    image, so every tile would get different lesions.
+
+    Parameters
+    ----------
+    op : Callable[..., np.ndarray]
+        Shape- and dtype-preserving op taking an (H, W) or (H, W, C) image, e.g. `blur`.
+    source : str, os.PathLike or np.ndarray
+        Path to an `.npy` file (opened read-only with `mmap_mode='r'`), or an array or
+        `np.memmap` of shape (H, W) or (H, W, C).
+    destination : str, os.PathLike or np.ndarray, optional
+        Path of the `.npy` file to create, or a preallocated array / `np.memmap` with the
+        shape and dtype of `source`. If None, a regular in-memory array is allocated.
+    params : Dict[str, Any], optional
+        Keyword arguments of `op`. Arrays whose first two dimensions are (H, W), such as
+        per-pixel blur sizes, are cut into tiles along with the image.
+    tile_size : int or Tuple[int, int], optional
+        Tile (height, width), or one size for both. Default is 1024.
+    halo : int, optional
+        Pixels read around every tile. Defaults to `tile_halo(op, params)`; required for
+        other ops.
+    num_threads : int, optional
+        Number of tiles processed in parallel. Defaults to `os.cpu_count()`.
+    seed : int, optional
+        Root seed of the random streams of random ops. If None, fresh entropy is used.
+
+    Returns
+    -------
+    np.ndarray
+        The output array (an `np.memmap` when `destination` is a path or memory map).
+
+    Raises
+    ------
+    TypeError
+        If `op` is not callable, `source` is not an array or path, or `params` does not
+        match the signature of `op`.
+    ValueError
+        If the image is not 2D or 3D, `destination` does not match it, the tiling
+        parameters are invalid, `params` contains an argument that tiling controls
+        (`out`, `inplace`, `rng`, `random_state`, `mean`), the halo of `op` is unknown, or
+        `op` cannot be tiled (`random_lesion`).
+    """
+    # ---------------------
+    # Validation
+    # ---------------------
+    if not callable(op):
+        raise TypeError(f"'op' must be callable, but got {type(op).__name__}.")
+    _check_tileable(op)
+    if isinstance(source, (str, os.PathLike)):
+        source = np.load(source, mmap_mode='r')
+    elif not isinstance(source, np.ndarray):
+        raise TypeError(f"'source' must be a path or a NumPy array, but got {type(source).__name__}.")
+    if source.ndim not in [2, 3] or source.size == 0:
+        raise ValueError(f"'source' must be a non-empty 2D or 3D image, but got shape {source.shape}.")
+
+    params = dict(params or {})
+    reserved = [name for name in _RESERVED_PARAMS if params.get(name) is not None]
+    if reserved:
+        raise ValueError(f"'params' must not set {reserved}: tiled execution controls them.")
+    arguments = _arguments(op, params)
+
+    if isinstance(tile_size, int):
+        tile_size = (tile_size, tile_size)
+    if not (isinstance(tile_size, tuple) and len(tile_size) == 2 and
+            all(isinstance(size, int) and size > 0 for size in tile_size)):
+        raise ValueError(f"'tile_size' must be a positive integer or a pair of them, but got {tile_size}.")
+    if halo is None:
+        halo = tile_halo(op, params)
+    elif not isinstance(halo, int) or halo < 0:
+        raise ValueError(f"'halo' must be a non-negative integer, but got {halo}.")
+    if num_threads is None:
+        num_threads = multiprocessing.cpu_count()
+    if not isinstance(num_threads, int) or num_threads < 1:
+        raise ValueError(f"'num_threads' must be a positive integer, but got {num_threads}.")
+
+    # ---------------------
+    # Output Allocation
+    # ---------------------
+    if destination is None:
+        out = np.empty(source.shape, dtype=source.dtype)
+    elif isinstance(destination, (str, os.PathLike)):
+        out = np.lib.format.open_memmap(destination, mode='w+', dtype=source.dtype, shape=source.shape)
+    elif isinstance(destination, np.ndarray):
+        out = destination
+        if out.shape != source.shape or out.dtype != source.dtype:
+            raise ValueError(f"'destination' must have shape {source.shape} and dtype {source.dtype}, "
+                             f"but got {out.shape} and {out.dtype}.")
+    else:
+        raise TypeError(f"'destination' must be None, a path or a NumPy array, but got {type(destination).__name__}.")
+
+    # ---------------------
+    # Whole-Image Statistics
+    # ---------------------
+    name = _op_name(op)
+    entropy = np.random.SeedSequence(seed).entropy
+    if name == 'elastic_deformation' and arguments['method'] != 'exact':
+        raise ValueError("Tiled elastic deformations draw their fields with method='exact' only.")
+    if name == 'intensity' and arguments['contrast_factor'] != 1:
+        params['mean'] = _chunked_mean(source, tile_size[0])
+
+    height, width = source.shape[:2]
+    per_pixel = {key: value for key, value in params.items()
+                 if isinstance(value, np.ndarray) and value.shape[:2] == (height, width)}
+
+    def run_tile(tile: Tuple[int, int, int, int]) -> None:
+        top, bottom, left, right = tile
+        window_top, window_left = max(top - halo, 0), max(left - halo, 0)
+        window_bottom, window_right = min(bottom + halo, height), min(right + halo, width)
+        window = np.asarray(source[window_top:window_bottom, window_left:window_right])
+        if name == 'elastic_deformation':
+            from .default.elastic_deformation import _elastic_tile
+            result = _elastic_tile(window, (window_top, window_left), tile, source.shape,
+                                   arguments['alpha'], arguments['sigma'], entropy, arguments['fixed_point'])
+            out[top:bottom, left:right] = result.astype(out.dtype, copy=False)
+            return
+        tile_params = dict(params)
+        for key, value in per_pixel.items():
+            tile_params[key] = value[window_top:window_bottom, window_left:window_right]
+        with use_rng(stream_rng(entropy, top, left)):
+            result = op(window, **tile_params)
+        out[top:bottom, left:right] = result[top - window_top:bottom - window_top, left - window_left:right - window_left]
+
+    # ---------------------
+    # Tiles
+    # ---------------------
+    tiles = _tiles(source.shape, tile_size)
+    if num_threads == 1 or len(tiles) == 1:
+        for tile in tiles:
+            run_tile(tile)
+    else:
+        # Imported here so that serial runs of ops that never use OpenCV do not load it
+        import cv2
+        previous_cv2_threads = cv2.getNumThreads()
+        # One OpenCV thread per tile, so that OpenCV does not oversubscribe the pool's cores
+        cv2.setNumThreads(1)
+        try:
+            with ThreadPoolExecutor(max_workers=num_threads, thread_name_prefix="anaug-tile") as pool:
+                for future in [pool.submit(run_tile, tile) for tile in tiles]:
+                    future.result()
+        finally:
+            cv2.setNumThreads(previous_cv2_threads)
+
+    if isinstance(out, np.memmap):
+        out.flush()
+    return out
@@ -1,6 +1,9 @@
 import unittest
 import numpy as np
-from src.anaug.default import blur
+import cv2
+from scipy.ndimage import gaussian_filter, median_filter, uniform_filter
+from src.anaug.default import blur, blur_batch, motion_blur
+from src.anaug.default._filters import _motion_kernel
 
 
 class TestBlur(unittest.TestCase):
@@ -49,5 +52,280 @@ class TestBlur(unittest.TestCase):
             blur(self.image, blur_type='invalid')
 
 
+class TestBlurBatch(unittest.TestCase):
+    """
+    Test suite for the `blur_batch` function.
+    """
+
+    def setUp(self):
+        """Set up test batches for use in all test cases."""
+        self.batch = np.random.rand(5, 32, 32)
+        self.color_batch = np.random.rand(3, 32, 32, 3)
+
+    def test_matches_single_image(self):
+        """Test if each image matches `blur` with its own radius."""
+        radii = [1, 2, 1, 3, 2]
+        for blur_type in ('gaussian', 'uniform', 'median'):
+            blurred = blur_batch(self.batch, blur_type=blur_type, blur_radii=radii)
+            for i, image in enumerate(self.batch):
+                np.testing.assert_allclose(blurred[i], blur(image, blur_type=blur_type, blur_radius=radii[i]))
+
+    def test_color_batch(self):
+        """Test if color batches keep their shape and match `blur`."""
+        blurred = blur_batch(self.color_batch, blur_type='gaussian', blur_radii=2)
+        self.assertEqual(blurred.shape, self.color_batch.shape)
+        np.testing.assert_allclose(blurred[1], blur(self.color_batch[1], blur_type='gaussian', blur_radius=2))
+
+    def test_motion_blur(self):
+        """Test if motion blur is applied to every image."""
+        blurred = blur_batch(self.batch.astype(np.float32), blur_type='motion', length=7, angle=30)
+        self.assertEqual(blurred.shape, self.batch.shape)
+
+    def test_invalid_blur_type(self):
+        """Test if an unsupported blur type raises a ValueError."""
+        with self.assertRaises(ValueError):
+            blur_batch(self.batch, blur_type='invalid')
+
+
+class TestBlurOut(unittest.TestCase):
+    """
+    Test suite for the `out` parameter of `blur` and `blur_batch`.
+    """
+
+    def setUp(self):
+        self.image = np.random.rand(32, 32).astype(np.float32)
+
+    def test_out_matches_default(self):
+        """Test if every blur type writes the default result into `out`."""
+        for blur_type in ('gaussian', 'uniform', 'median', 'motion'):
+            out = np.empty_like(self.image)
+            self.assertIs(blur(self.image, blur_type, 3, out=out), out)
+            np.testing.assert_array_equal(out, blur(self.image, blur_type, 3))
+
+    def test_batch_out(self):
+        """Test if `blur_batch` writes into `out`."""
+        batch = np.stack([self.image, self.image * 0.5])
+        for blur_type in ('gaussian', 'motion'):
+            out = np.empty_like(batch)
+            self.assertIs(blur_batch(batch, blur_type, [1, 2], out=out), out)
+            np.testing.assert_array_equal(out, blur_batch(batch, blur_type, [1, 2]))
+
+
+
+class TestBlurChannels(unittest.TestCase):
+    """
+    Test suite for the channel handling and the Gaussian backends of `blur`.
+    """
+
+    def test_channels_blurred_independently(self):
+        """Test if no channel bleeds into another for any blur type."""
+        image = np.zeros((32, 32, 3), dtype=np.float32)
+        image[..., 1] = np.random.rand(32, 32)
+        for blur_type in ('gaussian', 'uniform', 'median'):
+            blurred = blur(image, blur_type, 3)
+            np.testing.assert_array_equal(blurred[..., 0], 0)
+            np.testing.assert_array_equal(blurred[..., 2], 0)
+            np.testing.assert_allclose(blurred[..., 1], blur(image[..., 1], blur_type, 3), atol=1e-6)
+
+    def test_gaussian_matches_scipy(self):
+        """Test if every backend gives the per-channel `gaussian_filter` result."""
+        # Integer results are compared with the rounded float result, and with SciPy's integer result
+        for dtype, top, atol in ((np.float64, 1, 1e-10), (np.float32, 1, 1e-4), (np.uint8, 256, 2), (np.uint16, 65536, 2)):
+            for channels in (1, 3, 8, 600):
+                for sigma in (0.5, 0.7, 3, 20):
+                    shape = (24, 40) if channels == 1 else (24, 40, channels)
+                    image = (np.random.rand(*shape) * top).astype(dtype)
+                    spatial_sigma = (sigma,) * 2 + (0,) * (image.ndim - 2)
+                    expected = gaussian_filter(image.astype(np.float64), sigma=spatial_sigma)
+                    blurred = blur(image, 'gaussian', sigma)
+                    self.assertEqual(blurred.shape, image.shape)
+                    self.assertEqual(blurred.dtype, image.dtype)
+                    message = f"{np.dtype(dtype)}, {channels} channels, sigma {sigma}"
+                    if np.issubdtype(dtype, np.integer):
+                        np.testing.assert_allclose(blurred, np.rint(expected), atol=atol, err_msg=message)
+                        np.testing.assert_allclose(blurred.astype(np.float64),
+                                                   gaussian_filter(image, sigma=spatial_sigma), atol=3, err_msg=message)
+                    else:
+                        np.testing.assert_allclose(blurred, expected, atol=atol, err_msg=message)
+
+    def test_median_matches_scipy(self):
+        """Test if every median backend gives exactly the per-channel `median_filter` result."""
+        inputs = (
+            (np.uint8, 255),
+            (np.uint16, 4095),   # 12-bit data, split into byte medians from 7x7 windows
+            (np.uint16, 65535),
+            (np.float32, 1),
+            (np.float64, 1),
+        )
+        for dtype, maximum in inputs:
+            for shape in ((40, 36), (6, 9), (30, 20, 3)):
+                image = (np.random.rand(*shape) * maximum).astype(dtype)
+                for size in (2, 3, 5, 9, 25):
+                    expected = median_filter(image, size=(size, size) + (1,) * (image.ndim - 2))
+                    np.testing.assert_array_equal(blur(image, 'median', size), expected,
+                                                  err_msg=f"{np.dtype(dtype)}, {shape}, size {size}")
+        batch = (np.random.rand(2, 16, 16, 2) * 4095).astype(np.uint16)
+        out = np.empty_like(batch)
+        self.assertIs(blur_batch(batch, 'median', [3, 9], out=out), out)
+        for image, result, size in zip(batch, out, (3, 9)):
+            np.testing.assert_array_equal(result, median_filter(image, size=(size, size, 1)))
+
+    def test_gaussian_out_single_channel(self):
+        """Test if an (H, W, 1) image keeps its channel axis and fills `out`."""
+        image = np.random.rand(16, 16, 1).astype(np.float32)
+        out = np.empty_like(image)
+        self.assertIs(blur(image, 'gaussian', 2, out=out), out)
+        np.testing.assert_array_equal(out, blur(image, 'gaussian', 2))
+        self.assertEqual(blur(image, 'gaussian', 2).shape, image.shape)
+
+    def test_batch_channels(self):
+        """Test if `blur_batch` matches `blur` for color batches on every backend."""
+        for dtype in (np.uint8, np.float64):
+            batch = (np.random.rand(3, 20, 20, 3) * 255).astype(dtype)
+            for radius in (1, 30):
+                blurred = blur_batch(batch, 'gaussian', radius)
+                for image, result in zip(batch, blurred):
+                    np.testing.assert_array_equal(result, blur(image, 'gaussian', radius))
+
+
+class TestGaussianApproximations(unittest.TestCase):
+    """
+    Test suite for the recursive ('iir') and pyramid Gaussian blur methods.
+    """
+
+    def setUp(self):
+        """Set up an image with sharp edges, the worst case of both approximations."""
+        self.image = np.zeros((96, 128), dtype=np.float32)
+        self.image[:, 64:] = 1
+        self.image[30:50, :] = 1
+
+    def test_error_bounds(self):
+        """Test if both methods stay within their documented error of `gaussian_filter`."""
+        for method, bound in (('iir', 0.03), ('pyramid', 0.005)):
+            for dtype, scale in ((np.float32, 1), (np.float64, 1), (np.uint8, 255), (np.uint16, 4095)):
+                for channels in (1, 3):
+                    image = (self.image * scale).astype(dtype)
+                    if channels == 3:
+                        image = np.stack([image, image[::-1], scale - image], axis=-1)
+                    for sigma in (1, 3, 8, 20):
+                        expected = gaussian_filter(image.astype(np.float64), sigma=(sigma,) * 2 + (0,) * (image.ndim - 2))
+                        blurred = blur(image, 'gaussian', sigma, method=method)
+                        self.assertEqual(blurred.shape, image.shape)
+                        self.assertEqual(blurred.dtype, image.dtype)
+                        # One more level for the rounding of integer results
+                        atol = bound * scale + (1 if np.issubdtype(dtype, np.integer) else 0)
+                        np.testing.assert_allclose(blurred.astype(np.float64), expected, atol=atol,
+                                                   err_msg=f"{method}, {np.dtype(dtype)}, {channels} channels, "
+                                                           f"sigma {sigma}")
+
+    def test_exact_for_small_sigma(self):
+        """Test if sigmas too small for an approximation are blurred exactly."""
+        np.testing.assert_array_equal(blur(self.image, 'gaussian', 2, method='iir'), blur(self.image, 'gaussian', 2))
+        np.testing.assert_array_equal(blur(self.image, 'gaussian', 7, method='pyramid'),
+                                      blur(self.image, 'gaussian', 7))
+        with self.assertRaises(ValueError):
+            blur(self.image, 'gaussian', 2, method='fir')
+
+    def test_batch_and_out(self):
+        """Test if `blur_batch` and `out` give the results of `blur`."""
+        batch = np.stack([self.image, self.image[::-1, ::-1]])
+        for method in ('iir', 'pyramid'):
+            out = np.empty_like(batch)
+            self.assertIs(blur_batch(batch, 'gaussian', [10, 16], out=out, method=method), out)
+            for image, result, sigma in zip(batch, out, (10, 16)):
+                np.testing.assert_array_equal(result, blur(image, 'gaussian', sigma, method=method))
+
+
+class TestBoxBlur(unittest.TestCase):
+    """
+    Test suite for the OpenCV and summed-area-table backends of uniform blurs.
+    """
+
+    def test_matches_scipy(self):
+        """Test if uniform blurs give the window means of `uniform_filter` for every dtype and window."""
+        # int32 and bool images fall back to SciPy, which truncates after each axis
+        for dtype, atol in ((np.float64, 1e-10), (np.float32, 1e-4), (np.uint8, 1), (np.uint16, 0.5),
+                            (np.int32, 2), (bool, 1)):
+            for shape in ((30, 41), (30, 41, 3)):
+                image = (np.random.rand(*shape) * 200).astype(dtype)
+                for size in (1, 2, 5, 40):
+                    expected = uniform_filter(image.astype(np.float64), size=(size, size) + (1,) * (image.ndim - 2))
+                    blurred = blur(image, 'uniform', size)
+                    self.assertEqual(blurred.dtype, image.dtype)
+                    np.testing.assert_allclose(blurred.astype(np.float64), expected, atol=atol,
+                                               err_msg=f"{np.dtype(dtype)}, {shape}, size {size}")
+
+    def test_size_per_pixel_and_channel(self):
+        """Test if every pixel and channel gets the window mean of its own size."""
+        image = np.random.rand(40, 50, 3)
+        sizes = np.random.randint(1, 12, size=(40, 50))
+        blurred = blur(image, 'uniform', sizes)
+        for size in np.unique(sizes):
+            region = sizes == size
+            np.testing.assert_allclose(blurred[region], uniform_filter(image, size=(size, size, 1))[region], atol=1e-12)
+        integer = (image * 255).astype(np.uint8)
+        np.testing.assert_array_equal(blur(integer, 'uniform', np.full((40, 50), 5)), blur(integer, 'uniform', 5))
+        per_channel = blur(image, 'uniform', [1, 4, 9])
+        for channel, size in enumerate((1, 4, 9)):
+            np.testing.assert_allclose(per_channel[..., channel], uniform_filter(image[..., channel], size), atol=1e-12)
+        with self.assertRaises(ValueError):
+            blur(image, 'uniform', np.ones((40, 49)))
+        with self.assertRaises(ValueError):
+            blur(image, 'uniform', [3, 3])
+
+    def test_batch_per_sample_radii(self):
+        """Test if `blur_batch` with one radius per sample matches `blur`."""
+        batch = np.random.rand(4, 24, 24, 2).astype(np.float32)
+        blurred = blur_batch(batch, 'uniform', [1, 3, 8, 3])
+        for image, result, size in zip(batch, blurred, (1, 3, 8, 3)):
+            np.testing.assert_array_equal(result, blur(image, 'uniform', size))
+
+
+class TestMotionBlur(unittest.TestCase):
+    """
+    Test suite for the kernel cache and the FFT path of `motion_blur`.
+    """
+
+    @staticmethod
+    def _filter2d(image, length, angle):
+        """Reference: `cv2.filter2D` with the full, uncropped rotated kernel."""
+        kernel = np.zeros((length, length))
+        kernel[length // 2, :] = 1 / length
+        rotation = cv2.getRotationMatrix2D((length // 2, length // 2), angle, 1)
+        return cv2.filter2D(image, -1, cv2.warpAffine(kernel, rotation, (length, length)))
+
+    def test_kernel_cache(self):
+        """Test if kernels are cached per rounded angle and cannot be modified."""
+        image = np.random.rand(24, 24).astype(np.float32)
+        motion_blur(image, length=9, angle=30)
+        hits = _motion_kernel.cache_info().hits
+        np.testing.assert_array_equal(motion_blur(image, length=9, angle=30.001), motion_blur(image, length=9, angle=-330))
+        self.assertEqual(_motion_kernel.cache_info().hits, hits + 2)
+        kernel, _ = _motion_kernel(9, 30.0)
+        self.assertFalse(kernel.flags.writeable)
+        self.assertLess(kernel.shape[0], 9)   # cropped to the rows of the line
+
+    def test_matches_filter2d(self):
+        """Test if the cropped kernels and the FFT path give the full-kernel `cv2.filter2D` result."""
+        for dtype, atol in ((np.float64, 1e-10), (np.float32, 1e-4), (np.uint8, 1), (np.uint16, 1)):
+            for shape in ((60, 90), (60, 90, 3)):
+                image = (np.random.rand(*shape) * 200).astype(dtype)
+                for length in (1, 4, 15, 101, 130):   # from 101 pixels: FFT
+                    for angle in (0, 12.5, 45, 90, 200):
+                        blurred = motion_blur(image, length=length, angle=angle)
+                        self.assertEqual(blurred.shape, image.shape)
+                        self.assertEqual(blurred.dtype, image.dtype)
+                        np.testing.assert_allclose(blurred.astype(np.float64),
+                                                   self._filter2d(image, length, angle).astype(np.float64), atol=atol,
+                                                   err_msg=f"{np.dtype(dtype)}, {shape}, length {length}, angle {angle}")
+
+    def test_fft_out_and_workers(self):
+        """Test if the FFT path fills `out` and does not depend on the number of workers."""
+        image = (np.random.rand(40, 50, 2) * 255).astype(np.uint8)
+        out = np.empty_like(image)
+        self.assertIs(blur(image, 'motion', length=101, angle=30, out=out, workers=2), out)
+        np.testing.assert_array_equal(out, motion_blur(image, length=101, angle=30))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,6 +1,7 @@
+import tracemalloc
 import unittest
 import numpy as np
-from src.anaug.default import crop
+from src.anaug.default import crop, crop_batch
 
 
 class TestCropFunction(unittest.TestCase):
@@ -207,5 +208,112 @@ class TestCropFunction(unittest.TestCase):
         expected = rgba_image[top:top+height, left:left+width, :]
         np.testing.assert_array_equal(cropped, expected)
 
+    def test_crop_without_copy_returns_view(self):
+        cropped = crop(self.color_image, 10, 20, 30, 40, copy=False)
+        self.assertTrue(np.shares_memory(cropped, self.color_image))
+        np.testing.assert_array_equal(cropped, self.color_image[10:40, 20:60])
+        self.assertFalse(np.shares_memory(crop(self.color_image, 10, 20, 30, 40), self.color_image))
+        # Padded crops are new arrays even without a copy
+        padded = crop(self.color_image, 90, 90, 20, 20, adjust_if_exceeds=True, pad_value=(1, 2, 3), copy=False)
+        self.assertFalse(np.shares_memory(padded, self.color_image))
+
+    def test_crop_padding_matches_np_pad(self):
+        image = np.random.rand(30, 40, 2).astype(np.float32)
+        for top, left in ((-5, 10), (25, -3), (28, 35), (40, 50)):
+            cropped = crop(image, top, left, 10, 12, adjust_if_exceeds=True, pad_value=(-1, 5))
+            valid = image[max(top, 0):min(top + 10, 30), max(left, 0):min(left + 12, 40)]
+            expected = np.stack([np.pad(valid[..., c], ((0, 10 - valid.shape[0]), (0, 12 - valid.shape[1])),
+                                        constant_values=value) for c, value in enumerate((-1, 5))], axis=2)
+            np.testing.assert_array_equal(cropped, expected)
+
+
+class TestCropBatchFunction(unittest.TestCase):
+
+    def setUp(self):
+        # Create a synthetic batch of color images (5x100x100x3)
+        self.color_batch = np.random.randint(0, 256, (5, 100, 100, 3), dtype=np.uint8)
+        self.tops = [0, 10, 50, 80, 95]
+        self.lefts = [5, 0, 60, 90, 95]
+
+    def test_per_sample_positions(self):
+        tops, lefts = [0, 10, 50, 80, 0], [5, 0, 60, 70, 0]
+        cropped = crop_batch(self.color_batch, tops, lefts, 20, 30)
+        self.assertEqual(cropped.shape, (5, 20, 30, 3))
+        for i in range(5):
+            np.testing.assert_array_equal(
+                cropped[i], crop(self.color_batch[i], tops[i], lefts[i], 20, 30)
+            )
+
+    def test_padding_matches_crop(self):
+        cropped = crop_batch(self.color_batch, self.tops, self.lefts, 20, 20,
+                             adjust_if_exceeds=True, pad_value=(0, 128, 255))
+        for i in range(5):
+            expected = crop(self.color_batch[i], self.tops[i], self.lefts[i], 20, 20,
+                            adjust_if_exceeds=True, pad_value=(0, 128, 255))
+            np.testing.assert_array_equal(cropped[i], expected)
+
+    def test_out_of_range_pad_value_matches_crop(self):
+        for batch, pad_value in ((self.color_batch, (-1, 256, 300)), (self.color_batch[..., 0], -1)):
+            cropped = crop_batch(batch, self.tops, self.lefts, 20, 20,
+                                 adjust_if_exceeds=True, pad_value=pad_value)
+            for i in range(5):
+                expected = crop(batch[i], self.tops[i], self.lefts[i], 20, 20,
+                                adjust_if_exceeds=True, pad_value=pad_value if batch.ndim == 4 else (pad_value,))
+                np.testing.assert_array_equal(cropped[i], expected)
+
+    def test_exceeds_without_adjustment(self):
+        with self.assertRaises(ValueError):
+            crop_batch(self.color_batch, self.tops, self.lefts, 20, 20)
+
+    def test_non_integer_positions(self):
+        with self.assertRaises(TypeError):
+            crop_batch(self.color_batch, [0.5] * 5, 0, 20, 20)
+
+
+class TestCropOut(unittest.TestCase):
+    """
+    Test suite for the `out` parameter of `crop` and `crop_batch`.
+    """
+
+    def setUp(self):
+        self.image = np.random.randint(0, 256, (40, 50, 3), dtype=np.uint8)
+
+    def test_out_matches_default(self):
+        """Test if regular and padded crops written into `out` match the default result."""
+        for top, left in ((5, 5), (30, 40)):
+            kwargs = dict(adjust_if_exceeds=True, pad_value=(1, 2, 3))
+            out = np.empty((20, 20, 3), dtype=np.uint8)
+            self.assertIs(crop(self.image, top, left, 20, 20, out=out, **kwargs), out)
+            np.testing.assert_array_equal(out, crop(self.image, top, left, 20, 20, **kwargs))
+
+    def test_batch_out(self):
+        """Test if `crop_batch` writes into `out`."""
+        batch = np.stack([self.image, self.image])
+        out = np.empty((2, 10, 10, 3), dtype=np.uint8)
+        self.assertIs(crop_batch(batch, [0, 3], [4, 0], 10, 10, out=out), out)
+        np.testing.assert_array_equal(out, crop_batch(batch, [0, 3], [4, 0], 10, 10))
+
+    def test_batch_out_without_temporaries(self):
+        """Test if padded `crop_batch` crops are written into `out` without a batch-sized temporary."""
+        batch = np.random.randint(0, 256, (8, 200, 200, 3), dtype=np.uint8)
+        out = np.empty((8, 150, 150, 3), dtype=np.uint8)
+        tops, lefts = [0, 60, 120, 10, 0, 90, 70, 100], [0, 100, 60, 120, 80, 0, 70, 100]
+        tracemalloc.start()
+        try:
+            crop_batch(batch, tops, lefts, 150, 150, adjust_if_exceeds=True, pad_value=(1, 2, 3), out=out)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertLess(peak, out.nbytes // 4)
+        for i in range(8):
+            np.testing.assert_array_equal(out[i], crop(batch[i], tops[i], lefts[i], 150, 150, adjust_if_exceeds=True,
+                                                       pad_value=(1, 2, 3)))
+
+    def test_invalid_out(self):
+        """Test if a buffer of the wrong shape raises a ValueError."""
+        with self.assertRaises(ValueError):
+            crop(self.image, 0, 0, 10, 10, out=np.empty((10, 10), dtype=np.uint8))
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
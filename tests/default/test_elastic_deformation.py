@@ -2,7 +2,9 @@
 
 import unittest
 import numpy as np
-from src.anaug.default import elastic_deformation
+from scipy.ndimage import gaussian_filter
+from src.anaug.default import elastic_deformation, elastic_deformation_batch
+from src.anaug.default.elastic_deformation import _grid_fields, _smooth_field
 
 
 class TestElasticDeformation(unittest.TestCase):
@@ -92,6 +94,14 @@ class TestElasticDeformation(unittest.TestCase):
         deformed2 = elastic_deformation(self.gray_image, alpha=34, sigma=4, random_state=43)
         self.assertFalse(np.array_equal(deformed1, deformed2))
 
+    def test_rng(self):
+        """Test if `rng` accepts a Generator, matches the same seed as `random_state` and takes precedence."""
+        deformed = elastic_deformation(self.gray_image, rng=np.random.default_rng(42))
+        np.testing.assert_array_equal(deformed, elastic_deformation(self.gray_image, random_state=42))
+        np.testing.assert_array_equal(deformed, elastic_deformation(self.gray_image, random_state=1, rng=42))
+        legacy = elastic_deformation(self.gray_image, random_state=np.random.RandomState(0))
+        self.assertEqual(legacy.shape, self.gray_image.shape)
+
     def test_dtype_preservation(self):
         """Test if elastic deformation preserves the dtype of the input image."""
         deformed_gray = elastic_deformation(self.gray_image, alpha=34, sigma=4, random_state=42)
@@ -102,5 +112,167 @@ class TestElasticDeformation(unittest.TestCase):
         self.assertEqual(self.three_d_image.dtype, deformed_3d.dtype)
 
 
+class TestElasticDeformationBatch(unittest.TestCase):
+    """
+    Test suite for the `elastic_deformation_batch` function.
+    """
+
+    def setUp(self):
+        """Set up test batches for use in all test cases."""
+        self.gray_batch = np.random.rand(4, 64, 64).astype(np.float32)
+        self.color_batch = np.random.rand(3, 64, 64, 3).astype(np.float32)
+
+    def test_output_shape_and_dtype(self):
+        """Test if the output keeps the batch shape and dtype."""
+        for batch in (self.gray_batch, self.color_batch):
+            deformed = elastic_deformation_batch(batch, alphas=34, sigmas=4, random_state=42)
+            self.assertEqual(deformed.shape, batch.shape)
+            self.assertEqual(deformed.dtype, batch.dtype)
+
+    def test_per_sample_parameters(self):
+        """Test if per-sample alphas control the deformation strength of each image."""
+        deformed = elastic_deformation_batch(self.gray_batch, alphas=[1, 10, 30, 60],
+                                             sigmas=[4, 4, 3, 3], random_state=0)
+        changes = np.abs(deformed - self.gray_batch).mean(axis=(1, 2))
+        self.assertLess(changes[0], changes[3])
+
+    def test_random_state_reproducibility(self):
+        """Test if the same random state gives the same batch."""
+        first = elastic_deformation_batch(self.gray_batch, random_state=7)
+        second = elastic_deformation_batch(self.gray_batch, random_state=7)
+        np.testing.assert_array_equal(first, second)
+
+    def test_invalid_parameters(self):
+        """Test if invalid parameters raise errors."""
+        with self.assertRaises(ValueError):
+            elastic_deformation_batch(self.gray_batch, alphas=[1, 2])
+        with self.assertRaises(ValueError):
+            elastic_deformation_batch(self.gray_batch, sigmas=0)
+        with self.assertRaises(TypeError):
+            elastic_deformation_batch(self.gray_batch, random_state='seed')
+
+
+class TestSmoothField(unittest.TestCase):
+    """
+    Test suite for the smoothing of the random fields of the exact method.
+    """
+
+    def test_matches_constant_gaussian_filter(self):
+        """Test if small sigmas are exact and large ones keep the statistics of `gaussian_filter`."""
+        rng = np.random.default_rng(0)
+        field = rng.random((256, 320)) * 2 - 1
+        exact = gaussian_filter(field, 3, mode='constant')
+        np.testing.assert_allclose(_smooth_field(field, 3), exact, atol=1e-10)
+        out = np.empty_like(field)
+        self.assertIs(_smooth_field(field, 3, out=out), out)
+
+        field = rng.random((1024, 1024)) * 2 - 1
+        exact = gaussian_filter(field, 16, mode='constant')
+        smoothed = _smooth_field(field, 16)
+        self.assertEqual(smoothed.shape, field.shape)
+        self.assertLess(np.abs(smoothed - exact).max(), 0.15 * np.abs(exact).max())
+        self.assertAlmostEqual(smoothed[64:-64, 64:-64].std() / exact[64:-64, 64:-64].std(), 1.0, delta=0.02)
+
+
+class TestElasticDeformationGrid(unittest.TestCase):
+    """
+    Test suite for the coarse control-grid method of `elastic_deformation`.
+    """
+
+    def setUp(self):
+        """Set up a smooth test image, on which deformations change every pixel a little."""
+        y, x = np.mgrid[:256, :256]
+        self.image = (np.sin(x / 9.0) * np.cos(y / 7.0)).astype(np.float32)
+
+    def test_fields_match_exact_statistics(self):
+        """Test if the grid fields have the standard deviation of the smoothed exact fields."""
+        rng = np.random.default_rng(0)
+        for sigma in (3.0, 12.0):
+            fields = _grid_fields((512, 512), 34.0, sigma, rng, np.float64)
+            exact = gaussian_filter(rng.random((512, 512)) * 2 - 1, sigma, mode='constant') * 34.0
+            for field in fields:
+                self.assertAlmostEqual(field[64:-64, 64:-64].std() / exact[64:-64, 64:-64].std(), 1.0, delta=0.15)
+
+    def test_output_and_reproducibility(self):
+        """Test if the grid method keeps shape and dtype, follows `rng` and deforms like the exact method."""
+        for image in (self.image, np.dstack([self.image] * 3)):
+            deformed = elastic_deformation(image, alpha=34, sigma=4, rng=1, method='grid')
+            self.assertEqual(deformed.shape, image.shape)
+            self.assertEqual(deformed.dtype, image.dtype)
+            np.testing.assert_array_equal(deformed, elastic_deformation(image, alpha=34, sigma=4, rng=1, method='grid'))
+        grid_change = np.abs(elastic_deformation(self.image, rng=2, method='grid') - self.image).mean()
+        exact_change = np.abs(elastic_deformation(self.image, rng=2) - self.image).mean()
+        self.assertAlmostEqual(grid_change / exact_change, 1.0, delta=0.35)
+
+    def test_batch_and_invalid_method(self):
+        """Test the grid method of the batch function and that unknown methods raise errors."""
+        batch = np.stack([self.image, self.image[::-1]])
+        out = np.empty_like(batch)
+        self.assertIs(elastic_deformation_batch(batch, alphas=[10, 30], sigmas=4, rng=0, method='grid', out=out), out)
+        np.testing.assert_array_equal(out, elastic_deformation_batch(batch, alphas=[10, 30], sigmas=4, rng=0,
+                                                                     method='grid'))
+        with self.assertRaises(ValueError):
+            elastic_deformation(self.image, method='bspline')
+        with self.assertRaises(ValueError):
+            elastic_deformation_batch(batch, method='bspline')
+
+
+class TestElasticDeformationChannels(unittest.TestCase):
+    """
+    Test suite for the displacement field shared by the channels of an image.
+    """
+
+    def setUp(self):
+        """Set up a smooth grayscale image."""
+        y, x = np.mgrid[:96, :80]
+        self.image = (np.sin(x / 5.0) * np.cos(y / 4.0) * 100 + 120).astype(np.float32)
+
+    def test_channels_share_the_field(self):
+        """Test if every channel is deformed like the grayscale image, for any channel count."""
+        gray = elastic_deformation(self.image, alpha=20, sigma=4, rng=0)
+        for channels in (3, 7):
+            color = elastic_deformation(np.dstack([self.image] * channels), alpha=20, sigma=4, rng=0)
+            for channel in range(channels):
+                np.testing.assert_array_equal(color[..., channel], gray)
+
+    def test_remap_matches_map_coordinates(self):
+        """Test if the `cv2.remap` dtypes match the `map_coordinates` fallback of other dtypes."""
+        image = np.dstack([self.image, self.image[::-1]])
+        fallback = elastic_deformation(image.astype(np.float64), alpha=20, sigma=4, rng=1)
+        remapped = elastic_deformation(image, alpha=20, sigma=4, rng=1)
+        np.testing.assert_allclose(remapped, fallback, atol=1e-3)
+        remapped = elastic_deformation(image.astype(np.uint8), alpha=20, sigma=4, rng=1)
+        np.testing.assert_allclose(remapped, np.round(fallback), atol=1)
+
+    def test_fixed_point(self):
+        """Test if fixed-point maps stay within the 1/32-pixel quantization of the float maps."""
+        image = self.image.astype(np.uint8)
+        exact = elastic_deformation(image, alpha=20, sigma=4, rng=2).astype(int)
+        fixed = elastic_deformation(image, alpha=20, sigma=4, rng=2, fixed_point=True).astype(int)
+        self.assertLessEqual(np.abs(fixed - exact).max(), 8)
+        self.assertLess(np.abs(fixed - exact).mean(), 1)
+        batch = np.stack([image, image])
+        deformed = elastic_deformation_batch(batch, alphas=20, sigmas=4, rng=3, fixed_point=True)
+        self.assertEqual(deformed.shape, batch.shape)
+
+
+class TestElasticDeformationOut(unittest.TestCase):
+    """
+    Test suite for the `out` parameter of `elastic_deformation` and its batch variant.
+    """
+
+    def test_out_matches_default(self):
+        """Test if the deformation written into `out` matches the default result."""
+        image = np.random.rand(24, 24, 3)
+        out = np.empty_like(image)
+        self.assertIs(elastic_deformation(image, random_state=0, out=out), out)
+        np.testing.assert_array_equal(out, elastic_deformation(image, random_state=0))
+
+        batch = np.stack([image, image])
+        out = np.empty_like(batch)
+        self.assertIs(elastic_deformation_batch(batch, random_state=1, out=out), out)
+        np.testing.assert_array_equal(out, elastic_deformation_batch(batch, random_state=1))
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -1,6 +1,6 @@
 import unittest
 import numpy as np
-from src.anaug.default import flip
+from src.anaug.default import flip, flip_batch
 
 
 class TestFlip(unittest.TestCase):
@@ -176,5 +176,68 @@ class TestFlip(unittest.TestCase):
             flip(self.color_image, axes=['horizontal', 'vertical', 'diagonal'])
 
 
+class TestFlipBatch(unittest.TestCase):
+    """
+    Test suite for the `flip_batch` function.
+    """
+
+    def setUp(self):
+        """Set up a test batch for use in all test cases."""
+        self.batch = np.random.rand(6, 32, 40, 3)
+
+    def test_per_sample_flips(self):
+        """Test if each image is flipped according to its own flags."""
+        horizontal = [True, False, True, False, False, True]
+        vertical = [False, False, True, True, False, False]
+        flipped = flip_batch(self.batch, horizontal=horizontal, vertical=vertical)
+        for i, image in enumerate(self.batch):
+            axes = [axis for axis, flag in zip(['horizontal', 'vertical'], [horizontal[i], vertical[i]]) if flag]
+            np.testing.assert_array_equal(flipped[i], flip(image, axes=axes))
+
+    def test_scalar_flags(self):
+        """Test if a single flag applies to the whole batch."""
+        flipped = flip_batch(self.batch, horizontal=True)
+        np.testing.assert_array_equal(flipped, self.batch[:, :, ::-1])
+
+    def test_invalid_batch(self):
+        """Test if invalid batches and flag lengths raise a ValueError."""
+        with self.assertRaises(ValueError):
+            flip_batch(self.batch[0, :, :, 0], horizontal=True)
+        with self.assertRaises(ValueError):
+            flip_batch(self.batch, horizontal=[True, False])
+
+
+class TestFlipOut(unittest.TestCase):
+    """
+    Test suite for the `out` and `inplace` parameters of `flip` and `flip_batch`.
+    """
+
+    def setUp(self):
+        self.image = np.random.rand(20, 30, 3)
+
+    def test_out_and_inplace(self):
+        """Test if flips written into `out` or in place match the default result."""
+        for axes in ('horizontal', 'vertical', ['horizontal', 'vertical']):
+            expected = flip(self.image, axes)
+            out = np.empty_like(self.image)
+            self.assertIs(flip(self.image, axes, out=out), out)
+            np.testing.assert_array_equal(out, expected)
+            image = self.image.copy()
+            self.assertIs(flip(image, axes, inplace=True), image)
+            np.testing.assert_array_equal(image, expected)
+
+    def test_batch_inplace(self):
+        """Test if `flip_batch` flips the selected images in place."""
+        batch = np.stack([self.image, self.image])
+        expected = flip_batch(batch, horizontal=[True, False], vertical=[False, True])
+        flip_batch(batch, horizontal=[True, False], vertical=[False, True], inplace=True)
+        np.testing.assert_array_equal(batch, expected)
+
+    def test_invalid_out(self):
+        """Test if a buffer of the wrong shape raises a ValueError."""
+        with self.assertRaises(ValueError):
+            flip(self.image, out=np.empty((30, 20, 3)))
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -1,6 +1,6 @@
 import unittest
 import numpy as np
-from src.anaug.default import intensity
+from src.anaug.default import intensity, intensity_batch
 
 
 class TestIntensityScaling(unittest.TestCase):
@@ -147,6 +147,16 @@ class TestIntensityScaling(unittest.TestCase):
         expected_std = brightness_factor * contrast_factor * original_std
         self.assertAlmostEqual(scaled_std, expected_std, delta=0.05 * original_std)
 
+    def test_contrast_around_given_mean(self):
+        """
+        Test if a given mean replaces the image mean as the center of the contrast stretch.
+        """
+        tile = self.gray_image_float[:10]
+        whole = intensity(self.gray_image_float, brightness_factor=1.2, contrast_factor=1.5)
+        adjusted = intensity(tile, brightness_factor=1.2, contrast_factor=1.5,
+                             mean=np.mean(self.gray_image_float, dtype=np.float64))
+        np.testing.assert_allclose(adjusted, whole[:10])
+
     def test_minimal_image_uint8(self):
         """
         Test intensity adjustment on a minimal image (1x1) with uint8 data type.
@@ -230,5 +240,72 @@ class TestIntensityScaling(unittest.TestCase):
             intensity(self.gray_image_float, brightness_factor=1.2, contrast_factor=0.0)
 
 
+class TestIntensityBatch(unittest.TestCase):
+    """
+    Test suite for the `intensity_batch` function.
+    """
+
+    def setUp(self):
+        """Set up a test batch for use in all test cases."""
+        self.batch = np.random.randint(0, 256, (5, 32, 32, 3), dtype=np.uint8)
+
+    def test_matches_single_image(self):
+        """Test if each image matches `intensity` with its own factors."""
+        brightness = [0.5, 1.0, 1.2, 1.5, 2.0]
+        contrast = [1.0, 0.5, 1.3, 2.0, 1.0]
+        adjusted = intensity_batch(self.batch, brightness, contrast)
+        self.assertEqual(adjusted.dtype, self.batch.dtype)
+        for i, image in enumerate(self.batch):
+            np.testing.assert_array_equal(adjusted[i], intensity(image, brightness[i], contrast[i]))
+
+    def test_invalid_factors(self):
+        """Test if non-positive or mismatched factors raise a ValueError."""
+        with self.assertRaises(ValueError):
+            intensity_batch(self.batch, brightness_factors=[1.0, 1.0, 0.0, 1.0, 1.0])
+        with self.assertRaises(ValueError):
+            intensity_batch(self.batch, contrast_factors=[1.0, 1.0])
+
+
+class TestIntensityOut(unittest.TestCase):
+    """
+    Test suite for the `out` and `inplace` parameters of `intensity` and `intensity_batch`.
+    """
+
+    def setUp(self):
+        self.image = np.random.randint(0, 256, (32, 32, 3), dtype=np.uint8)
+        self.float_image = np.random.rand(32, 32)
+
+    def test_out_matches_default(self):
+        """Test if writing into `out` gives the same result and returns `out`."""
+        for image in (self.image, self.float_image):
+            out = np.empty_like(image)
+            result = intensity(image, 1.2, 0.8, out=out)
+            self.assertIs(result, out)
+            np.testing.assert_array_equal(out, intensity(image, 1.2, 0.8))
+
+    def test_inplace(self):
+        """Test if `inplace=True` overwrites the input."""
+        image = self.image.copy()
+        expected = intensity(image, 0.7, 1.3)
+        self.assertIs(intensity(image, 0.7, 1.3, inplace=True), image)
+        np.testing.assert_array_equal(image, expected)
+
+    def test_batch_out(self):
+        """Test if `intensity_batch` writes into `out`."""
+        batch = np.stack([self.image, self.image // 2])
+        out = np.empty_like(batch)
+        self.assertIs(intensity_batch(batch, [1.1, 0.9], out=out), out)
+        np.testing.assert_array_equal(out, intensity_batch(batch, [1.1, 0.9]))
+
+    def test_invalid_out(self):
+        """Test if mismatched buffers raise errors."""
+        with self.assertRaises(ValueError):
+            intensity(self.image, 1.2, out=np.empty((32, 32, 3), dtype=np.float32))
+        with self.assertRaises(ValueError):
+            intensity(self.image, 1.2, out=np.empty((32, 32), dtype=np.uint8))
+        with self.assertRaises(ValueError):
+            intensity(self.image, 1.2, out=np.empty_like(self.image), inplace=True)
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
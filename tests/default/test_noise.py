@@ -1,6 +1,6 @@
 import unittest
 import numpy as np
-from src.anaug.default import noise
+from src.anaug.default import noise, noise_batch
 
 
 class TestNoise(unittest.TestCase):
@@ -303,5 +303,100 @@ class TestNoise(unittest.TestCase):
         self.assertAlmostEqual(num_salt + num_pepper, expected, delta=expected * 0.1)
 
 
+class TestNoiseBatch(unittest.TestCase):
+    """
+    Test suite for the `noise_batch` function.
+    """
+
+    def setUp(self):
+        """Set up test batches for use in all test cases."""
+        np.random.seed(0)
+        self.float_batch = np.random.rand(4, 64, 64).astype(np.float32)
+        self.uint8_batch = np.random.randint(0, 256, (4, 64, 64), dtype=np.uint8)
+
+    def test_gaussian_per_sample_intensity(self):
+        """Test if Gaussian noise strength follows the per-sample intensities."""
+        batch = np.full((4, 64, 64), 0.5, dtype=np.float32)
+        noisy = noise_batch(batch, 'gaussian', noise_intensities=[0.0, 0.01, 0.05, 0.1])
+        self.assertEqual(noisy.dtype, batch.dtype)
+        np.testing.assert_array_equal(noisy[0], batch[0])
+        stds = (noisy - batch).std(axis=(1, 2))
+        self.assertTrue(np.all(np.diff(stds) > 0))
+
+    def test_salt_and_pepper_proportion(self):
+        """Test if the proportion of salt and pepper pixels follows the intensities."""
+        intensities = [0.0, 0.1, 0.5]
+        batch = np.full((3, 100, 100), 128, dtype=np.uint8)
+        noisy = noise_batch(batch, 'salt_and_pepper', noise_intensities=intensities)
+        affected = (noisy != 128).mean(axis=(1, 2))
+        np.testing.assert_allclose(affected, intensities, atol=0.02)
+
+    def test_poisson_keeps_range_and_dtype(self):
+        """Test if Poisson noise keeps the valid range and dtype."""
+        noisy = noise_batch(self.uint8_batch, 'poisson', noise_intensities=[0.0, 1.0, 5.0, 10.0])
+        self.assertEqual(noisy.dtype, np.uint8)
+        np.testing.assert_array_equal(noisy[0], self.uint8_batch[0])
+
+    def test_invalid_parameters(self):
+        """Test if invalid parameters raise errors."""
+        with self.assertRaises(ValueError):
+            noise_batch(self.float_batch, 'gaussian', noise_intensities=[-0.1, 0.1, 0.1, 0.1])
+        with self.assertRaises(ValueError):
+            noise_batch(self.float_batch, 'salt_and_pepper', noise_intensities=1.5)
+        with self.assertRaises(ValueError):
+            noise_batch(self.float_batch, 'speckle')
+
+
+class TestNoiseOut(unittest.TestCase):
+    """
+    Test suite for the `out` and `inplace` parameters of `noise` and `noise_batch`.
+    """
+
+    def setUp(self):
+        self.image = np.random.rand(32, 32).astype(np.float32)
+        self.uint8_image = np.random.randint(0, 256, (32, 32, 3), dtype=np.uint8)
+
+    def test_out_matches_default(self):
+        """Test if every noise type gives the same result in `out` for the same seed."""
+        for image in (self.image, self.uint8_image):
+            for noise_type, intensity in (('gaussian', 0.1), ('salt_and_pepper', 0.2), ('poisson', 5.0)):
+                np.random.seed(3)
+                expected = noise(image, noise_type, intensity)
+                out = np.empty_like(image)
+                np.random.seed(3)
+                self.assertIs(noise(image, noise_type, intensity, out=out), out)
+                np.testing.assert_array_equal(out, expected)
+
+    def test_inplace(self):
+        """Test if `inplace=True` adds the noise to the input itself."""
+        image = self.image.copy()
+        np.random.seed(5)
+        expected = noise(image, 'salt_and_pepper', 0.3)
+        np.random.seed(5)
+        self.assertIs(noise(image, 'salt_and_pepper', 0.3, inplace=True), image)
+        np.testing.assert_array_equal(image, expected)
+
+    def test_batch_out(self):
+        """Test if `noise_batch` writes into `out`."""
+        batch = np.stack([self.image, self.image])
+        np.random.seed(7)
+        expected = noise_batch(batch, 'poisson', [0.0, 10.0])
+        out = np.empty_like(batch)
+        np.random.seed(7)
+        self.assertIs(noise_batch(batch, 'poisson', [0.0, 10.0], out=out), out)
+        np.testing.assert_array_equal(out, expected)
+
+    def test_rng(self):
+        """Test if a Generator or seed passed as `rng` reproduces the noise without touching the global state."""
+        for noise_type, intensity in (('gaussian', 0.1), ('salt_and_pepper', 0.2), ('poisson', 5.0)):
+            state = np.random.get_state()[1].copy()
+            first = noise(self.image, noise_type, intensity, rng=np.random.default_rng(1))
+            np.testing.assert_array_equal(first, noise(self.image, noise_type, intensity, rng=1))
+            np.testing.assert_array_equal(state, np.random.get_state()[1])
+            self.assertFalse(np.array_equal(first, noise(self.image, noise_type, intensity, rng=2)))
+        batch = np.stack([self.image, self.image])
+        np.testing.assert_array_equal(noise_batch(batch, 'gaussian', 0.1, rng=4), noise_batch(batch, 'gaussian', 0.1, rng=4))
+
+
 if __name__ == '__main__':
     unittest.main()
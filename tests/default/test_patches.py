@@ -0,0 +1,87 @@
+import unittest
+import numpy as np
+from src.anaug.default import crop, extract_patches, five_crop, ten_crop
+
+
+class TestPatches(unittest.TestCase):
+    """
+    Test suite for the `extract_patches`, `five_crop` and `ten_crop` functions.
+    """
+
+    def setUp(self):
+        """Set up grayscale and color test images."""
+        self.gray_image = np.random.randint(0, 256, (100, 90), dtype=np.uint8)
+        self.color_image = np.random.rand(100, 90, 3).astype(np.float32)
+
+    def test_grid_matches_crop(self):
+        """Test if every patch equals the `crop` at its grid position."""
+        for image in (self.gray_image, self.color_image):
+            patches = extract_patches(image, (32, 20), stride=(16, 10))
+            self.assertEqual(patches.shape, (5, 8, 32, 20) + image.shape[2:])
+            for i, j in ((0, 0), (2, 3), (4, 7)):
+                np.testing.assert_array_equal(patches[i, j], crop(image, i * 16, j * 10, 32, 20))
+
+    def test_views_share_memory(self):
+        """Test if patches are read-only views unless contiguous output is requested."""
+        patches = extract_patches(self.color_image, 10)
+        self.assertTrue(np.shares_memory(patches, self.color_image))
+        self.assertFalse(patches.flags.writeable)
+        self.assertEqual(patches.shape, (10, 9, 10, 10, 3))
+        contiguous = extract_patches(self.color_image, 10, contiguous=True)
+        self.assertFalse(np.shares_memory(contiguous, self.color_image))
+        self.assertTrue(contiguous.flags.c_contiguous)
+        np.testing.assert_array_equal(contiguous, patches)
+
+    def test_sliding_window(self):
+        """Test if a stride of 1 gives every window position."""
+        patches = extract_patches(self.gray_image, 5, stride=1)
+        self.assertEqual(patches.shape, (96, 86, 5, 5))
+        np.testing.assert_array_equal(patches[40, 17], self.gray_image[40:45, 17:22])
+
+    def test_padding(self):
+        """Test if padded patches cover the whole image and pad with `pad_value`."""
+        patches = extract_patches(self.color_image, 32, stride=32, pad=True, pad_value=(1, 2, 3))
+        self.assertEqual(patches.shape, (4, 3, 32, 32, 3))
+        expected = crop(self.color_image, 96, 64, 32, 32, adjust_if_exceeds=True, pad_value=(1, 2, 3))
+        np.testing.assert_array_equal(patches[3, 2], expected)
+        # The default and single pad values pad every channel
+        default = extract_patches(self.color_image, 32, stride=32, pad=True)
+        np.testing.assert_array_equal(default[3, 2], crop(self.color_image, 96, 64, 32, 32, adjust_if_exceeds=True,
+                                                          pad_value=(0, 0, 0)))
+        single = extract_patches(self.color_image, 32, stride=32, pad=True, pad_value=7)
+        np.testing.assert_array_equal(single[3, 2], crop(self.color_image, 96, 64, 32, 32, adjust_if_exceeds=True,
+                                                         pad_value=(7, 7, 7)))
+        # Without padding, the remainder is left out
+        self.assertEqual(extract_patches(self.color_image, 32).shape[:2], (3, 2))
+        self.assertEqual(extract_patches(self.gray_image, 128, pad=True).shape, (1, 1, 128, 128))
+        with self.assertRaises(ValueError):
+            extract_patches(self.gray_image, 128)
+
+    def test_five_and_ten_crop(self):
+        """Test the order and content of the five and ten crops."""
+        crops = five_crop(self.color_image, (40, 30))
+        self.assertEqual(len(crops), 5)
+        self.assertTrue(all(np.shares_memory(view, self.color_image) for view in crops))
+        np.testing.assert_array_equal(crops[1], self.color_image[:40, 60:])
+        np.testing.assert_array_equal(crops[4], self.color_image[30:70, 30:60])
+        stacked = ten_crop(self.color_image, (40, 30), contiguous=True)
+        self.assertEqual(stacked.shape, (10, 40, 30, 3))
+        np.testing.assert_array_equal(stacked[:5], np.stack(crops))
+        np.testing.assert_array_equal(stacked[5], self.color_image[:40, ::-1][:, :30])
+        vertical = ten_crop(self.gray_image, 20, vertical=True)
+        np.testing.assert_array_equal(vertical[7], self.gray_image[::-1][-20:, :20])
+
+    def test_invalid_arguments(self):
+        """Test if invalid inputs and parameters raise errors."""
+        with self.assertRaises(TypeError):
+            extract_patches(self.gray_image.tolist(), 8)
+        with self.assertRaises(ValueError):
+            extract_patches(self.gray_image, 8, stride=0)
+        with self.assertRaises(ValueError):
+            extract_patches(np.zeros((4, 4, 4, 4)), 2)
+        with self.assertRaises(ValueError):
+            five_crop(self.gray_image, (120, 10))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import unittest
+import cv2
+import numpy as np
+from src.anaug.default import random_resized_crop, random_resized_crop_batch
+from src.anaug.default.random_resized_crop import _sample_boxes
+
+
+class TestRandomResizedCrop(unittest.TestCase):
+    """
+    Test suite for the `random_resized_crop` and `random_resized_crop_batch` functions.
+    """
+
+    def setUp(self):
+        """Set up grayscale, color and many-channel test images."""
+        self.gray_image = np.random.randint(0, 256, (120, 90), dtype=np.uint8)
+        self.color_image = np.random.rand(120, 90, 3).astype(np.float32)
+        self.multi_channel_image = np.random.rand(120, 90, 6).astype(np.float32)
+
+    def test_output_shape_and_dtype(self):
+        """Test if the output has the requested size, the input channels and the input dtype."""
+        for image in (self.gray_image, self.color_image, self.multi_channel_image):
+            result = random_resized_crop(image, (32, 48), rng=0)
+            self.assertEqual(result.shape, (32, 48) + image.shape[2:])
+            self.assertEqual(result.dtype, image.dtype)
+
+    def test_reproducible_with_rng(self):
+        """Test if the same seed gives the same crop and different seeds differ."""
+        first = random_resized_crop(self.color_image, (32, 32), rng=3)
+        np.testing.assert_array_equal(first, random_resized_crop(self.color_image, (32, 32), rng=3))
+        self.assertFalse(np.array_equal(first, random_resized_crop(self.color_image, (32, 32), rng=4)))
+
+    def test_boxes_within_ranges(self):
+        """Test if sampled boxes lie inside the image with area and aspect ratio close to their ranges."""
+        boxes = _sample_boxes(np.random.default_rng(0), 500, 120, 90, (0.2, 0.6), (0.5, 2.0))
+        top, left, height, width = boxes.T
+        self.assertTrue(np.all((top >= 0) & (left >= 0) & (top + height <= 120) & (left + width <= 90)))
+        area = height * width / (120 * 90)
+        self.assertTrue(np.all((area > 0.18) & (area < 0.62)))
+        aspect = width / height
+        self.assertTrue(np.all((aspect > 0.45) & (aspect < 2.2)))
+
+    def test_fallback_to_centered_crop(self):
+        """Test if boxes that cannot fit fall back to a centered crop clamped to the ratio range."""
+        boxes = _sample_boxes(np.random.default_rng(0), 4, 100, 20, (1.0, 1.0), (1.0, 1.0))
+        np.testing.assert_array_equal(boxes, [[40, 0, 20, 20]] * 4)
+
+    def test_full_image_matches_resize(self):
+        """Test if a crop of the whole image equals resizing the image."""
+        image = self.color_image[:90]
+        result = random_resized_crop(image, (40, 40), scale=(1.0, 1.0), ratio=(1.0, 1.0), rng=0)
+        np.testing.assert_allclose(result, cv2.resize(image, (40, 40), interpolation=cv2.INTER_LINEAR))
+
+    def test_out(self):
+        """Test if the result is written into a preallocated `out` array."""
+        out = np.empty((32, 32, 6), dtype=np.float32)
+        result = random_resized_crop(self.multi_channel_image, (32, 32), out=out, rng=1)
+        self.assertIs(result, out)
+        np.testing.assert_array_equal(out, random_resized_crop(self.multi_channel_image, (32, 32), rng=1))
+        with self.assertRaises(ValueError):
+            random_resized_crop(self.multi_channel_image, (32, 32), out=np.empty((32, 32), dtype=np.float32))
+
+    def test_out_layouts(self):
+        """Test if contiguous and strided `out` arrays of every channel layout get the default result."""
+        for image in (self.gray_image, self.gray_image[..., np.newaxis], self.color_image, self.multi_channel_image):
+            expected = random_resized_crop(image, (20, 28), rng=4)
+            contiguous = np.empty_like(expected)
+            self.assertIs(random_resized_crop(image, (20, 28), out=contiguous, rng=4), contiguous)
+            np.testing.assert_array_equal(contiguous, expected)
+            strided = np.empty((20, 56) + image.shape[2:], dtype=image.dtype)[:, ::2]
+            self.assertIs(random_resized_crop(image, (20, 28), out=strided, rng=4), strided)
+            np.testing.assert_array_equal(strided, expected)
+
+    def test_batch(self):
+        """Test if the batch draws a box per image and image 0 matches the single-image op."""
+        images = np.random.rand(5, 60, 80, 3).astype(np.float32)
+        out = np.empty((5, 24, 24, 3), dtype=np.float32)
+        result = random_resized_crop_batch(images, (24, 24), out=out, rng=7)
+        self.assertIs(result, out)
+        np.testing.assert_array_equal(result[0], random_resized_crop(images[0], (24, 24), rng=7))
+        np.testing.assert_array_equal(result, random_resized_crop_batch(images, (24, 24), rng=7))
+
+    def test_invalid_arguments(self):
+        """Test if invalid inputs and parameters raise errors."""
+        with self.assertRaises(TypeError):
+            random_resized_crop(self.gray_image.tolist(), (32, 32))
+        with self.assertRaises(ValueError):
+            random_resized_crop(np.zeros((4, 4, 4, 4)), (32, 32))
+        with self.assertRaises(ValueError):
+            random_resized_crop(self.gray_image, (32, 0))
+        with self.assertRaises(ValueError):
+            random_resized_crop(self.gray_image, (32, 32), scale=(0.5, 1.5))
+        with self.assertRaises(ValueError):
+            random_resized_crop(self.gray_image, (32, 32), ratio=(2.0, 1.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -71,5 +71,28 @@ class TestRandomRotation(unittest.TestCase):
         with self.assertRaises(ValueError):
             random_rotation(empty_image, angle_range=(-30, 30))
 
+
+class TestRandomRotationOut(unittest.TestCase):
+    """
+    Test suite for the `out` parameter of `random_rotation`.
+    """
+
+    def test_out_matches_default(self):
+        """Test if the rotation written into `out` matches the default result."""
+        image = np.random.rand(20, 30).astype(np.float32)
+        np.random.seed(0)
+        expected = random_rotation(image)
+        out = np.empty_like(image)
+        np.random.seed(0)
+        self.assertIs(random_rotation(image, out=out), out)
+        np.testing.assert_array_equal(out, expected)
+
+    def test_rng(self):
+        """Test if the angle is drawn from the generator passed as `rng`."""
+        image = np.random.rand(20, 30).astype(np.float32)
+        np.testing.assert_array_equal(random_rotation(image, rng=np.random.default_rng(3)),
+                                      random_rotation(image, rng=3))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -2,7 +2,7 @@
 
 import unittest
 import numpy as np
-from src.anaug.default import rotate
+from src.anaug.default import rotate, rotate_batch
 
 
 class TestRotate(unittest.TestCase):
@@ -103,5 +103,73 @@ class TestRotate(unittest.TestCase):
         self.assertTrue(np.allclose(rotated_image, expected_image, atol=1e-6))
 
 
+class TestRotateBatch(unittest.TestCase):
+    """
+    Test suite for the `rotate_batch` function.
+    """
+
+    def setUp(self):
+        """Set up test batches for use in all test cases."""
+        self.batch = np.random.rand(6, 32, 40, 3).astype(np.float32)
+        self.square_batch = np.random.rand(4, 32, 32).astype(np.float32)
+
+    def test_matches_single_image(self):
+        """Test if each image matches `rotate` with its own angle."""
+        angles = [10, 20, 10, 180, 0, 33]
+        rotated = rotate_batch(self.batch, angles, mode='mirror')
+        for i, image in enumerate(self.batch):
+            np.testing.assert_allclose(rotated[i], rotate(image, angles[i], mode='mirror'), atol=1e-6)
+
+    def test_quarter_turns_square(self):
+        """Test if quarter turns can be mixed with other angles for square images."""
+        rotated = rotate_batch(self.square_batch, [90, 15, 270, 0])
+        np.testing.assert_array_equal(rotated[0], np.rot90(self.square_batch[0], k=1))
+        np.testing.assert_array_equal(rotated[2], np.rot90(self.square_batch[2], k=3))
+
+    def test_mixed_shapes_raise(self):
+        """Test if mixing quarter turns of non-square images with other angles raises a ValueError."""
+        with self.assertRaises(ValueError):
+            rotate_batch(self.batch, [90, 10, 0, 0, 0, 0])
+
+    def test_invalid_mode(self):
+        """Test if an invalid mode raises a ValueError."""
+        with self.assertRaises(ValueError):
+            rotate_batch(self.batch, 10, mode='invalid')
+
+
+class TestRotateOut(unittest.TestCase):
+    """
+    Test suite for the `out` parameter of `rotate` and `rotate_batch`.
+    """
+
+    def test_out_matches_default(self):
+        """Test if arbitrary and quarter-turn rotations write the default result into `out`."""
+        for image in (np.random.rand(20, 30), np.random.rand(20, 30, 3)):
+            for angle in (25, 90):
+                expected = rotate(image, angle)
+                out = np.empty(expected.shape, dtype=image.dtype)
+                self.assertIs(rotate(image, angle, out=out), out)
+                np.testing.assert_array_equal(out, expected)
+
+    def test_out_layouts(self):
+        """Test if contiguous and strided `out` arrays of every channel count get the default result."""
+        for channels in (1, 3, 4, 6):
+            image = np.random.rand(20, 30, channels).astype(np.float32)
+            expected = rotate(image, 25, mode='constant')
+            contiguous = np.empty_like(image)
+            self.assertIs(rotate(image, 25, mode='constant', out=contiguous), contiguous)
+            np.testing.assert_array_equal(contiguous, expected)
+            strided = np.empty((20, 60, channels), dtype=np.float32)[:, ::2]
+            self.assertIs(rotate(image, 25, mode='constant', out=strided), strided)
+            np.testing.assert_array_equal(strided, expected)
+
+    def test_batch_out(self):
+        """Test if `rotate_batch` writes the default result into `out`."""
+        batch = np.random.rand(3, 20, 20)
+        out = np.empty_like(batch)
+        self.assertIs(rotate_batch(batch, [10, 20, 10], out=out), out)
+        np.testing.assert_array_equal(out, rotate_batch(batch, [10, 20, 10]))
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -1,6 +1,6 @@
 import unittest
 import numpy as np
-from src.anaug.default import scale
+from src.anaug.default import scale, scale_batch
 
 class TestScale(unittest.TestCase):
     """Test cases for the scale augmentation function"""
@@ -71,5 +71,62 @@ class TestScale(unittest.TestCase):
         with self.assertRaises(ValueError):
             scale(self.test_image, scale_factor)
 
+
+class TestScaleBatch(unittest.TestCase):
+    """Test cases for the scale_batch augmentation function"""
+
+    def setUp(self):
+        """Set up a test batch for use in multiple tests"""
+        self.batch = np.random.randint(0, 256, (4, 40, 60, 3), dtype=np.uint8)
+
+    def test_shared_factor(self):
+        """Test scaling a batch with one factor and compare with scale"""
+        result = scale_batch(self.batch, 0.5)
+        self.assertEqual(result.shape, (4, 20, 30, 3))
+        np.testing.assert_array_equal(result[2], scale(self.batch[2], 0.5))
+
+    def test_per_sample_factors(self):
+        """Test that different factors return a list of differently sized images"""
+        result = scale_batch(self.batch, [0.5, 1.0, 2.0, 0.5])
+        self.assertIsInstance(result, list)
+        self.assertEqual([image.shape for image in result],
+                         [(20, 30, 3), (40, 60, 3), (80, 120, 3), (20, 30, 3)])
+        np.testing.assert_array_equal(result[2], scale(self.batch[2], 2.0))
+
+    def test_invalid_factor(self):
+        """Test that non-positive factors raise ValueError"""
+        with self.assertRaises(ValueError):
+            scale_batch(self.batch, [0.5, 0.0, 1.0, 1.0])
+
+    def test_out(self):
+        """Test that a same-size batch is written into out and mixed sizes reject out"""
+        out = np.empty((4, 20, 30, 3), dtype=np.uint8)
+        self.assertIs(scale_batch(self.batch, [0.5, 0.5, 0.505, 0.5], out=out), out)
+        np.testing.assert_array_equal(out, scale_batch(self.batch, [0.5, 0.5, 0.505, 0.5]))
+        with self.assertRaises(ValueError):
+            scale_batch(self.batch, [0.5, 1.0, 0.5, 0.5], out=out)
+        with self.assertRaises(ValueError):
+            scale_batch(self.batch, 0.5, out=np.empty((4, 20, 30), dtype=np.uint8))
+
+
+class TestScaleOut(unittest.TestCase):
+    """
+    Test suite for the `out` parameter of `scale`.
+    """
+
+    def test_out_matches_default(self):
+        """Test if the resized image written into `out` matches the default result."""
+        for image in (np.random.rand(20, 30).astype(np.float32), np.random.rand(20, 30, 1)):
+            expected = scale(image, 1.5)
+            out = np.empty((30, 45) + image.shape[2:], dtype=image.dtype)
+            self.assertIs(scale(image, 1.5, out=out), out)
+            np.testing.assert_array_equal(out.reshape(expected.shape), expected)
+
+    def test_invalid_out(self):
+        """Test if a buffer of the wrong shape raises a ValueError."""
+        with self.assertRaises(ValueError):
+            scale(np.random.rand(20, 30), 2.0, out=np.empty((20, 30)))
+
+
 if __name__ == '__main__':
     unittest.main()
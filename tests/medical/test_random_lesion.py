@@ -1,6 +1,6 @@
 import unittest
 import numpy as np
-from src.anaug.medical.random_lesion import random_lesion
+from src.anaug.generative.random_lesion import random_lesion
 
 
 class TestRandomLesion(unittest.TestCase):
@@ -66,6 +66,18 @@ class TestRandomLesion(unittest.TestCase):
         self.assertGreater(std_textured, std_smooth * 1.2,
                            "Texture strength did not increase lesion variability as expected.")
 
+    def test_texture_stays_within_intensity_range(self):
+        """Test if textured lesions stay within intensity_range without flattening at its bounds."""
+        intensity_range = (0.3, 0.7)
+        for seed in range(20):
+            lesion_diff = random_lesion(self.image, intensity_range=intensity_range, texture_strength=0.9,
+                                        seed=seed) - self.image
+            lesion_values = lesion_diff[lesion_diff > 0]
+            self.assertGreaterEqual(lesion_values.min(), intensity_range[0] - 1e-6)
+            self.assertLessEqual(lesion_values.max(), intensity_range[1] + 1e-6)
+            # The texture maximum is reached at a single pixel, not on a clipped plateau
+            self.assertLess(np.mean(lesion_values >= lesion_values.max() - 1e-6), 0.01)
+
     def test_clipping(self):
         """Test if the function clips the output values within [0, 1]."""
         lesion_image = random_lesion(self.image, intensity_range=(0.5, 0.9), seed=42)
@@ -158,6 +170,14 @@ class TestRandomLesion(unittest.TestCase):
         np.testing.assert_array_almost_equal(lesion1, lesion2, decimal=5,
                                              err_msg="Lesions with the same seed are not identical.")
 
+    def test_rng_keeps_global_state(self):
+        """Test if seeding through `seed` or `rng` leaves NumPy's global random state untouched."""
+        state = np.random.get_state()[1].copy()
+        lesion1 = random_lesion(self.image, shape='irregular', seed=5)
+        lesion2 = random_lesion(self.image, shape='irregular', rng=np.random.default_rng(5))
+        np.testing.assert_array_equal(lesion1, lesion2)
+        np.testing.assert_array_equal(state, np.random.get_state()[1])
+
     def test_lesion_overlap(self):
         """Test if multiple lesions do not unintentionally overlap excessively."""
         num_lesions = 10
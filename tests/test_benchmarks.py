@@ -0,0 +1,101 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+from benchmarks import CASES, compare, run_benchmarks
+from benchmarks.backends import run_backend_benchmarks
+from benchmarks.import_time import compare_imports
+from benchmarks.runner import main, make_input, select_cases
+
+
+class TestBenchmarks(unittest.TestCase):
+    """
+    Test suite for the benchmark runner, on a tiny matrix.
+    """
+
+    def test_every_case_runs_on_every_supported_input(self):
+        """Test if all cases run without errors on a small matrix."""
+        results = run_benchmarks(sizes=[32], channels=[1, 3], min_time=0, repeat=1, memory=False)
+        errors = [entry for entry in results if entry['status'] == 'error']
+        self.assertEqual(errors, [])
+        self.assertEqual(len(results), len(CASES) * 4 * 2)
+        skipped = {entry['op'] for entry in results if entry['status'] == 'skipped'}
+        self.assertIn('random_lesion', skipped)
+
+    def test_measurement_fields(self):
+        """Test if timings, throughput and peak memory are reported."""
+        cases = select_cases(['intensity'])
+        results = run_benchmarks(cases, sizes=[64], dtypes=['float32'], channels=[3], min_time=0, repeat=2)
+        entry = results[0]
+        self.assertEqual(entry['status'], 'ok')
+        self.assertGreaterEqual(entry['runs'], 2)
+        self.assertGreater(entry['megapixels_per_second'], 0)
+        # The float32 output alone takes 64 * 64 * 3 * 4 bytes
+        self.assertGreaterEqual(entry['peak_bytes'], 64 * 64 * 3 * 4)
+
+    def test_make_input(self):
+        """Test if inputs have the requested shape, dtype and value range."""
+        self.assertEqual(make_input(16, 'uint16', 1).shape, (16, 16))
+        batch = make_input(16, 'float32', 4, batch_size=2)
+        self.assertEqual(batch.shape, (2, 16, 16, 4))
+        self.assertEqual(batch.dtype, 'float32')
+        self.assertTrue(0 <= batch.min() and batch.max() <= 1)
+
+    def test_compare(self):
+        """Test if slowdowns, memory growth and new failures are reported as regressions."""
+        key = {'op': 'flip', 'size': 64, 'dtype': 'uint8', 'channels': 1, 'batch_size': 1}
+        baseline = [dict(key, status='ok', seconds=0.01, peak_bytes=1000)]
+        self.assertEqual(compare([dict(key, status='ok', seconds=0.011, peak_bytes=1000)], baseline), [])
+        slower = compare([dict(key, status='ok', seconds=0.02, peak_bytes=1000)], baseline)
+        self.assertEqual([regression['metric'] for regression in slower], ['seconds'])
+        bigger = compare([dict(key, status='ok', seconds=0.01, peak_bytes=2000)], baseline)
+        self.assertEqual([regression['metric'] for regression in bigger], ['peak_bytes'])
+        failing = compare([dict(key, status='error', reason='ValueError: x')], baseline)
+        self.assertEqual([regression['metric'] for regression in failing], ['status'])
+        # Timings below the noise floor are not compared
+        tiny = [dict(key, status='ok', seconds=1e-6, peak_bytes=None)]
+        self.assertEqual(compare([dict(key, status='ok', seconds=1e-5, peak_bytes=None)], tiny), [])
+
+    def test_main_exit_status(self):
+        """Test if the command line writes JSON and exits with 1 on regression."""
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, 'results.json')
+            arguments = ['--ops', 'flip', '--sizes', '32', '--dtypes', 'uint8', '--channels', '1',
+                         '--min-time', '0', '--repeat', '1', '--quiet']
+            self.assertEqual(main(arguments + ['--output', output]), 0)
+            with open(output) as file:
+                document = json.load(file)
+            self.assertIn('environment', document)
+            self.assertEqual(document['results'][0]['op'], 'flip')
+
+            # A baseline that used no memory makes the run fail
+            document['results'][0]['peak_bytes'] = 0
+            with open(output, 'w') as file:
+                json.dump(document, file)
+            stderr = io.StringIO()
+            with redirect_stderr(stderr):
+                self.assertEqual(main(arguments + ['--baseline', output]), 1)
+            self.assertIn('REGRESSION', stderr.getvalue())
+
+    def test_compare_imports(self):
+        """Test if slower imports are reported and tiny timings are ignored."""
+        baseline = [{'name': 'import anaug', 'seconds': 0.010}, {'name': 'flip', 'seconds': 0.001}]
+        results = [{'name': 'import anaug', 'seconds': 0.030}, {'name': 'flip', 'seconds': 0.004}]
+        messages = compare_imports(results, baseline)
+        self.assertEqual(len(messages), 1)
+        self.assertIn('import anaug', messages[0])
+
+    def test_backend_comparison(self):
+        """Test if backend comparisons report a speedup and agree with their reference."""
+        results = run_backend_benchmarks(['blur?gaussian,sigma=?]'], sizes=(32,), dtypes=('uint8', 'float32'),
+                                         channels=(1, 16), min_time=0, repeat=1)
+        self.assertEqual(len(results), 8)
+        for entry in results:
+            self.assertGreater(entry['speedup'], 0)
+            self.assertLessEqual(entry['max_difference'], 2 if entry['dtype'] == 'uint8' else 1e-5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import threading
+import unittest
+import numpy as np
+from src.anaug import BufferPool, Compose, get_buffer_pool, use_buffer_pool
+from src.anaug.default import crop, elastic_deformation, flip, intensity, noise
+from src.anaug.generative.random_lesion import random_lesion
+
+
+class TestBufferPool(unittest.TestCase):
+    """
+    Test suite for the `BufferPool` class and the active-pool context.
+    """
+
+    def test_borrow_release_reuse(self):
+        """Test if released buffers are handed out again for the same shape and dtype."""
+        pool = BufferPool()
+        first = pool.borrow((4, 5), np.float32)
+        self.assertEqual((first.shape, first.dtype), ((4, 5), np.float32))
+        pool.release(first)
+        self.assertIs(pool.borrow((4, 5), np.float32), first)
+        self.assertIsNot(pool.borrow((4, 5), np.float64), first)
+        stats = pool.stats()
+        self.assertEqual((stats['allocations'], stats['reuses']), (2, 1))
+
+    def test_high_water_marks(self):
+        """Test if peak usage is reported per key and in bytes."""
+        pool = BufferPool()
+        buffers = [pool.borrow((10,), np.float64) for _ in range(3)]
+        for buffer in buffers:
+            pool.release(buffer)
+        pool.borrow((10,), np.float64)
+        stats = pool.stats()
+        self.assertEqual(stats['high_water_bytes'], 240)
+        self.assertEqual(stats['in_use_bytes'], 80)
+        self.assertEqual(stats['idle_bytes'], 160)
+        self.assertEqual(stats['high_water_buffers'], {((10,), '<f8'): 3})
+
+    def test_max_idle_bytes(self):
+        """Test if buffers beyond the idle budget are dropped on release."""
+        pool = BufferPool(max_idle_bytes=80)
+        first, second = pool.borrow(10), pool.borrow(10)
+        pool.release(first)
+        pool.release(second)
+        self.assertEqual(pool.stats()['idle_bytes'], 80)
+
+    def test_invalid_release(self):
+        """Test if releasing a foreign or already released array raises a ValueError."""
+        pool = BufferPool()
+        with self.assertRaises(ValueError):
+            pool.release(np.empty(3))
+        buffer = pool.borrow(3)
+        pool.release(buffer)
+        with self.assertRaises(ValueError):
+            pool.release(buffer)
+
+    def test_context_is_scoped(self):
+        """Test if the active pool is restored on exit and not shared with other threads."""
+        pool = BufferPool()
+        seen = []
+        with use_buffer_pool(pool):
+            self.assertIs(get_buffer_pool(), pool)
+            thread = threading.Thread(target=lambda: seen.append(get_buffer_pool()))
+            thread.start()
+            thread.join()
+        self.assertIsNone(get_buffer_pool())
+        self.assertEqual(seen, [None])
+
+    def test_ops_borrow_scratch(self):
+        """Test if ops reuse pooled scratch memory and give unchanged results."""
+        image = np.random.rand(48, 48)
+        pool = BufferPool()
+        with use_buffer_pool(pool):
+            for _ in range(3):
+                deformed = elastic_deformation(image, random_state=0)
+                lesioned = random_lesion(image, size_range=(5, 20), seed=1)
+                noisy = noise(image.astype(np.float32), noise_intensity=0.1)
+        np.testing.assert_array_equal(deformed, elastic_deformation(image, random_state=0))
+        np.testing.assert_array_equal(lesioned, random_lesion(image, size_range=(5, 20), seed=1))
+        self.assertEqual(noisy.dtype, np.float32)
+        stats = pool.stats()
+        self.assertGreater(stats['reuses'], stats['allocations'])
+        self.assertEqual(stats['in_use_bytes'], 0)
+
+
+class TestComposeBufferPool(unittest.TestCase):
+    """
+    Test suite for `Compose` with a buffer pool.
+    """
+
+    def test_steady_state_reuses_buffers(self):
+        """Test if repeated pipeline calls stop allocating and match the unpooled result."""
+        image = np.random.rand(40, 40)
+        steps = [
+            (elastic_deformation, {'random_state': 3}),
+            (intensity, {'brightness_factor': 1.1}),
+            (flip, {'axes': 'vertical'}),
+            (crop, {'top': 0, 'left': 0, 'height': 20, 'width': 20}),
+        ]
+        pool = BufferPool()
+        pipeline = Compose(steps, buffer_pool=pool)
+        expected = Compose(steps)(image)
+        for _ in range(2):
+            np.testing.assert_array_equal(pipeline(image), expected)
+        allocations = pool.stats()['allocations']
+        results = [pipeline(image) for _ in range(3)]
+        self.assertEqual(pool.stats()['allocations'], allocations)
+        self.assertEqual(pool.stats()['in_use_bytes'], 0)
+        self.assertFalse(np.may_share_memory(results[0], results[1]))
+
+    def test_views_of_pooled_intermediates_are_detached(self):
+        """Test if a step returning a view of a pooled buffer does not see it recycled."""
+        pool = BufferPool()
+        pipeline = Compose([(intensity, {'brightness_factor': 2.0}), lambda img: img[:5]], buffer_pool=pool)
+        image = np.full((10, 10), 0.25)
+        first = pipeline(image)
+        pipeline(np.zeros((10, 10)))
+        np.testing.assert_array_equal(first, np.full((5, 10), 0.5))
+
+    def test_invalid_pool(self):
+        """Test if a non-pool object raises a TypeError."""
+        with self.assertRaises(TypeError):
+            Compose([flip], buffer_pool=object())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import os
+import pickle
+import shutil
+import tempfile
+import time
+import unittest
+import numpy as np
+from src.anaug import DiskCache, use_precision
+from src.anaug.default import elastic_deformation, rotate
+
+
+class TestDiskCache(unittest.TestCase):
+    """
+    Test suite for the `DiskCache` class.
+    """
+
+    def setUp(self):
+        """Create a temporary cache directory and a test image."""
+        self.directory = tempfile.mkdtemp()
+        self.image = np.random.rand(32, 32).astype(np.float32)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_miss_then_hit(self):
+        """Test if the second call is served from disk with an identical result."""
+        cache = DiskCache(self.directory)
+        first = cache(elastic_deformation, self.image, alpha=10, sigma=3, random_state=1)
+        second = cache(elastic_deformation, self.image, alpha=10, sigma=3, random_state=1)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertIsInstance(second, np.memmap)
+        np.testing.assert_array_equal(first, second)
+
+    def test_key_depends_on_inputs(self):
+        """Test if the key changes with the content, the operation and the parameters."""
+        key = DiskCache.key(self.image, rotate, {'angle': 10})
+        self.assertEqual(key, DiskCache.key(self.image.copy(), rotate, {'angle': 10}))
+        self.assertNotEqual(key, DiskCache.key(self.image + 1, rotate, {'angle': 10}))
+        self.assertNotEqual(key, DiskCache.key(self.image, rotate, {'angle': 11}))
+        self.assertNotEqual(key, DiskCache.key(self.image, elastic_deformation, {'angle': 10}))
+        self.assertNotEqual(key, DiskCache.key(self.image.astype(np.float64), rotate, {'angle': 10}))
+
+    def test_key_depends_on_precision(self):
+        """Test if results cached under one precision policy are not served under another."""
+        cache = DiskCache(self.directory)
+        params = {'alpha': 10, 'sigma': 3, 'random_state': 1}
+        with use_precision('float32'):
+            key = DiskCache.key(self.image, elastic_deformation, params)
+            cache.put(key, elastic_deformation(self.image.astype(np.float64), **params))
+        self.assertIsNone(cache.get(DiskCache.key(self.image, elastic_deformation, params)))
+        with use_precision('float32'):
+            self.assertIsNotNone(cache.get(DiskCache.key(self.image, elastic_deformation, params)))
+
+    def test_put_replaces_size(self):
+        """Test if storing a key again replaces its size instead of adding to it."""
+        cache = DiskCache(self.directory)
+        cache.put('aa01', self.image)
+        size = cache.size()
+        cache.put('aa01', self.image)
+        self.assertEqual(cache._size, size)
+        self.assertEqual(cache._size, cache._scan_size())
+
+    def test_compressed_entries(self):
+        """Test if compressed entries round-trip as regular arrays."""
+        cache = DiskCache(self.directory, compress=True)
+        op = cache.wrap(rotate, angle=30)
+        first = op(self.image)
+        second = op(self.image)
+        self.assertEqual(cache.hits, 1)
+        self.assertNotIsInstance(second, np.memmap)
+        np.testing.assert_array_equal(first, second)
+
+    def test_lru_eviction(self):
+        """Test if the least recently used entries are removed when the cap is exceeded."""
+        entry_bytes = self.image.nbytes + 128
+        cache = DiskCache(self.directory, max_bytes=2 * entry_bytes)
+        cache.put('aa01', self.image)
+        cache.put('aa02', self.image)
+        old = time.time() - 100
+        os.utime(cache._path('aa01'), (old, old))
+        os.utime(cache._path('aa02'), (old + 1, old + 1))
+        self.assertIsNotNone(cache.get('aa01'))  # refreshes aa01
+        cache.put('aa03', self.image)
+        self.assertIsNone(cache.get('aa02'))
+        self.assertIsNotNone(cache.get('aa01'))
+        self.assertIsNotNone(cache.get('aa03'))
+        self.assertLessEqual(cache.size(), 2 * entry_bytes)
+
+    def test_wrapped_op_is_picklable(self):
+        """Test if a wrapped operation survives pickling for use in worker processes."""
+        op = pickle.loads(pickle.dumps(DiskCache(self.directory).wrap(rotate, angle=45)))
+        np.testing.assert_array_equal(op(self.image), rotate(self.image, angle=45))
+
+    def test_invalid_parameters(self):
+        """Test if unhashable parameters and invalid caps raise errors."""
+        cache = DiskCache(self.directory)
+        with self.assertRaises(TypeError):
+            cache.wrap(elastic_deformation, random_state=np.random.RandomState(0))
+        with self.assertRaises(ValueError):
+            DiskCache(self.directory, max_bytes=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import functools
+import unittest
+import numpy as np
+from src.anaug import Compose
+from src.anaug.default import crop, flip, intensity, random_rotation, rotate, scale
+
+
+class TestCompose(unittest.TestCase):
+    """
+    Test suite for the `Compose` pipeline.
+    """
+
+    def setUp(self):
+        """Set up test images for use in all test cases."""
+        self.gray_image = np.random.rand(60, 80).astype(np.float32)
+        self.color_image = np.random.rand(60, 80, 3).astype(np.float32)
+
+        # A linear ramp is reproduced exactly by bilinear interpolation, so fused and
+        # sequential warps can be compared tightly away from the borders.
+        y, x = np.mgrid[0:200, 0:240].astype(np.float32)
+        self.ramp = (0.3 * x + 0.7 * y) / 300
+
+    def test_fused_matches_sequential_exact_ops(self):
+        """Test if fused flips, crops and quarter turns match running the ops one by one."""
+        steps = [
+            (rotate, {'angle': 90}),
+            (flip, {'axes': ['vertical', 'horizontal']}),
+            (crop, {'top': 5, 'left': 7, 'height': 30, 'width': 40}),
+        ]
+        for image in (self.gray_image, self.color_image):
+            fused = Compose(steps)(image)
+            sequential = Compose(steps, fuse=False)(image)
+            self.assertEqual(fused.shape, sequential.shape)
+            np.testing.assert_array_equal(fused, sequential)
+
+    def test_fused_matches_sequential_interpolated_ops(self):
+        """Test if a fused rotate/scale/crop chain matches the sequential result."""
+        steps = [
+            (rotate, {'angle': 10}),
+            (scale, {'scale_factor': 0.5}),
+            (crop, {'top': 20, 'left': 20, 'height': 60, 'width': 60}),
+        ]
+        fused = Compose(steps)(self.ramp)
+        sequential = Compose(steps, fuse=False)(self.ramp)
+        self.assertEqual(fused.shape, (60, 60))
+        np.testing.assert_allclose(fused, sequential, atol=1e-5)
+
+    def test_output_size_from_last_geometric_op(self):
+        """Test if the fused warp writes straight into the final scale/crop size."""
+        pipeline = Compose([
+            (scale, {'scale_factor': 2.0}),
+            (crop, {'top': 0, 'left': 0, 'height': 50, 'width': 70}),
+        ])
+        self.assertEqual(pipeline(self.color_image).shape, (50, 70, 3))
+
+    def test_many_channels(self):
+        """Test if images with more than four channels are warped correctly."""
+        image = np.random.rand(40, 40, 6).astype(np.float32)
+        steps = [(flip, {'axes': 'horizontal'}), (scale, {'scale_factor': 2.0})]
+        fused = Compose(steps)(image)
+        self.assertEqual(fused.shape, (80, 80, 6))
+        np.testing.assert_allclose(fused, Compose(steps, fuse=False)(image), atol=1e-5)
+
+    def test_random_rotation_reproducible(self):
+        """Test if random rotations in a fused run follow the global NumPy seed."""
+        pipeline = Compose([
+            (random_rotation, {'angle_range': (-30, 30)}),
+            (flip, {'axes': 'horizontal'}),
+        ])
+        np.random.seed(0)
+        first = pipeline(self.gray_image)
+        np.random.seed(0)
+        second = pipeline(self.gray_image)
+        np.testing.assert_array_equal(first, second)
+
+    def test_non_geometric_steps(self):
+        """Test if plain callables and partials run between geometric runs."""
+        image = (self.gray_image * 100).astype(np.uint8)
+        pipeline = Compose([
+            functools.partial(flip, axes='vertical'),
+            (intensity, {'brightness_factor': 1.5}),
+            lambda img: img[:10],
+        ])
+        expected = intensity(np.flipud(image), brightness_factor=1.5)[:10]
+        np.testing.assert_array_equal(pipeline(image), expected)
+
+    def test_padded_crop_breaks_fusion(self):
+        """Test if a crop that needs padding is executed by `crop` itself."""
+        steps = [
+            (flip, {'axes': 'horizontal'}),
+            (crop, {'top': 50, 'left': 70, 'height': 20, 'width': 20,
+                    'adjust_if_exceeds': True, 'pad_value': (1,)}),
+            (flip, {'axes': 'vertical'}),
+        ]
+        fused = Compose(steps)(self.gray_image)
+        np.testing.assert_array_equal(fused, Compose(steps, fuse=False)(self.gray_image))
+
+    def test_invalid_crop_raises(self):
+        """Test if an out-of-bounds crop without adjustment raises a ValueError."""
+        pipeline = Compose([
+            (scale, {'scale_factor': 0.5}),
+            (crop, {'top': 0, 'left': 0, 'height': 60, 'width': 80}),
+        ])
+        with self.assertRaises(ValueError):
+            pipeline(self.gray_image)
+
+    def test_invalid_steps(self):
+        """Test if invalid steps raise a TypeError."""
+        with self.assertRaises(TypeError):
+            Compose(flip)
+        with self.assertRaises(TypeError):
+            Compose([(flip, 'horizontal')])
+        with self.assertRaises(TypeError):
+            Compose([42])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,189 @@
+import time
+import unittest
+import cv2
+import numpy as np
+from src.anaug import Compose, SharedMemoryExecutor, ThreadExecutor
+from src.anaug.default import crop, flip, noise, rotate
+
+
+def _fail(image):
+    raise KeyError("broken pipeline")
+
+
+def _fail_on_marker(image):
+    if image[0, 0] < 0:
+        raise ValueError(f"marker {image[0, 0]}")
+    return image
+
+
+class TestSharedMemoryExecutor(unittest.TestCase):
+    """
+    Test suite for the `SharedMemoryExecutor` class.
+    """
+
+    def setUp(self):
+        """Set up test images and pipelines for use in all test cases."""
+        self.images = np.random.rand(40, 32, 32).astype(np.float32)
+        self.deterministic = Compose([
+            (flip, {'axes': 'horizontal'}),
+            (crop, {'top': 0, 'left': 0, 'height': 16, 'width': 24}),
+        ])
+        self.random = Compose([(noise, {'noise_type': 'gaussian', 'noise_intensity': 0.1})])
+
+    def test_matches_direct_calls(self):
+        """Test if results match running the pipeline in the parent process."""
+        with SharedMemoryExecutor(self.deterministic, input_shape=(32, 32), output_shape=(16, 24),
+                                  batch_size=8, num_workers=2) as executor:
+            results = executor.map(self.images)
+        expected = np.stack([self.deterministic(image) for image in self.images])
+        np.testing.assert_array_equal(results, expected)
+
+    def test_seed_reproducible_across_worker_counts(self):
+        """Test if a root seed gives the same results regardless of the number of workers."""
+        with SharedMemoryExecutor(self.random, input_shape=(32, 32), batch_size=8,
+                                  num_workers=1, seed=3) as executor:
+            first = executor.map(self.images)
+        with SharedMemoryExecutor(self.random, input_shape=(32, 32), batch_size=8,
+                                  num_workers=3, seed=3) as executor:
+            second = executor.map(self.images)
+        np.testing.assert_array_equal(first, second)
+        # Different samples get independent noise
+        self.assertFalse(np.array_equal(first[0] - self.images[0], first[1] - self.images[1]))
+
+    def test_imap_yields_views_with_backpressure(self):
+        """Test if imap yields shared-memory views and never pulls more than the ring holds."""
+        pulled = []
+
+        def batches():
+            for i in range(0, 40, 8):
+                pulled.append(i)
+                yield self.images[i:i + 8]
+
+        with SharedMemoryExecutor(self.deterministic, input_shape=(32, 32), output_shape=(16, 24),
+                                  batch_size=8, num_slots=2, num_workers=2) as executor:
+            for step, augmented in enumerate(executor.imap(batches())):
+                self.assertLessEqual(len(pulled), step + 2)
+                self.assertFalse(augmented.flags.owndata)
+                np.testing.assert_array_equal(augmented[0], self.deterministic(self.images[step * 8]))
+                del augmented
+
+    def test_worker_error_is_raised(self):
+        """Test if exceptions in worker processes surface as RuntimeError."""
+        with SharedMemoryExecutor(_fail, input_shape=(32, 32), batch_size=8, num_workers=2) as executor:
+            with self.assertRaises(RuntimeError):
+                executor.map(self.images)
+
+    def test_worker_error_belongs_to_its_batch(self):
+        """Test if a failing batch raises its own first error and earlier batches still arrive."""
+        images = self.images.copy()
+        images[8:16, 0, 0] = -1
+        images[16:24, 0, 0] = -2
+        batches = [images[i:i + 8] for i in range(0, 40, 8)]
+        yielded = 0
+        with SharedMemoryExecutor(_fail_on_marker, input_shape=(32, 32), batch_size=8,
+                                  num_workers=2) as executor:
+            with self.assertRaisesRegex(RuntimeError, r"marker -1\.0") as context:
+                for augmented in executor.imap(batches):
+                    np.testing.assert_array_equal(augmented, batches[yielded])
+                    yielded += 1
+        self.assertEqual(yielded, 1)
+        self.assertNotIn("marker -2", str(context.exception))
+
+    def test_invalid_batch(self):
+        """Test if batches with the wrong shape or size raise a ValueError."""
+        with SharedMemoryExecutor(self.random, input_shape=(32, 32), batch_size=8, num_workers=1) as executor:
+            with self.assertRaises(ValueError):
+                list(executor.imap([np.zeros((4, 16, 16), dtype=np.float32)]))
+            with self.assertRaises(ValueError):
+                list(executor.imap([np.zeros((9, 32, 32), dtype=np.float32)]))
+
+    def test_invalid_parameters(self):
+        """Test if invalid constructor parameters raise errors."""
+        with self.assertRaises(ValueError):
+            SharedMemoryExecutor(self.random, input_shape=(32, 32), num_slots=1)
+        with self.assertRaises(TypeError):
+            SharedMemoryExecutor(None, input_shape=(32, 32))
+
+
+class TestThreadExecutor(unittest.TestCase):
+    """
+    Test suite for the `ThreadExecutor` class.
+    """
+
+    def setUp(self):
+        """Set up test images and a pipeline for use in all test cases."""
+        self.images = np.random.rand(20, 32, 32).astype(np.float32)
+        self.pipeline = Compose([
+            (rotate, {'angle': 15}),
+            (crop, {'top': 0, 'left': 0, 'height': 16, 'width': 24}),
+        ])
+
+    def test_matches_direct_calls(self):
+        """Test if results match running the pipeline sequentially."""
+        with ThreadExecutor(self.pipeline, num_threads=4) as executor:
+            results = executor.map(self.images)
+        expected = np.stack([self.pipeline(image) for image in self.images])
+        np.testing.assert_array_equal(results, expected)
+
+    def test_out_buffer(self):
+        """Test if results are written into a caller-provided buffer."""
+        out = np.empty((20, 16, 24), dtype=np.float32)
+        with ThreadExecutor(self.pipeline, num_threads=3) as executor:
+            returned = executor.map(self.images, out=out)
+        self.assertIs(returned, out)
+        np.testing.assert_array_equal(out[5], self.pipeline(self.images[5]))
+
+    def test_restores_cv2_threads(self):
+        """Test if the OpenCV thread count is pinned while open and restored after the last close."""
+        previous = cv2.getNumThreads()
+        first = ThreadExecutor(self.pipeline, num_threads=2, cv2_threads=1)
+        self.assertEqual(cv2.getNumThreads(), 1)
+        with ThreadExecutor(self.pipeline, num_threads=2, cv2_threads=2) as executor:
+            executor.map(self.images)
+            self.assertEqual(cv2.getNumThreads(), 2)
+            first.close()
+            self.assertEqual(cv2.getNumThreads(), 2)
+        self.assertEqual(cv2.getNumThreads(), previous)
+        first.close()
+        self.assertEqual(cv2.getNumThreads(), previous)
+
+    def test_error_waits_for_all_chunks(self):
+        """Test if a failure re-raises the first chunk's error only after every other chunk is done."""
+        images = self.images.copy()
+        images[0, 0, 0] = -1
+        images[10, 0, 0] = -2
+
+        def pipeline(image):
+            if image[0, 0] < 0:
+                return _fail_on_marker(image)
+            time.sleep(0.01)
+            return image
+
+        out = np.zeros_like(images)
+        with ThreadExecutor(pipeline, num_threads=4) as executor:
+            with self.assertRaisesRegex(ValueError, r"marker -1\.0"):
+                executor.map(images, out=out)
+        np.testing.assert_array_equal(out[5:10], images[5:10])
+        np.testing.assert_array_equal(out[15:], images[15:])
+
+    def test_stats(self):
+        """Test if per-thread statistics account for every sample."""
+        with ThreadExecutor(self.pipeline, num_threads=4) as executor:
+            executor.map(self.images)
+            stats = executor.stats()
+            self.assertEqual(sum(thread['samples'] for thread in stats['threads'].values()), 20)
+            self.assertGreater(stats['wall_time'], 0)
+            self.assertGreaterEqual(stats['utilization'], 0)
+            executor.reset_stats()
+            self.assertEqual(executor.stats()['threads'], {})
+
+    def test_closed_executor(self):
+        """Test if using a closed executor raises a RuntimeError."""
+        executor = ThreadExecutor(self.pipeline, num_threads=1)
+        executor.close()
+        with self.assertRaises(RuntimeError):
+            executor.map(self.images)
+
+
+if __name__ == "__main__":
+    unittest.main()
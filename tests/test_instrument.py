@@ -0,0 +1,193 @@
+import json
+import time
+import tracemalloc
+import unittest
+from unittest import mock
+import numpy as np
+import src.anaug.instrument as instrument
+from src.anaug import (Compose, SharedMemoryExecutor, add_metrics, disable_instrumentation, enable_instrumentation,
+                       get_metrics, instrumentation, instrumented, is_instrumentation_enabled, merge_metrics,
+                       reset_metrics, to_json, to_prometheus)
+from src.anaug.default import blur, crop, elastic_deformation, flip, intensity, rotate, scale
+from src.anaug.generative.random_lesion import random_lesion
+
+
+def _augment(image):
+    return intensity(flip(image, 'horizontal'), brightness_factor=1.1)
+
+
+class TestInstrumentation(unittest.TestCase):
+    """
+    Test suite for per-op instrumentation.
+    """
+
+    def setUp(self):
+        """Start every test from a disabled switch and empty metrics."""
+        disable_instrumentation()
+        reset_metrics()
+        self.image = np.random.rand(64, 64).astype(np.float32)
+
+    def tearDown(self):
+        disable_instrumentation()
+        reset_metrics()
+
+    def test_disabled_records_nothing(self):
+        """Test if nothing is recorded while instrumentation is off."""
+        blur(self.image, blur_radius=1)
+        self.assertFalse(is_instrumentation_enabled())
+        self.assertEqual(get_metrics()['ops'], {})
+
+    def test_records_calls_and_bytes(self):
+        """Test if calls, time and bytes in/out/allocated are recorded per op."""
+        with instrumentation():
+            blur(self.image, blur_radius=1)
+            blur(self.image, blur_radius=2)
+            intensity(self.image, brightness_factor=1.2, inplace=True)
+            random_lesion(self.image.astype(np.float64), size_range=(5, 10), seed=0)
+        self.assertFalse(is_instrumentation_enabled())
+        ops = get_metrics()['ops']
+        self.assertEqual(ops['blur']['calls'], 2)
+        self.assertEqual(ops['blur']['bytes_in'], 2 * self.image.nbytes)
+        self.assertEqual(ops['blur']['bytes_out'], 2 * self.image.nbytes)
+        self.assertEqual(ops['blur']['bytes_allocated'], 2 * self.image.nbytes)
+        self.assertGreater(ops['blur']['seconds'], 0)
+        self.assertGreaterEqual(ops['blur']['seconds'], ops['blur']['seconds_max'])
+        self.assertIsNone(ops['blur']['peak_bytes'])
+        # In-place results are not counted as allocations
+        self.assertEqual(ops['intensity']['bytes_allocated'], 0)
+        self.assertEqual(ops['random_lesion']['calls'], 1)
+
+    def test_out_is_not_an_allocation(self):
+        """Test if results written into `out` are not counted as allocations."""
+        out = np.empty_like(self.image)
+        with instrumentation():
+            blur(self.image, blur_radius=1, out=out)
+        stats = get_metrics()['ops']['blur']
+        self.assertEqual(stats['bytes_allocated'], 0)
+        self.assertEqual(stats['bytes_in'], self.image.nbytes)
+
+    def test_errors(self):
+        """Test if failing calls are counted and the exception propagates."""
+        with instrumentation():
+            with self.assertRaises(ValueError):
+                crop(self.image, 0, 0, 128, 128)
+        stats = get_metrics()['ops']['crop']
+        self.assertEqual((stats['calls'], stats['errors']), (1, 1))
+
+    @unittest.skipUnless(hasattr(tracemalloc, 'reset_peak'), "per-call peaks need Python 3.9")
+    def test_trace_allocations(self):
+        """Test if the traced peak covers the temporaries of a call, including nested calls."""
+        was_tracing = tracemalloc.is_tracing()
+        with instrumentation(trace_allocations=True):
+            elastic_deformation(self.image, random_state=0)
+            blur(self.image, blur_type='motion', blur_radius=1)
+        self.assertEqual(tracemalloc.is_tracing(), was_tracing)
+        ops = get_metrics()['ops']
+        # Two float64 displacement fields are live at once
+        self.assertGreaterEqual(ops['elastic_deformation']['peak_bytes'], 2 * 64 * 64 * 8)
+        self.assertGreaterEqual(ops['blur']['peak_bytes'], self.image.nbytes)
+
+    def test_nested_calls_are_accounted_once(self):
+        """Test if ops called by other ops record calls but leave allocations to the outermost op."""
+        with instrumentation(trace_allocations=True):
+            blur(self.image, blur_type='motion', blur_radius=1)
+        ops = get_metrics()['ops']
+        self.assertEqual(ops['motion_blur']['calls'], 1)
+        self.assertEqual(ops['motion_blur']['bytes_allocated'], 0)
+        self.assertIsNone(ops['motion_blur']['peak_bytes'])
+        self.assertEqual(ops['blur']['bytes_allocated'], self.image.nbytes)
+
+    def test_trace_allocations_without_reset_peak(self):
+        """Test if peaks are reported as unavailable where `tracemalloc.reset_peak` is missing (Python 3.8)."""
+        with mock.patch.object(instrument, '_CAN_RESET_PEAK', False):
+            with instrumentation(trace_allocations=True):
+                blur(self.image, blur_radius=1)
+        stats = get_metrics()['ops']['blur']
+        self.assertEqual(stats['calls'], 1)
+        self.assertIsNone(stats['peak_bytes'])
+
+    def test_nested_switch_restores_state(self):
+        """Test if a nested block restores the outer state on exit."""
+        enable_instrumentation()
+        with instrumentation():
+            pass
+        self.assertTrue(is_instrumentation_enabled())
+        disable_instrumentation()
+        self.assertFalse(is_instrumentation_enabled())
+
+    def test_compose_reports_fused_warps(self):
+        """Test if fused geometric runs are reported as 'fused_affine'."""
+        pipeline = Compose([(rotate, {'angle': 10}), (scale, {'scale_factor': 0.5}), (blur, {})])
+        with instrumentation():
+            pipeline(self.image)
+        ops = get_metrics()['ops']
+        self.assertEqual(ops['fused_affine']['calls'], 1)
+        self.assertEqual(ops['blur']['calls'], 1)
+        self.assertNotIn('rotate', ops)
+
+    def test_decorator_preserves_metadata(self):
+        """Test if instrumented functions keep their name and can take a custom metric name."""
+        self.assertEqual(blur.__name__, 'blur')
+        self.assertIn('Applies blur', blur.__doc__)
+
+        @instrumented(name='custom')
+        def double(image):
+            return image * 2
+
+        with instrumentation():
+            double(self.image)
+        self.assertEqual(get_metrics()['ops']['custom']['calls'], 1)
+
+    def test_merge_and_export(self):
+        """Test merging snapshots and the JSON and Prometheus exports."""
+        with instrumentation():
+            blur(self.image)
+        first = get_metrics()
+        second = {'processes': [1], 'ops': {'blur': dict(first['ops']['blur'], seconds_max=100.0),
+                                            'flip': dict(first['ops']['blur'])}}
+        merged = merge_metrics(first, second)
+        self.assertEqual(merged['ops']['blur']['calls'], 2)
+        self.assertEqual(merged['ops']['blur']['seconds_max'], 100.0)
+        self.assertEqual(merged['ops']['flip']['calls'], 1)
+        self.assertIn(1, merged['processes'])
+
+        add_metrics(second)
+        self.assertEqual(get_metrics()['ops']['blur']['calls'], 2)
+        self.assertEqual(json.loads(to_json())['ops']['blur']['calls'], 2)
+
+        text = to_prometheus(merged)
+        self.assertIn('# TYPE anaug_op_calls_total counter', text)
+        self.assertIn('anaug_op_calls_total{op="blur"} 2', text)
+        self.assertNotIn('anaug_op_peak_bytes', text)
+        self.assertEqual(to_prometheus({'processes': [], 'ops': {}}), '')
+
+    def test_shared_memory_workers_are_merged(self):
+        """Test if metrics recorded in worker processes reach the parent."""
+        images = np.random.rand(8, 32, 32).astype(np.float32)
+        with instrumentation():
+            with SharedMemoryExecutor(_augment, input_shape=(32, 32), batch_size=4, num_workers=2, seed=0) as executor:
+                executor.map(images)
+        metrics = get_metrics()
+        self.assertEqual(metrics['ops']['flip']['calls'], 8)
+        self.assertEqual(metrics['ops']['intensity']['calls'], 8)
+        self.assertGreaterEqual(len(metrics['processes']), 1)
+
+    def test_disabled_overhead_is_small(self):
+        """Test if a disabled instrumented op costs little more than the bare function."""
+        small = np.zeros((2, 2), dtype=np.float32)
+        bare = flip.__wrapped__
+        calls = 2000
+
+        def timed(func):
+            begin = time.perf_counter()
+            for _ in range(calls):
+                func(small, 'horizontal')
+            return time.perf_counter() - begin
+
+        overhead = min(timed(flip) for _ in range(3)) - min(timed(bare) for _ in range(3))
+        # Generous bound: a flag check per call is well under a microsecond
+        self.assertLess(overhead / calls, 5e-6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import json
+import os
+import subprocess
+import sys
+import types
+import unittest
+import src.anaug
+import src.anaug.default
+from src.anaug.default import flip
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _loaded_after(statement):
+    """Run `statement` in a fresh interpreter and return which heavy backends it loaded."""
+    code = (f"import sys, json\n{statement}\n"
+            "print(json.dumps([name for name in ('cv2', 'scipy') if name in sys.modules]))")
+    completed = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+class TestLazyImports(unittest.TestCase):
+    """
+    Test suite for lazy loading of the public API.
+    """
+
+    def test_light_imports_do_not_load_backends(self):
+        """Test if importing the package and the NumPy-only ops loads neither OpenCV nor SciPy."""
+        self.assertEqual(_loaded_after("import src.anaug"), [])
+        self.assertEqual(_loaded_after("from src.anaug.default import flip, intensity, noise, crop"), [])
+        self.assertEqual(_loaded_after("from src.anaug import Compose, BufferPool, get_metrics"), ['cv2'])
+
+    def test_backends_load_on_first_use(self):
+        """Test if an op that needs a backend loads it when it is accessed."""
+        self.assertEqual(_loaded_after("import src.anaug\nsrc.anaug.blur"), ['cv2', 'scipy'])
+
+    def test_attributes_resolve_to_functions(self):
+        """Test if names resolve to the functions even when a submodule of the same name is imported."""
+        import src.anaug.default.blur
+        self.assertIsInstance(src.anaug.default.blur, types.FunctionType)
+        self.assertIs(src.anaug.default.flip, flip)
+        self.assertIs(src.anaug.flip, flip)
+        self.assertIsInstance(src.anaug.Compose, type)
+        from src.anaug.generative import random_lesion
+        self.assertIsInstance(random_lesion, types.FunctionType)
+
+    def test_dir_and_missing_names(self):
+        """Test if `dir` lists lazy names and unknown names raise AttributeError."""
+        self.assertIn('elastic_deformation_batch', dir(src.anaug.default))
+        self.assertIn('DiskCache', dir(src.anaug))
+        with self.assertRaises(AttributeError):
+            getattr(src.anaug.default, 'does_not_exist')
+        with self.assertRaises(AttributeError):
+            getattr(src.anaug, 'does_not_exist')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from src.anaug import augment_memmap
+from src.anaug.default import crop, flip, flip_batch
+
+
+def _flip_horizontal(image):
+    return flip(image, axes='horizontal')
+
+
+def _crop_center(image):
+    return crop(image, 4, 4, 8, 8)
+
+
+class TestAugmentMemmap(unittest.TestCase):
+    """
+    Test suite for the `augment_memmap` function.
+    """
+
+    def setUp(self):
+        """Write a test stack to a temporary .npy file."""
+        self.directory = tempfile.mkdtemp()
+        self.source_path = os.path.join(self.directory, 'stack.npy')
+        self.output_path = os.path.join(self.directory, 'augmented.npy')
+        self.stack = np.random.rand(25, 16, 16).astype(np.float32)
+        np.save(self.source_path, self.stack)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_path_to_path(self):
+        """Test if a .npy file is augmented into a new memory-mapped .npy file."""
+        out = augment_memmap(_flip_horizontal, self.source_path, self.output_path, chunk_size=4)
+        self.assertIsInstance(out, np.memmap)
+        del out
+        np.testing.assert_array_equal(np.load(self.output_path), self.stack[:, :, ::-1])
+
+    def test_output_shape_inferred(self):
+        """Test if the output shape follows the pipeline output."""
+        out = augment_memmap(_crop_center, self.source_path, self.output_path, chunk_bytes=3 * 16 * 16 * 4)
+        self.assertEqual(out.shape, (25, 8, 8))
+        np.testing.assert_array_equal(out, self.stack[:, 4:12, 4:12])
+
+    def test_preallocated_destination(self):
+        """Test if results are written into a caller-provided memory map."""
+        destination = np.lib.format.open_memmap(self.output_path, mode='w+', dtype=np.float32, shape=(25, 16, 16))
+        out = augment_memmap(_flip_horizontal, self.source_path, destination, chunk_size=7)
+        self.assertIs(out, destination)
+        np.testing.assert_array_equal(destination, self.stack[:, :, ::-1])
+
+    def test_batched_pipeline(self):
+        """Test if a batched pipeline is called once per chunk."""
+        calls = []
+
+        def pipeline(chunk):
+            calls.append(chunk.shape[0])
+            return flip_batch(chunk, vertical=True)
+
+        out = augment_memmap(pipeline, np.load(self.source_path, mmap_mode='r'), chunk_size=10, batched=True)
+        self.assertEqual(calls, [10, 10, 5])
+        np.testing.assert_array_equal(out, self.stack[:, ::-1])
+
+    def test_invalid_parameters(self):
+        """Test if invalid inputs raise errors."""
+        with self.assertRaises(TypeError):
+            augment_memmap(_flip_horizontal, [[1, 2], [3, 4]])
+        with self.assertRaises(ValueError):
+            augment_memmap(_flip_horizontal, self.source_path, chunk_size=0)
+        with self.assertRaises(ValueError):
+            augment_memmap(_flip_horizontal, self.source_path, np.empty((3, 16, 16), dtype=np.float32))
+
+
+if __name__ == "__main__":
+    unittest.main()
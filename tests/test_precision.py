@@ -0,0 +1,110 @@
+import unittest
+import numpy as np
+from src.anaug import BufferPool, Compose, get_precision, set_precision, use_buffer_pool, use_precision
+from src.anaug.default import elastic_deformation, intensity, intensity_batch, noise, noise_batch
+from src.anaug.generative.random_lesion import random_lesion
+
+
+class TestPrecisionPolicy(unittest.TestCase):
+    """
+    Test suite for the floating-point precision policy.
+    """
+
+    def setUp(self):
+        """Set up a float32 test image."""
+        self.image = np.random.rand(64, 64).astype(np.float32)
+
+    def test_default_and_scoping(self):
+        """Test if the default is 'float64' and overrides are restored on exit."""
+        self.assertEqual(get_precision(), 'float64')
+        with use_precision('float32'):
+            self.assertEqual(get_precision(), 'float32')
+            with use_precision(None):
+                self.assertEqual(get_precision(), 'float32')
+        self.assertEqual(get_precision(), 'float64')
+        set_precision('input')
+        try:
+            self.assertEqual(get_precision(), 'input')
+        finally:
+            set_precision('float64')
+        with self.assertRaises(ValueError):
+            set_precision('float16')
+
+    def _compare(self, func, atol, **kwargs):
+        """Run `func` under the float64 and float32 policies with the same seed."""
+        np.random.seed(0)
+        reference = func(**kwargs)
+        with use_precision('float32'):
+            np.random.seed(0)
+            result = func(**kwargs)
+        self.assertEqual(result.dtype, reference.dtype)
+        np.testing.assert_allclose(result, reference, atol=atol)
+
+    def test_intensity_close_to_float64(self):
+        """Test if float32 brightness/contrast stays within float32 rounding of float64."""
+        self._compare(intensity, 1e-6, image=self.image, brightness_factor=1.3, contrast_factor=0.7)
+        self._compare(intensity_batch, 1e-6, images=np.stack([self.image] * 2), brightness_factors=[1.3, 0.8])
+        uint8_image = (self.image * 255).astype(np.uint8)
+        self._compare(intensity, 1, image=uint8_image, brightness_factor=1.3, contrast_factor=0.7)
+
+    def _compare_statistics(self, func, rtol, **kwargs):
+        """Run `func` under both policies; float32 sampling draws its own stream, so compare statistics."""
+        reference = func(rng=0, **kwargs)
+        with use_precision('float32'):
+            result = func(rng=0, **kwargs)
+            np.testing.assert_array_equal(result, func(rng=0, **kwargs))
+        self.assertEqual(result.dtype, reference.dtype)
+        change = np.abs(result.astype(np.float64) - self.image).mean()
+        reference_change = np.abs(reference.astype(np.float64) - self.image).mean()
+        self.assertAlmostEqual(change / reference_change, 1.0, delta=rtol)
+
+    def test_noise_close_to_float64(self):
+        """Test if float32 noise has the statistics of float64 noise and Poisson draws are unchanged."""
+        self._compare_statistics(noise, 0.05, image=self.image, noise_type='gaussian', noise_intensity=0.1)
+        self._compare(noise, 1e-6, image=self.image, noise_type='poisson', noise_intensity=20.0)
+        batch = np.stack([self.image] * 2)
+        reference = noise_batch(batch, 'gaussian', noise_intensities=[0.05, 0.1], rng=0)
+        with use_precision('float32'):
+            result = noise_batch(batch, 'gaussian', noise_intensities=[0.05, 0.1], rng=0)
+        self.assertEqual(result.dtype, reference.dtype)
+        np.testing.assert_allclose(np.std(result - batch, axis=(1, 2)), np.std(reference - batch, axis=(1, 2)),
+                                   rtol=0.1)
+
+    def test_elastic_and_lesion_close_to_float64(self):
+        """Test if float32 displacement fields and textures deform like float64 ones."""
+        self._compare_statistics(elastic_deformation, 0.2, image=self.image, alpha=20, sigma=3)
+        self._compare_statistics(random_lesion, 0.5, image=self.image, shape='ellipse', size_range=(10, 20))
+        self._compare_statistics(random_lesion, 0.5, image=self.image, shape='irregular', size_range=(10, 20))
+
+    def test_float32_intermediates(self):
+        """Test if no float64 scratch buffer is borrowed under the float32 policy."""
+        pool = BufferPool()
+        with use_buffer_pool(pool), use_precision('float32'):
+            elastic_deformation(self.image, random_state=0)
+            noise(self.image, noise_intensity=0.1)
+            random_lesion(self.image, seed=0)
+        dtypes = {dtype for _, dtype in pool.stats()['high_water_buffers']}
+        self.assertEqual(dtypes, {'<f4'})
+
+    def test_input_policy(self):
+        """Test if the 'input' policy follows float inputs and uses float32 otherwise."""
+        pool = BufferPool()
+        with use_buffer_pool(pool), use_precision('input'):
+            elastic_deformation(self.image.astype(np.float64), random_state=0)
+            elastic_deformation((self.image * 255).astype(np.uint8), random_state=0)
+        dtypes = {dtype for _, dtype in pool.stats()['high_water_buffers']}
+        self.assertEqual(dtypes, {'<f8', '<f4'})
+
+    def test_compose_precision(self):
+        """Test if a pipeline applies its policy only while it runs."""
+        seen = []
+        pipeline = Compose([lambda image: seen.append(get_precision()) or image], precision='float32')
+        pipeline(self.image)
+        self.assertEqual(seen, ['float32'])
+        self.assertEqual(get_precision(), 'float64')
+        with self.assertRaises(ValueError):
+            Compose([], precision='double')
+
+
+if __name__ == "__main__":
+    unittest.main()
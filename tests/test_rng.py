@@ -0,0 +1,78 @@
+import threading
+import unittest
+import numpy as np
+from src.anaug import get_rng, spawn_rngs, stream_rng, use_rng
+from src.anaug.default import noise
+
+
+class TestRng(unittest.TestCase):
+    """
+    Test suite for the `rng=` resolution and the parallel stream helpers.
+    """
+
+    def setUp(self):
+        """Set up a float32 test image."""
+        self.image = np.random.rand(32, 32).astype(np.float32)
+
+    def test_get_rng(self):
+        """Test if every accepted `rng` type resolves to a Generator."""
+        generator = np.random.default_rng(0)
+        self.assertIs(get_rng(generator), generator)
+        np.testing.assert_array_equal(get_rng(5).random(4), np.random.default_rng(5).random(4))
+        np.testing.assert_array_equal(get_rng(np.random.SeedSequence(5)).random(4),
+                                      np.random.default_rng(5).random(4))
+        legacy = np.random.RandomState(0)
+        self.assertIsInstance(get_rng(legacy), np.random.Generator)
+        with self.assertRaises(TypeError):
+            get_rng('seed')
+
+    def test_default_follows_global_seed(self):
+        """Test if ops without `rng` are reproducible with `np.random.seed`."""
+        np.random.seed(3)
+        first = noise(self.image, noise_intensity=0.1)
+        np.random.seed(3)
+        second = noise(self.image, noise_intensity=0.1)
+        np.testing.assert_array_equal(first, second)
+
+    def test_use_rng(self):
+        """Test if `use_rng` supplies the generator of ops called without `rng`, and only in its context."""
+        with use_rng(7):
+            first = noise(self.image, noise_intensity=0.1)
+            seen = []
+            thread = threading.Thread(target=lambda: seen.append(get_rng()))
+            thread.start()
+            thread.join()
+        with use_rng(np.random.default_rng(7)) as rng:
+            self.assertIs(get_rng(), rng)
+            second = noise(self.image, noise_intensity=0.1)
+            # An explicit `rng` still takes precedence
+            third = noise(self.image, noise_intensity=0.1, rng=11)
+        np.testing.assert_array_equal(first, second)
+        np.testing.assert_array_equal(third, noise(self.image, noise_intensity=0.1, rng=11))
+        self.assertIsNot(seen[0], rng)
+
+    def test_streams(self):
+        """Test if streams depend only on the root seed and key, and differ between keys."""
+        for bit_generator in ('philox', 'pcg64'):
+            first = stream_rng(1, 4, bit_generator=bit_generator).random(8)
+            np.testing.assert_array_equal(first, stream_rng(1, 4, bit_generator=bit_generator).random(8))
+            self.assertFalse(np.array_equal(first, stream_rng(1, 5, bit_generator=bit_generator).random(8)))
+            self.assertFalse(np.array_equal(first, stream_rng(2, 4, bit_generator=bit_generator).random(8)))
+        self.assertIsInstance(stream_rng(1, 0).bit_generator, np.random.Philox)
+        with self.assertRaises(ValueError):
+            stream_rng(1, -1)
+        with self.assertRaises(ValueError):
+            stream_rng(1, 0, bit_generator='mt19937')
+
+    def test_spawn_rngs(self):
+        """Test if spawned streams match `SeedSequence.spawn` and are distinct."""
+        rngs = spawn_rngs(42, 3, bit_generator='pcg64')
+        children = np.random.SeedSequence(42).spawn(3)
+        for rng, child in zip(rngs, children):
+            np.testing.assert_array_equal(rng.random(4), np.random.Generator(np.random.PCG64(child)).random(4))
+        draws = [rng.random(4) for rng in spawn_rngs(None, 2)]
+        self.assertFalse(np.array_equal(draws[0], draws[1]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import os
+import shutil
+import tempfile
+import unittest
+import cv2
+import numpy as np
+from src.anaug import DirectoryStream
+from src.anaug.default import flip
+
+
+def _flip_horizontal(image):
+    return flip(image, axes='horizontal')
+
+
+class TestDirectoryStream(unittest.TestCase):
+    """
+    Test suite for the `DirectoryStream` class.
+    """
+
+    def setUp(self):
+        """Create a source directory with images in nested folders."""
+        self.src_dir = tempfile.mkdtemp()
+        self.dst_dir = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.src_dir, 'nested'))
+        self.images = {}
+        for i in range(12):
+            relative_path = os.path.join('nested' if i % 3 == 0 else '', f'slice_{i}.png')
+            image = np.random.randint(0, 256, (24, 32), dtype=np.uint8)
+            cv2.imwrite(os.path.join(self.src_dir, relative_path), image)
+            self.images[relative_path] = image
+        with open(os.path.join(self.src_dir, 'notes.txt'), 'w') as handle:
+            handle.write('not an image')
+
+    def tearDown(self):
+        shutil.rmtree(self.src_dir)
+        shutil.rmtree(self.dst_dir)
+
+    def test_run_writes_augmented_images(self):
+        """Test if every image is augmented and written with the same layout and dtype."""
+        stats = DirectoryStream(_flip_horizontal, self.src_dir, self.dst_dir, num_readers=3).run()
+        for relative_path, image in self.images.items():
+            written = cv2.imread(os.path.join(self.dst_dir, relative_path), cv2.IMREAD_UNCHANGED)
+            self.assertEqual(written.dtype, np.uint8)
+            np.testing.assert_array_equal(written, image[:, ::-1])
+        for stage in ('read', 'augment', 'write'):
+            self.assertEqual(stats[stage]['images'], 12)
+        self.assertGreater(stats['wall_seconds'], 0)
+
+    def test_iteration_yields_normalized_images(self):
+        """Test if iterating yields float images in [0, 1] with their relative paths."""
+        results = dict(DirectoryStream(_flip_horizontal, self.src_dir))
+        self.assertEqual(set(results), set(self.images))
+        for relative_path, augmented in results.items():
+            self.assertEqual(augmented.dtype, np.float32)
+            np.testing.assert_allclose(augmented, self.images[relative_path][:, ::-1] / 255.0, atol=1e-6)
+
+    def test_early_stop(self):
+        """Test if abandoning the iteration stops the reader threads cleanly."""
+        stream = DirectoryStream(_flip_horizontal, self.src_dir, queue_size=1)
+        for count, _ in enumerate(stream, start=1):
+            if count == 2:
+                break
+        self.assertLessEqual(stream.stats()['augment']['images'], 2)
+
+    def test_unreadable_files(self):
+        """Test if undecodable files raise or are skipped as configured."""
+        with open(os.path.join(self.src_dir, 'broken.png'), 'w') as handle:
+            handle.write('garbage')
+        with self.assertRaises(ValueError):
+            DirectoryStream(_flip_horizontal, self.src_dir, self.dst_dir).run()
+        stats = DirectoryStream(_flip_horizontal, self.src_dir, self.dst_dir, skip_unreadable=True).run()
+        self.assertEqual(stats['skipped'], 1)
+        self.assertEqual(stats['write']['images'], 12)
+
+    def test_invalid_parameters(self):
+        """Test if invalid parameters raise errors."""
+        with self.assertRaises(ValueError):
+            DirectoryStream(_flip_horizontal, os.path.join(self.src_dir, 'missing'))
+        with self.assertRaises(ValueError):
+            DirectoryStream(_flip_horizontal, self.src_dir, queue_size=0)
+        with self.assertRaises(ValueError):
+            DirectoryStream(_flip_horizontal, self.src_dir).run()
+
+
+if __name__ == "__main__":
+    unittest.main()
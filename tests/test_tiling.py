@@ -0,0 +1,117 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from src.anaug import tile_halo, tiled_apply
+from src.anaug.default import blur, elastic_deformation, intensity, noise
+from src.anaug.generative.random_lesion import random_lesion
+
+
+def _invert(image):
+    return 1 - image
+
+
+class TestTiledApply(unittest.TestCase):
+    """
+    Test suite for the `tiled_apply` and `tile_halo` functions.
+    """
+
+    def setUp(self):
+        """Set up grayscale and color test images and a temporary directory."""
+        self.directory = tempfile.mkdtemp()
+        self.gray_image = np.random.rand(150, 130).astype(np.float32)
+        self.color_image = np.random.randint(0, 256, (150, 130, 3), dtype=np.uint8)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_tile_halo(self):
+        """Test the halos of the built-in ops."""
+        self.assertEqual(tile_halo(blur, {'blur_type': 'gaussian', 'blur_radius': 2}), 9)
+        self.assertEqual(tile_halo(blur, {'blur_type': 'median', 'blur_radius': 5}), 3)
+        self.assertEqual(tile_halo(blur, {'blur_type': 'motion', 'length': 9}), 5)
+        self.assertEqual(tile_halo(elastic_deformation, {'alpha': 10}), 11)
+        self.assertEqual(tile_halo(noise), 0)
+        with self.assertRaises(ValueError):
+            tile_halo(_invert)
+        with self.assertRaises(TypeError):
+            tile_halo(intensity, {'brightness': 2})
+
+    def test_filters_match_untiled(self):
+        """Test if tiled filters equal the untiled result across tile borders."""
+        for image in (self.gray_image, self.color_image):
+            for params in ({'blur_type': 'gaussian', 'blur_radius': 2.5},
+                           {'blur_type': 'uniform', 'blur_radius': 7},
+                           {'blur_type': 'median', 'blur_radius': 5},
+                           {'blur_type': 'motion', 'length': 9, 'angle': 30}):
+                tiled = tiled_apply(blur, image, params=params, tile_size=(40, 50), num_threads=2)
+                np.testing.assert_allclose(tiled, blur(image, **params), atol=1e-5, err_msg=str(params))
+
+    def test_per_pixel_parameters(self):
+        """Test if per-pixel parameter maps are tiled along with the image."""
+        sizes = 1 + np.arange(130)[None, :].repeat(150, axis=0) % 9
+        params = {'blur_type': 'uniform', 'blur_radius': sizes}
+        tiled = tiled_apply(blur, self.gray_image, params=params, tile_size=32)
+        np.testing.assert_allclose(tiled, blur(self.gray_image, **params), atol=1e-5)
+
+    def test_intensity_uses_whole_image_mean(self):
+        """Test if tiled contrast adjustments stretch around the mean of the whole image."""
+        params = {'brightness_factor': 1.1, 'contrast_factor': 1.5}
+        tiled = tiled_apply(intensity, self.gray_image, params=params, tile_size=32)
+        np.testing.assert_allclose(tiled, intensity(self.gray_image, **params), atol=1e-5)
+
+    def test_random_ops_are_reproducible(self):
+        """Test if random ops follow `seed`, and elastic fields do not depend on the tiling."""
+        params = {'noise_intensity': 0.1}
+        first = tiled_apply(noise, self.gray_image, params=params, tile_size=64, seed=1)
+        np.testing.assert_array_equal(first, tiled_apply(noise, self.gray_image, params=params, tile_size=64, seed=1))
+        self.assertFalse(np.array_equal(first, tiled_apply(noise, self.gray_image, params=params, tile_size=64, seed=2)))
+
+        for image in (self.gray_image, self.color_image):
+            params = {'alpha': 8.0, 'sigma': 3.0}
+            whole = tiled_apply(elastic_deformation, image, params=params, tile_size=1024, seed=3)
+            tiled = tiled_apply(elastic_deformation, image, params=params, tile_size=(37, 45), num_threads=3, seed=3)
+            # Integer results may round the other way where coordinates are off by float error
+            np.testing.assert_allclose(tiled, whole, atol=1 if image.dtype == np.uint8 else 1e-4)
+            self.assertFalse(np.array_equal(whole, image))
+
+    def test_memmap_input_and_output(self):
+        """Test if .npy files are processed from and into memory maps."""
+        source_path = os.path.join(self.directory, 'image.npy')
+        output_path = os.path.join(self.directory, 'blurred.npy')
+        np.save(source_path, self.color_image)
+        params = {'blur_type': 'gaussian', 'blur_radius': 1.5}
+        out = tiled_apply(blur, source_path, output_path, params, tile_size=48)
+        self.assertIsInstance(out, np.memmap)
+        del out
+        np.testing.assert_array_equal(np.load(output_path), blur(self.color_image, **params))
+
+    def test_custom_op_and_invalid_arguments(self):
+        """Test other ops with an explicit halo, and invalid arguments."""
+        out = np.empty_like(self.gray_image)
+        self.assertIs(tiled_apply(_invert, self.gray_image, out, halo=0, tile_size=40), out)
+        np.testing.assert_array_equal(out, 1 - self.gray_image)
+        with self.assertRaises(ValueError):
+            tiled_apply(_invert, self.gray_image)
+        with self.assertRaises(ValueError):
+            tiled_apply(noise, self.gray_image, params={'rng': 0})
+        with self.assertRaises(ValueError):
+            tiled_apply(blur, self.gray_image, np.empty((10, 10), dtype=np.float32))
+        with self.assertRaises(ValueError):
+            tiled_apply(blur, self.gray_image, tile_size=0)
+        with self.assertRaises(ValueError):
+            tiled_apply(blur, np.zeros((2, 8, 8, 3)))
+
+
+    def test_random_lesion_is_not_tiled(self):
+        """Test if `random_lesion`, which depends on the whole image, raises a clear error even with a halo."""
+        for call in (lambda: tile_halo(random_lesion),
+                     lambda: tiled_apply(random_lesion, self.gray_image),
+                     lambda: tiled_apply(random_lesion, self.gray_image, halo=64)):
+            with self.assertRaisesRegex(ValueError, 'random_lesion.*cannot be applied tile by tile'):
+                call()
+
+
+if __name__ == "__main__":
+    unittest.main()